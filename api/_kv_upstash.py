@@ -2,8 +2,6 @@ import json
 import os
 from typing import Any, Dict, Optional
 
-import requests
-
 
 class UpstashKV:
     def __init__(self):
@@ -23,12 +21,16 @@ class UpstashKV:
     def set_json(self, key: str, value: Dict[str, Any], ttl_seconds: int = 86400):
         endpoint = f"{self.url}/set/{key}"
         payload = {"value": json.dumps(value, ensure_ascii=False), "ttl": ttl_seconds}
+        import requests  # 첫 KV 호출 시 로드 (콜드 스타트 단축)
+
         r = requests.post(endpoint, headers=self._headers(), data=json.dumps(payload))
         r.raise_for_status()
         return r.json()
 
     def get_json(self, key: str) -> Optional[Dict[str, Any]]:
         endpoint = f"{self.url}/get/{key}"
+        import requests
+
         r = requests.get(endpoint, headers=self._headers())
         r.raise_for_status()
         data = r.json()
@@ -14,6 +14,19 @@ except ImportError:
     # If running locally in api folder without package structure
     import nowpayments
 
+# 프로젝트 루트의 공통 모듈(payment_status/order_store) 사용
+_root = str(Path(__file__).resolve().parents[1])
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+try:
+    import payment_status
+except ImportError:
+    payment_status = None
+
+PROJECT_ROOT = Path(_root)
+
+
 class handler(BaseHTTPRequestHandler):
     def _send_json(self, status, data):
         self.send_response(status)
@@ -124,7 +137,9 @@ class handler(BaseHTTPRequestHandler):
             parsed_path = urlparse(self.path)
             path = parsed_path.path
 
-            if "/api/pay/start" in path:
+            if "/api/pay/ipn" in path:
+                self.handle_ipn(body)
+            elif "/api/pay/start" in path:
                 self.handle_start(data)
             elif "/api/pay/token" in path:
                 self.handle_token(data)
@@ -149,8 +164,13 @@ class handler(BaseHTTPRequestHandler):
              self._send_json(400, {"error": "order_id_missing"})
              return
 
-        # Check status via NOWPayments
-        payment_info = nowpayments.get_payment_status(payment_id)
+        # IPN 으로 저장된 상태 -> 짧은 TTL 캐시 -> (동시 요청 1회로 합친) NOWPayments 조회
+        if payment_status is not None:
+            payment_info = payment_status.lookup_provider_status(
+                PROJECT_ROOT, payment_id, nowpayments.get_payment_status
+            )
+        else:
+            payment_info = nowpayments.get_payment_status(payment_id)
         
         status = "pending"
         download_url = None
@@ -208,6 +228,14 @@ class handler(BaseHTTPRequestHandler):
             "provider_status": provider_status
         })
 
+    def handle_ipn(self, raw_body):
+        if payment_status is None:
+            self._send_json(503, {"ok": False, "error": "ipn_unavailable"})
+            return
+        signature = self.headers.get(payment_status.IPN_SIG_HEADER, "")
+        result = payment_status.ingest_ipn(PROJECT_ROOT, raw_body, signature)
+        self._send_json(result.pop("http_status", 200), result)
+
     def handle_start(self, data):
         product_id = data.get('product_id', '')
         # Default price
@@ -1,4 +1,3 @@
-import requests
 import json
 import os
 import random
@@ -56,6 +55,8 @@ def create_invoice(order_id, product_id, amount, currency="usd"):
         "cancel_url": f"https://metapassiveincome-final.vercel.app/outputs/{product_id}/index.html?payment=cancel"
     }
     
+    import requests  # 실제 API 호출 시에만 로드 (시뮬레이션/상태 조회 콜드 스타트 단축)
+
     try:
         response = requests.post(url, headers=_headers(), json=payload, timeout=10)
         response.raise_for_status()
@@ -89,6 +90,8 @@ def create_payment(order_id, product_id, amount, currency="usd"):
         "ipn_callback_url": "https://metapassiveincome-final.vercel.app/api/pay/ipn" # Optional
     }
     
+    import requests
+
     try:
         response = requests.post(url, headers=_headers(), json=payload, timeout=10)
         response.raise_for_status()
@@ -114,6 +117,8 @@ def get_payment_status(payment_id):
         }
 
     url = f"{BASE_URL}/v1/payment/{payment_id}"
+    import requests
+
     try:
         response = requests.get(url, headers=_headers(), timeout=10)
         response.raise_for_status()
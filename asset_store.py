@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+asset_store.py
+
+목적(운영용):
+- 제품과 무관하게 항상 같은 결과가 나오는 자산(다이어그램 PNG, 보너스 고정 템플릿 등)을
+  한 번만 만들고 내용 주소(SHA256)로 저장한 뒤, 제품 폴더에는 하드링크로 배치한다.
+- 제품 수천 개를 만들어도 렌더링 CPU는 자산당 1회, 디스크는 자산당 1벌만 사용한다.
+
+구조:
+    data/asset_store/
+      objects/<sha[:2]>/<sha><suffix>     : 실제 내용 (내용 주소)
+      index/<namespace>/<name>.<version>.json : (namespace, name, version) -> sha/suffix
+
+- version 은 생성 코드(빌더 소스 등)의 해시를 넣는다. 코드가 바뀌면 새 키가 되어 다시 렌더링된다.
+- 하드링크가 불가능한 환경(다른 드라이브 등)에서는 복사로 대체한다.
+- 제품 폴더의 파일은 os.replace 로 교체하므로, 공유 객체를 제자리에서 덮어쓰지 않는다.
+
+환경변수:
+- ASSET_STORE_DIR: 저장소 위치 (기본: <프로젝트>/data/asset_store)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+DEFAULT_STORE_DIR = PROJECT_ROOT / "data" / "asset_store"
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def version_hash(*parts: str) -> str:
+    """생성 코드/설정 문자열들로 짧은 버전 해시를 만든다."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def link_or_copy(src: Path, dest: Path) -> str:
+    """dest 에 src 를 하드링크(불가 시 복사)로 배치한다. 반환: exists|linked|copied"""
+    src, dest = Path(src), Path(dest)
+    try:
+        if dest.exists() and os.path.samefile(src, dest):
+            return "exists"
+    except OSError:
+        pass
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    try:
+        os.link(src, tmp)
+        mode = "linked"
+    except OSError:
+        shutil.copyfile(src, tmp)
+        mode = "copied"
+    os.replace(tmp, dest)
+    return mode
+
+
+class AssetStore:
+    """(namespace, name, version) 키로 자산을 1회 생성하고 내용 주소로 공유하는 저장소."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or os.getenv("ASSET_STORE_DIR") or DEFAULT_STORE_DIR)
+        self.objects_dir = self.root / "objects"
+        self.index_dir = self.root / "index"
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "created": 0}
+
+    def _index_path(self, namespace: str, name: str, version: str) -> Path:
+        return self.index_dir / namespace / f"{name}.{version}.json"
+
+    def _object_path(self, sha: str, suffix: str) -> Path:
+        return self.objects_dir / sha[:2] / f"{sha}{suffix}"
+
+    def lookup(self, namespace: str, name: str, version: str) -> Optional[Path]:
+        idx = self._index_path(namespace, name, version)
+        try:
+            entry = json.loads(idx.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        obj = self._object_path(entry["sha256"], entry.get("suffix", ""))
+        return obj if obj.exists() else None
+
+    def put_file(self, path: Path, suffix: str = "") -> Path:
+        """파일을 내용 주소 객체로 옮긴다 (같은 내용이 이미 있으면 원본은 삭제)."""
+        path = Path(path)
+        sha = _sha256_file(path)
+        obj = self._object_path(sha, suffix)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        if obj.exists():
+            path.unlink()
+        else:
+            os.replace(path, obj)
+        return obj
+
+    def put_bytes(self, data: bytes, suffix: str = "") -> Path:
+        sha = hashlib.sha256(data).hexdigest()
+        obj = self._object_path(sha, suffix)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_name(f".{obj.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+            tmp.write_bytes(data)
+            os.replace(tmp, obj)
+        return obj
+
+    def _record(self, namespace: str, name: str, version: str, obj: Path, suffix: str) -> None:
+        idx = self._index_path(namespace, name, version)
+        idx.parent.mkdir(parents=True, exist_ok=True)
+        tmp = idx.with_name(f".{idx.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+        tmp.write_text(
+            json.dumps({"sha256": obj.name[: -len(suffix)] if suffix else obj.name, "suffix": suffix}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, idx)
+
+    def get_or_create(
+        self,
+        namespace: str,
+        name: str,
+        version: str,
+        suffix: str,
+        producer: Callable[[Path], bool],
+    ) -> Optional[Path]:
+        """키에 해당하는 객체를 반환한다. 없으면 producer(tmp_path) 로 1회 생성한다.
+
+        producer 는 tmp_path 에 파일을 쓰고 성공 여부를 반환한다 (실패 시 None 반환, 저장하지 않음).
+        """
+        found = self.lookup(namespace, name, version)
+        if found is not None:
+            self.stats["hits"] += 1
+            return found
+        with self._lock:
+            found = self.lookup(namespace, name, version)
+            if found is not None:
+                self.stats["hits"] += 1
+                return found
+            tmp_dir = self.root / "tmp"
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            tmp = tmp_dir / f"{namespace}-{name}-{os.getpid()}-{threading.get_ident()}{suffix}"
+            try:
+                if not producer(tmp) or not tmp.exists():
+                    return None
+                obj = self.put_file(tmp, suffix)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            self._record(namespace, name, version, obj, suffix)
+            self.stats["created"] += 1
+            return obj
+
+    def materialize(self, obj: Path, dest: Path) -> str:
+        return link_or_copy(obj, dest)
+
+
+_STORE: Optional[AssetStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_asset_store() -> AssetStore:
+    """프로세스 전역 AssetStore 싱글톤."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = AssetStore()
+        return _STORE
+
+
+def usage(root: Optional[Path] = None) -> Dict[str, int]:
+    """저장소 객체 수/바이트 (도구용)."""
+    store = AssetStore(root) if root else get_asset_store()
+    count, size = 0, 0
+    if store.objects_dir.exists():
+        for p in store.objects_dir.rglob("*"):
+            if p.is_file():
+                count += 1
+                size += p.stat().st_size
+    return {"objects": count, "bytes": size}
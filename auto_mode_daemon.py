@@ -16,14 +16,15 @@ sys.path.append(str(PROJECT_ROOT))
 
 # Import core modules
 from src.ledger_manager import LedgerManager
-from src.config import Config
+from src.config import Config, init_config
+from src.config_store import get_secrets
 from src.publisher import Publisher
 from src.promotion_dispatcher import dispatch_publish, load_channel_config, repromote_best_sellers
-from src.key_manager import KeyManager
+from src.utils import configure_logging
 from src.comment_bot import CommentBot
+from src.comment_ingest import get_comment_ingestor, is_recreation_request, needs_recreation
 from src.error_learning_system import get_error_system
 import requests
-import re
 
 # Logging configuration
 LOGS_DIR = PROJECT_ROOT / "logs"
@@ -34,15 +35,8 @@ LOG_FILE = LOGS_DIR / "auto_mode_daemon.log"
 if LOG_FILE.exists() and LOG_FILE.stat().st_size == 0:
     pass # Keep it
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8", delay=False),
-        logging.StreamHandler(sys.stdout)
-    ],
-    force=True
-)
+# 로테이션 파일(+ LOG_JSONL 사이드카) + stdout, 쓰기는 백그라운드 QueueListener 가 담당
+configure_logging(LOG_FILE, level=logging.INFO, stream=sys.stdout, force=True)
 logger = logging.getLogger("AutoModeDaemon")
 
 STATUS_FILE = PROJECT_ROOT / "data" / "daemon_status.json"
@@ -351,7 +345,7 @@ def _discover_new_products(since_ts: float) -> List[str]:
     return new_ids
 
 def _check_wordpress_comments():
-    """워드프레스 댓글을 통한 상품 재생성 요청 확인"""
+    """워드프레스 댓글을 통한 상품 재생성 요청 확인 (공유 댓글 수집기의 새 댓글만 처리)"""
     try:
         cfg = load_channel_config()
         blog_cfg = cfg.get("blog", {})
@@ -361,82 +355,30 @@ def _check_wordpress_comments():
         if not wp_api_url or not wp_token:
             return
 
-        # 댓글 엔드포인트
-        base_url = wp_api_url.split('/wp/v2/')[0] + '/wp/v2/comments'
-        headers = {}
-        if ":" in wp_token:
-            import base64
-            encoded_auth = base64.b64encode(wp_token.encode("utf-8")).decode("utf-8")
-            headers["Authorization"] = f"Basic {encoded_auth}"
-        else:
-            headers["Authorization"] = f"Bearer {wp_token}"
-            
-        r = requests.get(base_url, headers=headers, params={"per_page": 10, "status": "approve"}, timeout=10)
-        if r.status_code != 200:
+        ingestor = get_comment_ingestor(wp_api_url, wp_token)
+        ingestor.refresh()
+        comments = ingestor.pending("recreate")
+        if not comments:
             return
-            
-        comments = r.json()
-        processed_file = PROJECT_ROOT / "data" / "processed_comments.json"
-        processed_ids = []
-        if processed_file.exists():
-            try:
-                processed_ids = json.loads(processed_file.read_text())
-            except: pass
 
         lm = LedgerManager(Config.DATABASE_URL)
-        new_processed = False
-        
         for c in comments:
-            c_id = c.get("id")
-            if c_id in processed_ids:
-                continue
-            
-            content = c.get("content", {}).get("rendered", "").lower()
-            keywords = ["request", "recreate", "buy", "purchase", "결제", "구매", "요청", "살게요", "재생성"]
-            
-            if any(k in content for k in keywords):
-                post_id = c.get("post")
-                # 포스트 본문에서 product_id 추출 시도
-                post_url = wp_api_url.split('/wp/v2/')[0] + f'/wp/v2/posts/{post_id}'
-                pr = requests.get(post_url, headers=headers, timeout=10)
-                if pr.status_code == 200:
-                    p_data = pr.json()
-                    p_content = p_data.get("content", {}).get("rendered", "")
-                    p_slug = p_data.get("slug", "")
-                    
-                    product_id = None
-                    # 1. data-product-id 속성
-                    m = re.search(r'data-product-id=["\']([^"\']+)["\']', p_content)
-                    if m: product_id = m.group(1)
-                    # 2. 슬러그에서 ID 패턴 추출
-                    if not product_id:
-                        m = re.search(r'(\d{8}-\d{6}-[a-zA-Z0-9\-]+)', p_slug)
-                        if m: product_id = m.group(1)
-                        
-                        if product_id:
-                            prod = lm.get_product(product_id)
-                            # 상품이 없거나, 실패 상태거나, 명시적으로 재생성 요청이 있는 경우 진행
-                            should_recreate = False
-                            if not prod:
-                                should_recreate = True
-                            elif prod.get("status") in ["PIPELINE_FAILED", "CRITICAL_FAILED", "QA_FAILED", "DELETED"]:
-                                should_recreate = True
-                            
-                            if should_recreate:
-                                logger_info(f"댓글 요청으로 인한 상품 재생성 시작: {product_id}")
-                                # 중복 실행 방지를 위해 즉시 처리된 것으로 간주 (또는 별도 락 파일 사용 가능)
-                                # 재생성 트리거 (auto_pilot 호출, product_id 전달)
-                                parts = product_id.split('-', 2)
-                                topic = parts[2] if len(parts) > 2 else "requested"
-                                subprocess.Popen([sys.executable, "auto_pilot.py", "--batch", "1", "--topic", topic, "--product_id", product_id, "--deploy", "1"])
-                            else:
-                                logger_info(f"댓글 요청이 있으나 상품이 이미 양호한 상태입니다: {product_id} ({prod.get('status')})")
-            
-            processed_ids.append(c_id)
-            new_processed = True
-            
-        if new_processed:
-            processed_file.write_text(json.dumps(processed_ids))
+            if is_recreation_request(c):
+                # 포스트 본문/슬러그에서 product_id 추출 (글별 캐시)
+                product_id = ingestor.product_for_post(c.get("post"))
+                if product_id:
+                    prod = lm.get_product(product_id)
+                    # 상품이 없거나 실패 상태인 경우에만 재생성
+                    if needs_recreation(prod):
+                        logger_info(f"댓글 요청으로 인한 상품 재생성 시작: {product_id}")
+                        # 재생성 트리거 (auto_pilot 호출, product_id 전달)
+                        parts = product_id.split('-', 2)
+                        topic = parts[2] if len(parts) > 2 else "requested"
+                        subprocess.Popen([sys.executable, "auto_pilot.py", "--batch", "1", "--topic", topic, "--product_id", product_id, "--deploy", "1"])
+                    else:
+                        logger_info(f"댓글 요청이 있으나 상품이 이미 양호한 상태입니다: {product_id} ({prod.get('status')})")
+            # 중복 실행 방지를 위해 즉시 처리된 것으로 기록
+            ingestor.mark_processed("recreate", [c.get("id")])
             
     except Exception as e:
         logger_info(f"WordPress 댓글 확인 중 오류: {e}")
@@ -531,19 +473,16 @@ def main() -> int:
     publish = bool(int(args.publish))
     max_runs = int(args.max_runs)
 
-    # 0. 초기 키 스캔 (Auto Key Extraction)
+    # 0. 환경 로드 + 초기 키 스캔 (Auto Key Extraction)
     try:
-        km = KeyManager(PROJECT_ROOT)
-        km.scan_and_extract()
+        init_config(PROJECT_ROOT)
     except Exception as e:
         logger_info(f"키 매니저 초기화 오류: {e}")
 
     # 0.5 댓글 봇 초기화
     comment_bot = None
     try:
-        # Load secrets fresh
-        with open(PROJECT_ROOT / "data" / "secrets.json", "r", encoding="utf-8") as f:
-            secrets = json.load(f)
+        secrets = get_secrets(PROJECT_ROOT)
         if secrets.get("WP_API_URL") and secrets.get("WP_TOKEN"):
             comment_bot = CommentBot(secrets["WP_API_URL"], secrets["WP_TOKEN"])
             logger_info("🤖 댓글 관리 봇(CommentBot) 활성화됨")
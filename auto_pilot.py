@@ -8,7 +8,6 @@ import json
 import os
 import random
 import time
-import zipfile
 from datetime import datetime
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
@@ -17,7 +16,7 @@ import subprocess
 import sys
 import difflib
 
-from src.utils import get_logger, handle_errors, retry_on_failure, ProductionError, ensure_parent_dir, write_text, write_json
+from src.utils import annotate_span, get_logger, handle_errors, mark_stage, retry_on_failure, ProductionError, ensure_parent_dir, write_text, write_json
 from src.progress_tracker import update_progress
 from src.error_learning_system import get_error_system
 from src.payment_flow_verifier import PaymentFlowVerifier
@@ -26,9 +25,7 @@ logger = get_logger(__name__)
 
 from premium_content_engine import generate_premium_product, to_markdown
 from product_factory import DEFAULT_TOPICS, write_manifest
-from pro_pdf_engine import build_pdf_from_markdown
 from promotion_factory import generate_promotions
-from promotion_dispatcher import dispatch_publish
 
 try:
     from premium_bonus_generator import build_bonus_package
@@ -66,7 +63,7 @@ except Exception as e:
 from src.ledger_manager import LedgerManager
 from src.product_generator import ProductGenerator, ProductGenerationConfig
 from src.qa_manager import QAManager, QAResult
-from src.package_manager import PackageManager
+from src.package_manager import PackageManager, iter_tree_entries, write_deterministic_zip
 from src.publisher import Publisher
 # from src.payment_processor import PaymentProcessor # auto_pilot에서는 직접 사용하지 않음
 # from src.fulfillment_manager import FulfillmentManager # auto_pilot에서는 직접 사용하지 않음
@@ -165,9 +162,39 @@ class ProductFactory:
 
         logger.info("ProductFactory 초기화 완료")
     
+    def _find_near_duplicate_product(self, product_id: str, markdown: str) -> Dict | None:
+        """근사 중복 인덱스에서 같은 내용의 기존 제품을 찾습니다 (원장에 없는 항목은 인덱스에서 정리)."""
+        try:
+            from src.near_duplicate_index import get_near_duplicate_index
+
+            index = get_near_duplicate_index()
+            for match in index.query(markdown, kind="product", exclude_product=product_id):
+                existing = self.ledger_manager.get_product(match.product_id)
+                if existing:
+                    logger.info(f"[{product_id}] 근사 중복 후보: {match.product_id} (해밍 거리 {match.distance})")
+                    return existing
+                index.remove_product(match.product_id)
+        except Exception as e:
+            logger.warning(f"[{product_id}] 근사 중복 인덱스 조회 실패 (건너뜀): {e}")
+        return None
+
+    def _index_near_duplicate(self, product_id: str, markdown: str = "", product_dir: Path | None = None) -> None:
+        """제품 마크다운(또는 출력 폴더의 제품/랜딩/홍보글)을 근사 중복 인덱스에 반영합니다."""
+        try:
+            from src.near_duplicate_index import doc_id_for, get_near_duplicate_index, index_product_outputs
+
+            index = get_near_duplicate_index()
+            if markdown:
+                index.add(doc_id_for("product", product_id), markdown, kind="product", product_id=product_id)
+            if product_dir is not None:
+                index_product_outputs(index, product_dir)
+        except Exception as e:
+            logger.warning(f"[{product_id}] 근사 중복 인덱스 갱신 실패: {e}")
+
     @handle_errors(stage="Resume Pipeline")
     def resume_processing_product(self, product_id: str, topic: str, current_product_output_dir: str) -> RunResult:
         """기존 제품 ID와 출력 디렉토리를 사용하여 파이프라인을 재개합니다."""
+        annotate_span(product_id=product_id, topic=topic)
         logger.info(f"[{product_id}] 파이프라인 재개 시작 (주제: {topic}).")
         out_dir = Path(current_product_output_dir)
         languages = ["en"] # 영어만 사용
@@ -183,6 +210,7 @@ class ProductFactory:
                  return self.create_and_process_product(topic, languages)
 
             # 2. QA Stage 1 – Generation Quality Gate
+            mark_stage("qa1")
             logger.info(f"[{product_id}] 2. QA Stage 1 (생성 품질 게이트) 시작...")
             update_progress("Product Creation", "QA Stage 1", 70, "Validating generated content...", product_id)
             qa1_result = self.qa_manager.run_qa_stage_1(product_id, current_product_output_dir)
@@ -196,6 +224,7 @@ class ProductFactory:
                 return RunResult(product_id, current_product_output_dir, "QA1_FAILED")
 
             # 3. Monetize Stage – Inject Payment Widget
+            mark_stage("monetize")
             logger.info(f"[{product_id}] 3. 수익화 단계(결제 위젯 주입) 시작...")
             try:
                 from monetize_module import MonetizeModule, PaymentInjectConfig
@@ -255,6 +284,7 @@ class ProductFactory:
                     return RunResult(product_id, current_product_output_dir, "MONETIZATION_FAILED")
 
             # 4. Package Stage – Productization
+            mark_stage("package")
             logger.info(f"[{product_id}] 4. 패키징 단계 시작...")
             update_progress("Product Creation", "Packaging", 80, "Creating ZIP package...", product_id)
             
@@ -283,6 +313,7 @@ class ProductFactory:
             logger.info(f"[{product_id}] 4. 패키징 단계 완료. 패키지 경로: {package_path}")
 
             # 5. QA Stage 2 – Shipment Gate
+            mark_stage("qa2")
             logger.info(f"[{product_id}] 5. QA Stage 2 (배송 게이트) 시작...")
             strict_download_check = os.getenv("QA2_CHECK_DOWNLOAD_ENDPOINT", "0") == "1"
             download_url = None
@@ -318,6 +349,7 @@ class ProductFactory:
                 return RunResult(product_id, current_product_output_dir, "QA2_FAILED")
 
             # 6. Publish Stage
+            mark_stage("publish")
             logger.info(f"[{product_id}] 6. 발행 단계 시작...")
             if self.publisher is None:
                 self.ledger_manager.update_product_status(product_id, "PUBLISH_SKIPPED", metadata={"reason":"publisher_not_initialized"})
@@ -344,6 +376,7 @@ class ProductFactory:
 
                 # 6.5. Payment Flow Verification (소비자 구매 과정 검수)
                 if deployment_url:
+                    mark_stage("payment_verify")
                     logger.info(f"[{product_id}] 6.5. 소비자 구매 과정 검수 시작...")
                     update_progress("Product Creation", "Verifying Payment Flow", 95, "Checking payment gateway...", product_id)
                     verifier = PaymentFlowVerifier()
@@ -411,9 +444,12 @@ class ProductFactory:
             product_id = f"{_now_ts()}-{_slugify(topic)[:30]}".strip("-")
         
         current_product_output_dir = "N/A" # 초기화
+        # 단계별 소요 시간은 handle_errors 의 span 이벤트로 기록 (Full Pipeline/<stage>)
+        annotate_span(product_id=product_id, topic=topic)
 
         try:
             # 2. 콘텐츠 생성 및 해시 추출
+            mark_stage("content")
             logger.info(f"[{product_id}] 콘텐츠 생성 시작...")
             update_progress("Product Creation", "Generating Content (AI)", 10, "Writing premium content...", product_id)
             
@@ -449,11 +485,20 @@ class ProductFactory:
                 # 주제가 다르더라도 내용이 같으면 중복으로 간주하여 비효율성 제거
                 return RunResult(existing_hash["id"], str(self.outputs_dir / existing_hash["id"]), existing_hash["status"])
 
+            # 3-1. 근사 중복 체크 (SimHash): 일부 문장만 다른 제품도 PDF/패키징/배포 전에 중단
+            md_en = to_markdown(premium_product)
+            near_dup = self._find_near_duplicate_product(product_id, md_en)
+            if near_dup:
+                logger.warning(f"[{product_id}] 기존 제품과 거의 같은 콘텐츠입니다 (ID: {near_dup['id']}). 중복 생성을 중단합니다.")
+                return RunResult(near_dup["id"], str(self.outputs_dir / near_dup["id"]), near_dup["status"])
+
             # 4. 원장에 제품 초기 상태 기록 (DRAFT + content_hash)
             self.ledger_manager.create_product(product_id, topic, content_hash=content_hash, metadata={"initial_topic": topic, "languages": languages})
+            self._index_near_duplicate(product_id, md_en)
             logger.info(f"[{product_id}] 제품 원장 초기화 완료 (상태: DRAFT, 해시: {content_hash[:10]}...).")
 
             # 5. Asset Generation Stage
+            mark_stage("assets")
             logger.info(f"[{product_id}] 1. 에셋 생성 단계 시작...")
             update_progress("Product Creation", "Generating Assets (AI)", 30, "Creating images and HTML...", product_id)
             
@@ -486,11 +531,11 @@ class ProductFactory:
             current_product_output_dir = gen_result["output_dir"]
             out_dir = Path(current_product_output_dir)
             
-            md_en = to_markdown(premium_product)
             write_text(out_dir / "product.md", md_en)
             md_en_path = out_dir / "product_en.md"
             write_text(md_en_path, md_en)
 
+            mark_stage("pdf")
             update_progress("Product Creation", "Generating PDF", 40, "Building PDF ebook...", product_id)
 
             # 영어 전용 요청에 따라 한국어 번역 생략
@@ -510,12 +555,15 @@ class ProductFactory:
                 "footer_note": "Premium playbook + templates + promotion assets",
             }
             pdf_status: Dict[str, Dict[str, str]] = {}
+            # reportlab 은 PDF 단계에서만 로드
+            from pdf_render_service import get_pdf_service
+
             # 영어 PDF만 생성
             for lang, md_path in [("en", md_en_path)]:
                 pdf_path = out_dir / f"product_{lang}.pdf"
                 cover_meta = dict(cover_base)
                 cover_meta["language"] = lang.upper()
-                res = build_pdf_from_markdown(md_path, pdf_path, premium_product.title, cover_meta=cover_meta)
+                res = get_pdf_service().build(md_path, pdf_path, premium_product.title, cover_meta=cover_meta)
                 pdf_status[lang] = {
                     "ok": "true" if res.ok else "false",
                     "error": str(res.error or ""),
@@ -529,6 +577,7 @@ class ProductFactory:
                 },
             )
             # 보너스 팩도 영어로만 (필요 시 수정 가능하지만 현재는 기본 유지)
+            mark_stage("bonus")
             update_progress("Product Creation", "Generating Bonus Pack", 50, "Creating bonus templates...", product_id)
             bonus_dir = out_dir / "bonus_en" # ko -> en 변경
             bonus_result = build_bonus_package(bonus_dir=bonus_dir, product=premium_product)
@@ -541,14 +590,12 @@ class ProductFactory:
                 },
             )
             bonus_zip = out_dir / "bonus_en.zip" # ko -> en 변경
-            with zipfile.ZipFile(bonus_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-                for p in bonus_dir.rglob("*"):
-                    if p.is_file():
-                        zf.write(p, arcname=p.relative_to(bonus_dir).as_posix())
+            write_deterministic_zip(str(bonus_zip), iter_tree_entries(str(bonus_dir)))
             
             # 홍보 자료 생성 시에도 최종 결정된 가격 사용
             price_usd_for_promo = final_price if final_price is not None else 29.0
             
+            mark_stage("promotions")
             update_progress("Product Creation", "Generating Promo Content", 60, "Writing blog posts and social content...", product_id)
 
             promo_meta = generate_promotions(
@@ -577,6 +624,7 @@ class ProductFactory:
                     write_text(promos_dir / "tiktok.txt", txt)
                     write_text(promos_dir / "youtube_shorts.txt", txt)
             write_json(out_dir / "promotion_report.json", promo_meta)
+            self._index_near_duplicate(product_id, product_dir=out_dir)
             write_json(
                 out_dir / "premium_content_report.json",
                 {
@@ -588,6 +636,7 @@ class ProductFactory:
             )
 
             # 5. manifest.json 생성 (체크섬 포함)
+            mark_stage("manifest")
             manifest_meta = {
                 "title": premium_product.title,
                 "topic": topic,
@@ -605,6 +654,7 @@ class ProductFactory:
             logger.info(f"[{product_id}] 1. 생성 단계 완료. 출력 디렉토리: {current_product_output_dir}")
 
             # 2. QA Stage 1 – Generation Quality Gate
+            mark_stage("qa1")
             logger.info(f"[{product_id}] 2. QA Stage 1 (생성 품질 게이트) 시작...")
             qa1_result = self.qa_manager.run_qa_stage_1(product_id, current_product_output_dir)
             
@@ -633,6 +683,7 @@ class ProductFactory:
                 return RunResult(product_id, current_product_output_dir, "QA1_FAILED")
 
             # 3. Monetize Stage – Inject Payment Widget
+            mark_stage("monetize")
             logger.info(f"[{product_id}] 3. 수익화 단계(결제 위젯 주입) 시작...")
             try:
                 from monetize_module import MonetizeModule, PaymentInjectConfig
@@ -650,6 +701,7 @@ class ProductFactory:
                 return RunResult(product_id, current_product_output_dir, "MONETIZATION_FAILED")
 
             # 4. Package Stage – Productization
+            mark_stage("package")
             logger.info(f"[{product_id}] 4. 패키징 단계 시작...")
             try:
                 package_result = self.package_manager.package_product(product_id, current_product_output_dir)
@@ -676,6 +728,7 @@ class ProductFactory:
             logger.info(f"[{product_id}] 4. 패키징 단계 완료. 패키지 경로: {package_path}")
 
             # 5. QA Stage 2 – Shipment Gate
+            mark_stage("qa2")
             logger.info(f"[{product_id}] 5. QA Stage 2 (배송 게이트) 시작...")
             strict_download_check = os.getenv("QA2_CHECK_DOWNLOAD_ENDPOINT", "0") == "1"
             download_url = None
@@ -711,6 +764,7 @@ class ProductFactory:
                 return RunResult(product_id, current_product_output_dir, "QA2_FAILED")
 
             # 6. Publish Stage
+            mark_stage("publish")
             logger.info(f"[{product_id}] 6. 발행 단계 시작...")
             if self.publisher is None:
                 self.ledger_manager.update_product_status(product_id, "PUBLISH_SKIPPED", metadata={"reason":"publisher_not_initialized"})
@@ -737,6 +791,7 @@ class ProductFactory:
                 
                 # 6.5. Payment Flow Verification (소비자 구매 과정 검수)
                 if deployment_url:
+                    mark_stage("payment_verify")
                     logger.info(f"[{product_id}] 6.5. 소비자 구매 과정 검수 시작...")
                     update_progress("Product Creation", "Verifying Payment Flow", 95, "Checking payment gateway...", product_id)
                     verifier = PaymentFlowVerifier()
@@ -788,8 +843,11 @@ class ProductFactory:
                     logger.error(f"[{product_id}] manifest.json 업데이트 중 오류: {e}")
 
                 # 7. Promotion Stage - Simultaneous publishing to external channels (WordPress, etc.)
+                mark_stage("promote")
                 logger.info(f"[{product_id}] 7. 홍보 채널 자동 발행 시작...")
                 try:
+                    from src.promotion_dispatcher import dispatch_publish
+
                     dispatch_publish(product_id)
                     logger.info(f"[{product_id}] 7. 홍보 채널 발행 완료.")
                 except Exception as e:
@@ -989,7 +1047,25 @@ def main() -> int:
     p.add_argument("--product_id", type=str, default="", help="특정 product_id 사용 (재생성 시 사용)")
     p.add_argument("--continuous", action="store_true", help="지속생성 모드로 주기적으로 배치 실행")
     p.add_argument("--interval", type=int, default=60, help="지속생성 모드에서 실행 간격(분)")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        default=os.getenv("PIPELINE_PROFILE", ""),
+        help="프로파일링 모드: all|cprofile|sample|timing (기본: PIPELINE_PROFILE). 결과는 data/perf/<run_id>/",
+    )
     args = p.parse_args()
+    try:
+        from src.pipeline_profiler import resolve_mode
+
+        args.profile = resolve_mode(args.profile)
+    except ValueError as e:
+        p.error(str(e))
+
+    from src.config import init_config
+
+    # .env / secrets.json 적용 + 새 키 추출 (import 시에는 하지 않음)
+    init_config()
 
     if int(args.batch or 0) <= 0:
         logger.info("Legacy auto_pilot 모드를 실행합니다.")
@@ -1058,13 +1134,21 @@ def main() -> int:
     factory = ProductFactory(PROJECT_ROOT)
     def _run_once():
         t = str(args.topic or "")
-        results = factory.run_batch(
-            batch_size=int(args.batch), 
-            languages=langs, 
-            seed=int(args.seed), 
-            topic=t,
-            product_id=str(args.product_id or "")
-        )
+        # 프로파일링 모드: 배치 1회 = 보고서 1개 (단계별 시간 + cProfile + collapsed stacks)
+        from src.pipeline_profiler import start_profiling
+
+        profiler = start_profiling(args.profile, label=f"batch={args.batch} topic={t or 'auto'}")
+        try:
+            results = factory.run_batch(
+                batch_size=int(args.batch), 
+                languages=langs, 
+                seed=int(args.seed), 
+                topic=t,
+                product_id=str(args.product_id or "")
+            )
+        finally:
+            if profiler is not None:
+                profiler.stop()
         logger.info("=== auto_pilot 배치 결과 ===")
         for r in results:
             logger.info(f"- product_id={r.product_id} status={r.status} dir={r.output_dir}")
@@ -26,6 +26,7 @@ backend/payment_server.py
 - GET     /api/pay/download
 - GET     /api/pay/orders
 - POST    /api/pay/admin/mark_paid   (테스트 전용: pending -> paid)
+- POST    /api/pay/ipn               (NOWPayments IPN, x-nowpayments-sig 서명 검증 후 주문 저장소 갱신)
 
 초보자 안내:
 - 이 서버는 로컬 전용 테스트 서버입니다.
@@ -638,6 +639,16 @@ def admin_mark_paid():
     return _cors(jsonify({"ok": True, "order_id": order_id, "status": "paid"}))
 
 
+@app.post("/api/pay/ipn")
+def pay_ipn():
+    """NOWPayments IPN(webhook): 서명이 맞을 때만 주문 저장소(order_store)에 상태를 반영합니다."""
+    from payment_status import IPN_SIG_HEADER, ingest_ipn
+
+    result = ingest_ipn(PROJECT_ROOT, request.get_data(), request.headers.get(IPN_SIG_HEADER, ""))
+    status = int(result.pop("http_status", 200))
+    return _cors(jsonify(result)), status
+
+
 # -----------------------------
 # 엔트리포인트
 # -----------------------------
@@ -646,6 +657,13 @@ def admin_mark_paid():
 def main() -> None:
     """서버 실행(기본 5000, 환경변수 PAYMENT_PORT로 변경 가능)"""
     port = int(os.getenv("PAYMENT_PORT", "5000"))
+    try:
+        # IPN 을 놓친 pending NOWPayments 주문을 주기적으로 재확인
+        from payment_status import start_reconciler
+
+        start_reconciler(PROJECT_ROOT)
+    except Exception as e:
+        print(f"[WARN] payment reconciler not started: {e}")
     app.run(host="127.0.0.1", port=port, debug=False)
 
 
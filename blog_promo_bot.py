@@ -2,16 +2,14 @@ import time
 import json
 import threading
 from pathlib import Path
-from src.ledger_manager import LedgerManager
+from src.ledger_manager import LedgerManager, PROMOTION_CHANNELS, missing_channels, promotion_mask
 from src.config import Config
 from promotion_dispatcher import dispatch_publish
 
 PROJECT_ROOT = Path(__file__).resolve().parent
-BLOG_CHANNELS = [
-    "medium", "tumblr", "github_pages", "wordpress", "blogger",
-    "x", "telegram", "discord", "reddit", "pinterest", "linkedin",
-    "youtube_shorts", "instagram", "tiktok"
-]
+BLOG_CHANNELS = [name for name, _keys in PROMOTION_CHANNELS]
+# 원장에서 홍보가 남은 제품을 한 번에 가져오는 개수
+GAP_PAGE_SIZE = 50
 
 class BlogPromoBot:
     def __init__(self):
@@ -58,80 +56,69 @@ class BlogPromoBot:
         prod = lm.get_product(product_id)
         if not prod:
             return []
-        
-        meta = prod.get("metadata") or {}
-        needed = []
-        
-        if not meta.get("medium_url"): needed.append("medium")
-        if not meta.get("tumblr_url"): needed.append("tumblr")
-        if not meta.get("github_pages_url"): needed.append("github_pages")
-        if not meta.get("wp_link") and not meta.get("wp_post_id"): needed.append("wordpress")
-        if not meta.get("blogger_url"): needed.append("blogger")
-        
-        # Social
-        if not meta.get("x_post_id"): needed.append("x")
-        if not meta.get("telegram_posted"): needed.append("telegram")
-        if not meta.get("discord_posted"): needed.append("discord")
-        if not meta.get("reddit_url"): needed.append("reddit")
-        if not meta.get("pinterest_id"): needed.append("pinterest")
-        if not meta.get("linkedin_id"): needed.append("linkedin")
-        if not meta.get("youtube_shorts_id") and not meta.get("youtube_shorts_posted"): needed.append("youtube_shorts")
-        if not meta.get("instagram_posted"): needed.append("instagram")
-        if not meta.get("tiktok_posted"): needed.append("tiktok")
-        
-        return needed
+        return missing_channels(promotion_mask(prod.get("metadata") or {}), BLOG_CHANNELS)
 
+    def _sleep(self, seconds: int):
+        for _ in range(seconds):
+            if not self.running: break
+            time.sleep(1)
 
     def _run_loop(self):
         lm = LedgerManager(Config.DATABASE_URL)
         self.log(f"Target Channels: {', '.join(BLOG_CHANNELS)}")
+        # 원장 밖에서 metadata_json 을 직접 고친 제품이 있을 수 있으므로 시작할 때 한 번 마스크를 다시 계산
+        try:
+            fixed = lm.rebuild_promotion_masks()
+            if fixed:
+                self.log(f"Refreshed promotion state of {fixed} products.")
+        except Exception as e:
+            self.log(f"⚠️ Could not refresh promotion state: {e}")
         
         while self.running:
             try:
-                products = lm.get_all_products()
                 promoted_count = 0
+                after_id = None
                 
-                for p in products:
-                    if not self.running: break
-                    
-                    pid = p['id']
-                    topic = p['topic']
-                    needed_channels = self._get_unpromoted_blogs(pid, lm)
-                    
-                    if not needed_channels:
-                        continue
-                    
-                    self.log(f"Checking {topic[:20]}... Needs: {needed_channels}")
-                    
-                    self.log(f"🚀 Promoting '{topic[:20]}' to {needed_channels}...")
-                    results = dispatch_publish(pid, channels=needed_channels)
+                # 홍보가 남은 제품만 id 순으로 페이지 단위 조회 (완료된 제품은 SQL 에서 걸러짐)
+                while self.running:
+                    gaps = lm.get_promotion_gaps(BLOG_CHANNELS, limit=GAP_PAGE_SIZE, after_id=after_id)
+                    if not gaps: break
+                    after_id = gaps[-1]['id']
                     
-                    # Log brief result
-                    success = []
-                    failed = []
-                    dr = results.get("dispatch_results", {})
-                    for ch, res in dr.items():
-                        if res.get("ok"): success.append(ch)
-                        else: failed.append(f"{ch}({res.get('error')})")
-                    
-                    if success: self.log(f"✅ Success: {', '.join(success)}")
-                    if failed: self.log(f"❌ Failed: {', '.join(failed)}")
+                    for gap in gaps:
+                        if not self.running: break
+                        
+                        pid = gap['id']
+                        topic = gap['topic']
+                        needed_channels = gap['missing']
+                        
+                        self.log(f"🚀 Promoting '{topic[:20]}' to {needed_channels}...")
+                        results = dispatch_publish(pid, channels=needed_channels)
+                        
+                        # Log brief result
+                        success = []
+                        failed = []
+                        dr = results.get("dispatch_results", {})
+                        for ch, res in dr.items():
+                            if res.get("ok"): success.append(ch)
+                            else: failed.append(f"{ch}({res.get('error')})")
+                        
+                        if success: self.log(f"✅ Success: {', '.join(success)}")
+                        if failed: self.log(f"❌ Failed: {', '.join(failed)}")
+                        
+                        promoted_count += 1
+                        self._sleep(10)
                     
-                    promoted_count += 1
-                    time.sleep(10)
+                    if len(gaps) < GAP_PAGE_SIZE: break
             
                 if not self.running: break
                 
                 if promoted_count == 0:
                     self.log("😴 No new promotions needed. Sleeping 60s...")
-                    for _ in range(60):
-                        if not self.running: break
-                        time.sleep(1)
+                    self._sleep(60)
                 else:
                     self.log(f"🎉 Batch done. Sleeping 30s...")
-                    for _ in range(30):
-                        if not self.running: break
-                        time.sleep(1)
+                    self._sleep(30)
                         
             except Exception as e:
                 self.log(f"⚠️ Error in bot loop: {e}")
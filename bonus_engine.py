@@ -71,8 +71,11 @@ def generate_bonus_pack(output_dir: Path, topic: str, lang: str = "en") -> Path:
     _write(bonus_dir / "promotion_calendar.md", _promo_calendar(topic))
 
     zip_path = output_dir / f"bonus_{lang}.zip"
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+    # 출력 폴더의 파일은 공유 원본의 하드링크일 수 있으므로 임시 파일에 쓴 뒤 교체
+    tmp = zip_path.with_suffix(".zip.tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as z:
         for p in bonus_dir.rglob("*"):
             if p.is_file():
                 z.write(p, arcname=str(p.relative_to(output_dir)))
+    tmp.replace(zip_path)
     return zip_path
@@ -1,36 +1,48 @@
 
-import os
-import json
+import argparse
+import sys
 from pathlib import Path
-import hashlib
-
-def get_dir_hash(directory):
-    """간단한 디렉토리 콘텐츠 해시 (디자인/내용 중복 체크용)"""
-    hasher = hashlib.md5()
-    # 주요 파일들만 체크: index.html (디자인), product_en.md (내용)
-    targets = ["index.html", "product_en.md"]
-    for target in targets:
-        p = Path(directory) / target
-        if p.exists():
-            hasher.update(p.read_bytes())
-    return hasher.hexdigest()
-
-outputs_dir = Path("outputs")
-hashes = {}
-duplicates = []
-
-if outputs_dir.exists():
-    for d in outputs_dir.iterdir():
-        if d.is_dir():
-            h = get_dir_hash(d)
-            if h in hashes:
-                duplicates.append((d.name, hashes[h]))
-            else:
-                hashes[h] = d.name
-
-if duplicates:
-    print(f"Found {len(duplicates)} potential duplicates (same design/content):")
-    for dup, original in duplicates:
-        print(f" - {dup} (matches {original})")
-else:
-    print("No exact design/content duplicates found in outputs.")
+
+from src.near_duplicate_index import get_near_duplicate_index, index_product_outputs
+
+
+def main() -> int:
+    """outputs 를 근사 중복 인덱스(SimHash)에 증분 반영한 뒤 (거의) 같은 제품/홍보글 묶음을 보고합니다.
+
+    변경되지 않은 파일(크기+mtime 동일)은 다시 읽지 않으므로 두 번째 실행부터는 전체 스캔 비용이 거의 없습니다.
+    """
+    ap = argparse.ArgumentParser(description="Near-duplicate content check over outputs/")
+    ap.add_argument("--outputs", default="outputs")
+    ap.add_argument("--kinds", default="product,promotion", help="product,landing,promotion 중 보고할 종류")
+    ap.add_argument("--max-distance", type=int, default=None, help="해밍 거리 임계값 (기본: NEAR_DUP_MAX_DISTANCE 또는 3)")
+    args = ap.parse_args()
+
+    index = get_near_duplicate_index()
+    outputs_dir = Path(args.outputs)
+    updated = 0
+    if outputs_dir.exists():
+        for d in outputs_dir.iterdir():
+            if d.is_dir():
+                updated += index_product_outputs(index, d)
+    print(f"Index: {len(index)} documents ({updated} updated)")
+
+    found = 0
+    for kind in [k.strip() for k in args.kinds.split(",") if k.strip()]:
+        groups = index.clusters(kind=kind, max_distance=args.max_distance)
+        if not groups:
+            continue
+        print(f"[{kind}] {len(groups)} near-duplicate groups:")
+        for group in groups:
+            original, rest = group[0], group[1:]
+            found += len(rest)
+            for m in rest:
+                label = "same" if m.distance == 0 else f"distance {m.distance}"
+                print(f" - {m.product_id} (matches {original.product_id}, {label})")
+
+    if not found:
+        print("No near-duplicate design/content found in outputs.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -57,28 +57,13 @@ from flask import (
 )
 
 from order_store import FileOrderStore
-from src.ledger_manager import LedgerManager, Order
-from sqlalchemy import func
-from payment_api import (
-    create_order_evm,
-    get_evm_config,
-    get_product_price_wei,
-    mark_paid_testonly,
-    validate_download_token_and_consume,
-    verify_evm_payment,
-)
-from portfolio_manager import build_portfolio, write_portfolio_report
-from product_factory import ProductConfig, generate_one
-from promotion_dispatcher import (
-    dispatch_publish,
-    load_channel_config,
-    save_channel_config,
-)
-from promotion_factory import mark_ready_to_publish
-from src.key_manager import apply_keys
-from scheduler_service import SchedulerService
-from src.progress_tracker import get_progress
-from blog_promo_bot import bot_instance
+from src.config_store import get_secrets, secrets_file
+from src.dashboard_snapshot import Snapshot, get_snapshot_service
+from src.health_monitor import ServiceHealthMonitor, http_probe
+from src.log_store import query_log, stage_breakdown, tail_lines
+
+# 원장(SQLAlchemy), 결제, 제품 생성, 홍보 발행, 홍보 봇 모듈은 사용하는 라우트 안에서 import 한다.
+# (대시보드 기동과 `import dashboard_server` 를 가볍게 유지)
 
 app = Flask(__name__)
 
@@ -86,6 +71,7 @@ app = Flask(__name__)
 @app.route("/checkout/<product_id>")
 def checkout_page(product_id):
     """제품 결제 페이지 (로컬 프리뷰용)"""
+    from src.ledger_manager import LedgerManager
     try:
         lm = LedgerManager()
         product = lm.get_product(product_id)
@@ -113,77 +99,23 @@ def health():
     return jsonify({"ok": True, "service": "dashboard"})
 
 
+def _snapshot_response(snap: Snapshot) -> Response:
+    """스냅샷 본문을 ETag(본문 전체 기준이면 강한, 일부 필드 기준이면 약한)와 함께 반환하고, 변경이 없으면 304 로 응답합니다."""
+    matched = request.if_none_match.contains_weak(snap.etag) if snap.weak else request.if_none_match.contains(snap.etag)
+    if matched:
+        resp = Response(status=304)
+    else:
+        resp = Response(snap.body, mimetype="application/json")
+    resp.set_etag(snap.etag, weak=snap.weak)
+    resp.cache_control.no_cache = True
+    return resp
+
+
 @app.route("/api/system/progress", methods=["GET"])
 def system_progress():
-    """현재 시스템 진행상황 조회"""
+    """현재 시스템 진행상황 조회 (스냅샷 서비스의 읽기 모델)"""
     try:
-        lm = LedgerManager()
-        # Use get_all_products to ensure we count everything, not just the first 100
-        products = lm.get_all_products()
-        total = len(products)
-        published = len([p for p in products if p.get("status") in ["PUBLISHED", "PROMOTED"]])
-        pending = len([p for p in products if p.get("status") == "PENDING"])
-        
-        # Read logs
-        logs = []
-        log_path = PROJECT_ROOT / "logs" / "auto_mode_daemon.log"
-        if log_path.exists():
-            try:
-                # Read last 50 lines efficiently
-                with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-                    lines = f.readlines()
-                    logs = [l.strip() for l in lines[-50:]]
-            except Exception:
-                logs = ["Failed to read log file"]
-        else:
-            logs = ["Log file not found"]
-
-        # Read daemon status
-        daemon_status = {}
-        status_file = PROJECT_ROOT / "data" / "daemon_status.json"
-        if status_file.exists():
-            try:
-                daemon_status = json.loads(status_file.read_text(encoding="utf-8"))
-            except Exception:
-                pass
-        
-        # Read current detailed progress
-        current_progress = get_progress()
-        
-        # Financial Stats
-        session = lm.get_session()
-        try:
-            total_revenue = session.query(func.sum(Order.amount)).filter(Order.status == 'PAID').scalar() or 0
-            total_transactions = session.query(Order).filter(Order.status == 'PAID').count()
-            
-            recent_tx_rows = session.query(Order).filter(Order.status == 'PAID').order_by(Order.created_at.desc()).limit(5).all()
-            recent_transactions = [{
-                "id": tx.id,
-                "product_id": tx.product_id,
-                "amount": tx.amount,
-                "currency": tx.currency,
-                "date": tx.created_at.strftime("%Y-%m-%d %H:%M") if tx.created_at else "",
-                "email": tx.customer_email
-            } for tx in recent_tx_rows]
-        except Exception as e:
-            total_revenue = 0
-            total_transactions = 0
-            recent_transactions = []
-            print(f"Error calculating financial stats: {e}")
-        finally:
-            session.close()
-            
-        return jsonify({
-            "total_products": total,
-            "published_count": published,
-            "pending_count": pending,
-            "total_revenue": total_revenue,
-            "total_transactions": total_transactions,
-            "recent_transactions": recent_transactions,
-            "recent_logs": logs,
-            "daemon_status": daemon_status,
-            "current_progress": current_progress
-        })
+        return _snapshot_response(get_snapshot_service().progress())
     except Exception as e:
         return jsonify({
             "total_products": 0,
@@ -200,158 +132,7 @@ def list_products():
     try:
         page = int(request.args.get("page", 1))
         limit = int(request.args.get("limit", 10))
-        
-        lm = LedgerManager()
-        products = lm.get_all_products()
-        
-        # Sort by created_at desc
-        products.sort(key=lambda x: x.get("created_at") or "", reverse=True)
-        
-        total_products = len(products)
-        total_pages = (total_products + limit - 1) // limit
-        
-        # Slice for pagination
-        start = (page - 1) * limit
-        end = start + limit
-        paginated_products = products[start:end]
-        
-        # Load audit report for promotion status
-        audit_map = {}
-        audit_file = PROJECT_ROOT / "data" / "audit_report.json"
-        if audit_file.exists():
-            try:
-                audit_data = json.loads(audit_file.read_text(encoding="utf-8"))
-                for item in audit_data.get("details", []):
-                    # We are interested in promotion items
-                    if "promotion_" not in item.get("type", ""):
-                        continue
-                    
-                    pid = item.get("product_id")
-                    if not pid: continue
-                    
-                    if pid not in audit_map:
-                        audit_map[pid] = []
-                    
-                    channel = item.get("type").replace("promotion_", "")
-                    # Normalize channel names (remove _api suffix)
-                    if channel.endswith("_api"):
-                        channel = channel.replace("_api", "")
-                    
-                    # Merge duplicate entries for the same channel
-                    existing = next((x for x in audit_map[pid] if x['channel'] == channel), None)
-                    if existing:
-                        existing['issues'].extend(item.get("issues", []))
-                    else:
-                        audit_map[pid].append({
-                            "channel": channel,
-                            "issues": item.get("issues", [])
-                        })
-            except Exception:
-                pass
-                
-        # Merge promotion data and format for frontend
-        results = []
-        for p in paginated_products:
-            # Normalize status
-            p_status = str(p.get("status", "")).strip().upper()
-            
-            meta = p.get("metadata", {})
-            qa_status = "Pending"
-            qa_details = []
-            
-            if p_status == "PUBLISHED":
-                qa_status = "Passed"
-            elif p_status == "PROMOTED":
-                qa_status = "Published & Promoted"
-            elif "QA2_PASSED" in p_status:
-                qa_status = "Passed (Ready to Publish)"
-            elif "QA1_PASSED" in p_status:
-                qa_status = "Content Verified"
-            elif "QA" in p_status and "FAILED" in p_status:
-                qa_status = "Failed"
-                # Try to extract failure reason from metadata
-                if meta.get("messages"):
-                    qa_details = meta.get("messages")
-                elif meta.get("error"):
-                    qa_details = [meta.get("error")]
-            
-            # If QA passed, show success messages if available
-            if not qa_details and meta.get("messages"):
-                 qa_details = meta.get("messages")
-
-            # Collect promotion status from both Audit Report AND Product Metadata
-            promo_list = audit_map.get(p["id"], [])
-            
-            # Helper to add or update
-            def add_promo(channel, url=None, id_val=None):
-                existing = next((x for x in promo_list if x['channel'] == channel), None)
-                if existing:
-                    if url: 
-                        existing["url"] = url
-                        existing["issues"] = [] # Clear issues if URL is confirmed
-                    if id_val: 
-                        existing["id"] = id_val
-                        existing["issues"] = [] # Clear issues if ID is confirmed
-                else:
-                    entry = {"channel": channel, "issues": []}
-                    if url: entry["url"] = url
-                    if id_val: entry["id"] = id_val
-                    promo_list.append(entry)
-
-            # Check metadata for successful promotions
-            if meta.get("wp_link"): add_promo("wordpress", url=meta.get("wp_link"))
-            if meta.get("medium_url"): add_promo("medium", url=meta.get("medium_url"))
-            if meta.get("tumblr_url"): add_promo("tumblr", url=meta.get("tumblr_url"))
-            if meta.get("github_pages_url"): add_promo("github_pages", url=meta.get("github_pages_url"))
-            if meta.get("blogger_url"): add_promo("blogger", url=meta.get("blogger_url"))
-            if meta.get("reddit_url"): add_promo("reddit", url=meta.get("reddit_url"))
-            
-            if meta.get("x_post_id"): 
-                x_id = meta.get("x_post_id")
-                # Try to construct URL if it looks like a numeric ID
-                x_url = f"https://x.com/i/status/{x_id}" if x_id.isdigit() else None
-                add_promo("x", url=x_url, id_val=x_id)
-
-            if meta.get("pinterest_id"): 
-                pin_id = meta.get("pinterest_id")
-                pin_url = f"https://www.pinterest.com/pin/{pin_id}/" if pin_id.isdigit() else None
-                add_promo("pinterest", url=pin_url, id_val=pin_id)
-
-            if meta.get("linkedin_id"): 
-                li_id = meta.get("linkedin_id")
-                # LinkedIn IDs are complex, often just numbers or urns. 
-                # If number, likely urn:li:share:ID or urn:li:activity:ID
-                li_url = f"https://www.linkedin.com/feed/update/urn:li:activity:{li_id}/" if li_id.isdigit() else None
-                add_promo("linkedin", url=li_url, id_val=li_id)
-            
-            if meta.get("telegram_posted") == "true": add_promo("telegram", id_val="Posted")
-            if meta.get("discord_posted") == "true": add_promo("discord", id_val="Posted")
-
-            # Fallback: if no wp_link but deployment_url exists, maybe treat deployment_url as "Site"
-            # But do not label it as 'wordpress' promotion unless we are sure.
-            # actually, let's keep deployment_url separate as 'live_url' in the main dict.
-
-            results.append({
-                "id": p["id"],
-                "topic": p["topic"],
-                "status": p_status,
-                "created_at": p["created_at"],
-                "published_at": meta.get("published_at"),
-                "live_url": meta.get("deployment_url"),
-                "price": meta.get("price_usd", 0),
-                "promotions": promo_list,
-                "qa_status": qa_status,
-                "qa_details": qa_details,
-                "preview_url": f"http://127.0.0.1:8088/outputs/{p['id']}/index.html"  # Assuming preview server port 8088
-            })
-            
-        return jsonify({
-            "products": results,
-            "total": total_products,
-            "page": page,
-            "limit": limit,
-            "total_pages": total_pages
-        })
+        return _snapshot_response(get_snapshot_service().products_page(page, limit))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -359,6 +140,7 @@ def list_products():
 @app.route("/api/system/sync_products", methods=["POST"])
 def sync_products():
     """파일 시스템의 제품 정보를 원장(Ledger)과 동기화합니다."""
+    from src.ledger_manager import LedgerManager
     try:
         lm = LedgerManager()
         outputs_dir = PROJECT_ROOT / "outputs"
@@ -538,7 +320,7 @@ def _kill_port(port: int):
 
 def _get_channel_status() -> Dict[str, bool]:
     """secrets.json을 기반으로 각 채널 설정 여부를 확인합니다."""
-    secrets = _read_json(SECRETS_PATH, {})
+    secrets = get_secrets(PROJECT_ROOT)
     status = {}
     
     # Helper to check nested or flat
@@ -586,95 +368,97 @@ def _get_channel_status() -> Dict[str, bool]:
 
     return status
 
-@app.get("/api/system/status")
-def system_status():
-    """전체 시스템 서비스 상태 확인"""
-    import requests
-    pids = _pids()
-    services = {
-        "payment": {"port": 5000, "url": "http://127.0.0.1:5000/health"},
-        "preview": {"port": 8088, "url": "http://127.0.0.1:8088/health"},
-        "daemon": {"status_file": str(PROJECT_ROOT / "data" / "daemon_status.json")},
-    }
-    
-    results = {}
-    pids = _pids() # 최신 PIDs 로드
-    for name, cfg in services.items():
-        if name == "daemon":
-            # 데몬 상태 확인 (파일 기반)
-            daemon_status = {}
-            sf = Path(cfg["status_file"])
-            if sf.exists():
-                try:
-                    daemon_status = json.loads(sf.read_text(encoding="utf-8"))
-                except:
-                    pass
-            
-            # 실제 PID 확인
-            running = False
-            pid = daemon_status.get("pid")
-            if pid:
-                if _is_windows():
-                    import ctypes
-                    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-                    handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
-                    if handle:
-                        ctypes.windll.kernel32.CloseHandle(handle)
-                        running = True
-                else:
-                    try:
-                        os.kill(pid, 0)
-                        running = True
-                    except OSError:
-                        pass
-            
-            results[name] = {
-                "running": running,
-                "alive": running, # 데몬은 헬스체크가 따로 없으므로 running과 동일하게 취급
-                "pid": pid if running else None,
-                "details": daemon_status
-            }
-            continue
+def _pid_alive(pid) -> bool:
+    """OS 수준에서 PID 존재 여부 확인 (Windows/Unix)."""
+    if not pid:
+        return False
+    if _is_windows():
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if handle:
+            ctypes.windll.kernel32.CloseHandle(handle)
+            return True
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
 
-        # PID 파일 기반 실행 여부 확인
-        running = name in pids
-        alive = False
-        
-        # 실제 프로세스가 살아있는지 OS 수준에서 한 번 더 확인 (PID 존재 여부)
-        if running:
-            pid = pids[name].get("pid")
-            if pid:
-                if _is_windows():
-                    # Windows에서 PID 존재 확인
-                    import ctypes
-                    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-                    handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
-                    if handle:
-                        ctypes.windll.kernel32.CloseHandle(handle)
-                    else:
-                        running = False
-                else:
-                    try:
-                        os.kill(pid, 0)
-                    except OSError:
-                        running = False
 
+def _service_probe(name: str, url: str):
+    """PID 파일 + 헬스체크 엔드포인트로 서버 상태를 확인하는 프로브."""
+    health_check = http_probe(url, timeout=2)
+
+    def _probe() -> Dict[str, Any]:
+        pids = _pids()
+        # PID 파일 기반 실행 여부 확인 + 실제 프로세스 생존 확인
+        running = name in pids and _pid_alive(pids[name].get("pid"))
         # 헬스체크는 running 여부와 상관없이 시도 (좀 더 관대하게 상태 표시)
-        try:
-            # 헬스체크 엔드포인트 호출 시도
-            r = requests.get(cfg["url"], timeout=2)
-            alive = r.status_code == 200
-            if alive:
-                running = True # 헬스체크 성공하면 살아있는 것으로 간주
-        except Exception as e:
-            alive = False
-        
-        results[name] = {
+        alive = bool(health_check().get("ok"))
+        if alive:
+            running = True  # 헬스체크 성공하면 살아있는 것으로 간주
+        return {
+            "ok": alive,
             "running": running,
             "alive": alive,
-            "pid": pids.get(name, {}).get("pid") if running else None
+            "pid": pids.get(name, {}).get("pid") if running else None,
         }
-    
+
+    return _probe
+
+
+def _daemon_probe() -> Dict[str, Any]:
+    # 데몬 상태 확인 (파일 기반) + 실제 PID 확인
+    daemon_status = _read_json(DATA_DIR / "daemon_status.json", {})
+    pid = daemon_status.get("pid")
+    running = _pid_alive(pid)
+    return {
+        "ok": running,
+        "running": running,
+        "alive": running,  # 데몬은 헬스체크가 따로 없으므로 running과 동일하게 취급
+        "pid": pid if running else None,
+        "details": daemon_status,
+    }
+
+
+HEALTH_MONITOR = ServiceHealthMonitor(
+    interval=float(os.getenv("HEALTH_MONITOR_INTERVAL", "5")),
+    max_backoff=float(os.getenv("HEALTH_MONITOR_MAX_BACKOFF", "60")),
+)
+HEALTH_MONITOR.register("payment", _service_probe("payment", "http://127.0.0.1:5000/health"))
+HEALTH_MONITOR.register("preview", _service_probe("preview", "http://127.0.0.1:8088/health"))
+HEALTH_MONITOR.register("daemon", _daemon_probe)
+
+# /api/system/status 의 ETag 계산에 쓰는 서비스 필드 (업/다운 상태만: 가동률·지연 통계·프로브 시각은 매 프로브마다 바뀜)
+SERVICE_STATUS_FIELDS = ("running", "alive", "pid")
+
+def _cached_channel_status() -> Dict[str, bool]:
+    """secrets.json 이 바뀐 경우에만 채널 설정 상태를 다시 계산합니다."""
+    return secrets_file(PROJECT_ROOT).derive("channel_status", lambda _s: _get_channel_status())
+
+
+@app.get("/api/system/status")
+def system_status():
+    """전체 시스템 서비스 상태 확인 (백그라운드 헬스 모니터의 캐시된 상태)"""
+    from blog_promo_bot import bot_instance
+    HEALTH_MONITOR.start()
+    state = HEALTH_MONITOR.state()
+
+    results = {}
+    stable = {}
+    for name in ("payment", "preview", "daemon"):
+        svc = state.get(name) or {}
+        entry = {"running": False, "alive": False, "pid": None}
+        entry.update({k: v for k, v in (svc.get("result") or {}).items() if k in ("running", "alive", "pid", "details")})
+        if name == "daemon":
+            entry.setdefault("details", {})
+        entry["health"] = {k: svc.get(k) for k in ("last_checked", "uptime_pct", "latency_ms", "consecutive_failures", "next_probe_at")}
+        results[name] = entry
+        # ETag 는 업/다운 상태로만 계산 (약한 ETag): 상태가 그대로면 304
+        stable[name] = {k: entry.get(k) for k in SERVICE_STATUS_FIELDS}
+
     # Add Bot Status
     results["bot"] = {
         "running": bot_instance.is_running(),
@@ -683,13 +467,22 @@ def system_status():
     }
 
     # Add Channel Status
-    results["channels"] = _get_channel_status()
-        
-    return jsonify(results)
+    results["channels"] = _cached_channel_status()
+
+    stable.update({k: v for k, v in results.items() if k not in stable})
+    return _snapshot_response(Snapshot.from_payload(results, etag_payload=stable))
+
+
+@app.get("/api/system/health")
+def system_health():
+    """헬스 모니터 상세 (서비스별 가동률/지연 백분위/백오프 상태)"""
+    HEALTH_MONITOR.start()
+    return jsonify(HEALTH_MONITOR.state())
 
 @app.route("/api/bot/control", methods=["POST"])
 def api_bot_control():
     """Bot 제어 (start/stop)"""
+    from blog_promo_bot import bot_instance
     data = request.json or {}
     action = data.get("action")
     
@@ -702,9 +495,61 @@ def api_bot_control():
     else:
         return jsonify({"ok": False, "error": "Invalid action"}), 400
 
+@app.get("/api/system/logs")
+def system_logs():
+    """로그 페이지 조회.
+
+    - JSONL 사이드카(LOG_JSONL=1)가 있으면 인덱스로 product_id/level/시간 필터 + 커서 페이지네이션
+    - 없으면 파일 끝에서 limit 줄만 역방향으로 읽어 반환
+    """
+    name = request.args.get("name", "auto_mode_daemon")
+    if not re.fullmatch(r"[A-Za-z0-9_.-]+", name):
+        return jsonify({"ok": False, "error": "Invalid log name"}), 400
+    log_path = LOGS_DIR / f"{name}.log"
+    try:
+        limit = int(request.args.get("limit", 50))
+        since = request.args.get("since")
+        until = request.args.get("until")
+        if Path(str(log_path) + ".jsonl.idx").exists():
+            page = query_log(
+                log_path,
+                product_id=request.args.get("product_id") or None,
+                level=request.args.get("level") or None,
+                since=float(since) if since else None,
+                until=float(until) if until else None,
+                limit=limit,
+                cursor=request.args.get("cursor") or None,
+            )
+            return jsonify({"ok": True, "structured": True, **page})
+        lines = tail_lines(log_path, limit) if log_path.exists() else []
+        product_id = request.args.get("product_id")
+        if product_id:
+            lines = [l for l in lines if product_id in l]
+        return jsonify({"ok": True, "structured": False, "lines": lines})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
+@app.get("/api/system/spans")
+def system_spans():
+    """제품 하나의 단계별 소요 시간/재시도/결과 (span 이벤트, LOG_JSONL=1 로그 기준)."""
+    name = request.args.get("name", "product_factory")
+    product_id = request.args.get("product_id", "")
+    if not re.fullmatch(r"[A-Za-z0-9_.-]+", name) or not product_id:
+        return jsonify({"ok": False, "error": "name and product_id required"}), 400
+    log_path = LOGS_DIR / f"{name}.log"
+    if not Path(str(log_path) + ".jsonl.idx").exists():
+        return jsonify({"ok": False, "error": "Structured log not found (LOG_JSONL=1)"}), 404
+    try:
+        return jsonify({"ok": True, **stage_breakdown(log_path, product_id)})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+
 @app.get("/api/bot/logs")
 def bot_logs():
     """Bot 로그 조회"""
+    from blog_promo_bot import bot_instance
     return jsonify({
         "logs": bot_instance.get_logs(),
         "running": bot_instance.is_running(),
@@ -713,12 +558,6 @@ def bot_logs():
 
 
 
-PROJECT_ROOT = Path(__file__).resolve().parent
-# Startup key application (Sync secrets.json and os.environ)
-apply_keys(PROJECT_ROOT, write=False, inject=True)
-
-SCHED = SchedulerService(PROJECT_ROOT)
-
 PROJECT_ROOT = Path(__file__).resolve().parent
 DATA_DIR = PROJECT_ROOT / "data"
 LOGS_DIR = PROJECT_ROOT / "logs"
@@ -729,6 +568,19 @@ SECRETS_PATH = DATA_DIR / "secrets.json"
 DEFAULT_DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8099"))
 
 
+def init_dashboard() -> None:
+    """Startup key application (.env + secrets.json -> os.environ). 여러 번 호출해도 1회만 실행."""
+    from src.config import load_environment
+
+    load_environment(PROJECT_ROOT)
+
+
+@app.before_request
+def _ensure_initialized() -> None:
+    # WSGI 서버 등 __main__ 을 거치지 않는 실행 경로용
+    init_dashboard()
+
+
 def _atomic_write_json(path: Path, obj) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
@@ -779,19 +631,15 @@ def _read_json(path: Path, default):
         return default
 
 def _load_secrets() -> Dict[str, Any]:
-    return _read_json(SECRETS_PATH, {})
+    data = secrets_file(PROJECT_ROOT).copy()
+    return data if isinstance(data, dict) else {}
 
 def _save_secrets(data: Dict[str, Any]) -> None:
-    _atomic_write_json(SECRETS_PATH, data)
+    secrets_file(PROJECT_ROOT).write(data)
+    # Config 는 접근 시점에 환경 변수를 읽으므로 모듈 재로드가 필요 없음
     for k, v in data.items():
         if isinstance(v, str):
             os.environ[k] = v
-    try:
-        import importlib
-        from src import config as _cfg
-        importlib.reload(_cfg)
-    except Exception:
-        pass
 
 
 def _pids() -> Dict[str, Any]:
@@ -866,6 +714,7 @@ def _start_process(name: str, cmd: List[str]) -> Dict[str, Any]:
             close_fds=True # Windows에서 핸들 상속 방지
         )
         _set_pid(name=name, pid=p.pid, cmd=cmd, log_file=str(log_path))
+        HEALTH_MONITOR.poke(name)
         return {"ok": True, "pid": p.pid, "log_file": str(log_path)}
     except Exception as e:
         f.close()
@@ -879,6 +728,7 @@ def _stop_process(name: str) -> Dict[str, Any]:
     pid = int(info.get("pid", 0))
     ok = _kill_pid(pid)
     _clear_pid(name)
+    HEALTH_MONITOR.poke(name)
     return {"ok": ok, "pid": pid}
 
 
@@ -886,13 +736,13 @@ def _tail_log(path: Path, n: int = 200) -> str:
     if not path.exists():
         return "(log not found)"
     try:
-        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-        return "\n".join(lines[-max(1, int(n)) :])
+        return "\n".join(tail_lines(path, n))
     except Exception:
         return "(failed to read log)"
 
 
 def _list_products() -> List[Dict[str, Any]]:
+    from payment_api import get_product_price_wei
     OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
     items: List[Dict[str, Any]] = []
     ledger = None
@@ -1851,7 +1701,7 @@ def _get_system_health():
 
 def _get_channel_status() -> Dict[str, bool]:
     """secrets.json을 기반으로 각 채널 설정 여부를 확인합니다."""
-    secrets = _read_json(SECRETS_PATH, {})
+    secrets = get_secrets(PROJECT_ROOT)
     status = {}
     
     # Helper to check nested or flat
@@ -1903,6 +1753,7 @@ def _get_channel_status() -> Dict[str, bool]:
 @app.route("/")
 def home():
     """대시보드 메인: 제품 목록, 주문 목록, 서버/파이프라인 제어."""
+    from promotion_dispatcher import load_channel_config
     pids = _pids()
     all_products = _list_products()[::-1] # 최신순
     
@@ -2252,6 +2103,7 @@ def save_promo_config_action():
     대시보드 폼에서 채널 설정 저장.
     tokens/urls 등 민감정보는 로컬 data/promo_channels.json에만 저장한다.
     """
+    from promotion_dispatcher import load_channel_config, save_channel_config
     cfg = load_channel_config()
 
     # blog
@@ -2345,6 +2197,7 @@ def save_promo_config_action():
 
 @app.route("/action/save_secrets", methods=["POST"])
 def save_secrets_action():
+    from src.key_manager import apply_keys
     data = _load_secrets() # 기존 값 유지하면서 업데이트
     for key in [
         "LEMON_SQUEEZY_API_KEY",
@@ -2380,6 +2233,8 @@ def test_publish(product_id: str):
     현재 채널 설정으로 '발행'을 한 번 실행(가능하면 webhook/wordpress로 전송).
     키가 없으면 파일만 생성되고 no-op.
     """
+    from promotion_dispatcher import dispatch_publish
+    from promotion_factory import mark_ready_to_publish
     try:
         product_dir = OUTPUTS_DIR / product_id
         if not product_dir.exists():
@@ -2452,6 +2307,7 @@ def action_run_autopilot():
 
 @app.route("/action/rebuild_product", methods=["POST"])
 def action_rebuild_product():
+    from product_factory import ProductConfig, generate_one
     product_id = str(request.form.get("product_id", "")).strip()
     topic = str(request.form.get("topic", "")).strip()
     if not product_id or not topic:
@@ -2510,6 +2366,8 @@ def action_delete_product(product_id: str):
 
 @app.route("/action/bulk_products", methods=["POST"])
 def action_bulk_products():
+    from promotion_dispatcher import dispatch_publish
+    from promotion_factory import mark_ready_to_publish
     ids = request.form.getlist("product_id")
     action = (request.form.get("bulk_action") or "").strip()
     if not ids or action not in {"publish", "test_publish", "delete"}:
@@ -2621,6 +2479,8 @@ def action_vercel_cleanup():
 
 @app.route("/action/publish/<product_id>")
 def action_publish(product_id: str):
+    from promotion_dispatcher import dispatch_publish
+    from promotion_factory import mark_ready_to_publish
     d = OUTPUTS_DIR / product_id
     if not d.exists():
         return jsonify({"error": "product_not_found", "product_id": product_id}), 404
@@ -2674,6 +2534,7 @@ def action_publish(product_id: str):
 
 @app.route("/action/mark_paid", methods=["POST"])
 def action_mark_paid():
+    from payment_api import mark_paid_testonly
     order_id = str(request.form.get("order_id", "")).strip()
     if not order_id:
         return jsonify({"error": "order_id_required"}), 400
@@ -2919,6 +2780,7 @@ _CHECKOUT_HTML = """
 
 def _checkout_config(product_id: str):
     """체크아웃용 상품/체인 설정. 패키지 없으면 None."""
+    from payment_api import get_evm_config, get_product_price_wei
     pkg = OUTPUTS_DIR / product_id / "package.zip"
     if not pkg.exists():
         return None
@@ -2947,6 +2809,7 @@ def _checkout_config(product_id: str):
 @app.route("/api/payment/create_order", methods=["POST"])
 def api_payment_create_order():
     """EVM 주문 생성. body: {product_id, buyer_wallet?}."""
+    from payment_api import create_order_evm
     data = request.get_json(silent=True) or request.form or {}
     product_id = str(data.get("product_id") or "").strip()
     buyer_wallet = (data.get("buyer_wallet") or "").strip() or None
@@ -2961,6 +2824,7 @@ def api_payment_create_order():
 @app.route("/api/payment/verify", methods=["POST"])
 def api_payment_verify():
     """온체인 결제 검증. body: {tx_hash, chain_id, product_id, buyer_wallet?, order_id?}."""
+    from payment_api import verify_evm_payment
     data = request.get_json(silent=True) or request.form or {}
     tx_hash = str(data.get("tx_hash") or "").strip()
     chain_id = data.get("chain_id")
@@ -2985,6 +2849,7 @@ def api_payment_verify():
 @app.route("/download_token/<token>")
 def download_token_route(token: str):
     """토큰 검증 후 패키지 zip 제공. 결제 검증된 경우에만 토큰 발급되므로 게이팅 완료."""
+    from payment_api import validate_download_token_and_consume
     ip = request.headers.get("X-Forwarded-For", request.remote_addr)
     user_agent = request.headers.get("User-Agent", "")
     result = validate_download_token_and_consume(
@@ -3252,7 +3117,8 @@ def legacy_preview_alias(maybe_product):
 
 
 if __name__ == "__main__":
-    port = DEFAULT_DASHBOARD_PORT
+    init_dashboard()
+    port = int(os.getenv("DASHBOARD_PORT") or DEFAULT_DASHBOARD_PORT)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     LOGS_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -3261,6 +3127,8 @@ if __name__ == "__main__":
     # Auto-start Blog Promotion Bot
     if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
         print("[Bot] Auto-starting Blog Promotion Bot...")
+        from blog_promo_bot import bot_instance
+
         bot_instance.start()
 
     app.run(host="127.0.0.1", port=port, debug=True, use_reloader=True)
@@ -9,6 +9,7 @@ diagram_generator.py (PREMIUM+)
 핵심:
 - reportlab.graphics + renderPM 으로 PNG 생성(추가 의존성 최소화)
 - renderPM 실패 환경 대비: SVG placeholder도 함께 생성
+- 제품과 무관한 그림이므로 asset_store 에 1회 렌더링 후 제품 폴더로 하드링크
 
 생성 다이어그램(기본 10종):
 1) funnel_flow.png
@@ -25,14 +26,19 @@ diagram_generator.py (PREMIUM+)
 
 from __future__ import annotations
 
+import inspect
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+import reportlab
 from reportlab.graphics import renderPM
 from reportlab.graphics.shapes import Drawing, Line, Rect, String
 from reportlab.lib import colors
 
+from asset_store import AssetStore, get_asset_store, link_or_copy, version_hash
+
 
 @dataclass(frozen=True)
 class DiagramResult:
@@ -75,12 +81,12 @@ def _write_svg_placeholder(svg_path: Path, title: str, lines: List[str]) -> None
   <text x="24" y="96" font-size="16" font-family="Arial" fill="#93a4b8">PNG generation failed. This is a fallback SVG placeholder.</text>
   <text x="24" y="140" font-size="16" font-family="Courier New" fill="#e7eef7">{body.replace("<","&lt;").replace(">","&gt;")}</text>
 </svg>
-# """
-#     svg_path.write_text(svg, encoding="utf-8")
-# 
-# 
-# def _box(d: Drawing, x: int, y: int, w: int, h: int, title: str) -> None:
-#     """박스 + 타이틀."""
+"""
+    svg_path.write_text(svg, encoding="utf-8")
+
+
+def _box(d: Drawing, x: int, y: int, w: int, h: int, title: str) -> None:
+    """박스 + 타이틀."""
     d.add(
         Rect(
             x,
@@ -343,50 +349,122 @@ _DIAGRAM_BUILDERS = {
 }
 
 
+# ----------------------------
+# Shared asset store
+# ----------------------------
+
+# 다이어그램 모양/색상 규칙을 바꿨는데 빌더 소스가 그대로인 경우(예: reportlab 설정) 올려서 재렌더링한다.
+DIAGRAM_STYLE_VERSION = "1"
+_STORE_NAMESPACE = "diagrams"
+_HELPERS = (_box, _label, _arrow)
+
+# 이 프로세스에서 PNG 렌더링에 실패한 (name, version) -> 오류 (제품마다 다시 시도하지 않음)
+_PNG_FAILURES: Dict[Tuple[str, str], str] = {}
+
+
+@lru_cache(maxsize=None)
+def _helpers_source() -> str:
+    return "\n".join(inspect.getsource(fn) for fn in _HELPERS)
+
+
+@lru_cache(maxsize=None)
+def diagram_version(name: str) -> str:
+    """빌더/헬퍼 소스 + 스타일 버전 + reportlab 버전으로 만든 다이어그램 버전 해시."""
+    builder = _DIAGRAM_BUILDERS[name]
+    return version_hash(
+        DIAGRAM_STYLE_VERSION,
+        reportlab.Version,
+        _helpers_source(),
+        inspect.getsource(builder),
+    )
+
+
+def _render_png_shared(store: AssetStore, name: str) -> Tuple[Path | None, str]:
+    """공유 저장소에서 PNG 를 찾고, 없으면 1회 렌더링하여 저장한다."""
+    version = diagram_version(name)
+    failed = _PNG_FAILURES.get((name, version))
+    if failed:
+        return None, failed
+    errors: List[str] = []
+
+    def _produce(tmp_path: Path) -> bool:
+        ok, err = _try_png(_DIAGRAM_BUILDERS[name](), tmp_path)
+        if not ok:
+            errors.append(err)
+        return ok
+
+    obj = store.get_or_create(_STORE_NAMESPACE, f"{name}.png", version, ".png", _produce)
+    if obj is None:
+        err = errors[0] if errors else "renderPM produced no file"
+        _PNG_FAILURES[(name, version)] = err
+        return None, err
+    return obj, ""
+
+
+def _svg_fallback_shared(store: AssetStore, name: str) -> Path | None:
+    """PNG 실패 시 쓰는 SVG placeholder 도 제품과 무관하므로 공유한다."""
+
+    def _produce(tmp_path: Path) -> bool:
+        _write_svg_placeholder(
+            tmp_path,
+            title=name,
+            lines=[
+                f"{name}",
+                "This diagram could not be rendered to PNG in this environment.",
+                "Use the PDF text diagram fallback or install renderPM dependencies.",
+            ],
+        )
+        return True
+
+    return store.get_or_create(
+        _STORE_NAMESPACE, f"{name}.svg", version_hash(DIAGRAM_STYLE_VERSION, inspect.getsource(_write_svg_placeholder)), ".svg", _produce
+    )
+
+
 # ----------------------------
 # Public API
 # ----------------------------
 
 
 def generate_diagrams(
-    output_dir: Path, product_id: str, meta: Dict[str, Any] | None = None
+    output_dir: Path,
+    product_id: str,
+    meta: Dict[str, Any] | None = None,
+    store: AssetStore | None = None,
 ) -> DiagramResult:
-#     """
-#     outputs/<product_id>/assets/diagrams/ 아래에 다이어그램 생성.
-# 
-#     반환:
-#     - diagrams: name->png path
-#     - fallbacks_svg: name->svg path (png 실패한 것만)
-#     - errors: 실패 사유 목록
-#     """
+    """
+    outputs/<product_id>/assets/diagrams/ 아래에 다이어그램 생성.
+
+    다이어그램은 제품과 무관하므로 공유 자산 저장소(asset_store)에서 (이름, 버전 해시)당 1회만
+    렌더링하고, 제품 폴더에는 하드링크(불가 시 복사)로 배치한다.
+
+    반환:
+    - diagrams: name->png path
+    - fallbacks_svg: name->svg path (png 실패한 것만)
+    - errors: 실패 사유 목록
+    """
     diagrams_dir = output_dir / product_id / "assets" / "diagrams"
     _safe_mkdir(diagrams_dir)
+    store = store or get_asset_store()
 
     diagrams: Dict[str, Path] = {}
     fallbacks: Dict[str, Path] = {}
     errors: List[str] = []
 
-    for name, builder in _DIAGRAM_BUILDERS.items():
+    for name in _DIAGRAM_BUILDERS:
         png_path = diagrams_dir / f"{name}.png"
         svg_path = diagrams_dir / f"{name}.svg"
 
-        drawing = builder()
-
-        ok, err = _try_png(drawing, png_path)
-        if ok:
+        obj, err = _render_png_shared(store, name)
+        if obj is not None:
+            link_or_copy(obj, png_path)
             diagrams[name] = png_path
             continue
 
         # PNG 실패: SVG 생성 + 오류 기록
-        _write_svg_placeholder(
-            svg_path,
-            title=name,
-            lines=[
-                f"{name}",
-                "This diagram could not be rendered to PNG in this environment.",
-                "Use the PDF text diagram fallback or install renderPM dependencies.",
-            ],
-        )
+        svg_obj = _svg_fallback_shared(store, name)
+        if svg_obj is not None:
+            link_or_copy(svg_obj, svg_path)
         fallbacks[name] = svg_path
         errors.append(f"{name}: {err}")
 
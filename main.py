@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 
 # src 모듈 임포트
-from src.config import Config
+from src.config import Config, init_config
 from src.product_factory import ProductFactory
 from src.utils import ProductionError, get_logger
 
@@ -84,6 +84,7 @@ def main() -> int:
     )
 
     args = parser.parse_args()
+    init_config()
 
     languages = [s.strip().lower() for s in args.languages.split(",") if s.strip()]
     if not languages:
@@ -14,7 +14,8 @@ nowpayments_client.py
 
 주의:
 - 실제 운영에서는 IPN(webhook) 기반으로 status를 업데이트하는 것이 안정적이다.
-  (이 프로젝트는 우선 polling 기반 check로 구현)
+  NOWPAYMENTS_IPN_CALLBACK_URL 이 있으면 결제 생성 시 ipn_callback_url 로 전달하고,
+  수신/서명 검증/캐시는 payment_status.py 가 담당한다(polling 은 캐시 미스/재확인용).
 """
 
 from __future__ import annotations
@@ -22,7 +23,7 @@ from __future__ import annotations
 import os  # env
 from typing import Any, Dict, Optional  # 타입
 
-import requests  # HTTP
+# requests 는 실제 API 호출 시에만 import (payment_status 를 거치는 api/* 콜드 스타트 단축)
 
 NOWPAYMENTS_BASE_URL = os.getenv(
     "NOWPAYMENTS_BASE_URL", "https://api.nowpayments.io"
@@ -103,6 +104,11 @@ def create_payment(
         payload["success_url"] = success_url
     if cancel_url:
         payload["cancel_url"] = cancel_url
+    ipn_url = os.getenv("NOWPAYMENTS_IPN_CALLBACK_URL", "").strip()
+    if ipn_url:
+        payload["ipn_callback_url"] = ipn_url
+
+    import requests  # HTTP
 
     r = requests.post(
         f"{NOWPAYMENTS_BASE_URL}/v1/payment",
@@ -130,6 +136,8 @@ def get_payment_status(payment_id: str) -> Dict[str, Any]:
     """payment_id로 상태 조회."""
     if not payment_id:
         raise NowPaymentsError("payment_id is required")
+    import requests  # HTTP
+
     r = requests.get(
         f"{NOWPAYMENTS_BASE_URL}/v1/payment/{payment_id}",
         headers=_headers(),
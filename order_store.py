@@ -28,7 +28,6 @@ from dataclasses import asdict, dataclass  # 구조체
 from pathlib import Path  # 경로
 from typing import Any, Dict, List, Optional  # 타입
 
-import requests  # Upstash REST 호출
 
 
 @dataclass
@@ -192,6 +191,13 @@ class FileOrderStore:
         return None
 
 
+def _requests():
+    """Upstash REST 호출용 requests (파일 저장소만 쓰는 경우 import 하지 않음)."""
+    import requests
+
+    return requests
+
+
 class UpstashOrderStore:
     """Upstash Redis REST 기반 주문 저장소."""
 
@@ -207,7 +213,7 @@ class UpstashOrderStore:
         return {"Authorization": f"Bearer {self.token}"}
 
     def get(self, order_id: str) -> Optional[Dict[str, Any]]:
-        r = requests.get(
+        r = _requests().get(
             f"{self.url}/get/{self._key(order_id)}", headers=self._headers(), timeout=10
         )
         r.raise_for_status()
@@ -222,7 +228,7 @@ class UpstashOrderStore:
     def upsert(self, order: Order) -> Dict[str, Any]:
         key = self._key(order.order_id)
         value = json.dumps(asdict(order), ensure_ascii=False)
-        r = requests.post(
+        r = _requests().post(
             f"{self.url}/set/{key}",
             headers=self._headers(),
             data=value.encode("utf-8"),
@@ -237,7 +243,7 @@ class UpstashOrderStore:
             return None
         cur["status"] = status
         key = self._key(order_id)
-        r = requests.post(
+        r = _requests().post(
             f"{self.url}/set/{key}",
             headers=self._headers(),
             data=json.dumps(cur, ensure_ascii=False).encode("utf-8"),
@@ -256,7 +262,7 @@ class UpstashOrderStore:
         meta.update(patch or {})
         cur["meta"] = meta
         key = self._key(order_id)
-        r = requests.post(
+        r = _requests().post(
             f"{self.url}/set/{key}",
             headers=self._headers(),
             data=json.dumps(cur, ensure_ascii=False).encode("utf-8"),
@@ -291,7 +297,7 @@ class UpstashOrderStore:
         meta["used_download_jti"] = used
         cur["meta"] = meta
         key = self._key(order_id)
-        r = requests.post(
+        r = _requests().post(
             f"{self.url}/set/{key}",
             headers=self._headers(),
             data=json.dumps(cur, ensure_ascii=False).encode("utf-8"),
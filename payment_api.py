@@ -10,6 +10,7 @@ payment_api.py
 - POST /api/pay/start   {product_id, amount, currency} -> {order_id, status, provider, invoice_url?}
 - GET  /api/pay/check?order_id=... -> {order_id, status, can_download, download_url, token?}
 - GET  /api/pay/download?order_id=...&token=... -> (paid면 package.zip 반환, 아니면 403)
+- POST /api/pay/ipn     (NOWPayments IPN, x-nowpayments-sig 서명) -> handle_ipn
 
 결제 제공자:
 - 기본: NOWPayments (NOWPAYMENTS_API_KEY가 있을 때)
@@ -51,9 +52,15 @@ from nowpayments_client import (
     create_payment,
     get_payment_status,
     has_api_key,
-    map_nowpayments_status_to_order,
 )
 from order_store import Order, get_order_store, new_order_id  # 주문 저장소
+from payment_status import (  # IPN/상태 캐시
+    SETTLED_ORDER_STATUSES,
+    apply_provider_status,
+    get_status_cache,
+    ingest_ipn,
+    ipn_is_fresh,
+)
 from evm_verifier import verify_evm_payment as evm_verify_on_chain  # 온체인 검증
 
 import json
@@ -756,18 +763,15 @@ def check_order(project_root: Path, order_id: str) -> Dict[str, Any]:
 
     status = str(order.get("status", "pending"))
 
-    # NOWPayments polling으로 상태 갱신
-    if str(order.get("provider")) == "nowpayments":
+    # NOWPayments 상태 갱신: 확정된 주문이나 최근 IPN 으로 갱신된 주문은 provider 를 다시 부르지 않고,
+    # 그 외에는 짧은 TTL 캐시 + singleflight 로 같은 payment_id 의 polling 을 1회 호출로 합친다.
+    if str(order.get("provider")) == "nowpayments" and status not in SETTLED_ORDER_STATUSES:
         payment_id = str(order.get("provider_payment_id", ""))
-        if has_api_key() and payment_id:
+        if has_api_key() and payment_id and not ipn_is_fresh(order):
             try:
-                p = get_payment_status(payment_id)
-                mapped = map_nowpayments_status_to_order(
-                    str(p.get("payment_status", ""))
-                )
-                if mapped and mapped != status:
-                    store.update_status(order_id, mapped)
-                    status = mapped
+                p = get_status_cache().get(payment_id, get_payment_status)
+                if p:
+                    status = apply_provider_status(store, order, p, source="poll")["status"]
             except Exception:
                 pass
 
@@ -796,6 +800,12 @@ def check_order(project_root: Path, order_id: str) -> Dict[str, Any]:
     }
 
 
+def handle_ipn(project_root: Path, raw_body: bytes, signature: str) -> Dict[str, Any]:
+    """NOWPayments IPN(webhook) 수신: 서명 검증 후 주문 상태를 갱신한다. 반환의 http_status 로 응답."""
+    _load_env(project_root)
+    return ingest_ipn(project_root, raw_body, signature)
+
+
 def download_for_order(
     project_root: Path, *, order_id: str, token: str
 ) -> Dict[str, Any]:
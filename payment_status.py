@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+"""
+payment_status.py
+
+목적:
+- NOWPayments 결제 상태를 "IPN(webhook) 푸시 우선 + 짧은 TTL 캐시 + singleflight 폴링"으로 관리한다.
+- 체크아웃 페이지가 수 초마다 /api/pay/check 를 호출해도 같은 payment_id 에 대한
+  provider 호출은 TTL 당 최대 1회, 동시 요청은 1회의 upstream 호출 결과를 공유한다.
+
+구성:
+- verify_ipn_signature: x-nowpayments-sig 헤더(HMAC-SHA512, 키 정렬 JSON.stringify 형식) 검증
+- ingest_ipn: 검증된 IPN 을 주문 저장소(order_store)에 반영 (재시도/역순 도착에 안전)
+- PaymentStatusCache: payment_id -> provider 상태 TTL 캐시 + singleflight
+- lookup_provider_status: IPN 저장 상태 -> 캐시 -> upstream 순 조회 (api/main 무상태 흐름용)
+- PendingReconciler: IPN 을 놓친 pending 주문을 주기적으로 provider 에 재확인하는 백그라운드 스레드
+
+환경변수:
+- NOWPAYMENTS_IPN_SECRET            IPN 서명 검증 키 (없으면 data/secrets.json)
+- NOWPAYMENTS_STATUS_TTL            진행 중 상태 캐시 TTL 초 (기본 15)
+- NOWPAYMENTS_FINAL_STATUS_TTL      확정 상태 캐시 TTL 초 (기본 3600)
+- NOWPAYMENTS_IPN_TRUST_SEC         최근 IPN 을 upstream 조회 없이 신뢰하는 시간 (기본 600)
+- NOWPAYMENTS_RECONCILE_INTERVAL    재확인 주기 초 (기본 120)
+- NOWPAYMENTS_RECONCILE_MIN_AGE     생성 후 이 시간이 지난 pending 주문만 재확인 (기본 180)
+- NOWPAYMENTS_RECONCILE_MAX_AGE     이 시간보다 오래된 주문은 재확인하지 않음 (기본 259200 = 3일)
+"""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from nowpayments_client import _load_secrets, map_nowpayments_status_to_order
+from order_store import Order, get_order_store
+
+logger = logging.getLogger(__name__)
+
+IPN_SIG_HEADER = "x-nowpayments-sig"
+
+# provider 상태 중 더 이상 바뀌지 않는 것 (긴 TTL 로 캐시)
+FINAL_PROVIDER_STATUSES = {"finished", "failed", "refunded", "expired"}
+# 내부 상태 중 pending 으로 되돌리면 안 되는 것
+SETTLED_ORDER_STATUSES = {"paid", "delivered", "failed", "expired"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _utc_iso(ts: Optional[float] = None) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _parse_iso(value: Any) -> Optional[float]:
+    """order.created_at 등 UTC 문자열 -> epoch (파싱 실패 시 None)."""
+    s = str(value or "").strip()
+    for fmt in ("%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return float(calendar.timegm(time.strptime(s, fmt)))
+        except ValueError:
+            continue
+    return None
+
+
+# -----------------------------
+# IPN 서명 검증
+# -----------------------------
+
+
+def _ipn_secret() -> str:
+    secret = os.getenv("NOWPAYMENTS_IPN_SECRET", "").strip()
+    if secret:
+        return secret
+    secrets_data = _load_secrets()
+    if isinstance(secrets_data, dict):
+        return str(secrets_data.get("NOWPAYMENTS_IPN_SECRET", "") or "").strip()
+    return ""
+
+
+def _js_number(value: Any) -> str:
+    """JavaScript Number.prototype.toString 과 같은 숫자 표기 (JSON.stringify 가 쓰는 형식).
+
+    파이썬 repr 은 5e-05 / 1e+16 / 39.0 처럼 쓰지만 JS 는 0.00005 / 10000000000000000 / 39 로 씁니다.
+    JS 는 정수도 double 이므로 2**53 을 넘는 정수는 double 로 반올림한 값으로 표기합니다.
+    """
+    if isinstance(value, int) and abs(value) <= 2**53:
+        return str(value)
+    x = float(value)
+    if x != x or x in (float("inf"), float("-inf")):
+        return "null"
+    if x == 0:
+        return "0"
+    sign = "-" if x < 0 else ""
+    _, digit_tuple, exponent = Decimal(repr(abs(x))).as_tuple()
+    digits = "".join(map(str, digit_tuple)).rstrip("0")
+    exponent += len(digit_tuple) - len(digits)
+    k = len(digits)
+    n = exponent + k  # 값 = 0.digits * 10**n
+    if k <= n <= 21:
+        out = digits + "0" * (n - k)
+    elif 0 < n <= 21:
+        out = digits[:n] + "." + digits[n:]
+    elif -6 < n <= 0:
+        out = "0." + "0" * (-n) + digits
+    else:
+        e = n - 1
+        out = digits[0] + ("." + digits[1:] if k > 1 else "") + "e" + ("+" if e > 0 else "-") + str(abs(e))
+    return sign + out
+
+
+def _js_json(value: Any) -> str:
+    if isinstance(value, dict):
+        items = sorted((str(k), v) for k, v in value.items())
+        return "{" + ",".join(json.dumps(k, ensure_ascii=False) + ":" + _js_json(v) for k, v in items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_js_json(v) for v in value) + "]"
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (int, float)):
+        return _js_number(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def canonical_ipn_body(payload: Dict[str, Any]) -> bytes:
+    """NOWPayments 서명 대상: 키를 (재귀) 정렬한 뒤 JSON.stringify 한 문자열.
+
+    서명은 JS 쪽 직렬화 결과에 대해 계산되므로 숫자도 JS 표기(_js_number)로 맞춥니다.
+    """
+    return _js_json(payload).encode("utf-8")
+
+
+def sign_ipn(payload: Dict[str, Any], secret: str) -> str:
+    """IPN 서명(hex HMAC-SHA512). 검증과 로컬 fake 서버가 같은 규칙을 쓰도록 공개한다."""
+    return hmac.new(secret.encode("utf-8"), canonical_ipn_body(payload), hashlib.sha512).hexdigest()
+
+
+def verify_ipn_signature(raw_body: bytes, signature: str, secret: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """서명이 맞으면 파싱된 payload, 아니면 None."""
+    secret = secret if secret is not None else _ipn_secret()
+    if not secret or not signature:
+        return None
+    try:
+        payload = json.loads((raw_body or b"").decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    expected = sign_ipn(payload, secret)
+    if not hmac.compare_digest(expected, str(signature).strip().lower()):
+        return None
+    return payload
+
+
+# -----------------------------
+# 상태 캐시 + singleflight
+# -----------------------------
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class PaymentStatusCache:
+    """payment_id -> provider 상태 dict (TTL) + 동일 키 동시 조회 병합."""
+
+    MAX_ENTRIES = 4096
+
+    def __init__(self, ttl: Optional[float] = None, final_ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else _env_float("NOWPAYMENTS_STATUS_TTL", 15.0)
+        self.final_ttl = final_ttl if final_ttl is not None else _env_float("NOWPAYMENTS_FINAL_STATUS_TTL", 3600.0)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}  # key -> (expires_at, info)
+        self._flights: Dict[str, _Flight] = {}
+        self.upstream_calls = 0
+
+    def _ttl_for(self, info: Dict[str, Any]) -> float:
+        status = str(info.get("payment_status", "")).lower()
+        return self.final_ttl if status in FINAL_PROVIDER_STATUSES else self.ttl
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(str(key))
+            if hit and hit[0] > now:
+                return hit[1]
+        return None
+
+    def put(self, key: str, info: Dict[str, Any]) -> None:
+        if not key or not isinstance(info, dict):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.MAX_ENTRIES:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.MAX_ENTRIES:
+                    self._entries.clear()
+            self._entries[str(key)] = (now + self._ttl_for(info), info)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(str(key), None)
+
+    def get(self, key: str, fetch: Callable[[str], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """캐시 히트면 즉시 반환, 아니면 동일 키의 진행 중 조회에 합류하거나 직접 조회한다.
+
+        fetch 가 None 을 반환하거나 예외를 던지면 캐시하지 않는다(대기 중이던 호출자도 같은 결과를 받음).
+        """
+        key = str(key)
+        cached = self.peek(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.upstream_calls += 1
+
+        if not leader:
+            flight.event.wait(timeout=30)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch(key)
+            if flight.result:
+                self.put(key, flight.result)
+            return flight.result
+        except BaseException as e:  # noqa: BLE001 - 대기 중인 호출자에게 그대로 전달
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+
+_CACHE: Optional[PaymentStatusCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_status_cache() -> PaymentStatusCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = PaymentStatusCache()
+        return _CACHE
+
+
+# -----------------------------
+# 주문 저장소 반영
+# -----------------------------
+
+
+def _next_status(current: str, provider_status: str) -> str:
+    """provider 상태를 내부 상태로 매핑하되, 확정된 주문을 pending 으로 되돌리지 않는다.
+
+    IPN 은 재시도/역순으로 도착할 수 있으므로 (예: finished 뒤에 늦게 온 confirming)
+    paid/delivered 는 환불(failed) 외에는 바꾸지 않는다.
+    """
+    mapped = map_nowpayments_status_to_order(provider_status)
+    cur = (current or "pending").lower()
+    if cur in ("paid", "delivered"):
+        return "failed" if provider_status.lower() == "refunded" else current
+    if cur in SETTLED_ORDER_STATUSES and mapped == "pending":
+        return current
+    return mapped
+
+
+def ipn_is_fresh(order: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """최근 IPN 으로 갱신된 주문이면 upstream 재조회 없이 저장 상태를 신뢰한다."""
+    meta = order.get("meta") if isinstance(order.get("meta"), dict) else {}
+    if str(meta.get("provider_status", "")).lower() in FINAL_PROVIDER_STATUSES:
+        return True
+    ipn_at = meta.get("ipn_at_ts")
+    if not ipn_at:
+        return False
+    now = time.time() if now is None else now
+    return (now - float(ipn_at)) <= _env_float("NOWPAYMENTS_IPN_TRUST_SEC", 600.0)
+
+
+def apply_provider_status(store, order: Dict[str, Any], info: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """provider 상태 dict 를 주문에 반영. 바뀐 것이 있을 때만 저장소에 쓴다."""
+    provider_status = str(info.get("payment_status", "") or "")
+    order_id = str(order.get("order_id"))
+    current = str(order.get("status", "pending"))
+    new_status = _next_status(current, provider_status) if provider_status else current
+    meta = order.get("meta") if isinstance(order.get("meta"), dict) else {}
+
+    changed = new_status != current
+    if changed:
+        store.update_status(order_id, new_status)
+        order["status"] = new_status
+
+    patch: Dict[str, Any] = {}
+    if provider_status and meta.get("provider_status") != provider_status:
+        patch["provider_status"] = provider_status
+    if source == "ipn":
+        patch["ipn_at"] = _utc_iso()
+        patch["ipn_at_ts"] = int(time.time())
+    if changed:
+        patch["status_source"] = source
+    if patch:
+        updated = store.update_meta(order_id, patch)
+        if isinstance(updated, dict):
+            order["meta"] = updated.get("meta") or {**meta, **patch}
+    if changed:
+        logger.info("결제 상태 반영 order_id=%s %s -> %s (%s, provider=%s)", order_id, current, new_status, source, provider_status)
+    return {"order_id": order_id, "status": new_status, "changed": changed, "provider_status": provider_status}
+
+
+def _product_from_description(desc: Any) -> str:
+    """create_invoice/create_payment 의 order_description("Product: <id>") 에서 product_id 복원."""
+    s = str(desc or "").strip()
+    return s.split(":", 1)[1].strip() if ":" in s else s
+
+
+def ingest_ipn(project_root: Path, raw_body: bytes, signature: str, secret: Optional[str] = None) -> Dict[str, Any]:
+    """서명된 IPN 을 주문 저장소와 상태 캐시에 반영한다.
+
+    - 서명 키가 없거나 서명이 틀리면 거부한다(ok=False).
+    - 저장소에 주문이 없으면(api/main 무상태 흐름) IPN 내용으로 최소 주문 레코드를 만든다.
+    - 같은 IPN 의 재전송은 changed=False 로 무해하게 처리된다.
+    """
+    if not (secret if secret is not None else _ipn_secret()):
+        return {"ok": False, "error": "ipn_secret_not_configured", "http_status": 503}
+    payload = verify_ipn_signature(raw_body, signature, secret)
+    if payload is None:
+        logger.warning("NOWPayments IPN 서명 검증 실패")
+        return {"ok": False, "error": "bad_signature", "http_status": 401}
+
+    payment_id = str(payload.get("payment_id") or "")
+    order_id = str(payload.get("order_id") or "")
+    provider_status = str(payload.get("payment_status") or "")
+    if not provider_status or not (payment_id or order_id):
+        return {"ok": False, "error": "bad_payload", "http_status": 400}
+
+    info = {"payment_id": payment_id, "payment_status": provider_status, "raw": payload}
+    cache = get_status_cache()
+    for key in {payment_id, order_id, str(payload.get("invoice_id") or "")}:
+        if key:
+            cache.put(key, info)
+
+    store = get_order_store(project_root)
+    order = store.get(order_id) if order_id else None
+    if not order:
+        order = asdict(
+            Order(
+                order_id=order_id or payment_id,
+                product_id=_product_from_description(payload.get("order_description")),
+                amount=float(payload.get("price_amount") or 0.0),
+                currency=str(payload.get("price_currency") or "usd").lower(),
+                status="pending",
+                created_at=_utc_iso(),
+                provider="nowpayments",
+                provider_payment_id=payment_id,
+                meta={"source": "ipn", "used_download_jti": []},
+            )
+        )
+        store.upsert(Order(**order))
+
+    result = apply_provider_status(store, order, info, source="ipn")
+    return {"ok": True, "http_status": 200, **result}
+
+
+def lookup_provider_status(
+    project_root: Path, key: str, fetch: Callable[[str], Optional[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """무상태 흐름(api/main)용 provider 상태 조회: 캐시 -> IPN 저장 상태 -> singleflight upstream."""
+    cache = get_status_cache()
+    cached = cache.peek(key)
+    if cached is not None:
+        return cached
+    try:
+        order = get_order_store(project_root).get(key)
+    except Exception:
+        order = None
+    if order and ipn_is_fresh(order):
+        meta = order.get("meta") or {}
+        info = {"payment_id": order.get("provider_payment_id") or key, "payment_status": meta.get("provider_status", "")}
+        cache.put(key, info)
+        return info
+    payment_id = str((order or {}).get("provider_payment_id") or key)
+    info = cache.get(payment_id, fetch)
+    if info is not None and payment_id != key:
+        cache.put(key, info)
+    return info
+
+
+# -----------------------------
+# pending 주문 재확인 (IPN 누락 대비)
+# -----------------------------
+
+
+@dataclass
+class ReconcileResult:
+    checked: int = 0
+    updated: int = 0
+    errors: int = 0
+
+
+class PendingReconciler:
+    """IPN 이 오지 않은 pending NOWPayments 주문을 주기적으로 provider 에 재확인한다.
+
+    list_orders 를 지원하는 저장소(로컬 파일)에서만 의미가 있다. Upstash 저장소는 IPN 에 의존한다.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        fetch: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+        interval: Optional[float] = None,
+        min_age: Optional[float] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.project_root = Path(project_root)
+        self.fetch = fetch
+        self.interval = interval if interval is not None else _env_float("NOWPAYMENTS_RECONCILE_INTERVAL", 120.0)
+        self.min_age = min_age if min_age is not None else _env_float("NOWPAYMENTS_RECONCILE_MIN_AGE", 180.0)
+        self.max_age = max_age if max_age is not None else _env_float("NOWPAYMENTS_RECONCILE_MAX_AGE", 259200.0)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch(self, payment_id: str) -> Optional[Dict[str, Any]]:
+        if self.fetch is not None:
+            return self.fetch(payment_id)
+        from nowpayments_client import get_payment_status, has_api_key
+
+        if not has_api_key():
+            return None
+        return get_payment_status(payment_id)
+
+    def run_once(self, now: Optional[float] = None) -> ReconcileResult:
+        now = time.time() if now is None else now
+        res = ReconcileResult()
+        store = get_order_store(self.project_root)
+        cache = get_status_cache()
+        for order in list(store.list_orders()):
+            if str(order.get("provider")) != "nowpayments" or str(order.get("status", "pending")) != "pending":
+                continue
+            payment_id = str(order.get("provider_payment_id") or "")
+            created = _parse_iso(order.get("created_at"))
+            if not payment_id or created is None:
+                continue
+            age = now - created
+            if age < self.min_age or age > self.max_age or ipn_is_fresh(order, now):
+                continue
+            res.checked += 1
+            try:
+                info = cache.get(payment_id, self._fetch)
+                if info and apply_provider_status(store, order, info, source="reconcile")["changed"]:
+                    res.updated += 1
+            except Exception as e:
+                res.errors += 1
+                logger.warning("pending 주문 재확인 실패 order_id=%s: %s", order.get("order_id"), e)
+        if res.checked:
+            logger.info("pending 주문 재확인: checked=%d updated=%d errors=%d", res.checked, res.updated, res.errors)
+        return res
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning("pending 주문 재확인 루프 오류: %s", e)
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="PaymentReconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+
+_RECONCILER: Optional[PendingReconciler] = None
+
+
+def start_reconciler(project_root: Path) -> PendingReconciler:
+    """프로세스당 1개의 재확인 스레드를 시작한다(중복 호출 안전)."""
+    global _RECONCILER
+    with _CACHE_LOCK:
+        if _RECONCILER is None:
+            _RECONCILER = PendingReconciler(project_root)
+        _RECONCILER.start()
+        return _RECONCILER
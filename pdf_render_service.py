@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+pdf_render_service.py
+
+목적(운영용):
+- pro_pdf_engine.build_pdf_from_markdown 을 "워밍된 워커 프로세스 풀"에서 실행한다.
+- 워커는 시작 시 1회만 스타일시트/폰트/커버 스타일을 초기화하고 이후 작업에서 재사용한다.
+- (markdown 해시 + 제목 + cover_meta) 가 동일하면 PDF를 다시 만들지 않는다(빌드 키 캐시).
+
+사용 예:
+    from pdf_render_service import get_pdf_service
+
+    svc = get_pdf_service()
+    fut = svc.submit(md_path, pdf_path, title, cover_meta=meta)   # concurrent.futures.Future
+    res = fut.result()                                            # PDFBuildResult
+    # asyncio 에서는: res = await asyncio.wrap_future(fut)
+
+환경변수:
+- PDF_RENDER_WORKERS: 워커 프로세스 수 (기본: min(4, CPU 수)). 0 이면 현재 프로세스에서 직접 실행.
+
+캐시:
+- PDF 옆에 <pdf>.buildkey 파일을 남긴다. PDF가 존재하고 빌드 키가 같으면 캐시 히트로 간주한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pro_pdf_engine import PDFBuildResult, build_pdf_from_markdown, get_styles
+
+# 엔진 레이아웃이 바뀌면 올려서 기존 캐시를 무효화한다.
+ENGINE_VERSION = "1"
+BUILDKEY_SUFFIX = ".buildkey"
+
+PDFJob = Tuple[Path, Path, str, Optional[Dict[str, str]]]
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+
+
+def _warm_worker() -> None:
+    """워커 초기화: 스타일시트/표준 폰트 메트릭을 미리 로딩한다."""
+    from reportlab.pdfbase import pdfmetrics
+
+    get_styles()
+    for font_name in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Courier"):
+        pdfmetrics.getFont(font_name)
+    try:
+        import premium_pdf_builder
+
+        premium_pdf_builder._styles()
+    except Exception:  # noqa: BLE001
+        # premium 빌더는 선택 사항 (의존 모듈이 없으면 건너뜀)
+        pass
+
+
+def _render_job(
+    md_path: str, pdf_path: str, title: str, cover_meta: Optional[Dict[str, str]], build_key: str
+) -> PDFBuildResult:
+    res = build_pdf_from_markdown(
+        Path(md_path), Path(pdf_path), title, cover_meta=cover_meta
+    )
+    if res.ok:
+        Path(pdf_path + BUILDKEY_SUFFIX).write_text(build_key, encoding="utf-8")
+    return res
+
+
+# -----------------------------
+# Cache key
+# -----------------------------
+
+
+def compute_build_key(
+    md_path: Path, title: str, cover_meta: Optional[Dict[str, str]] = None
+) -> str:
+    """markdown 내용 해시 + 제목 + cover_meta 로 빌드 키를 만든다."""
+    h = hashlib.sha256()
+    h.update(ENGINE_VERSION.encode("utf-8"))
+    h.update(b"\0")
+    h.update(Path(md_path).read_bytes())
+    h.update(b"\0")
+    h.update((title or "").encode("utf-8"))
+    h.update(b"\0")
+    h.update(json.dumps(cover_meta or {}, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def is_cached(pdf_path: Path, build_key: str) -> bool:
+    key_path = Path(str(pdf_path) + BUILDKEY_SUFFIX)
+    if not pdf_path.exists() or not key_path.exists():
+        return False
+    try:
+        return key_path.read_text(encoding="utf-8").strip() == build_key
+    except OSError:
+        return False
+
+
+# -----------------------------
+# Service
+# -----------------------------
+
+
+class PDFRenderService:
+    """워밍된 프로세스 풀 기반 PDF 렌더링 서비스."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            env_workers = os.getenv("PDF_RENDER_WORKERS")
+            max_workers = int(env_workers) if env_workers else min(4, os.cpu_count() or 1)
+        self.max_workers = max(0, int(max_workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "cache_hits": 0}
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers == 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=_warm_worker
+                )
+            return self._pool
+
+    def submit(
+        self,
+        md_path: Path,
+        pdf_path: Path,
+        title: str,
+        *,
+        cover_meta: Optional[Dict[str, str]] = None,
+        force: bool = False,
+    ) -> "Future[PDFBuildResult]":
+        """PDF 빌드 작업을 제출한다. 캐시 히트면 이미 완료된 Future를 돌려준다."""
+        md_path, pdf_path = Path(md_path), Path(pdf_path)
+        self.stats["submitted"] += 1
+        try:
+            build_key = compute_build_key(md_path, title, cover_meta)
+        except OSError as e:
+            fut: Future = Future()
+            fut.set_result(
+                PDFBuildResult(ok=False, pdf_path=pdf_path, error=f"{type(e).__name__}: {e}")
+            )
+            return fut
+
+        if not force and is_cached(pdf_path, build_key):
+            self.stats["cache_hits"] += 1
+            fut = Future()
+            fut.set_result(PDFBuildResult(ok=True, pdf_path=pdf_path))
+            return fut
+
+        args = (str(md_path), str(pdf_path), title, cover_meta, build_key)
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return pool.submit(_render_job, *args)
+            except Exception:  # noqa: BLE001
+                # 풀이 깨졌으면(BrokenProcessPool 등) 다음 호출에서 재생성
+                with self._lock:
+                    self._pool = None
+        fut = Future()
+        fut.set_result(_render_job(*args))
+        return fut
+
+    def build(
+        self,
+        md_path: Path,
+        pdf_path: Path,
+        title: str,
+        *,
+        cover_meta: Optional[Dict[str, str]] = None,
+        force: bool = False,
+    ) -> PDFBuildResult:
+        """submit 후 결과를 기다리는 동기 버전 (build_pdf_from_markdown 과 동일한 반환형)."""
+        fut = self.submit(md_path, pdf_path, title, cover_meta=cover_meta, force=force)
+        try:
+            return fut.result()
+        except Exception as e:  # noqa: BLE001
+            return PDFBuildResult(
+                ok=False, pdf_path=Path(pdf_path), error=f"{type(e).__name__}: {e}"
+            )
+
+    def build_many(self, jobs: Iterable[PDFJob], force: bool = False) -> List[PDFBuildResult]:
+        """여러 작업을 한 번에 제출하고 제출 순서대로 결과를 반환한다."""
+        jobs = list(jobs)
+        futures = [
+            self.submit(md, pdf, title, cover_meta=meta, force=force)
+            for md, pdf, title, meta in jobs
+        ]
+        results: List[PDFBuildResult] = []
+        for (md, pdf, _, _), fut in zip(jobs, futures):
+            try:
+                results.append(fut.result())
+            except Exception as e:  # noqa: BLE001
+                results.append(
+                    PDFBuildResult(ok=False, pdf_path=Path(pdf), error=f"{type(e).__name__}: {e}")
+                )
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+    def __enter__(self) -> "PDFRenderService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+_SERVICE: Optional[PDFRenderService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_pdf_service() -> PDFRenderService:
+    """프로세스 전역 PDFRenderService 싱글톤."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = PDFRenderService()
+        return _SERVICE
@@ -20,15 +20,18 @@ outputs/<product_id>/bonus/
 
 주의:
 - 외부 LLM 없이도 사용할 수 있는 형태로 "빈칸 채우기" 템플릿 중심.
+- 제품과 무관한 고정 파일(FAQ/런치 플랜/워크시트 일부)은 asset_store 에 1벌만 두고 하드링크.
 - product_id 기반 결정적(내용은 topic/meta에 따라 변형).
 """
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
+from asset_store import get_asset_store, link_or_copy
 from premium_content_engine import PremiumProduct
 
 
@@ -43,6 +46,14 @@ def _safe_mkdir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def _write_shared(p: Path, text: str) -> None:
+    """제품과 무관한 고정 파일: 공유 자산 저장소에 1벌만 두고 하드링크로 배치한다."""
+    # Path.write_text 와 같은 개행 변환을 적용하여 기존 출력과 동일한 바이트를 유지
+    data = text.replace("\n", os.linesep).encode("utf-8")
+    obj = get_asset_store().put_bytes(data, p.suffix)
+    link_or_copy(obj, p)
+
+
 def build_bonus_package(bonus_dir: Path, product: PremiumProduct) -> BonusBuildResult:
     bonus_dir.mkdir(parents=True, exist_ok=True)
 
@@ -259,7 +270,8 @@ CTA: "Get the ops-ready implementation guide."
     # 4) Worksheets (CSV)
     try:
         p = worksheets_dir / "30_60_90_plan.csv"
-        p.write_text(
+        _write_shared(
+            p,
             "Phase,Goal,Tasks,Owner,DueDate,Status,Notes\n"
             "30 days,Baseline + Instrumentation,"
             '"Ship v1; instrument funnel; publish FAQ; stabilize payment + download",'
@@ -270,7 +282,6 @@ CTA: "Get the ops-ready implementation guide."
             "90 days,Scale + Portfolio,"
             '"Add 3–5 adjacent products; systematize reporting; enforce QC threshold",'
             '"You",,,,\n',
-            encoding="utf-8",
         )
         files.append(p)
     except Exception as e:  # noqa: BLE001
@@ -329,7 +340,8 @@ Use these blocks to improve landing page clarity + perceived value.
     # 6) FAQ blocks
     try:
         p = bonus_dir / "faq_blocks.md"
-        p.write_text(
+        _write_shared(
+            p,
             """# FAQ Blocks (Copy/Paste)
 
 ## Does this work without a huge audience?
@@ -344,7 +356,6 @@ You get an automated status check + a gated download link (signed token).
 ## Refund policy?
 Define it upfront. Common options: (a) refund before download, (b) credit after download, (c) manual review for wrong-network payments.
 """,
-            encoding="utf-8",
         )
         files.append(p)
     except Exception as e:  # noqa: BLE001
@@ -355,9 +366,9 @@ Define it upfront. Common options: (a) refund before download, (b) credit after
         ws = bonus_dir / "worksheets"
         ws.mkdir(parents=True, exist_ok=True)
         p = ws / "ab_test_log.csv"
-        p.write_text(
+        _write_shared(
+            p,
             "test_name,start_date,end_date,variant_a,variant_b,metric,decision,notes\n",
-            encoding="utf-8",
         )
         files.append(p)
     except Exception as e:  # noqa: BLE001
@@ -366,7 +377,8 @@ Define it upfront. Common options: (a) refund before download, (b) credit after
     # 8) Launch plan
     try:
         p = bonus_dir / "launch_plan.md"
-        p.write_text(
+        _write_shared(
+            p,
             """# 7-Day Launch Plan (Realistic)
 
 Day 1 — Setup
@@ -390,7 +402,6 @@ Day 6 — Fix top 3 leaks
 Day 7 — Optimize
 - A/B hero + CTA; lock in a weekly iteration loop
 """,
-            encoding="utf-8",
         )
         files.append(p)
     except Exception as e:  # noqa: BLE001
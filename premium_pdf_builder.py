@@ -21,6 +21,7 @@ premium_pdf_builder.py
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -50,10 +51,12 @@ class PDFBuildResult:
     errors: List[str]
 
 
+@lru_cache(maxsize=1)
 def _styles():
     """
     reportlab 기본 스타일시트에 "고유한 이름"으로 커스텀 스타일을 추가한다.
     (getSampleStyleSheet()에는 이미 'Bullet' 등 일부 이름이 존재할 수 있으므로 prefix 사용)
+    프로세스당 1회만 생성하고 이후 호출은 캐시된 스타일시트를 재사용한다.
     """
     styles = getSampleStyleSheet()
 
@@ -3,13 +3,21 @@
 preview_server.py
 목적:
 - outputs/ 아래 생성된 index.html들을 브라우저에서 쉽게 열어보게 하는 로컬 미리보기 서버
-- /_list 에서 클릭 가능한 링크 목록 제공
+- /_list 에서 클릭 가능한 링크 목록 제공 (페이지네이션 + 검색: /_list?q=crypto&page=2)
 - flask_cors 의존성 제거(초보자 환경에서 설치 이슈 방지)
 
+성능:
+- outputs 목록은 메모리 인덱스로 캐시하고, outputs 폴더 mtime 변경(제품 추가/삭제),
+  watchdog 감시 이벤트(설치된 경우), 또는 PREVIEW_INDEX_TTL 초 경과 시에만 다시 스캔합니다.
+- 정적 파일은 ETag/Last-Modified 를 붙여 서빙하고 조건부 요청에는 304로 응답합니다.
+- <파일>.br / <파일>.gz 사전 압축본이 있으면 Accept-Encoding 에 맞춰 그대로 서빙합니다.
+  (python preview_server.py --precompress 로 생성, outputs 밖의 data/preview_precompressed 에 저장하므로
+  package.zip 이나 배포 업로드에는 섞이지 않습니다. PREVIEW_PRECOMPRESS_DIR 로 변경)
+
 실행:
   python preview_server.py
 접속:
-  http://127.0.0.1:8090/_list
+  http://127.0.0.1:8088/_list
 """
 
 from __future__ import annotations
@@ -24,10 +32,30 @@ if sys.platform == "win32":
     except AttributeError:
         pass
 
+import argparse
+import gzip
+import mimetypes
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from flask import Flask, Response, abort, jsonify, request, send_file
+from werkzeug.security import safe_join
 
-from flask import Flask, Response, send_from_directory
+try:
+    import brotli  # 선택 의존성: 없으면 .br 생성만 건너뜀
+except ImportError:
+    brotli = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
 
 app = Flask(__name__)
 
@@ -35,6 +63,28 @@ app = Flask(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parent
 OUTPUTS_DIR = PROJECT_ROOT / "outputs"
 
+# 인덱스 최대 유지 시간(초). 제품 폴더 안의 index.html 을 제자리에서 덮어쓰는 경우
+# outputs 폴더 mtime 이 바뀌지 않으므로 이 주기로 한 번씩 다시 스캔합니다.
+INDEX_TTL_SECONDS = float(os.getenv("PREVIEW_INDEX_TTL", "30"))
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 사전 압축 대상 (이미 압축된 포맷은 제외)
+PRECOMPRESS_EXTENSIONS = {".html", ".css", ".js", ".json", ".svg", ".txt", ".md", ".xml", ".csv"}
+PRECOMPRESS_MIN_BYTES = 1024
+# Accept-Encoding 우선순위: brotli > gzip
+_ENCODED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+# 사전 압축본 저장 위치 (outputs/<상대 경로>.gz 구조를 그대로 둠)
+PRECOMPRESS_DIR = Path(os.getenv("PREVIEW_PRECOMPRESS_DIR") or PROJECT_ROOT / "data" / "preview_precompressed")
+
+
+def _variant_path(path: str, suffix: str) -> Optional[str]:
+    """outputs 아래 원본 path 의 사전 압축본 경로 (outputs 밖이면 None)."""
+    rel = os.path.relpath(path, OUTPUTS_DIR)
+    if rel.startswith(os.pardir):
+        return None
+    return os.path.join(PRECOMPRESS_DIR, rel + suffix)
+
 
 def _html_escape(s: str) -> str:
     return (
@@ -47,36 +97,229 @@ def _html_escape(s: str) -> str:
     )
 
 
-def _collect_outputs() -> List[Dict[str, str]]:
+def _collect_outputs() -> List[Dict[str, Any]]:
     """
-    outputs/<product_id>/index.html 목록 수집
+    outputs/<product_id>/index.html 목록 수집 (최신 수정 순)
+    - scandir 1회 + 제품당 stat 1회 (존재 확인과 mtime 조회를 겸함)
     """
-    items: List[Dict[str, str]] = []
-    if not OUTPUTS_DIR.exists():
+    items: List[Dict[str, Any]] = []
+    try:
+        entries = list(os.scandir(OUTPUTS_DIR))
+    except OSError:
         return items
 
-    for p in OUTPUTS_DIR.glob("*"):
-        if not p.is_dir():
+    for entry in entries:
+        try:
+            if not entry.is_dir():
+                continue
+            mtime = os.stat(os.path.join(entry.path, "index.html")).st_mtime
+        except OSError:
             continue
-        index_html = p / "index.html"
-        if index_html.exists():
-            items.append(
-                {
-                    "product_id": p.name,
-                    "rel_path": f"outputs/{p.name}/index.html",
-                    "url": f"/outputs/{p.name}/index.html",
-                }
-            )
+        items.append(
+            {
+                "product_id": entry.name,
+                "rel_path": f"outputs/{entry.name}/index.html",
+                "url": f"/outputs/{entry.name}/index.html",
+                "mtime": mtime,
+            }
+        )
 
     # 최신 수정 파일이 위로 오게 정렬
-    def _mtime(item: Dict[str, str]) -> float:
+    items.sort(key=lambda it: it["mtime"], reverse=True)
+    return items
+
+
+class OutputsIndex:
+    """outputs 목록 캐시. 폴더 mtime/감시 이벤트/TTL 기준으로만 다시 스캔합니다."""
+
+    def __init__(self, ttl_seconds: float = INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._items: List[Dict[str, Any]] = []
+        self._dir_mtime_ns: Optional[int] = None
+        self._built_at = 0.0
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def _outputs_mtime_ns(self) -> Optional[int]:
         try:
-            return (OUTPUTS_DIR / item["product_id"] / "index.html").stat().st_mtime
-        except Exception:
-            return 0.0
+            return OUTPUTS_DIR.stat().st_mtime_ns
+        except OSError:
+            return None
 
-    items.sort(key=_mtime, reverse=True)
-    return items
+    def items(self) -> List[Dict[str, Any]]:
+        dir_mtime = self._outputs_mtime_ns()
+        with self._lock:
+            expired = self.ttl_seconds >= 0 and time.monotonic() - self._built_at > self.ttl_seconds
+            if self._dirty or expired or dir_mtime != self._dir_mtime_ns:
+                self._items = _collect_outputs()
+                self._dir_mtime_ns = dir_mtime
+                self._built_at = time.monotonic()
+                self._dirty = False
+            return self._items
+
+    def query(self, q: str = "", page: int = 1, per_page: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        items = self.items()
+        q = (q or "").strip().lower()
+        if q:
+            items = [it for it in items if q in it["product_id"].lower()]
+        per_page = max(1, min(MAX_PAGE_SIZE, per_page))
+        pages = max(1, (len(items) + per_page - 1) // per_page)
+        page = max(1, min(page, pages))
+        start = (page - 1) * per_page
+        return {
+            "q": q,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "total": len(items),
+            "items": items[start : start + per_page],
+        }
+
+
+OUTPUTS_INDEX = OutputsIndex()
+
+
+class _OutputsWatchHandler(FileSystemEventHandler):
+    def on_any_event(self, event) -> None:  # noqa: D401
+        if str(getattr(event, "src_path", "")).endswith("index.html") or event.is_directory:
+            OUTPUTS_INDEX.invalidate()
+
+
+def start_outputs_watcher() -> bool:
+    """watchdog 이 설치되어 있으면 outputs 변경 시 인덱스를 즉시 무효화합니다."""
+    if Observer is None or not OUTPUTS_DIR.exists():
+        return False
+    observer = Observer()
+    observer.schedule(_OutputsWatchHandler(), str(OUTPUTS_DIR), recursive=True)
+    observer.daemon = True
+    observer.start()
+    return True
+
+
+# -----------------------------
+# 정적 파일 (ETag / 304 / 사전 압축본)
+# -----------------------------
+
+# (base_dir, subpath) -> 실제 경로
+_RESOLVE_CACHE: Dict[Tuple[str, str], Optional[str]] = {}
+_RESOLVE_CACHE_MAX = 4096
+# 원본 경로 -> (mtime_ns, size, 확인 시각, {encoding: 압축본 경로})
+_VARIANT_CACHE: Dict[str, Tuple[int, int, float, Dict[str, str]]] = {}
+
+
+def _resolve(base_dir: Path, subpath: str) -> Optional[str]:
+    key = (str(base_dir), subpath)
+    if key not in _RESOLVE_CACHE:
+        if len(_RESOLVE_CACHE) >= _RESOLVE_CACHE_MAX:
+            _RESOLVE_CACHE.clear()
+        _RESOLVE_CACHE[key] = safe_join(str(base_dir), subpath)
+    return _RESOLVE_CACHE[key]
+
+
+def _variants(path: str, st: os.stat_result) -> Dict[str, str]:
+    now = time.monotonic()
+    cached = _VARIANT_CACHE.get(path)
+    if (
+        cached
+        and cached[0] == st.st_mtime_ns
+        and cached[1] == st.st_size
+        and now - cached[2] <= INDEX_TTL_SECONDS
+    ):
+        return cached[3]
+    found: Dict[str, str] = {}
+    for encoding, suffix in _ENCODED_VARIANTS:
+        variant = _variant_path(path, suffix)
+        if variant is None:
+            continue
+        try:
+            # 원본보다 오래된 압축본은 무시 (원본이 다시 생성된 경우)
+            if os.stat(variant).st_mtime_ns >= st.st_mtime_ns:
+                found[encoding] = variant
+        except OSError:
+            continue
+    if len(_VARIANT_CACHE) >= _RESOLVE_CACHE_MAX:
+        _VARIANT_CACHE.clear()
+    _VARIANT_CACHE[path] = (st.st_mtime_ns, st.st_size, now, found)
+    return found
+
+
+def _send_static(base_dir: Path, subpath: str) -> Response:
+    path = _resolve(base_dir, subpath)
+    if path is None:
+        abort(404)
+    try:
+        st = os.stat(path)
+    except OSError:
+        abort(404)
+    if not os.path.isfile(path):
+        abort(404)
+
+    encoding = None
+    send_path = path
+    variants = _variants(path, st)
+    if variants:
+        accepted = request.accept_encodings
+        for enc, _suffix in _ENCODED_VARIANTS:
+            if enc in variants and accepted[enc]:
+                encoding, send_path = enc, variants[enc]
+                break
+
+    etag = f"{st.st_mtime_ns:x}-{st.st_size:x}" + (f"-{encoding}" if encoding else "")
+    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    resp = send_file(
+        send_path,
+        mimetype=mimetype,
+        conditional=True,
+        etag=etag,
+        last_modified=st.st_mtime,
+        max_age=0,
+    )
+    resp.cache_control.no_cache = True
+    if variants:
+        resp.vary.add("Accept-Encoding")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    return resp
+
+
+def precompress_outputs(min_bytes: int = PRECOMPRESS_MIN_BYTES) -> Dict[str, int]:
+    """outputs 아래 텍스트 자산의 .gz(와 brotli 설치 시 .br) 사전 압축본을 PRECOMPRESS_DIR 에 생성/갱신합니다."""
+    stats = {"written": 0, "fresh": 0}
+    encoders = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda data: brotli.compress(data, quality=11)))
+
+    for root, _dirs, files in os.walk(OUTPUTS_DIR):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in PRECOMPRESS_EXTENSIONS:
+                continue
+            src = os.path.join(root, name)
+            st = os.stat(src)
+            if st.st_size < min_bytes:
+                continue
+            data = None
+            for suffix, encode in encoders:
+                dst = _variant_path(src, suffix)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                try:
+                    if os.stat(dst).st_mtime_ns >= st.st_mtime_ns:
+                        stats["fresh"] += 1
+                        continue
+                except OSError:
+                    pass
+                if data is None:
+                    with open(src, "rb") as f:
+                        data = f.read()
+                tmp = f"{dst}.tmp-{os.getpid()}"
+                with open(tmp, "wb") as f:
+                    f.write(encode(data))
+                os.replace(tmp, dst)
+                stats["written"] += 1
+    _VARIANT_CACHE.clear()
+    return stats
 
 
 @app.get("/health")
@@ -84,9 +327,41 @@ def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+def _list_args() -> Tuple[str, int, int]:
+    try:
+        page = int(request.args.get("page", 1))
+    except ValueError:
+        page = 1
+    try:
+        per_page = int(request.args.get("per_page", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        per_page = DEFAULT_PAGE_SIZE
+    return request.args.get("q", ""), page, per_page
+
+
+@app.get("/_list.json")
+def list_json():
+    q, page, per_page = _list_args()
+    return jsonify(OUTPUTS_INDEX.query(q, page, per_page))
+
+
 @app.get("/_list")
 def list_page() -> Response:
-    items = _collect_outputs()
+    q, page, per_page = _list_args()
+    result = OUTPUTS_INDEX.query(q, page, per_page)
+    items = result["items"]
+
+    def _page_link(n: int, label: str) -> str:
+        href = f"/_list?q={quote(result['q'])}&page={n}&per_page={result['per_page']}"
+        return f'<a href="{_html_escape(href)}">{label}</a>'
+
+    nav = []
+    if result["page"] > 1:
+        nav.append(_page_link(result["page"] - 1, "&laquo; Prev"))
+    nav.append(f'<span class="muted">page {result["page"]} / {result["pages"]} ({result["total"]} items)</span>')
+    if result["page"] < result["pages"]:
+        nav.append(_page_link(result["page"] + 1, "Next &raquo;"))
+    nav_html = f'<div style="display:flex;gap:12px;align-items:center;">{"".join(nav)}</div>'
 
     rows = []
     for it in items:
@@ -121,7 +396,14 @@ def list_page() -> Response:
       <p class="muted">
         현재 outputs 경로: <code>{_html_escape(str(OUTPUTS_DIR))}</code>
       </p>
+      <form method="get" action="/_list">
+        <input type="text" name="q" value="{_html_escape(result["q"])}" placeholder="product_id 검색"/>
+        <input type="hidden" name="per_page" value="{result["per_page"]}"/>
+        <button type="submit">Search</button>
+      </form>
+      {nav_html}
       {("".join(rows) if rows else "<p>outputs에 index.html이 없습니다. 먼저 <code>python auto_pilot.py</code>를 실행하세요.</p>")}
+      {nav_html if rows else ""}
     </body>
     </html>
     """
@@ -133,22 +415,30 @@ def preview_product(product_id: str):
     """
     /preview/<product_id> 로 접속 시 outputs/<product_id>/index.html 서빙
     """
-    return send_from_directory(str(OUTPUTS_DIR / product_id), "index.html")
+    return _send_static(OUTPUTS_DIR, f"{product_id}/index.html")
 
 @app.get("/preview/<product_id>/<path:filename>")
 def preview_product_assets(product_id: str, filename: str):
     """
     /preview/<product_id>/... 로 접속 시 해당 제품 폴더 내 파일 서빙 (assets 등)
     """
-    return send_from_directory(str(OUTPUTS_DIR / product_id), filename)
+    return _send_static(OUTPUTS_DIR, f"{product_id}/{filename}")
 
 @app.get("/outputs/<path:subpath>")
 def serve_outputs(subpath: str):
     # outputs 폴더를 정적으로 서빙
-    return send_from_directory(str(OUTPUTS_DIR), subpath)
+    return _send_static(OUTPUTS_DIR, subpath)
 
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="outputs preview server")
+    ap.add_argument("--precompress", action="store_true", help="텍스트 자산의 .gz/.br 사전 압축본 생성 후 종료")
+    args = ap.parse_args()
+    if args.precompress:
+        print(precompress_outputs())
+        sys.exit(0)
+
+    start_outputs_watcher()
     # Windows에서 포트 충돌 방지: host 127.0.0.1 고정
     # auto_mode_daemon.py와 포트 일치 (8088)
     app.run(host="127.0.0.1", port=8088, debug=False)
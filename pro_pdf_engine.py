@@ -24,6 +24,7 @@ from __future__ import annotations
 import re
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -165,6 +166,79 @@ def _build_toc(story: List, styles, headings: List[str]) -> None:
     story.append(PageBreak())
 
 
+@lru_cache(maxsize=1)
+def get_styles():
+    """본문 빌드용 스타일시트 (프로세스당 1회 생성 후 재사용)."""
+    styles = getSampleStyleSheet()
+
+    # 스타일 강화(상업용 느낌)
+    styles.add(
+        ParagraphStyle(
+            name="Body", parent=styles["Normal"], fontSize=10.2, leading=14
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Small",
+            parent=styles["Normal"],
+            fontSize=9,
+            leading=12,
+            textColor=colors.grey,
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="Quote",
+            parent=styles["Normal"],
+            fontSize=10,
+            leading=14,
+            leftIndent=14,
+            textColor=colors.HexColor("#333333"),
+        )
+    )
+    try:
+        styles.add(
+            ParagraphStyle(
+                name="Code",
+                parent=styles["Normal"],
+                fontName="Courier",
+                fontSize=9,
+                leading=11,
+                backColor=colors.whitesmoke,
+                leftIndent=10,
+                rightIndent=10,
+                spaceBefore=6,
+                spaceAfter=6,
+            )
+        )
+    except KeyError:
+        code_style = styles["Code"]
+        code_style.fontName = "Courier"
+        code_style.fontSize = 9
+        code_style.leading = 11
+        code_style.backColor = colors.whitesmoke
+        code_style.leftIndent = 10
+        code_style.rightIndent = 10
+        code_style.spaceBefore = 6
+        code_style.spaceAfter = 6
+    styles.add(
+        ParagraphStyle(
+            name="H1", parent=styles["Heading1"], spaceBefore=14, spaceAfter=10
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="H2", parent=styles["Heading2"], spaceBefore=12, spaceAfter=8
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="H3", parent=styles["Heading3"], spaceBefore=10, spaceAfter=6
+        )
+    )
+    return styles
+
+
 def build_pdf_from_markdown(
     md_path: Path,
     pdf_path: Path,
@@ -182,73 +256,7 @@ def build_pdf_from_markdown(
         md = md_path.read_text(encoding="utf-8", errors="ignore")
         lines = md.splitlines()
 
-        styles = getSampleStyleSheet()
-
-        # 스타일 강화(상업용 느낌)
-        styles.add(
-            ParagraphStyle(
-                name="Body", parent=styles["Normal"], fontSize=10.2, leading=14
-            )
-        )
-        styles.add(
-            ParagraphStyle(
-                name="Small",
-                parent=styles["Normal"],
-                fontSize=9,
-                leading=12,
-                textColor=colors.grey,
-            )
-        )
-        styles.add(
-            ParagraphStyle(
-                name="Quote",
-                parent=styles["Normal"],
-                fontSize=10,
-                leading=14,
-                leftIndent=14,
-                textColor=colors.HexColor("#333333"),
-            )
-        )
-        try:
-            styles.add(
-                ParagraphStyle(
-                    name="Code",
-                    parent=styles["Normal"],
-                    fontName="Courier",
-                    fontSize=9,
-                    leading=11,
-                    backColor=colors.whitesmoke,
-                    leftIndent=10,
-                    rightIndent=10,
-                    spaceBefore=6,
-                    spaceAfter=6,
-                )
-            )
-        except KeyError:
-            code_style = styles["Code"]
-            code_style.fontName = "Courier"
-            code_style.fontSize = 9
-            code_style.leading = 11
-            code_style.backColor = colors.whitesmoke
-            code_style.leftIndent = 10
-            code_style.rightIndent = 10
-            code_style.spaceBefore = 6
-            code_style.spaceAfter = 6
-        styles.add(
-            ParagraphStyle(
-                name="H1", parent=styles["Heading1"], spaceBefore=14, spaceAfter=10
-            )
-        )
-        styles.add(
-            ParagraphStyle(
-                name="H2", parent=styles["Heading2"], spaceBefore=12, spaceAfter=8
-            )
-        )
-        styles.add(
-            ParagraphStyle(
-                name="H3", parent=styles["Heading3"], spaceBefore=10, spaceAfter=6
-            )
-        )
+        styles = get_styles()
 
         story: List = []
 
@@ -522,14 +522,25 @@ Focus on: privacy, global payments, instant delivery, chargeback-free.
 
 
 def build_package_zip(product_dir: Path, package_zip_path: Path) -> None:
-    """product_dir 내부를 package.zip으로 묶는다."""
+    """product_dir 내부를 package.zip으로 묶는다.
+
+    기존 package.zip 은 CAS 원본(downloads/.cas)의 하드링크일 수 있으므로 제자리에서 덮어쓰지 않고
+    임시 파일에 쓴 뒤 교체한다 (링크만 끊기고 공유 원본은 그대로 남는다).
+    """
     package_zip_path.parent.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(package_zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        for p in sorted(product_dir.rglob("*")):
-            if p.is_dir():
-                continue
-            rel = p.relative_to(product_dir).as_posix()
-            z.write(p, rel)
+    tmp = package_zip_path.with_suffix(package_zip_path.suffix + ".tmp")
+    skip = {package_zip_path.resolve(), tmp.resolve()}
+    try:
+        with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as z:
+            for p in sorted(product_dir.rglob("*")):
+                if p.is_dir() or p.resolve() in skip:
+                    continue
+                rel = p.relative_to(product_dir).as_posix()
+                z.write(p, rel)
+        tmp.replace(package_zip_path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
 
 
 def write_manifest(product_dir: Path, meta: Dict[str, object]) -> None:
@@ -828,13 +828,16 @@ def generate_promotions(
     )
 
     # promo_pack.zip 생성(폴더 내 파일 전체 압축)
+    # 출력 폴더의 파일은 공유 원본의 하드링크일 수 있으므로 임시 파일에 쓴 뒤 교체
     promo_zip = promo_dir / "promo_pack.zip"
-    with zipfile.ZipFile(promo_zip, "w", compression=zipfile.ZIP_DEFLATED) as z:
+    promo_tmp = promo_dir / "promo_pack.zip.tmp"
+    with zipfile.ZipFile(promo_tmp, "w", compression=zipfile.ZIP_DEFLATED) as z:
         for p in sorted(promo_dir.glob("*")):
-            if p.name == "promo_pack.zip":
+            if p.name in ("promo_pack.zip", "promo_pack.zip.tmp"):
                 continue
             if p.is_file():
                 z.write(p, p.name)
+    promo_tmp.replace(promo_zip)
 
     meta = {
         "product_id": product_id,
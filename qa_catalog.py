@@ -0,0 +1,41 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to sys.path
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.qa_manager import QAManager
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Run QA Stage 1 over the catalog in parallel (unchanged products are served from the QA cache)"
+    )
+    ap.add_argument("--products", nargs="+", help="대상 제품 ID (기본: outputs/ 전체)")
+    ap.add_argument("--workers", type=int, default=4, help="동시에 검사할 제품 수")
+    ap.add_argument("--no-cache", action="store_true", help="QA 캐시를 무시하고 모두 다시 검사")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    results = QAManager().run_qa_batch(
+        product_ids=args.products,
+        workers=args.workers,
+        use_cache=not args.no_cache,
+    )
+
+    if args.json:
+        print(json.dumps({pid: r.to_dict() for pid, r in results.items()}, ensure_ascii=False, indent=2))
+        return
+
+    failed = [pid for pid, r in results.items() if not r.passed]
+    for pid in failed:
+        errors = [m for m in results[pid].messages if m.startswith(("ERROR", "CRITICAL"))]
+        print(f"{pid}: FAILED " + "; ".join(errors[:3]))
+    print(f"Completed. {len(results)} products (passed={len(results) - len(failed)}, failed={len(failed)}).")
+
+
+if __name__ == "__main__":
+    main()
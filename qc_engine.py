@@ -9,18 +9,29 @@ qc_engine.py
 주의:
 - 본 QC는 "정량적 근거 기반 휴리스틱"입니다. (LLM 없이도 동작)
 - 실제로는 LLM/전문 리뷰 기반 점수와 혼합하는 것이 가장 강력합니다.
+- 섹션/숫자/체크리스트/템플릿/테이블 규칙은 src.qa_rules 로 한 번에 평가하고 (소문자 사본 1회),
+  같은 내용(SHA256)의 재채점은 메모리 캐시에서 바로 반환합니다.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from src.qa_rules import Rule, RuleSet
+
 RE_NUMBER = re.compile(r"\b\d+(\.\d+)?%?\b")
 RE_TABLE = re.compile(r"^\|.+\|$", re.M)
+RE_WORD = re.compile(r"\w+")
+
+CHECKLIST_MARKERS = [r"^- \[ \]", r"\b체크리스트\b", r"\bworkflow\b", r"\b단계\b", r"\bstep\b"]
+TEMPLATE_MARKERS = [r"\btemplate\b", r"\b매크로\b", r"\bpolicy\b", r"\b정책\b", r"\b스크립트\b"]
 
 
 REQUIRED_SECTIONS = [
@@ -40,6 +51,18 @@ REQUIRED_SECTIONS = [
     "Support Macros",
 ]
 
+# 마커끼리는 겹치지 않으므로 마커별 매치 수의 합 == 기존 alternation findall 결과
+QC_RULES = RuleSet(
+    [Rule(f"section:{sec}", sec, ignore_case=True) for sec in REQUIRED_SECTIONS]
+    + [Rule("number", RE_NUMBER.pattern, regex=True, count=True), Rule("table", RE_TABLE.pattern, regex=True, multiline=True)]
+    + [Rule(f"checklist:{i}", p, regex=True, ignore_case=True, multiline=True, count=True) for i, p in enumerate(CHECKLIST_MARKERS)]
+    + [Rule(f"template:{i}", p, regex=True, ignore_case=True, count=True) for i, p in enumerate(TEMPLATE_MARKERS)]
+)
+
+_SCORE_CACHE_MAX = 256
+_score_cache: "OrderedDict[str, Tuple[int, Dict[str, int], List[str]]]" = OrderedDict()
+_score_cache_lock = threading.Lock()
+
 
 @dataclass
 class QCResult:
@@ -48,25 +71,6 @@ class QCResult:
     missing_sections: List[str]
 
 
-def _count_numbers(text: str) -> int:
-    return len(RE_NUMBER.findall(text))
-
-
-def _has_table(text: str) -> bool:
-    return bool(RE_TABLE.search(text or ""))
-
-
-def _section_presence(text: str) -> Tuple[int, List[str]]:
-    missing = []
-    present = 0
-    for sec in REQUIRED_SECTIONS:
-        if sec.lower() in (text or "").lower():
-            present += 1
-        else:
-            missing.append(sec)
-    return present, missing
-
-
 def score_markdown(md_text: str) -> QCResult:
     """
     점수 구성(총 100):
@@ -75,18 +79,38 @@ def score_markdown(md_text: str) -> QCResult:
     - 숫자/지표 15
     - 체크리스트/워크플로우 15
     - 테이블/템플릿/매크로 15
+
+    같은 내용은 다시 계산하지 않습니다 (내용 해시 기준 LRU 캐시).
     """
     text = md_text or ""
+    key = hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+    with _score_cache_lock:
+        hit = _score_cache.get(key)
+        if hit is not None:
+            _score_cache.move_to_end(key)
+    if hit is None:
+        result = _score_uncached(text)
+        hit = (result.score, result.details, result.missing_sections)
+        with _score_cache_lock:
+            _score_cache[key] = hit
+            while len(_score_cache) > _SCORE_CACHE_MAX:
+                _score_cache.popitem(last=False)
+    return QCResult(score=hit[0], details=dict(hit[1]), missing_sections=list(hit[2]))
+
+
+def _score_uncached(text: str) -> QCResult:
     details: Dict[str, int] = {}
+    scan = QC_RULES.scan(text)
 
     # 1) 섹션 커버리지
-    present, missing = _section_presence(text)
+    missing = [sec for sec in REQUIRED_SECTIONS if not scan.has(f"section:{sec}")]
+    present = len(REQUIRED_SECTIONS) - len(missing)
     coverage_ratio = present / max(1, len(REQUIRED_SECTIONS))
     s_coverage = int(round(35 * coverage_ratio))
     details["section_coverage"] = s_coverage
 
     # 2) 분량
-    words = len(re.findall(r"\w+", text))
+    words = len(RE_WORD.findall(text))
     # 4,000 단어 이상이면 만점(20), 2,000이면 15, 1,000이면 10, 500이면 5
     if words >= 4000:
         s_depth = 20
@@ -101,7 +125,7 @@ def score_markdown(md_text: str) -> QCResult:
     details["depth_words"] = s_depth
 
     # 3) 숫자/지표
-    nums = _count_numbers(text)
+    nums = scan.count("number")
     if nums >= 120:
         s_metrics = 15
     elif nums >= 70:
@@ -115,13 +139,7 @@ def score_markdown(md_text: str) -> QCResult:
     details["metrics_numbers"] = s_metrics
 
     # 4) 워크플로우/체크리스트(마커 기반)
-    checklist_hits = len(
-        re.findall(
-            r"(^- \[ \]|\b체크리스트\b|\bworkflow\b|\b단계\b|\bstep\b)",
-            text,
-            re.I | re.M,
-        )
-    )
+    checklist_hits = sum(scan.count(f"checklist:{i}") for i in range(len(CHECKLIST_MARKERS)))
     if checklist_hits >= 60:
         s_workflows = 15
     elif checklist_hits >= 35:
@@ -135,12 +153,8 @@ def score_markdown(md_text: str) -> QCResult:
     details["workflows_checklists"] = s_workflows
 
     # 5) 테이블/템플릿/매크로
-    templates_hits = len(
-        re.findall(
-            r"\btemplate\b|\b매크로\b|\bpolicy\b|\b정책\b|\b스크립트\b", text, re.I
-        )
-    )
-    has_table = _has_table(text)
+    templates_hits = sum(scan.count(f"template:{i}") for i in range(len(TEMPLATE_MARKERS)))
+    has_table = scan.has("table")
     s_templates = 0
     if has_table:
         s_templates += 6
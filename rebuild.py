@@ -0,0 +1,58 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to sys.path
+PROJECT_ROOT = Path(__file__).resolve().parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.build_graph import DEFAULT_NODES, rebuild
+
+
+def main():
+    node_names = [n.name for n in DEFAULT_NODES]
+    ap = argparse.ArgumentParser(
+        description="Incrementally rebuild product artifacts (only stale nodes are re-executed)"
+    )
+    ap.add_argument("--products", nargs="+", help="대상 제품 ID (기본: outputs/ 전체)")
+    ap.add_argument("--only", nargs="+", choices=node_names, help="지정한 노드만 판정/실행")
+    ap.add_argument("--workers", type=int, default=4, help="동시에 처리할 제품 수")
+    ap.add_argument("--dry-run", action="store_true", help="실행하지 않고 오래된 노드만 표시")
+    ap.add_argument("--force", action="store_true", help="입력 변화와 무관하게 모두 다시 빌드")
+    ap.add_argument(
+        "--adopt",
+        action="store_true",
+        help="실행 없이 현재 산출물을 빌드 완료 상태로 기록 (기존 카탈로그 초기 등록)",
+    )
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    results = rebuild(
+        product_ids=args.products,
+        only=args.only,
+        workers=args.workers,
+        force=args.force,
+        dry_run=args.dry_run,
+        adopt=args.adopt,
+    )
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    counts = {}
+    for product_id, nodes in results.items():
+        changed = {k: v for k, v in nodes.items() if v not in ("fresh", "skipped")}
+        for status in nodes.values():
+            key = status.split(":", 1)[0]
+            counts[key] = counts.get(key, 0) + 1
+        if changed:
+            print(f"{product_id}: " + ", ".join(f"{k}={v}" for k, v in changed.items()))
+
+    summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    print(f"Completed. {len(results)} products ({summary or 'nothing to do'}).")
+
+
+if __name__ == "__main__":
+    main()
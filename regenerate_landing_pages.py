@@ -1,5 +1,6 @@
 import sys
 import json
+import argparse
 from pathlib import Path
 
 # Add project root to sys.path
@@ -7,7 +8,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.append(str(PROJECT_ROOT))
 
 try:
-    from src.product_generator import _render_landing_html_from_schema
+    from src.product_generator import render_product_pages
 except ImportError:
     # If running from root, src is a package
     # But if imports inside src.product_generator are relative, they might fail if not run as module
@@ -15,6 +16,10 @@ except ImportError:
     pass
 
 def main():
+    ap = argparse.ArgumentParser(description="Regenerate landing/checkout pages from product_schema.json")
+    ap.add_argument("--force", action="store_true", help="렌더 키가 같아도 다시 렌더링")
+    args = ap.parse_args()
+
     outputs_dir = PROJECT_ROOT / "outputs"
     if not outputs_dir.exists():
         print("Outputs directory not found.")
@@ -23,6 +28,7 @@ def main():
     print(f"Scanning {outputs_dir}...")
     
     count = 0
+    skipped = 0
     for product_dir in outputs_dir.iterdir():
         if not product_dir.is_dir():
             continue
@@ -44,11 +50,11 @@ def main():
             if not pkg_file:
                 print(f"Warning: {product_dir.name} schema missing package_file. Defaulting to package.zip")
             
-            # Regenerate HTML
-            html = _render_landing_html_from_schema(schema, brand="MetaPassiveIncome")
-            
-            # Write back
-            (product_dir / "index.html").write_text(html, encoding="utf-8")
+            # Regenerate HTML (unchanged schema/template -> skipped)
+            result = render_product_pages(schema, str(product_dir), brand="MetaPassiveIncome", force=args.force)
+            if not result["rendered"]:
+                skipped += 1
+                continue
             print(f"Regenerated index.html for {product_dir.name} (pkg: {pkg_file or 'default'})")
             count += 1
         except Exception as e:
@@ -56,7 +62,7 @@ def main():
             import traceback
             traceback.print_exc()
 
-    print(f"Completed. Regenerated {count} landing pages.")
+    print(f"Completed. Regenerated {count} landing pages ({skipped} unchanged, skipped).")
 
 if __name__ == "__main__":
     main()
@@ -23,10 +23,6 @@ logger = get_logger(__name__)
 # 품질 통과 임계값 (이 값 이상이어야 QA Stage 1 통과)
 QUALITY_SCORE_THRESHOLD = int(os.getenv("AI_QUALITY_THRESHOLD", "90"))
 
-# 환경 변수: DeepSeek 또는 호환 OpenAI API
-AI_API_KEY = os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
-AI_API_BASE = os.getenv("AI_API_BASE", "https://api.deepseek.com/v1")
-AI_MODEL = os.getenv("AI_QUALITY_MODEL", "deepseek-chat")
 
 
 @dataclass
@@ -54,16 +50,19 @@ def _call_chat_completion(
     OpenAI 호환 Chat Completions API 호출.
     API 키가 없으면 None 반환 (품질 검사 스킵 시뮬레이션 시 75로 통과 처리).
     """
-    if not AI_API_KEY:
+    # 환경 변수: DeepSeek 또는 호환 OpenAI API (호출 시점에 읽음)
+    api_key = os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
+    if not api_key:
         logger.warning("AI_API_KEY(DEEPSEEK_API_KEY/OPENAI_API_KEY) 미설정. AI 품질 검사 스킵.")
         return None
-    url = f"{AI_API_BASE.rstrip('/')}/chat/completions"
+    api_base = os.getenv("AI_API_BASE", "https://api.deepseek.com/v1")
+    url = f"{api_base.rstrip('/')}/chat/completions"
     headers = {
-        "Authorization": f"Bearer {AI_API_KEY}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
     payload = {
-        "model": AI_MODEL,
+        "model": os.getenv("AI_QUALITY_MODEL", "deepseek-chat"),
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
@@ -5,44 +5,134 @@ ai_web_researcher.py
 AI가 웹을 통해 실시간 정보를 수집하고 분석하는 모듈입니다.
 DuckDuckGo HTML 검색을 통해 검색 결과를 수집하고,
 페이지 콘텐츠를 추출하여 AI 프롬프트에 컨텍스트로 제공합니다.
+
+- 검색 결과와 페이지 본문은 src.research_cache 에 캐시됩니다 (TTL + ETag 재검증).
+- 페이지 수집은 RESEARCH_FETCH_WORKERS(기본 4)개 스레드로 동시에 하되,
+  도메인별로 RESEARCH_DOMAIN_INTERVAL(기본 1초) 간격을 지킵니다 (토큰 버킷, 프로세스 간 공유).
+- 본문 추출은 lxml 을 우선 사용하고, 실패 시 BeautifulSoup 으로 처리합니다.
+- 테스트/로컬 fake 서버용: DDG_HTML_URL (HTML 검색 엔드포인트), RESEARCH_SEARCH_BACKEND=html (DDGS 라이브러리 생략)
 """
 
+import os
 import time
 import random
+import threading
 import requests
-from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
-try:
-    from ddgs import DDGS
-except ImportError:
-    from duckduckgo_search import DDGS
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus, urlparse
+from .lazy_import import lazy_module
+from .rate_limiter import get_rate_limiter
+from .research_cache import ResearchCache, get_research_cache
 from .utils import get_logger, ProductionError
 
 logger = get_logger(__name__)
 
+# bs4 / DDGS 는 처음 파싱/검색할 때 import (lxml 본문 추출과 캐시 적중 경로에서는 로드하지 않음)
+bs4 = lazy_module("bs4")
+ddgs_module = lazy_module("ddgs") or lazy_module("duckduckgo_search")
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+# 캐시에 저장하는 본문 최대 길이 (호출별 max_chars 는 여기서 잘라 씀)
+PAGE_TEXT_CAP = 20000
+_STRIP_TAGS = ("script", "style", "nav", "footer", "header")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def extract_text(html: str) -> str:
+    """HTML 본문 텍스트 (script/style/nav/footer/header 제외, 빈 줄 제거)."""
+    try:
+        import lxml.html
+
+        doc = lxml.html.fromstring(html)
+        for el in doc.xpath("|".join(f"//{t}" for t in _STRIP_TAGS)):
+            el.drop_tree()
+        chunks = doc.itertext()
+    except Exception:
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        for script in soup(list(_STRIP_TAGS)):
+            script.extract()
+        chunks = soup.get_text(separator="\n", strip=True).splitlines()
+    lines = []
+    for chunk in chunks:
+        for line in chunk.splitlines():
+            line = line.strip()
+            if line:
+                lines.append(line)
+    return "\n".join(lines)
+
+
 class AIWebResearcher:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResearchCache] = None, fetch_workers: Optional[int] = None):
         self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-        })
+        self.session.headers.update(DEFAULT_HEADERS)
+        self._cache = cache
+        self._local = threading.local()
+        self.fetch_workers = max(1, int(fetch_workers or _env_float("RESEARCH_FETCH_WORKERS", 4)))
+        self.domain_interval = _env_float("RESEARCH_DOMAIN_INTERVAL", 1.0)
+
+    @property
+    def cache(self) -> ResearchCache:
+        # 모듈 import 시점에 DB 를 만들지 않도록 첫 사용 때 연결
+        if self._cache is None:
+            self._cache = get_research_cache()
+        return self._cache
+
+    def _thread_session(self) -> requests.Session:
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.headers.update(DEFAULT_HEADERS)
+            self._local.session = s
+        return s
+
+    def _wait_for_domain(self, url: str) -> None:
+        """도메인별 최소 요청 간격 (research_cache.db 의 토큰 버킷을 프로세스 간 공유)."""
+        if self.domain_interval <= 0:
+            return
+        limiter = get_rate_limiter(self.cache.db_path)
+        key = f"research:{urlparse(url).netloc.lower()}"
+        policy = {"min_interval_sec": self.domain_interval}
+        while True:
+            ok, wait = limiter.try_acquire(key, policy)
+            if ok:
+                return
+            time.sleep(min(wait, self.domain_interval))
 
-    def search(self, query: str, max_results: int = 5) -> list:
+    def search(self, query: str, max_results: int = 5, related_topic: str = "") -> list:
         """
         Uses duckduckgo_search library for robust search results.
         Falls back to HTML scraping if library fails.
+        결과는 캐시되며, related_topic 을 주면 토픽이 거의 같은 최근 검색의 캐시 결과도 재사용합니다.
         """
+        cached = self.cache.get_search(query, max_results, related_topic=related_topic)
+        if cached is not None:
+            logger.info(f"Web Search cache hit: {query}")
+            return cached
+        results = self._search_uncached(query, max_results)
+        self.cache.put_search(query, max_results, results, related_topic=related_topic)
+        return results
+
+    def _search_uncached(self, query: str, max_results: int) -> list:
         results = []
         
         # Method 1: Try duckduckgo_search library (Preferred)
         # Retry logic for rate limits (429)
-        max_retries = 3
+        max_retries = 3 if os.getenv("RESEARCH_SEARCH_BACKEND", "auto") != "html" else 0
         for attempt in range(max_retries):
             try:
                 logger.info(f"Web Searching (DDGS) [Attempt {attempt+1}/{max_retries}]: {query}")
-                with DDGS() as ddgs:
+                with ddgs_module.DDGS() as ddgs:
                     ddgs_gen = ddgs.text(query, max_results=max_results)
                     for r in ddgs_gen:
                         results.append({
@@ -69,14 +159,15 @@ class AIWebResearcher:
 
         # Method 2: Fallback to HTML Scraping
         try:
-            url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
+            base_url = os.getenv("DDG_HTML_URL", "https://html.duckduckgo.com/html/")
+            url = f"{base_url}?q={quote_plus(query)}"
             logger.info(f"Web Searching (Fallback): {query}")
-            time.sleep(random.uniform(1.0, 2.0))
+            self._wait_for_domain(url)
             
             resp = self.session.get(url, timeout=15)
             resp.raise_for_status()
             
-            soup = BeautifulSoup(resp.text, 'html.parser')
+            soup = bs4.BeautifulSoup(resp.text, 'html.parser')
             links = soup.find_all('a', class_='result__a', limit=max_results)
             
             for link in links:
@@ -104,43 +195,70 @@ class AIWebResearcher:
     def fetch_page_content(self, url: str, max_chars: int = 3000) -> str:
         """
         URL의 본문 텍스트를 추출합니다.
+        캐시가 유효하면 네트워크 없이 반환하고, 만료된 항목은 ETag/Last-Modified 로 재검증합니다.
         """
+        cached = self.cache.get_page(url)
+        if cached is not None and cached.fresh:
+            return cached.text[:max_chars]
+
+        headers = {}
+        if cached is not None and cached.revalidatable:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
         try:
             logger.info(f"Fetching content from: {url}")
-            time.sleep(random.uniform(0.5, 1.0))
-            
-            resp = self.session.get(url, timeout=10)
+            self._wait_for_domain(url)
+            resp = self._thread_session().get(url, timeout=10, headers=headers)
+            if resp.status_code == 304 and cached is not None:
+                self.cache.touch_page(url)
+                return cached.text[:max_chars]
+            if resp.status_code >= 400 and (cached is None or not cached.text):
+                self.cache.put_page(url, "", resp.status_code)
             resp.raise_for_status()
-            
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.extract()
-            
-            # Get text
-            text = soup.get_text(separator='\n', strip=True)
-            
-            # Basic cleaning
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            cleaned_text = '\n'.join(lines)
-            
-            return cleaned_text[:max_chars]
-            
+
+            text = extract_text(resp.text)[:PAGE_TEXT_CAP]
+            self.cache.put_page(
+                url,
+                text,
+                resp.status_code,
+                etag=resp.headers.get("ETag", ""),
+                last_modified=resp.headers.get("Last-Modified", ""),
+            )
+            return text[:max_chars]
+
         except Exception as e:
             logger.warning(f"Failed to fetch content from {url}: {e}")
+            # 일시 장애 시 만료된 본문이라도 있으면 사용
+            if cached is not None and cached.text:
+                return cached.text[:max_chars]
             return ""
 
+    def fetch_many(self, urls: List[str], max_chars: int = 3000) -> Dict[str, str]:
+        """여러 URL 을 동시에 수집합니다 (도메인별 간격은 유지)."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            return {}
+        workers = min(self.fetch_workers, len(unique))
+        if workers == 1:
+            return {u: self.fetch_page_content(u, max_chars=max_chars) for u in unique}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research") as ex:
+            texts = list(ex.map(lambda u: self.fetch_page_content(u, max_chars=max_chars), unique))
+        return dict(zip(unique, texts))
+
     def research_topic_trends(self, topic: str) -> str:
         """
         토픽에 대한 최신 트렌드를 검색하고 요약 컨텍스트를 반환합니다.
         """
         search_query = f"{topic} trends 2025 market analysis"
-        results = self.search(search_query, max_results=3)
+        # 관련 검색은 고정 문구를 뺀 토픽끼리만 비교
+        results = self.search(search_query, max_results=3, related_topic=topic)
+        contents = self.fetch_many([res['link'] for res in results], max_chars=1500)
         
         context_parts = []
         for res in results:
-            content = self.fetch_page_content(res['link'], max_chars=1500)
+            content = contents.get(res['link'], "")
             if content:
                 context_parts.append(f"Source: {res['title']} ({res['link']})\nContent:\n{content}\n---")
         
@@ -29,6 +29,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from src.ledger_manager import LedgerManager
 from src.config import Config
 from src.promotion_validator import PromotionValidator
+from src.qa_rules import Rule, RuleSet
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -39,6 +40,17 @@ OUTPUTS_DIR = PROJECT_ROOT / "outputs"
 DATA_DIR = PROJECT_ROOT / "data"
 REPORT_PATH = DATA_DIR / "audit_report.json"
 
+# 결제 위젯 삽입 흔적 (하나라도 있으면 삽입된 것으로 판단)
+PAYMENT_WIDGET_RULES = RuleSet(
+    [Rule(m, m) for m in ("startPay", "choose-plan", "crypto-payment-widget")]
+)
+
+
+def _has_payment_widget(content: str) -> bool:
+    scan = PAYMENT_WIDGET_RULES.scan(content)
+    return any(scan.has(r.name) for r in PAYMENT_WIDGET_RULES.rules)
+
+
 class SystemAuditBot:
     def __init__(self, db_url: str = Config.DATABASE_URL):
         self.ledger = LedgerManager(db_url)
@@ -129,7 +141,7 @@ class SystemAuditBot:
                         try:
                             r = requests.get(deployment_url, timeout=5)
                             content = r.text
-                            if "startPay" not in content and "choose-plan" not in content and "crypto-payment-widget" not in content:
+                            if not _has_payment_widget(content):
                                 audit_item["issues"].append("Live site missing payment widget/script")
                         except:
                             pass
@@ -147,7 +159,7 @@ class SystemAuditBot:
             # 3. 결제 위젯 삽입 여부 체크 (index.html 내용 확인)
             if (p_dir / "index.html").exists():
                 content = (p_dir / "index.html").read_text(encoding="utf-8", errors="ignore")
-                if "startPay" not in content and "choose-plan" not in content and "crypto-payment-widget" not in content:
+                if not _has_payment_widget(content):
                     audit_item["issues"].append("Payment widget not found in index.html")
 
             # 4. 홍보 콘텐츠 품질 검수 (로컬 파일)
@@ -182,28 +194,18 @@ class SystemAuditBot:
         """WordPress REST API를 통해 포스트 상태를 상세 검수합니다."""
         issues = []
         try:
-            # API URL에서 개별 포스트 엔드포인트 구성
+            from src.wp_client import get_wp_client
+
             # wp_api_url은 보통 .../wp-json/wp/v2/posts 형태임
-            check_url = f"{wp_api_url.rstrip('/')}/{post_id}"
-            
-            headers = {"Content-Type": "application/json"}
-            if wp_token:
-                # Strip spaces from token to prevent header injection or auth errors
-                # Especially for Application Passwords which might be displayed with spaces
-                clean_token = wp_token.replace(" ", "")
-                if ":" in clean_token:
-                    import base64
-                    encoded_auth = base64.b64encode(clean_token.encode("utf-8")).decode("utf-8")
-                    headers["Authorization"] = f"Basic {encoded_auth}"
-                else:
-                    headers["Authorization"] = f"Bearer {clean_token}"
-            
-            r = requests.get(check_url, headers=headers, timeout=10)
-            if r.status_code != 200:
-                issues.append(f"WordPress API returned {r.status_code} for post {post_id}")
+            # Strip spaces from token to prevent header injection or auth errors
+            # Especially for Application Passwords which might be displayed with spaces
+            client = get_wp_client(wp_api_url, (wp_token or "").replace(" ", ""))
+            # 이전 조회의 ETag/Last-Modified 로 조건부 요청 (바뀌지 않았으면 304 + 저장된 본문)
+            status, data = client.get_post(post_id)
+            if status != 200 or data is None:
+                issues.append(f"WordPress API returned {status} for post {post_id}")
                 return False, issues
             
-            data = r.json()
             if data.get("status") != "publish":
                 issues.append(f"WordPress post status is '{data.get('status')}', not 'publish'")
             
@@ -2,8 +2,6 @@
 import logging
 import json
 import time
-import requests
-import base64
 import os
 from pathlib import Path
 from typing import Dict, Any, List
@@ -40,6 +38,8 @@ class AutoHealSystem:
         self.local_verifier = LocalVerifier()
         self.project_root = Path(__file__).parent.parent
         self.outputs_dir = self.project_root / "outputs"
+        # _heal_promotions 중 모은 WordPress 글 수정 (api_url, token, post_id, content)
+        self._pending_wp_updates = None
 
     def run_full_audit_and_heal(self):
         logger.info("Starting Full System Audit and Heal Process...")
@@ -172,6 +172,15 @@ class AutoHealSystem:
                 logger.error(f"AI Error Analysis failed: {ai_e}")
 
     def _heal_promotions(self, audits: List[Dict[str, Any]]):
+        self._pending_wp_updates = []
+        try:
+            self._heal_promotion_items(audits)
+        finally:
+            pending, self._pending_wp_updates = self._pending_wp_updates, None
+            if pending:
+                self._flush_wp_updates(pending)
+
+    def _heal_promotion_items(self, audits: List[Dict[str, Any]]):
         for item in audits:
             pid = item["product_id"]
             issues = item["issues"]
@@ -261,32 +270,28 @@ class AutoHealSystem:
         self._update_wp_post(wp_api_url, wp_token, post_id, html_content)
 
     def _update_wp_post(self, api_url: str, token: str, post_id: str, content: str):
-        # Strip spaces from token
-        clean_token = token.replace(" ", "")
-        
-        if ":" in clean_token:
-            encoded_auth = base64.b64encode(clean_token.encode("utf-8")).decode("utf-8")
-            headers = {
-                "Authorization": f"Basic {encoded_auth}",
-                "Content-Type": "application/json",
-            }
-        else:
-            headers = {
-                "Authorization": f"Bearer {clean_token}",
-                "Content-Type": "application/json",
-            }
-        
-        update_url = f"{api_url.rstrip('/')}/{post_id}"
-        payload = {"content": content}
-        
-        try:
-            r = requests.post(update_url, headers=headers, json=payload, timeout=20)
-            if r.status_code == 200:
-                logger.info(f"Successfully updated WordPress post {post_id}.")
-            else:
-                logger.error(f"Failed to update post {post_id}: {r.status_code} - {r.text[:200]}")
-        except Exception as e:
-            logger.error(f"Exception updating post {post_id}: {e}")
+        # _heal_promotions 실행 중이면 모아 두었다가 한 번의 batch 요청으로 보냄
+        if self._pending_wp_updates is not None:
+            self._pending_wp_updates.append((api_url, token, post_id, content))
+            return
+        self._flush_wp_updates([(api_url, token, post_id, content)])
+
+    def _flush_wp_updates(self, updates: List[tuple]):
+        from src.wp_client import get_wp_client
+
+        by_site: Dict[tuple, Dict[str, Any]] = {}
+        for api_url, token, post_id, content in updates:
+            # Strip spaces from token
+            by_site.setdefault((api_url, token.replace(" ", "")), {})[post_id] = {"content": content}
+        for (api_url, token), posts in by_site.items():
+            try:
+                results = get_wp_client(api_url, token).update_posts(posts)
+            except Exception as e:
+                logger.error(f"Exception updating posts {list(posts)}: {e}")
+                continue
+            for post_id, post in results.items():
+                if post:
+                    logger.info(f"Successfully updated WordPress post {post_id}.")
 
 if __name__ == "__main__":
     healer = AutoHealSystem()
@@ -0,0 +1,370 @@
+"""
+제품 산출물 증분 재빌드 그래프 (make 스타일).
+
+제품마다 다음 의존 관계가 있습니다.
+
+    product_schema.json ─▶ pages (index.html, checkout.html) ─┐
+    product_en.md ───────▶ pdf (product_en.pdf) ──────────────┼─▶ package (package.zip)
+    manifest.json ───────▶ promotions (channel payloads) ─────┘
+
+각 노드의 입력 해시와 출력 해시를 제품 폴더의 `.build_manifest.json`에 기록하고,
+`rebuild()`는 입력이 바뀌었거나 출력이 없어졌거나/외부에서 바뀐 노드만 다시 실행합니다.
+업스트림 노드의 출력은 다운스트림 노드의 입력이므로, 템플릿만 바뀌면
+pages → package 만 다시 빌드되고 PDF/프로모션은 건너뜁니다.
+"""
+
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .config import Config
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+BUILD_MANIFEST_FILENAME = ".build_manifest.json"
+BUILD_MANIFEST_VERSION = 1
+
+
+@dataclass
+class BuildNode:
+    """그래프 노드: 입력 파일 집합 + 추가 키(salt) → 출력 파일을 만드는 action."""
+
+    name: str
+    inputs: Callable[[Path], List[str]]
+    outputs: List[str]
+    action: Callable[[str, Path], None]
+    deps: List[str] = field(default_factory=list)
+    salt: Callable[[], str] = lambda: ""
+
+
+# -----------------------------
+# 파일 해시 (stat 캐시)
+# -----------------------------
+
+
+class _FileHasher:
+    """(size, mtime_ns)가 같으면 이전 해시를 재사용하는 파일 해시 계산기."""
+
+    def __init__(self, product_dir: Path, stat_cache: Dict[str, List[Any]]):
+        self.product_dir = product_dir
+        self.stat_cache = stat_cache
+
+    def hash(self, rel: str) -> Optional[str]:
+        path = self.product_dir / rel
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        cached = self.stat_cache.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.stat_cache[rel] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+
+def _input_fingerprint(node: BuildNode, hasher: _FileHasher) -> str:
+    h = hashlib.sha256()
+    h.update(node.name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(node.salt().encode("utf-8"))
+    for rel in sorted(node.inputs(hasher.product_dir)):
+        h.update(b"\0")
+        h.update(rel.encode("utf-8"))
+        h.update(b"=")
+        h.update((hasher.hash(rel) or "missing").encode("utf-8"))
+    return h.hexdigest()
+
+
+# -----------------------------
+# 기본 노드 정의
+# -----------------------------
+
+
+def _existing(*names: str) -> Callable[[Path], List[str]]:
+    return lambda product_dir: [n for n in names if (product_dir / n).exists()]
+
+
+def _package_inputs(product_dir: Path) -> List[str]:
+    from .package_manager import iter_tree_entries
+
+    return [
+        arcname
+        for arcname, _ in iter_tree_entries(str(product_dir), exclude_prefix="package")
+    ]
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _pages_salt() -> str:
+    from .template_engine import template_version
+
+    return template_version()
+
+
+def _build_pages(product_id: str, product_dir: Path) -> None:
+    from .product_generator import _landing_context_from_schema, render_product_pages
+
+    schema = _load_json(product_dir / "product_schema.json")
+    render_product_pages(schema, str(product_dir), brand="MetaPassiveIncome", force=True)
+
+    # 재렌더링하면 결제 위젯이 사라지므로 파이프라인과 동일하게 다시 주입
+    try:
+        from monetize_module import MonetizeModule, PaymentInjectConfig
+
+        price = _landing_context_from_schema(schema)["checkout"]["product_price"]
+        price_usd = float(str(price).replace("$", "").replace(",", "") or 0) or 29.0
+        MonetizeModule().inject_payment_logic(
+            target_html_path=str(product_dir / "index.html"),
+            config=PaymentInjectConfig(product_id=product_id, price_usd=price_usd),
+        )
+    except Exception as e:
+        logger.warning(f"[{product_id}] 결제 위젯 재주입 실패: {e}")
+
+
+def _pdf_salt() -> str:
+    from pdf_render_service import ENGINE_VERSION
+
+    return ENGINE_VERSION
+
+
+def _build_pdf(product_id: str, product_dir: Path) -> None:
+    from pdf_render_service import get_pdf_service
+
+    manifest = _load_json(product_dir / "manifest.json")
+    title = manifest.get("title") or product_id
+    res = get_pdf_service().build(
+        product_dir / "product_en.md",
+        product_dir / "product_en.pdf",
+        title,
+        cover_meta={
+            "brand": "MetaPassiveIncome",
+            "title": title,
+            "product_id": product_id,
+            "version": "production",
+            "language": "EN",
+        },
+    )
+    if not res.ok:
+        raise RuntimeError(f"PDF build failed: {res.error}")
+
+
+def _build_promotions(product_id: str, product_dir: Path) -> None:
+    from promotion_factory import generate_promotions
+    from .promotion_dispatcher import build_channel_payloads
+
+    manifest = _load_json(product_dir / "manifest.json")
+    metadata = manifest.get("metadata") or {}
+    price_usd = manifest.get("price_usd") or metadata.get("final_price_usd") or 29.0
+    generate_promotions(
+        product_dir=product_dir,
+        product_id=product_id,
+        title=manifest.get("title") or product_id,
+        topic=manifest.get("topic") or metadata.get("initial_topic") or "",
+        price_usd=float(price_usd),
+    )
+    build_channel_payloads(product_id)
+
+
+def _build_package(product_id: str, product_dir: Path) -> None:
+    from .package_manager import PackageManager
+
+    PackageManager(Config.DOWNLOAD_DIR).package_product(product_id, str(product_dir))
+
+
+DEFAULT_NODES: List[BuildNode] = [
+    BuildNode(
+        name="pages",
+        inputs=_existing("product_schema.json"),
+        outputs=["index.html", "checkout.html"],
+        action=_build_pages,
+        salt=_pages_salt,
+    ),
+    BuildNode(
+        name="pdf",
+        inputs=_existing("product_en.md", "manifest.json"),
+        outputs=["product_en.pdf"],
+        action=_build_pdf,
+        salt=_pdf_salt,
+    ),
+    BuildNode(
+        name="promotions",
+        inputs=_existing("manifest.json", "product_schema.json"),
+        outputs=["promotions/promotion_manifest.json", "promotions/channel_payloads.json"],
+        action=_build_promotions,
+    ),
+    BuildNode(
+        name="package",
+        inputs=_package_inputs,
+        outputs=["package.zip"],
+        action=_build_package,
+        deps=["pages", "pdf", "promotions"],
+    ),
+]
+
+
+# -----------------------------
+# 빌드 매니페스트
+# -----------------------------
+
+
+def load_build_manifest(product_dir: Path) -> Dict[str, Any]:
+    data = _load_json(product_dir / BUILD_MANIFEST_FILENAME)
+    if data.get("version") != BUILD_MANIFEST_VERSION:
+        return {"version": BUILD_MANIFEST_VERSION, "nodes": {}, "file_stats": {}}
+    data.setdefault("nodes", {})
+    data.setdefault("file_stats", {})
+    return data
+
+
+def save_build_manifest(product_dir: Path, manifest: Dict[str, Any]) -> None:
+    path = product_dir / BUILD_MANIFEST_FILENAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _topo_order(nodes: List[BuildNode]) -> List[BuildNode]:
+    by_name = {n.name: n for n in nodes}
+    ordered: List[BuildNode] = []
+    seen: Dict[str, bool] = {}
+
+    def visit(node: BuildNode) -> None:
+        state = seen.get(node.name)
+        if state is True:
+            return
+        if state is False:
+            raise ValueError(f"build graph cycle at node: {node.name}")
+        seen[node.name] = False
+        for dep in node.deps:
+            if dep in by_name:
+                visit(by_name[dep])
+        seen[node.name] = True
+        ordered.append(node)
+
+    for n in nodes:
+        visit(n)
+    return ordered
+
+
+# -----------------------------
+# 재빌드
+# -----------------------------
+
+
+def rebuild_product(
+    product_id: str,
+    product_dir: Optional[Path] = None,
+    nodes: Optional[List[BuildNode]] = None,
+    only: Optional[Iterable[str]] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    adopt: bool = False,
+) -> Dict[str, str]:
+    """한 제품의 오래된(stale) 노드만 의존 순서대로 다시 실행합니다.
+
+    Args:
+        only: 지정 시 해당 노드(와 그 다운스트림 판정)만 대상으로 함
+        force: 입력 변화와 무관하게 대상 노드를 모두 실행
+        dry_run: 실행 없이 판정 결과만 반환
+        adopt: 실행 없이 현재 파일 상태를 "빌드 완료"로 기록 (기존 카탈로그 초기 등록용)
+
+    Returns:
+        노드 이름 -> "fresh" | "stale" | "built" | "adopted" | "skipped" | "failed: ..."
+    """
+    product_dir = Path(product_dir or Path(Config.OUTPUT_DIR) / product_id)
+    graph = _topo_order(nodes or DEFAULT_NODES)
+    selected = set(only) if only else None
+    manifest = load_build_manifest(product_dir)
+    hasher = _FileHasher(product_dir, manifest["file_stats"])
+    results: Dict[str, str] = {}
+
+    for node in graph:
+        if selected is not None and node.name not in selected:
+            continue
+        if any(results.get(dep, "").startswith("failed") for dep in node.deps):
+            results[node.name] = "skipped"
+            continue
+        if not node.inputs(product_dir):
+            results[node.name] = "skipped"
+            continue
+
+        fingerprint = _input_fingerprint(node, hasher)
+        record = manifest["nodes"].get(node.name) or {}
+        recorded_outputs = record.get("outputs") or {}
+        current_outputs = {rel: hasher.hash(rel) for rel in node.outputs}
+        stale = (
+            force
+            or record.get("input_hash") != fingerprint
+            or any(
+                digest is None or digest != recorded_outputs.get(rel)
+                for rel, digest in current_outputs.items()
+            )
+        )
+
+        if not stale:
+            results[node.name] = "fresh"
+            continue
+        if dry_run:
+            results[node.name] = "stale"
+            continue
+
+        if not adopt:
+            started = time.time()
+            try:
+                node.action(product_id, product_dir)
+            except Exception as e:
+                logger.error(f"[{product_id}] build node '{node.name}' failed: {e}")
+                results[node.name] = f"failed: {e}"
+                continue
+            logger.info(f"[{product_id}] build node '{node.name}' rebuilt in {time.time() - started:.2f}s")
+
+        manifest["nodes"][node.name] = {
+            "input_hash": fingerprint,
+            "outputs": {rel: hasher.hash(rel) for rel in node.outputs},
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        results[node.name] = "adopted" if adopt else "built"
+
+    if not dry_run:
+        save_build_manifest(product_dir, manifest)
+    return results
+
+
+def rebuild(
+    product_ids: Optional[List[str]] = None,
+    only: Optional[Iterable[str]] = None,
+    workers: int = 4,
+    force: bool = False,
+    dry_run: bool = False,
+    adopt: bool = False,
+) -> Dict[str, Dict[str, str]]:
+    """카탈로그 전체(또는 지정 제품)를 병렬로 증분 재빌드합니다."""
+    outputs_dir = Path(Config.OUTPUT_DIR)
+    if product_ids is None:
+        product_ids = sorted(
+            p.name for p in outputs_dir.iterdir() if p.is_dir()
+        ) if outputs_dir.exists() else []
+    only = list(only) if only else None
+
+    def _one(pid: str) -> Dict[str, str]:
+        return rebuild_product(
+            pid, outputs_dir / pid, only=only, force=force, dry_run=dry_run, adopt=adopt
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(product_ids, pool.map(_one, product_ids)))
@@ -1,12 +1,22 @@
 import os
 import json
+import re
 import time
-import requests
 import random
 from typing import List, Dict, Optional
 from pathlib import Path
 from datetime import datetime
 
+# Add project root to sys.path if run directly
+if __name__ == "__main__":
+    import sys
+    project_root = Path(__file__).resolve().parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.append(str(project_root))
+
+from src.comment_ingest import get_comment_ingestor
+from src.wp_client import get_wp_client
+
 # Load configuration
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
@@ -21,47 +31,24 @@ class CommentBot:
     3. Rate limiting (delays between actions).
     """
     
-    def __init__(self, wp_api_url: str, wp_token: str):
+    def __init__(self, wp_api_url: str, wp_token: str, refresh_max_age: float = 300.0):
         self.wp_api_url = wp_api_url.rstrip("/")
+        # WP_TOKEN 이 'user:app-password' 가 아니면 이미 인코딩된 Basic 자격 증명으로 취급
+        self.client = get_wp_client(self.wp_api_url, wp_token, default_scheme="Basic")
         # wp-json/wp/v2/posts -> wp-json/wp/v2/comments
-        self.comments_url = self.wp_api_url.replace("/posts", "/comments")
-        self.headers = {
-            "Authorization": f"Basic {wp_token}",
-            "Content-Type": "application/json"
-        }
-        self.processed_comments = set()
+        self.comments_url = self.client.comments_url
+        # 댓글은 공유 수집기(커서 이후만 조회)가 가져오고, 답글 처리 기록은 재시작 후에도 유지됩니다.
+        # 같은 사이트의 다른 소비자(재생성 요청 확인)가 refresh_max_age 초 안에 가져온 결과는 그대로 씁니다.
+        self.ingestor = get_comment_ingestor(self.wp_api_url, wp_token, default_scheme="Basic")
+        self.refresh_max_age = refresh_max_age
 
     def fetch_unreplied_comments(self, limit: int = 10) -> List[Dict]:
         """
-        Fetches recent comments that don't have replies from the author.
+        Fetches new comments that the bot has not replied to yet.
         """
         try:
-            # Fetch recent comments
-            params = {
-                "per_page": limit,
-                "status": "approve",  # Only approved comments
-                "orderby": "date",
-                "order": "desc"
-            }
-            response = requests.get(self.comments_url, headers=self.headers, params=params)
-            
-            if response.status_code != 200:
-                print(f"❌ [CommentBot] Failed to fetch comments: {response.text}")
-                return []
-                
-            comments = response.json()
-            unreplied = []
-            
-            # Simple check: if we haven't processed this ID yet
-            # In a real scenario, we'd check if children exist or check author ID
-            # For simplicity, we just check our local memory set for this session
-            for comment in comments:
-                c_id = comment['id']
-                if c_id not in self.processed_comments:
-                    unreplied.append(comment)
-                    
-            return unreplied
-            
+            self.ingestor.refresh(max_age=self.refresh_max_age)
+            return self.ingestor.pending("reply", limit=limit)
         except Exception as e:
             print(f"❌ [CommentBot] Error fetching comments: {e}")
             return []
@@ -105,14 +92,17 @@ class CommentBot:
             # Policy Compliance: Random delay to mimic human behavior
             time.sleep(random.uniform(2, 5))
             
-            response = requests.post(self.comments_url, headers=self.headers, json=payload)
+            ok, result = self.client.create_comment(payload)
             
-            if response.status_code in [200, 201]:
+            if ok:
                 print(f"✅ [CommentBot] Replied to comment {comment_id}")
-                self.processed_comments.add(comment_id)
+                self.ingestor.mark_processed("reply", [comment_id])
+                # Our own reply must not be picked up as a new visitor comment
+                if isinstance(result, dict) and result.get("id"):
+                    self.ingestor.mark_own(result["id"])
                 return True
             else:
-                print(f"❌ [CommentBot] Failed to reply: {response.text}")
+                print(f"❌ [CommentBot] Failed to reply: {result}")
                 return False
                 
         except Exception as e:
@@ -152,7 +142,6 @@ class CommentBot:
             time.sleep(random.uniform(1, 3))
 
 if __name__ == "__main__":
-    import re
     # Load secrets
     if SECRETS_FILE.exists():
         with open(SECRETS_FILE, "r", encoding="utf-8") as f:
@@ -0,0 +1,333 @@
+"""
+WordPress 댓글 수집 (증분 커서 + 영속 처리 기록 + 글->제품 매핑 캐시).
+
+댓글 봇(comment_bot 자동 응답), 데몬(auto_mode_daemon 재생성 요청), 감시기(wp_comment_handler)가
+각자 최근 N개 댓글을 매번 가져오고, 요청 댓글마다 글을 다시 조회해 product_id 를 찾던 것을 하나로 모읍니다.
+
+- refresh(): 최신 댓글부터(date_gmt 내림차순) 가져오다가 커서(마지막 댓글 date_gmt)보다 COMMENT_CURSOR_OVERLAP
+  (초, 기본 10분) 이전 댓글이 나오면 멈추고, inbox 에 쌓은 뒤 커서를 옮깁니다. 응답의 date_gmt 로 직접 비교하므로
+  WordPress after 필터의 사이트 시간대 해석에 기대지 않고, 새 댓글이 없으면 첫 페이지(20개) 한 번으로 끝납니다.
+  보류 후 늦게 승인된 댓글(작성 시각이 과거)은 COMMENT_SWEEP_INTERVAL(기본 1시간)마다 한 번
+  COMMENT_SWEEP_WINDOW(기본 1일)까지 거슬러 올라가 가져옵니다. 이미 받은 댓글은 inbox 의 키로 걸러집니다.
+  max_age 안에 이미 가져왔다면 네트워크를 타지 않습니다.
+- pending(consumer): 그 소비자("reply", "recreate")가 아직 처리하지 않은 inbox 댓글. 처리 후 mark_processed().
+  한 번 가져온 댓글을 여러 소비자가 나눠 쓰고, 실패한 댓글은 커서와 무관하게 다음 번에 다시 나옵니다.
+- product_for_post(): 글 본문/슬러그에서 찾은 product_id 를 캐시 (못 찾은 글은 하루 뒤 다시 확인).
+
+상태는 data/comment_ingest.db (COMMENT_INGEST_DB) 에 저장되어 재시작 후에도 유지됩니다.
+예전 data/processed_comments.json 은 사이트의 첫 수집 때 "recreate" 처리 기록으로 가져옵니다.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .utils import get_logger
+from .wp_client import get_wp_client
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "comment_ingest.db"
+LEGACY_PROCESSED_FILE = PROJECT_ROOT / "data" / "processed_comments.json"
+
+CONSUMERS = ("reply", "recreate")
+PAGE_SIZE = 100
+MAX_PAGES = 10
+# 폴링의 첫 요청 크기 (새 댓글이 없으면 이 요청 하나로 끝남)
+POLL_PAGE_SIZE = 20
+# 커서가 없을 때(첫 수집) 가져올 최근 댓글 수 (예전 폴링과 같은 범위)
+BOOTSTRAP_COUNT = 20
+INBOX_KEEP_DAYS = 14
+NEGATIVE_PRODUCT_TTL = 86400.0
+
+# 재생성 요청으로 보는 댓글 키워드와 재생성 대상 제품 상태
+REQUEST_KEYWORDS = ["request", "recreate", "buy", "purchase", "결제", "구매", "요청", "살게요", "재생성"]
+RECREATE_STATUSES = ("PIPELINE_FAILED", "CRITICAL_FAILED", "QA_FAILED", "DELETED")
+
+_PRODUCT_ID_PATTERNS = (
+    re.compile(r'data-product-id=["\']([^"\']+)["\']'),
+    re.compile(r"product_id=([a-zA-Z0-9\-_]+)"),
+)
+_SLUG_PRODUCT_ID = re.compile(r"(\d{8}-\d{6}-[a-zA-Z0-9\-]+)")
+
+
+def _db_path(db_path: Optional[str] = None) -> str:
+    return str(db_path or os.getenv("COMMENT_INGEST_DB") or DEFAULT_DB_PATH)
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _overlap_seconds() -> float:
+    return _env_seconds("COMMENT_CURSOR_OVERLAP", 600.0)
+
+
+def _sweep_window_seconds() -> float:
+    return max(_overlap_seconds(), _env_seconds("COMMENT_SWEEP_WINDOW", 86400.0))
+
+
+def _sweep_interval_seconds() -> float:
+    return _env_seconds("COMMENT_SWEEP_INTERVAL", 3600.0)
+
+
+def is_recreation_request(comment: Dict[str, Any]) -> bool:
+    content = (comment.get("content", {}) or {}).get("rendered", "").lower()
+    return any(k in content for k in REQUEST_KEYWORDS)
+
+
+def needs_recreation(product: Optional[Dict[str, Any]]) -> bool:
+    """원장에 없거나 실패 상태인 제품만 재생성합니다."""
+    return not product or product.get("status") in RECREATE_STATUSES
+
+
+def extract_product_id(post: Dict[str, Any]) -> Optional[str]:
+    """글 본문의 data-product-id / product_id= 또는 슬러그의 ID 패턴에서 product_id 를 찾습니다."""
+    content = (post.get("content", {}) or {}).get("rendered", "")
+    for pattern in _PRODUCT_ID_PATTERNS:
+        m = pattern.search(content)
+        if m:
+            return m.group(1)
+    m = _SLUG_PRODUCT_ID.search(post.get("slug", "") or "")
+    return m.group(1) if m else None
+
+
+class CommentStore:
+    """커서 / 수집한 댓글(inbox) / 소비자별 처리 기록 / 글->제품 매핑을 저장하는 SQLite."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = _db_path(db_path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cursors (
+                site TEXT PRIMARY KEY,
+                after TEXT,
+                last_fetch_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS inbox (
+                site TEXT NOT NULL,
+                comment_id INTEGER NOT NULL,
+                date_gmt TEXT,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (site, comment_id)
+            );
+            CREATE TABLE IF NOT EXISTS processed (
+                site TEXT NOT NULL,
+                consumer TEXT NOT NULL,
+                comment_id INTEGER NOT NULL,
+                processed_at REAL NOT NULL,
+                PRIMARY KEY (site, consumer, comment_id)
+            );
+            CREATE TABLE IF NOT EXISTS post_products (
+                site TEXT NOT NULL,
+                post_id INTEGER NOT NULL,
+                product_id TEXT,
+                resolved_at REAL NOT NULL,
+                PRIMARY KEY (site, post_id)
+            );
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cursors)")}
+        if "swept_at" not in columns:
+            self._conn.execute("ALTER TABLE cursors ADD COLUMN swept_at REAL")
+        self._conn.commit()
+
+    def cursor(self, site: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT after, last_fetch_at, swept_at FROM cursors WHERE site = ?", (site,)).fetchone()
+        return {"after": row[0], "last_fetch_at": row[1] or 0.0, "swept_at": row[2] or 0.0} if row else None
+
+    def save_fetch(self, site: str, comments: List[Dict[str, Any]], after: Optional[str], swept: bool = False) -> int:
+        """가져온 댓글을 inbox 에 넣고 커서를 옮깁니다. swept 면 늦은 승인 확인 시각도 갱신. 새로 들어간 댓글 수를 반환."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO inbox (site, comment_id, date_gmt, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                [(site, int(c["id"]), c.get("date_gmt") or "", json.dumps(c, ensure_ascii=False), now) for c in comments],
+            )
+            added = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT INTO cursors (site, after, last_fetch_at, swept_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(site) DO UPDATE SET after = excluded.after, last_fetch_at = excluded.last_fetch_at, "
+                "swept_at = COALESCE(excluded.swept_at, cursors.swept_at)",
+                (site, after, now, now if swept else None),
+            )
+            cutoff = now - INBOX_KEEP_DAYS * 86400
+            self._conn.execute("DELETE FROM inbox WHERE site = ? AND fetched_at < ?", (site, cutoff))
+            # 처리 기록은 inbox 보다 먼저 쓰일 수 있으므로(mark_own, 예전 기록 가져오기) 댓글이 inbox 에서 빠지고
+            # 다시 가져올 수 있는 구간(늦은 승인 확인 범위)까지 지난 뒤에만 지웁니다. 그 전에 지우면 같은 댓글이 다시 pending 으로 나옵니다.
+            self._conn.execute(
+                "DELETE FROM processed WHERE site = ? AND processed_at < ? AND NOT EXISTS ("
+                "SELECT 1 FROM inbox i WHERE i.site = processed.site AND i.comment_id = processed.comment_id)",
+                (site, cutoff - _sweep_window_seconds()),
+            )
+            self._conn.commit()
+        return added
+
+    def pending(self, site: str, consumer: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        sql = (
+            "SELECT body FROM inbox i WHERE site = ? AND NOT EXISTS ("
+            "SELECT 1 FROM processed p WHERE p.site = i.site AND p.consumer = ? AND p.comment_id = i.comment_id"
+            ") ORDER BY date_gmt, comment_id"
+        )
+        params: List[Any] = [site, consumer]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def mark_processed(self, site: str, consumer: str, comment_ids: Iterable[Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed (site, consumer, comment_id, processed_at) VALUES (?, ?, ?, ?)",
+                [(site, consumer, int(cid), now) for cid in comment_ids],
+            )
+            self._conn.commit()
+
+    def is_processed(self, site: str, consumer: str, comment_id: Any) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed WHERE site = ? AND consumer = ? AND comment_id = ?", (site, consumer, int(comment_id))
+            ).fetchone()
+        return row is not None
+
+    def post_product(self, site: str, post_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT product_id, resolved_at FROM post_products WHERE site = ? AND post_id = ?", (site, int(post_id))
+            ).fetchone()
+        return {"product_id": row[0], "resolved_at": row[1]} if row else None
+
+    def save_post_product(self, site: str, post_id: Any, product_id: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO post_products (site, post_id, product_id, resolved_at) VALUES (?, ?, ?, ?)",
+                (site, int(post_id), product_id, time.time()),
+            )
+            self._conn.commit()
+
+
+class CommentIngestor:
+    """한 WordPress 사이트의 댓글 수집기. get_comment_ingestor() 로 공유해서 씁니다."""
+
+    def __init__(self, api_url: str, token: str, default_scheme: str = "Bearer", store: Optional[CommentStore] = None):
+        self.client = get_wp_client(api_url, token, default_scheme=default_scheme)
+        self.site = self.client.v2_url
+        self.store = store or get_comment_store()
+
+    def refresh(self, max_age: float = 0.0) -> int:
+        """커서 이후 댓글을 가져와 inbox 에 쌓습니다. 새 댓글 수를 반환 (max_age 초 안에 가져왔으면 0)."""
+        cur = self.store.cursor(self.site)
+        if cur and max_age and time.time() - cur["last_fetch_at"] < max_age:
+            return 0
+        if cur is None or not cur["after"]:
+            self._import_legacy_processed()
+            comments = self.client.list_comments(per_page=BOOTSTRAP_COUNT, status="approve", orderby="date_gmt", order="desc")
+            swept = True  # 첫 수집은 최근 댓글만 보므로 이전 구간의 늦은 승인은 확인하지 않음
+        else:
+            swept = time.time() - cur["swept_at"] >= _sweep_interval_seconds()
+            lookback = _sweep_window_seconds() if swept else _overlap_seconds()
+            stop_before = (datetime.fromisoformat(cur["after"]) - timedelta(seconds=lookback)).strftime("%Y-%m-%dT%H:%M:%S")
+            comments = self._fetch_newest(stop_before)
+        dates = [c.get("date_gmt") for c in comments if c.get("date_gmt")]
+        latest = max(dates + ([cur["after"]] if cur and cur["after"] else []), default=None)
+        added = self.store.save_fetch(self.site, comments, latest, swept=swept)
+        if added:
+            logger.info(f"새 댓글 {added}개 수집 ({self.site})")
+        return added
+
+    def _fetch_newest(self, stop_before: str) -> List[Dict[str, Any]]:
+        """최신 댓글부터 date_gmt 가 stop_before 이하인 댓글이 나올 때까지 가져옵니다 (offset 페이지)."""
+        comments: List[Dict[str, Any]] = []
+        per_page = POLL_PAGE_SIZE
+        for _ in range(MAX_PAGES):
+            batch = self.client.list_comments(
+                per_page=per_page, offset=len(comments), status="approve", orderby="date_gmt", order="desc"
+            )
+            comments.extend(batch)
+            dates = [c["date_gmt"] for c in batch if c.get("date_gmt")]
+            if len(batch) < per_page or (dates and min(dates) <= stop_before):
+                return comments
+            per_page = PAGE_SIZE
+        # 커서는 가장 최신 댓글로 옮기므로 다음 폴링이 멈추지는 않음 (상한 밖의 오래된 댓글은 건너뜀)
+        logger.warning(f"댓글이 많아 최신 {len(comments)}개까지만 수집했습니다. 더 오래된 댓글은 건너뜁니다 ({self.site})")
+        return comments
+
+    def pending(self, consumer: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.store.pending(self.site, consumer, limit)
+
+    def mark_processed(self, consumer: str, comment_ids: Iterable[Any]) -> None:
+        self.store.mark_processed(self.site, consumer, comment_ids)
+
+    def is_processed(self, consumer: str, comment_id: Any) -> bool:
+        return self.store.is_processed(self.site, consumer, comment_id)
+
+    def mark_own(self, comment_id: Any) -> None:
+        """봇이 쓴 댓글은 어떤 소비자도 다시 처리하지 않도록 기록합니다."""
+        for consumer in CONSUMERS:
+            self.store.mark_processed(self.site, consumer, [comment_id])
+
+    def product_for_post(self, post_id: Any) -> Optional[str]:
+        """글의 product_id (캐시). 못 찾은 결과는 NEGATIVE_PRODUCT_TTL 동안만 기억합니다."""
+        cached = self.store.post_product(self.site, post_id)
+        if cached and (cached["product_id"] or time.time() - cached["resolved_at"] < NEGATIVE_PRODUCT_TTL):
+            return cached["product_id"]
+        status, post = self.client.get_post(post_id)
+        if status != 200 or post is None:
+            logger.warning(f"댓글 글 조회 실패: post {post_id} ({status})")
+            return None
+        product_id = extract_product_id(post)
+        self.store.save_post_product(self.site, post_id, product_id)
+        return product_id
+
+    def _import_legacy_processed(self) -> None:
+        try:
+            ids = json.loads(LEGACY_PROCESSED_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        ids = [i for i in ids if isinstance(i, int)]
+        if ids:
+            self.store.mark_processed(self.site, "recreate", ids)
+            logger.info(f"processed_comments.json 의 처리 기록 {len(ids)}개를 가져왔습니다.")
+
+
+_STORES: Dict[str, CommentStore] = {}
+_INGESTORS: Dict[tuple, CommentIngestor] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_comment_store(db_path: Optional[str] = None) -> CommentStore:
+    path = _db_path(db_path)
+    with _REGISTRY_LOCK:
+        if path not in _STORES:
+            _STORES[path] = CommentStore(path)
+        return _STORES[path]
+
+
+def get_comment_ingestor(api_url: str, token: str, default_scheme: str = "Bearer") -> CommentIngestor:
+    key = (api_url.rstrip("/"), token, default_scheme)
+    store = get_comment_store()
+    with _REGISTRY_LOCK:
+        ingestor = _INGESTORS.get(key)
+        if ingestor is None or ingestor.store is not store:
+            ingestor = _INGESTORS[key] = CommentIngestor(api_url, token, default_scheme=default_scheme, store=store)
+        return ingestor
@@ -1,56 +1,109 @@
+"""
+런타임 설정.
+
+import 시에는 아무 작업도 하지 않습니다 (.env 로드, secrets.json 주입/갱신 없음).
+
+- load_environment(): .env 로드 + secrets.json 값을 os.environ 에 주입 (파일을 쓰지 않음, 1회만 실행)
+- init_config(): load_environment() + .env/시스템 환경변수의 새 키를 secrets.json 으로 추출
+  (KeyManager.scan_and_extract). 실행 진입점(main)에서 한 번 호출하며, 여러 번 호출해도 1회만 실행됩니다.
+- Config.X: 처음 접근할 때 load_environment() 를 수행하고 환경 변수를 그 시점에 읽습니다.
+"""
+
 import os
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Callable, Dict, Optional
 
-# .env 파일에서 환경 변수 로드
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-load_dotenv(PROJECT_ROOT / ".env")
-
-# MetaPassiveIncome 전용 키 매니저를 통한 동기화
-try:
-    # Optional: try to sync keys if manager exists
-    from src.key_manager import KeyManager, apply_keys
-    
-    # Apply keys from secrets.json to os.environ first
-    apply_keys(PROJECT_ROOT, inject=True)
-    
-    # Then scan .env to update secrets.json if needed
-    km = KeyManager(PROJECT_ROOT)
-    km.scan_and_extract()
-except ImportError:
-    # KeyManager is optional, so we just ignore if it's missing
-    pass
-except Exception as e:
-    print(f"Warning: Failed to initialize KeyManager: {e}")
-
-class Config:
+
+_INIT_LOCK = threading.RLock()
+_ENV_LOADED = False
+_SECRETS_SYNCED = False
+
+
+def load_environment(project_root: Optional[Path] = None, force: bool = False) -> None:
+    """.env 와 data/secrets.json 을 os.environ 에 반영합니다 (기존 환경 변수는 덮어쓰지 않음)."""
+    global _ENV_LOADED
+    with _INIT_LOCK:
+        if _ENV_LOADED and not force:
+            return
+        root = Path(project_root) if project_root else PROJECT_ROOT
+        try:
+            from dotenv import load_dotenv
+
+            # .env 파일에서 환경 변수 로드
+            load_dotenv(root / ".env")
+        except ImportError:
+            pass
+        try:
+            # Apply keys from secrets.json to os.environ
+            from .key_manager import apply_keys
+
+            apply_keys(root, inject=True)
+        except Exception as e:
+            print(f"Warning: Failed to apply keys: {e}")
+        _ENV_LOADED = True
+
+
+def init_config(project_root: Optional[Path] = None, sync_secrets: bool = True, force: bool = False) -> None:
+    """실행 진입점용 명시적 초기화 (멱등). sync_secrets=True 면 .env 의 새 키를 secrets.json 에 추출합니다."""
+    global _SECRETS_SYNCED
+    with _INIT_LOCK:
+        load_environment(project_root, force=force)
+        if not sync_secrets or (_SECRETS_SYNCED and not force):
+            return
+        try:
+            # MetaPassiveIncome 전용 키 매니저: scan .env to update secrets.json if needed
+            from .key_manager import KeyManager
+
+            KeyManager(Path(project_root) if project_root else PROJECT_ROOT).scan_and_extract()
+        except Exception as e:
+            print(f"Warning: Failed to initialize KeyManager: {e}")
+        _SECRETS_SYNCED = True
+
+
+# 설정 이름 -> 값 계산 (접근 시점의 환경 변수 기준)
+_SETTINGS: Dict[str, Callable[[], object]] = {
     # Lemon Squeezy API 키
-    LEMON_SQUEEZY_API_KEY = os.getenv("LEMON_SQUEEZY_API_KEY")
+    "LEMON_SQUEEZY_API_KEY": lambda: os.getenv("LEMON_SQUEEZY_API_KEY"),
     # GitHub 토큰
-    GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+    "GITHUB_TOKEN": lambda: os.getenv("GITHUB_TOKEN"),
     # Vercel API 토큰
-    VERCEL_API_TOKEN = os.getenv("VERCEL_API_TOKEN")
+    "VERCEL_API_TOKEN": lambda: os.getenv("VERCEL_API_TOKEN"),
     # 다운로드 토큰 만료 시간 (초)
-    DOWNLOAD_TOKEN_EXPIRY_SECONDS = int(
-        os.getenv("DOWNLOAD_TOKEN_EXPIRY_SECONDS", 3600)
-    )
+    "DOWNLOAD_TOKEN_EXPIRY_SECONDS": lambda: int(os.getenv("DOWNLOAD_TOKEN_EXPIRY_SECONDS", 3600)),
     # JWT 시크릿 키
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    "JWT_SECRET_KEY": lambda: os.getenv("JWT_SECRET_KEY"),
     # 데이터베이스 URL (예: SQLite 파일 경로)
-    DATABASE_URL = os.getenv("DATABASE_URL") or f"sqlite:///{PROJECT_ROOT}/data/ledger.db"
+    "DATABASE_URL": lambda: os.getenv("DATABASE_URL") or f"sqlite:///{PROJECT_ROOT}/data/ledger.db",
     # 출력 파일 저장 경로
-    OUTPUT_DIR = os.getenv("OUTPUT_DIR") or str(PROJECT_ROOT / "outputs")
+    "OUTPUT_DIR": lambda: os.getenv("OUTPUT_DIR") or str(PROJECT_ROOT / "outputs"),
     # 다운로드 파일 저장 경로
-    DOWNLOAD_DIR = os.getenv("DOWNLOAD_DIR") or str(PROJECT_ROOT / "downloads")
+    "DOWNLOAD_DIR": lambda: os.getenv("DOWNLOAD_DIR") or str(PROJECT_ROOT / "downloads"),
     # 로그 파일 경로
-    LOG_FILE = os.getenv("LOG_FILE") or str(PROJECT_ROOT / "logs" / "product_factory.log")
-
+    "LOG_FILE": lambda: os.getenv("LOG_FILE") or str(PROJECT_ROOT / "logs" / "product_factory.log"),
     # 대시보드 서버 포트
-    DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8099"))
-    
+    "DASHBOARD_PORT": lambda: int(os.getenv("DASHBOARD_PORT", "8099")),
     # Payment Mode
-    PAYMENT_MODE = os.getenv("PAYMENT_MODE", "nowpayments")
+    "PAYMENT_MODE": lambda: os.getenv("PAYMENT_MODE", "nowpayments"),
+}
+
 
+class _LazyConfigMeta(type):
+    """Config.X 접근 시 환경을 (1회) 로드하고 현재 값을 반환합니다."""
+
+    def __getattr__(cls, name: str):
+        factory = _SETTINGS.get(name)
+        if factory is None:
+            raise AttributeError(name)
+        load_environment()
+        return factory()
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(_SETTINGS))
+
+
+class Config(metaclass=_LazyConfigMeta):
     # 필요한 환경 변수가 설정되었는지 확인
     @classmethod
     def validate(cls):
@@ -62,7 +115,7 @@ class Config:
         # Only require Lemon Squeezy key if using it
         if cls.PAYMENT_MODE == "lemonsqueezy":
             required_vars.append("LEMON_SQUEEZY_API_KEY")
-            
+
         missing_vars = [var for var in required_vars if getattr(cls, var) is None or getattr(cls, var) == ""]
         if missing_vars:
             # Just warn instead of crash for now to allow partial operation
@@ -0,0 +1,229 @@
+"""
+설정/시크릿 파일 공유 캐시 서비스.
+
+data/secrets.json, data/promo_channels.json 처럼 여러 모듈이 반복해서 읽는 설정 파일을
+프로세스당 한 번만 파싱해 두고, 파일 시그니처(inode, mtime_ns, size)가 바뀐 경우에만 다시 읽습니다.
+
+- 조회 경로: 마지막 확인 후 CONFIG_CHECK_INTERVAL(기본 1초)이 지나지 않았으면 stat 도 하지 않습니다.
+- 같은 프로세스에서 write() 로 저장하면 캐시가 즉시 갱신됩니다 (원자적 tmp + replace).
+- 파싱 실패(쓰는 도중 읽힘 등) 시 마지막 정상 값을 유지합니다.
+- on_change(callback): 내용이 바뀌면 callback(new, old) 호출
+- derive(name, fn): 파싱 결과에서 계산한 값(채널 설정 상태 등)을 버전별로 캐시
+- 반환값은 공유 객체이므로 수정하지 말고, 수정이 필요하면 copy() 를 사용합니다.
+- SECRETS_PATH 환경 변수로 이 프로젝트의 secrets.json 위치를 바꿀 수 있습니다 (tools/bench_pipeline.py).
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = PROJECT_ROOT / "data"
+
+
+def _check_interval() -> float:
+    try:
+        return float(os.getenv("CONFIG_CHECK_INTERVAL", "") or 1.0)
+    except ValueError:
+        return 1.0
+
+
+def _parse_json(raw: bytes) -> Any:
+    return json.loads(raw.decode("utf-8-sig")) if raw.strip() else {}
+
+
+class WatchedFile:
+    """파일 하나의 파싱 결과 캐시 (시그니처 변경 시 재파싱)."""
+
+    def __init__(
+        self,
+        path: Path,
+        parser: Callable[[bytes], Any] = _parse_json,
+        default_factory: Callable[[], Any] = dict,
+        check_interval: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.parser = parser
+        self.default_factory = default_factory
+        self.check_interval = _check_interval() if check_interval is None else check_interval
+        self._lock = threading.RLock()
+        self._value: Any = default_factory()
+        self._sig: Optional[Tuple[int, int, int]] = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self._callbacks: List[Callable[[Any, Any], None]] = []
+        self._derived: Dict[str, Tuple[int, Any]] = {}
+        self.version = 0
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def _signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _set(self, value: Any, sig: Optional[Tuple[int, int, int]]) -> None:
+        old = self._value
+        self._sig = sig
+        if self._loaded and value == old:
+            return
+        self._value = value
+        self._derived.clear()
+        self.version += 1
+        first = not self._loaded
+        self._loaded = True
+        if first:
+            return
+        for cb in list(self._callbacks):
+            try:
+                cb(value, old)
+            except Exception as e:
+                logger.warning("설정 변경 콜백 실패 (%s): %s", self.path.name, e)
+
+    def refresh(self, force: bool = False) -> bool:
+        """시그니처가 바뀌었으면 다시 읽습니다. 내용이 바뀌었으면 True."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._loaded and now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            sig = self._signature()
+            if self._loaded and sig == self._sig and not force:
+                return False
+            version = self.version
+            if sig is None:
+                self._set(self.default_factory(), None)
+                return self.version != version
+            t0 = time.perf_counter()
+            try:
+                value = self.parser(self.path.read_bytes())
+            except Exception as e:
+                logger.warning("설정 파일 파싱 실패, 이전 값 유지 (%s): %s", self.path, e)
+                if not self._loaded:
+                    self._loaded = True
+                    self.version += 1
+                return False
+            finally:
+                self.loads += 1
+                self.load_seconds += time.perf_counter() - t0
+            self._set(value, sig)
+            return self.version != version
+
+    def get(self) -> Any:
+        """캐시된 파싱 결과 (공유 객체, 읽기 전용으로 사용)."""
+        self.refresh()
+        return self._value
+
+    def copy(self) -> Any:
+        """수정 가능한 깊은 복사본."""
+        return copy.deepcopy(self.get())
+
+    def derive(self, name: str, fn: Callable[[Any], Any]) -> Any:
+        """fn(파싱 결과)를 파일 버전별로 캐시합니다."""
+        value = self.get()
+        with self._lock:
+            hit = self._derived.get(name)
+            if hit and hit[0] == self.version:
+                return hit[1]
+            result = fn(value)
+            self._derived[name] = (self.version, result)
+            return result
+
+    def on_change(self, callback: Callable[[Any, Any], None]) -> None:
+        with self._lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def write(self, data: Any, indent: int = 2) -> None:
+        """원자적으로 저장하고 캐시를 즉시 갱신합니다 (Windows 파일 잠금 시 짧게 재시도)."""
+        text = json.dumps(data, ensure_ascii=False, indent=indent) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            for attempt in range(10):
+                try:
+                    os.replace(tmp, self.path)
+                    break
+                except PermissionError:
+                    if attempt == 9:
+                        raise
+                    time.sleep(0.2)
+            self._checked_at = time.monotonic()
+            self._set(copy.deepcopy(data), self._signature())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "loads": self.loads,
+            "load_ms": round(self.load_seconds * 1000, 3),
+            "exists": self._sig is not None,
+        }
+
+
+_FILES: Dict[str, WatchedFile] = {}
+_FILES_LOCK = threading.Lock()
+_MULTI_DERIVED: Dict[str, Tuple[Tuple[int, ...], Any]] = {}
+
+
+def get_config_file(path: Path, parser: Callable[[bytes], Any] = _parse_json) -> WatchedFile:
+    """경로별 WatchedFile 싱글톤."""
+    key = os.path.abspath(str(path))
+    with _FILES_LOCK:
+        wf = _FILES.get(key)
+        if wf is None:
+            wf = WatchedFile(Path(key), parser=parser)
+            _FILES[key] = wf
+        return wf
+
+
+def secrets_file(project_root: Optional[Path] = None) -> WatchedFile:
+    """프로젝트의 data/secrets.json. SECRETS_PATH 가 있으면 이 프로젝트 대신 그 파일 (오프라인 벤치마크 등)."""
+    root = Path(project_root) if project_root else PROJECT_ROOT
+    override = os.getenv("SECRETS_PATH", "").strip()
+    if override and root.resolve() == PROJECT_ROOT:
+        return get_config_file(Path(override))
+    return get_config_file(root / "data" / "secrets.json")
+
+
+def channel_config_file(project_root: Optional[Path] = None) -> WatchedFile:
+    root = Path(project_root) if project_root else PROJECT_ROOT
+    return get_config_file(root / "data" / "promo_channels.json")
+
+
+def get_secrets(project_root: Optional[Path] = None) -> Dict[str, Any]:
+    """data/secrets.json (읽기 전용 공유 dict). 파일이 없거나 dict 가 아니면 빈 dict."""
+    value = secrets_file(project_root).get()
+    return value if isinstance(value, dict) else {}
+
+
+def derived(name: str, files: Sequence[WatchedFile], fn: Callable[..., Any]) -> Any:
+    """여러 파일에서 계산한 값을 (파일 버전 조합)별로 캐시합니다. fn 은 각 파일의 파싱 결과를 인자로 받습니다."""
+    values = [f.get() for f in files]
+    versions = tuple(f.version for f in files)
+    with _FILES_LOCK:
+        hit = _MULTI_DERIVED.get(name)
+        if hit and hit[0] == versions:
+            return hit[1]
+    result = fn(*values)
+    with _FILES_LOCK:
+        _MULTI_DERIVED[name] = (versions, result)
+    return result
+
+
+def config_stats() -> List[Dict[str, Any]]:
+    """파일별 재파싱 횟수/누적 시간 (재로드 비용 측정용)."""
+    with _FILES_LOCK:
+        files = list(_FILES.values())
+    return [f.stats() for f in files]
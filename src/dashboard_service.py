@@ -18,6 +18,7 @@ from flask import (
 from .config import Config
 from .fulfillment_manager import FulfillmentManager
 from .ledger_manager import LedgerManager
+from .log_store import tail_lines
 from .payment_processor import PaymentProcessor
 from .publisher import Publisher
 from .utils import (
@@ -173,8 +174,7 @@ class DashboardService:
         if not path.exists():
             return "(log not found)"
         try:
-            lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-            return "\n".join(lines[-max(1, int(n)) :])
+            return "\n".join(tail_lines(path, n))
         except Exception as e:
             logger.error(f"로그 파일 읽기 실패: {path}, 오류: {e}")
             return "(failed to read log)"
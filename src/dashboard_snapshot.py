@@ -0,0 +1,458 @@
+"""
+대시보드 읽기 모델(materialized view) 스냅샷 서비스.
+
+templates/dashboard.html 은 5초마다 /api/system/progress, /api/products 를 폴링합니다.
+매 요청마다 원장 전체 로드 + audit_report.json 파싱 + 매출 SQL + 로그 읽기를 하지 않도록,
+각 입력 소스의 "버전 토큰"(파일 stat, 원장 쓰기 이벤트)을 확인하여 바뀐 부분만 다시 계산하고
+직렬화된 JSON 본문과 강한 ETag 를 메모리에 유지합니다.
+
+- 원장: 같은 프로세스의 쓰기는 ledger_manager.add_write_listener 로 즉시 반영,
+  다른 프로세스(데몬)의 쓰기는 SQLite 파일(+WAL) stat 또는 집계 쿼리 토큰으로 감지
+- audit_report.json / daemon_status.json / progress.json / 데몬 로그: 파일 stat 토큰
+- 토큰 확인은 check_interval 초에 한 번만 수행하므로, 대시보드가 여러 개 열려 있어도
+  원장/파일 시스템 부하는 늘지 않습니다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .log_store import recent_lines
+from .utils import PROJECT_ROOT, get_logger
+
+logger = get_logger(__name__)
+
+DATA_DIR = Path(PROJECT_ROOT) / "data"
+AUDIT_REPORT_PATH = DATA_DIR / "audit_report.json"
+DAEMON_STATUS_PATH = DATA_DIR / "daemon_status.json"
+DAEMON_LOG_PATH = Path(PROJECT_ROOT) / "logs" / "auto_mode_daemon.log"
+PREVIEW_BASE_URL = "http://127.0.0.1:8088"
+RECENT_LOG_LINES = 50
+_PAGE_CACHE_MAX = 64
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """직렬화된 응답 본문 + ETag (본문 SHA256 기반이면 강한 ETag, etag_payload 기반이면 약한 ETag)."""
+
+    version: int
+    etag: str
+    body: bytes
+    weak: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: Any, version: int = 0, etag_payload: Any = None) -> "Snapshot":
+        """etag_payload 를 주면 본문 대신 그 값으로 약한 ETag 를 만듭니다 (본문의 시각·통계 필드처럼 자주 바뀌지만
+        캐시를 무효화할 필요가 없는 값을 빼고 비교할 때). 본문이 바이트 단위로 같다는 보장이 없으므로 weak=True."""
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        etag_source = body
+        if etag_payload is not None:
+            etag_source = json.dumps(etag_payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        return cls(version=version, etag=hashlib.sha256(etag_source).hexdigest()[:32], body=body, weak=etag_payload is not None)
+
+
+def _stat_token(*paths: Path) -> Tuple:
+    token = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            token.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        except OSError:
+            token.append(None)
+    return tuple(token)
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return default
+
+
+# -----------------------------
+# 제품 행(row) 구성 (기존 /api/products 포맷과 동일)
+# -----------------------------
+
+
+def build_audit_map(audit_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """audit_report.json 에서 제품별 홍보 채널 이슈 목록을 만듭니다."""
+    audit_map: Dict[str, List[Dict[str, Any]]] = {}
+    for item in audit_data.get("details", []):
+        # We are interested in promotion items
+        if "promotion_" not in item.get("type", ""):
+            continue
+
+        pid = item.get("product_id")
+        if not pid:
+            continue
+
+        if pid not in audit_map:
+            audit_map[pid] = []
+
+        channel = item.get("type").replace("promotion_", "")
+        # Normalize channel names (remove _api suffix)
+        if channel.endswith("_api"):
+            channel = channel.replace("_api", "")
+
+        # Merge duplicate entries for the same channel
+        existing = next((x for x in audit_map[pid] if x["channel"] == channel), None)
+        if existing:
+            existing["issues"].extend(item.get("issues", []))
+        else:
+            audit_map[pid].append({"channel": channel, "issues": list(item.get("issues", []))})
+    return audit_map
+
+
+def format_product_row(p: Dict[str, Any], audit_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """원장 제품 dict + audit 항목을 대시보드 제품 행으로 변환합니다."""
+    # Normalize status
+    p_status = str(p.get("status", "")).strip().upper()
+
+    meta = p.get("metadata", {})
+    qa_status = "Pending"
+    qa_details = []
+
+    if p_status == "PUBLISHED":
+        qa_status = "Passed"
+    elif p_status == "PROMOTED":
+        qa_status = "Published & Promoted"
+    elif "QA2_PASSED" in p_status:
+        qa_status = "Passed (Ready to Publish)"
+    elif "QA1_PASSED" in p_status:
+        qa_status = "Content Verified"
+    elif "QA" in p_status and "FAILED" in p_status:
+        qa_status = "Failed"
+        # Try to extract failure reason from metadata
+        if meta.get("messages"):
+            qa_details = meta.get("messages")
+        elif meta.get("error"):
+            qa_details = [meta.get("error")]
+
+    # If QA passed, show success messages if available
+    if not qa_details and meta.get("messages"):
+        qa_details = meta.get("messages")
+
+    # audit 맵은 재사용되므로 복사본에 병합
+    promo_list = [dict(x, issues=list(x.get("issues", []))) for x in audit_entries]
+
+    def add_promo(channel, url=None, id_val=None):
+        existing = next((x for x in promo_list if x["channel"] == channel), None)
+        if existing:
+            if url:
+                existing["url"] = url
+                existing["issues"] = []  # Clear issues if URL is confirmed
+            if id_val:
+                existing["id"] = id_val
+                existing["issues"] = []  # Clear issues if ID is confirmed
+        else:
+            entry = {"channel": channel, "issues": []}
+            if url:
+                entry["url"] = url
+            if id_val:
+                entry["id"] = id_val
+            promo_list.append(entry)
+
+    # Check metadata for successful promotions
+    if meta.get("wp_link"):
+        add_promo("wordpress", url=meta.get("wp_link"))
+    if meta.get("medium_url"):
+        add_promo("medium", url=meta.get("medium_url"))
+    if meta.get("tumblr_url"):
+        add_promo("tumblr", url=meta.get("tumblr_url"))
+    if meta.get("github_pages_url"):
+        add_promo("github_pages", url=meta.get("github_pages_url"))
+    if meta.get("blogger_url"):
+        add_promo("blogger", url=meta.get("blogger_url"))
+    if meta.get("reddit_url"):
+        add_promo("reddit", url=meta.get("reddit_url"))
+
+    if meta.get("x_post_id"):
+        x_id = meta.get("x_post_id")
+        # Try to construct URL if it looks like a numeric ID
+        x_url = f"https://x.com/i/status/{x_id}" if x_id.isdigit() else None
+        add_promo("x", url=x_url, id_val=x_id)
+
+    if meta.get("pinterest_id"):
+        pin_id = meta.get("pinterest_id")
+        pin_url = f"https://www.pinterest.com/pin/{pin_id}/" if pin_id.isdigit() else None
+        add_promo("pinterest", url=pin_url, id_val=pin_id)
+
+    if meta.get("linkedin_id"):
+        li_id = meta.get("linkedin_id")
+        # If number, likely urn:li:share:ID or urn:li:activity:ID
+        li_url = f"https://www.linkedin.com/feed/update/urn:li:activity:{li_id}/" if li_id.isdigit() else None
+        add_promo("linkedin", url=li_url, id_val=li_id)
+
+    if meta.get("telegram_posted") == "true":
+        add_promo("telegram", id_val="Posted")
+    if meta.get("discord_posted") == "true":
+        add_promo("discord", id_val="Posted")
+
+    return {
+        "id": p["id"],
+        "topic": p["topic"],
+        "status": p_status,
+        "created_at": p["created_at"],
+        "published_at": meta.get("published_at"),
+        "live_url": meta.get("deployment_url"),
+        "price": meta.get("price_usd", 0),
+        "promotions": promo_list,
+        "qa_status": qa_status,
+        "qa_details": qa_details,
+        "preview_url": f"{PREVIEW_BASE_URL}/outputs/{p['id']}/index.html",
+    }
+
+
+def read_recent_logs(path: Path = DAEMON_LOG_PATH, limit: int = RECENT_LOG_LINES) -> List[str]:
+    return recent_lines(path, limit)
+
+
+# -----------------------------
+# 스냅샷 서비스
+# -----------------------------
+
+
+class _Section:
+    """버전 토큰이 바뀔 때만 다시 계산되는 읽기 모델 조각."""
+
+    def __init__(self, name: str, token_fn: Callable[[], Any], build_fn: Callable[[], Any]):
+        self.name = name
+        self.token_fn = token_fn
+        self.build_fn = build_fn
+        self.token: Any = object()
+        self.value: Any = None
+
+    def refresh(self) -> bool:
+        token = self.token_fn()
+        if token == self.token:
+            return False
+        self.value = self.build_fn()
+        self.token = token
+        return True
+
+
+class DashboardSnapshotService:
+    """대시보드 API 응답의 materialized read model."""
+
+    def __init__(self, ledger_factory: Optional[Callable[[], Any]] = None, check_interval: Optional[float] = None):
+        if check_interval is None:
+            check_interval = float(os.getenv("DASHBOARD_SNAPSHOT_CHECK_INTERVAL", "1.0"))
+        self.check_interval = check_interval
+        self._ledger_factory = ledger_factory
+        self._ledger = None
+        self._ledger_writes = 0
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._progress: Optional[Snapshot] = None
+        self._products: List[Dict[str, Any]] = []
+        self._products_version = 0
+        self._page_cache: Dict[Tuple[int, int], Snapshot] = {}
+        self.stats = {"refreshes": 0, "rebuilds": 0}
+
+        self._sections = {
+            "products": _Section("products", self._ledger_token, self._load_products),
+            "financial": _Section("financial", self._ledger_token, self._load_financial),
+            "audit": _Section("audit", lambda: _stat_token(AUDIT_REPORT_PATH), self._load_audit_map),
+            "logs": _Section("logs", lambda: _stat_token(DAEMON_LOG_PATH), read_recent_logs),
+            "daemon": _Section("daemon", lambda: _stat_token(DAEMON_STATUS_PATH), lambda: _read_json(DAEMON_STATUS_PATH, {})),
+            "progress": _Section("progress", self._progress_token, self._load_progress),
+        }
+
+        try:
+            from .ledger_manager import add_write_listener
+
+            add_write_listener(self._on_ledger_write)
+        except Exception as e:
+            logger.warning(f"원장 쓰기 리스너 등록 실패: {e}")
+
+    # ---- sources ----
+
+    def _get_ledger(self):
+        if self._ledger is None:
+            if self._ledger_factory is not None:
+                self._ledger = self._ledger_factory()
+            else:
+                from .ledger_manager import LedgerManager
+
+                self._ledger = LedgerManager()
+        return self._ledger
+
+    def _on_ledger_write(self, table: str, key: str) -> None:
+        self._ledger_writes += 1
+        self._checked_at = 0.0  # 다음 요청에서 즉시 재확인
+
+    def _ledger_token(self) -> Tuple:
+        url = str(self._get_ledger().engine.url)
+        if url.startswith("sqlite:///"):
+            db_path = Path(url[len("sqlite:///"):])
+            file_token = _stat_token(db_path, Path(f"{db_path}-wal"))
+        else:
+            file_token = self._ledger_aggregate_token()
+        return (self._ledger_writes, file_token)
+
+    def _ledger_aggregate_token(self) -> Tuple:
+        from sqlalchemy import func
+
+        from .ledger_manager import Order, Product
+
+        session = self._get_ledger().get_session()
+        try:
+            products = session.query(func.count(Product.id), func.max(Product.updated_at)).one()
+            orders = session.query(func.count(Order.id), func.max(Order.updated_at)).one()
+            return (tuple(products), tuple(orders))
+        finally:
+            session.close()
+
+    def _progress_token(self) -> Tuple:
+        from .progress_tracker import PROGRESS_FILE
+
+        return _stat_token(PROGRESS_FILE)
+
+    def _load_progress(self) -> Dict[str, Any]:
+        from .progress_tracker import get_progress
+
+        return get_progress()
+
+    def _load_products(self) -> List[Dict[str, Any]]:
+        products = self._get_ledger().get_all_products() or []
+        # Sort by created_at desc
+        products.sort(key=lambda x: x.get("created_at") or "", reverse=True)
+        return products
+
+    def _load_audit_map(self) -> Dict[str, List[Dict[str, Any]]]:
+        audit_data = _read_json(AUDIT_REPORT_PATH, {})
+        try:
+            return build_audit_map(audit_data if isinstance(audit_data, dict) else {})
+        except Exception:
+            return {}
+
+    def _load_financial(self) -> Dict[str, Any]:
+        from sqlalchemy import func
+
+        from .ledger_manager import Order
+
+        session = self._get_ledger().get_session()
+        try:
+            total_revenue = session.query(func.sum(Order.amount)).filter(Order.status == "PAID").scalar() or 0
+            total_transactions = session.query(Order).filter(Order.status == "PAID").count()
+            recent_tx_rows = (
+                session.query(Order)
+                .filter(Order.status == "PAID")
+                .order_by(Order.created_at.desc())
+                .limit(5)
+                .all()
+            )
+            recent_transactions = [
+                {
+                    "id": tx.id,
+                    "product_id": tx.product_id,
+                    "amount": tx.amount,
+                    "currency": tx.currency,
+                    "date": tx.created_at.strftime("%Y-%m-%d %H:%M") if tx.created_at else "",
+                    "email": tx.customer_email,
+                }
+                for tx in recent_tx_rows
+            ]
+        except Exception as e:
+            logger.error(f"Error calculating financial stats: {e}")
+            total_revenue, total_transactions, recent_transactions = 0, 0, []
+        finally:
+            session.close()
+        return {
+            "total_revenue": total_revenue,
+            "total_transactions": total_transactions,
+            "recent_transactions": recent_transactions,
+        }
+
+    # ---- refresh ----
+
+    def refresh(self, force: bool = False) -> None:
+        """토큰을 확인하여 바뀐 조각만 다시 계산합니다 (check_interval 내 중복 호출은 무시)."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval and self._progress is not None:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._checked_at < self.check_interval and self._progress is not None:
+                return
+            self.stats["refreshes"] += 1
+            changed = {name for name, section in self._sections.items() if section.refresh()}
+            if changed or self._progress is None:
+                self.stats["rebuilds"] += 1
+                self._rebuild(changed)
+            self._checked_at = time.monotonic()
+
+    def _rebuild(self, changed: set) -> None:
+        s = self._sections
+        if self._progress is None or changed & {"products", "financial", "logs", "daemon", "progress"}:
+            products = s["products"].value or []
+            payload = {
+                "total_products": len(products),
+                "published_count": len([p for p in products if p.get("status") in ["PUBLISHED", "PROMOTED"]]),
+                "pending_count": len([p for p in products if p.get("status") == "PENDING"]),
+                **(s["financial"].value or {}),
+                "recent_logs": s["logs"].value or [],
+                "daemon_status": s["daemon"].value or {},
+                "current_progress": s["progress"].value or {},
+            }
+            snap = Snapshot.from_payload(payload)
+            if self._progress is None or snap.etag != self._progress.etag:
+                version = (self._progress.version if self._progress else 0) + 1
+                self._progress = Snapshot(version=version, etag=snap.etag, body=snap.body)
+
+        if not self._products or changed & {"products", "audit"}:
+            audit_map = s["audit"].value or {}
+            rows = [format_product_row(p, audit_map.get(p["id"], [])) for p in (s["products"].value or [])]
+            if rows != self._products:
+                self._products = rows
+                self._products_version += 1
+                self._page_cache = {}
+
+    # ---- public API ----
+
+    def progress(self) -> Snapshot:
+        self.refresh()
+        return self._progress
+
+    def products_page(self, page: int = 1, limit: int = 10) -> Snapshot:
+        self.refresh()
+        key = (page, limit)
+        snap = self._page_cache.get(key)
+        if snap is not None and snap.version == self._products_version:
+            return snap
+
+        rows = self._products
+        total_products = len(rows)
+        total_pages = (total_products + limit - 1) // limit
+        start = (page - 1) * limit
+        snap = Snapshot.from_payload(
+            {
+                "products": rows[start : start + limit],
+                "total": total_products,
+                "page": page,
+                "limit": limit,
+                "total_pages": total_pages,
+            },
+            version=self._products_version,
+        )
+        if len(self._page_cache) >= _PAGE_CACHE_MAX:
+            self._page_cache = {}
+        self._page_cache[key] = snap
+        return snap
+
+
+_SERVICE: Optional[DashboardSnapshotService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_snapshot_service() -> DashboardSnapshotService:
+    """프로세스 전역 DashboardSnapshotService 싱글톤."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = DashboardSnapshotService()
+        return _SERVICE
@@ -7,20 +7,18 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 import time
 
-# Try to import Gemini
-try:
-    # Check for new SDK first
-    import google.genai as genai
-    HAS_GEMINI = True
-    GEMINI_VERSION = "new"
-except ImportError as e:
-    logger.warning(f"google.genai import failed: {e}")
-    HAS_GEMINI = False
-    GEMINI_VERSION = None
+from .lazy_import import lazy_module
 
 # Setup logging
 logger = logging.getLogger("ErrorLearningSystem")
 
+# Gemini (new SDK). 설치 여부만 확인하고 실제 import 는 클라이언트 생성 시점에 수행
+genai = lazy_module("google.genai")
+HAS_GEMINI = genai is not None
+GEMINI_VERSION = "new" if HAS_GEMINI else None
+if not HAS_GEMINI:
+    logger.warning("google.genai not installed")
+
 class ErrorLearningSystem:
     def __init__(self, project_root: Optional[Path] = None):
         self.project_root = project_root or Path(__file__).resolve().parents[1]
@@ -0,0 +1,188 @@
+"""
+백그라운드 서비스 헬스 모니터.
+
+대시보드의 /api/system/status 가 폴링마다 동기 HTTP 헬스체크(타임아웃 2초)를 하지 않도록,
+등록된 프로브를 별도 스레드에서 주기적으로 동시 실행하고 결과를 메모리에 보관합니다.
+
+- 실패한 서비스는 지수 백오프(interval * 2^n, 최대 max_backoff)로 덜 자주 확인
+- 서비스별 최근 이력(ring buffer)으로 가동률/지연 백분위 계산
+- 서비스를 (재)시작한 직후에는 poke(name)으로 백오프를 초기화하여 즉시 재확인
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+# 프로브는 {"ok": bool, ...추가 정보} 를 반환합니다.
+Probe = Callable[[], Dict[str, Any]]
+
+
+def http_probe(url: str, timeout: float = 2.0) -> Probe:
+    """GET url 이 200 이면 ok 인 HTTP 프로브를 만듭니다."""
+
+    def _probe() -> Dict[str, Any]:
+        import requests
+
+        try:
+            r = requests.get(url, timeout=timeout)
+            return {"ok": r.status_code == 200, "status_code": r.status_code}
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+
+    return _probe
+
+
+def _percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))], 2)
+
+
+class _ServiceState:
+    def __init__(self, name: str, probe: Probe, history_size: int):
+        self.name = name
+        self.probe = probe
+        self.history: Deque[Tuple[float, bool, float]] = deque(maxlen=history_size)
+        self.result: Optional[Dict[str, Any]] = None
+        self.last_checked: Optional[float] = None
+        self.last_ok_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.next_probe_at = 0.0
+        # next_probe_at(monotonic)의 벽시계 값 (epoch 초, last_checked 와 같은 단위). 즉시 확인 예정이면 None
+        self.next_probe_wall: Optional[float] = None
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        oks = [ok for _, ok, _ in self.history]
+        latencies = sorted(lat for _, ok, lat in self.history if ok)
+        return {
+            "ok": bool(self.result and self.result.get("ok")),
+            "result": dict(self.result or {}),
+            "last_checked": self.last_checked,
+            "last_ok_at": self.last_ok_at,
+            "consecutive_failures": self.consecutive_failures,
+            "next_probe_in": round(max(0.0, self.next_probe_at - now), 2),
+            # 요청 시각과 무관한 절대 시각 (ETag 를 쓰는 응답은 next_probe_in 대신 이것을 사용)
+            "next_probe_at": self.next_probe_wall,
+            "uptime_pct": round(100.0 * sum(oks) / len(oks), 2) if oks else None,
+            "samples": len(oks),
+            "latency_ms": {
+                "p50": _percentile(latencies, 0.50),
+                "p95": _percentile(latencies, 0.95),
+                "p99": _percentile(latencies, 0.99),
+            },
+        }
+
+
+class ServiceHealthMonitor:
+    """등록된 서비스 프로브를 백그라운드에서 주기적으로 실행하고 상태를 캐시합니다."""
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        max_backoff: float = 60.0,
+        history_size: int = 720,
+    ):
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.history_size = history_size
+        self._services: Dict[str, _ServiceState] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, probe: Probe) -> None:
+        with self._lock:
+            self._services[name] = _ServiceState(name, probe, self.history_size)
+        self._wakeup.set()
+
+    def poke(self, name: Optional[str] = None) -> None:
+        """백오프를 초기화하고 다음 주기를 기다리지 않고 즉시 다시 확인합니다."""
+        with self._lock:
+            targets = [self._services[name]] if name in self._services else list(self._services.values())
+            for svc in targets:
+                svc.next_probe_at = 0.0
+                svc.next_probe_wall = None
+        self._wakeup.set()
+
+    def _backoff(self, failures: int) -> float:
+        if failures <= 0:
+            return self.interval
+        return min(self.max_backoff, self.interval * (2 ** min(failures, 16)))
+
+    def _run_probe(self, svc: _ServiceState) -> None:
+        started = time.perf_counter()
+        try:
+            result = svc.probe() or {}
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        ok = bool(result.get("ok"))
+        now = time.time()
+        with self._lock:
+            svc.result = result
+            svc.last_checked = now
+            svc.history.append((now, ok, latency_ms))
+            if ok:
+                svc.last_ok_at = now
+                svc.consecutive_failures = 0
+            else:
+                svc.consecutive_failures += 1
+            backoff = self._backoff(svc.consecutive_failures)
+            svc.next_probe_at = time.monotonic() + backoff
+            svc.next_probe_wall = round(now + backoff, 3)
+
+    def probe_once(self, force: bool = False) -> int:
+        """실행 시점이 된 프로브를 동시에 실행합니다. 실행한 프로브 수를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            due = [s for s in self._services.values() if force or s.next_probe_at <= now]
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health-probe")
+        list(self._pool.map(self._run_probe, due))
+        return len(due)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.probe_once()
+            except Exception as e:
+                logger.warning(f"헬스 모니터 주기 실행 오류: {e}")
+            with self._lock:
+                next_at = min((s.next_probe_at for s in self._services.values()), default=time.monotonic() + self.interval)
+            self._wakeup.wait(timeout=max(0.05, min(self.interval, next_at - time.monotonic())))
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="service-health-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """서비스별 마지막 결과 + 이력 요약 (프로브를 실행하지 않음)."""
+        now = time.monotonic()
+        with self._lock:
+            return {name: svc.summary(now) for name, svc in self._services.items()}
@@ -12,14 +12,12 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-try:
-    import google.generativeai as genai
-    HAS_GENAI = True
-except ImportError:
-    HAS_GENAI = False
-
+from .lazy_import import lazy_module
 from .utils import get_logger
 
+genai = lazy_module("google.generativeai")
+HAS_GENAI = genai is not None
+
 logger = get_logger(__name__)
 
 class ImageAnalyzer:
@@ -1,9 +1,24 @@
 import os
 import re
-import json
 from pathlib import Path
 from typing import Dict, Optional
 
+from .config_store import get_config_file, secrets_file
+
+
+def _parse_env_file(raw: bytes) -> Dict[str, str]:
+    """.env 의 KEY=VALUE 목록 (주석/빈 줄 무시, 따옴표 제거)."""
+    values: Dict[str, str] = {}
+    for line in raw.decode("utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split("=", 1)
+        if len(parts) == 2:
+            values[parts[0].strip()] = parts[1].strip().strip('"').strip("'")
+    return values
+
+
 class KeyManager:
     """
     Helper to extract API keys and secrets from environment files or config.
@@ -22,15 +37,12 @@ class KeyManager:
         ]
 
     def load_secrets(self) -> Dict[str, str]:
-        if self.secrets_file.exists():
-            with open(self.secrets_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
+        """secrets.json 의 수정 가능한 복사본 (config_store 캐시)."""
+        data = secrets_file(self.project_root).copy()
+        return data if isinstance(data, dict) else {}
 
     def save_secrets(self, secrets: Dict[str, str]):
-        self.secrets_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.secrets_file, "w", encoding="utf-8") as f:
-            json.dump(secrets, f, indent=4)
+        secrets_file(self.project_root).write(secrets, indent=4)
         print(f"[KeyManager] Secrets updated in {self.secrets_file}")
 
     def scan_and_extract(self):
@@ -40,23 +52,15 @@ class KeyManager:
         secrets = self.load_secrets()
         updated = False
         
-        # 1. Scan .env
+        # 1. Scan .env (파싱 결과는 .env 가 바뀔 때까지 캐시)
         if self.env_file.exists():
             print(f"[KeyManager] Scanning .env file...")
-            with open(self.env_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    
-                    parts = line.split("=", 1)
-                    if len(parts) == 2:
-                        key, value = parts[0].strip(), parts[1].strip().strip('"').strip("'")
-                        
-                        if key in self.known_keys and not secrets.get(key):
-                            secrets[key] = value
-                            print(f"   -> Extracted {key}")
-                            updated = True
+            env_values = get_config_file(self.env_file, parser=_parse_env_file).get()
+            for key, value in env_values.items():
+                if key in self.known_keys and not secrets.get(key):
+                    secrets[key] = value
+                    print(f"   -> Extracted {key}")
+                    updated = True
         
         # 2. Scan system env vars
         for key in self.known_keys:
@@ -79,8 +83,9 @@ def apply_keys(project_root=None, write=False, inject=True):
     if project_root is None:
         project_root = Path(__file__).resolve().parent.parent
         
-    manager = KeyManager(project_root)
-    secrets = manager.load_secrets()
+    secrets = secrets_file(Path(project_root)).get()
+    if not isinstance(secrets, dict):
+        secrets = {}
     
     if inject:
         for k, v in secrets.items():
@@ -0,0 +1,60 @@
+"""
+무거운 선택 의존성(google-genai, tweepy, praw, bs4, reportlab 등)의 지연 import.
+
+모듈 상단의 `try: import x / except ImportError: x = None` 패턴은 설치 여부만 확인하려고
+수백 ms 짜리 패키지를 매번 로드합니다. lazy_module 은 설치 여부를 import 없이(find_spec)
+확인하고, 실제 속성에 처음 접근할 때 모듈을 로드합니다.
+
+    tweepy = lazy_module("tweepy")      # 미설치면 None (기존 `tweepy = None` 과 동일)
+    if not tweepy: ...                  # 로드하지 않음
+    tweepy.Client(...)                  # 여기서 처음 import
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Any, Optional
+
+
+def module_available(name: str) -> bool:
+    """모듈을 import 하지 않고 설치 여부만 확인합니다."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # 부모 패키지가 없거나(google 미설치 등) 스펙이 깨진 경우
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """첫 속성 접근 시 실제 모듈을 import 하는 프록시."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str) -> Optional[LazyModule]:
+    """설치되어 있으면 LazyModule, 아니면 None."""
+    return LazyModule(name) if module_available(name) else None
@@ -1,7 +1,7 @@
 import json
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, create_engine
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -11,6 +11,90 @@ from .utils import ProductionError, get_logger, handle_errors
 logger = get_logger(__name__)
 Base = declarative_base()
 
+# 원장 쓰기 리스너 (같은 프로세스의 읽기 모델/캐시 무효화용). callback(table, key)
+_write_listeners = []
+
+
+def add_write_listener(callback) -> None:
+    """원장 커밋 후 호출될 콜백을 등록합니다."""
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+
+def remove_write_listener(callback) -> None:
+    if callback in _write_listeners:
+        _write_listeners.remove(callback)
+
+
+def _notify_write(table: str, key: str) -> None:
+    for callback in list(_write_listeners):
+        try:
+            callback(table, key)
+        except Exception as e:
+            logger.warning(f"원장 쓰기 리스너 오류: {e}")
+
+
+# 홍보 채널 -> 완료로 보는 metadata 키 (하나라도 값이 있으면 완료). 순서가 promo_mask 의 비트 위치.
+# 새 채널은 끝에만 추가한다 (기존 비트가 밀리면 저장된 마스크가 틀어짐).
+PROMOTION_CHANNELS = (
+    ("medium", ("medium_url",)),
+    ("tumblr", ("tumblr_url",)),
+    ("github_pages", ("github_pages_url",)),
+    ("wordpress", ("wp_link", "wp_post_id")),
+    ("blogger", ("blogger_url",)),
+    ("x", ("x_post_id",)),
+    ("telegram", ("telegram_posted",)),
+    ("discord", ("discord_posted",)),
+    ("reddit", ("reddit_url",)),
+    ("pinterest", ("pinterest_id",)),
+    ("linkedin", ("linkedin_id",)),
+    ("youtube_shorts", ("youtube_shorts_id", "youtube_shorts_posted")),
+    ("instagram", ("instagram_posted",)),
+    ("tiktok", ("tiktok_posted",)),
+)
+_CHANNEL_BITS = {name: 1 << i for i, (name, _keys) in enumerate(PROMOTION_CHANNELS)}
+ALL_PROMOTION_MASK = (1 << len(PROMOTION_CHANNELS)) - 1
+# 홍보가 남은 제품만 담는 부분 인덱스 (id 순 페이지 조회용). 채널 수가 바뀌면 조건이 달라지므로 이름에 포함.
+PROMO_GAPS_INDEX = f"ix_products_promo_gaps_{len(PROMOTION_CHANNELS)}"
+_PROMO_GAPS_WHERE = text(f"promo_mask < {ALL_PROMOTION_MASK}")
+
+# promo_mask 컬럼 마이그레이션을 확인한 DB (프로세스당 한 번)
+_migrated_urls = set()
+
+
+def promotion_mask(metadata: dict) -> int:
+    """metadata 에서 홍보가 끝난 채널의 비트 마스크를 계산합니다."""
+    mask = 0
+    for name, keys in PROMOTION_CHANNELS:
+        if any(metadata.get(k) for k in keys):
+            mask |= _CHANNEL_BITS[name]
+    return mask
+
+
+def channels_mask(channels=None) -> int:
+    """채널 이름 목록의 비트 마스크 (None 이면 전체). 모르는 채널은 ValueError."""
+    if channels is None:
+        return ALL_PROMOTION_MASK
+    unknown = [c for c in channels if c not in _CHANNEL_BITS]
+    if unknown:
+        raise ValueError(f"Unknown promotion channel: {', '.join(unknown)}")
+    mask = 0
+    for c in channels:
+        mask |= _CHANNEL_BITS[c]
+    return mask
+
+
+def missing_channels(mask: int, channels=None) -> list:
+    """mask 기준으로 아직 홍보되지 않은 채널 (PROMOTION_CHANNELS 순서)."""
+    wanted = channels_mask(channels)
+    return [name for name, _keys in PROMOTION_CHANNELS if wanted & _CHANNEL_BITS[name] and not mask & _CHANNEL_BITS[name]]
+
+
+def _set_metadata(product, metadata: dict) -> None:
+    """metadata_json 과 promo_mask 를 함께 갱신합니다."""
+    product.metadata_json = json.dumps(metadata)
+    product.promo_mask = promotion_mask(metadata)
+
 
 class Product(Base):
     """제품 정보를 저장하는 데이터 모델"""
@@ -28,6 +112,10 @@ class Product(Base):
     checksum = Column(String)  # 패키지 파일 체크섬
     content_hash = Column(String)  # 콘텐츠 내용 해시 (중복 생성 방지용)
     metadata_json = Column(Text)  # 제품 메타데이터 (JSON 형태)
+    promo_mask = Column(Integer, default=0)  # 홍보 완료 채널 비트 (PROMOTION_CHANNELS 순서)
+    __table_args__ = (
+        Index(PROMO_GAPS_INDEX, "id", sqlite_where=_PROMO_GAPS_WHERE, postgresql_where=_PROMO_GAPS_WHERE),
+    )
 
     def to_dict(self):
         return {
@@ -115,12 +203,30 @@ class Download(Base):
 class LedgerManager:
     """제품 생산 파이프라인의 모든 상태와 이력을 관리하는 원장 매니저"""
 
-    def __init__(self, database_url=Config.DATABASE_URL):
+    def __init__(self, database_url=None):
+        # 기본값은 생성 시점의 설정 (import 시 환경을 로드하지 않도록 인자 기본값으로 평가하지 않음)
+        database_url = database_url or Config.DATABASE_URL
         self.engine = create_engine(database_url)
         Base.metadata.create_all(self.engine)  # DB 스키마 생성
         self.Session = sessionmaker(bind=self.engine)
+        if database_url not in _migrated_urls:
+            self._migrate_promo_mask()
+            _migrated_urls.add(database_url)
         logger.info(f"LedgerManager 초기화 완료. 데이터베이스: {database_url}")
 
+    def _migrate_promo_mask(self):
+        """promo_mask 컬럼이 없는 기존 원장에 컬럼/인덱스를 추가하고 채웁니다 (create_all 은 기존 테이블을 바꾸지 않음)."""
+        columns = {c["name"] for c in inspect(self.engine).get_columns("products")}
+        if "promo_mask" in columns:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE products ADD COLUMN promo_mask INTEGER"))
+            conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {PROMO_GAPS_INDEX} ON products (id) WHERE {_PROMO_GAPS_WHERE.text}")
+            )
+        updated = self.rebuild_promotion_masks()
+        logger.info(f"원장 promo_mask 컬럼 추가 및 {updated}개 제품 채움")
+
     @handle_errors(stage="Ledger Initialization")
     def get_session(self):
         """새로운 DB 세션을 반환합니다."""
@@ -198,19 +304,16 @@ class LedgerManager:
                 if content_hash:
                     product.content_hash = content_hash
                 if metadata:
-                    product.metadata_json = json.dumps(metadata)
+                    _set_metadata(product, metadata)
                 product.updated_at = datetime.now()
             else:
-                product = Product(
-                    id=product_id,
-                    topic=topic,
-                    content_hash=content_hash,
-                    metadata_json=json.dumps(metadata) if metadata else "{}",
-                )
+                product = Product(id=product_id, topic=topic, content_hash=content_hash)
+                _set_metadata(product, metadata or {})
                 session.add(product)
             
             session.commit()
             logger.info(f"제품 정보 저장 완료 - ID: {product_id}, 주제: {topic}")
+            _notify_write("products", product_id)
             return product.to_dict()
         except Exception as e:
             session.rollback()
@@ -259,11 +362,12 @@ class LedgerManager:
                     json.loads(product.metadata_json) if product.metadata_json else {}
                 )
                 current_meta.update(metadata)
-                product.metadata_json = json.dumps(current_meta)
+                _set_metadata(product, current_meta)
             product.updated_at = datetime.now()
 
             session.commit()
             logger.info(f"제품 상태 업데이트 - ID: {product_id}, 새 상태: {status}")
+            _notify_write("products", product_id)
             return product.to_dict()
         except Exception as e:
             session.rollback()
@@ -291,12 +395,13 @@ class LedgerManager:
                         json.loads(product.metadata_json) if product.metadata_json else {}
                     )
                     current_meta.update(value)
-                    product.metadata_json = json.dumps(current_meta)
+                    _set_metadata(product, current_meta)
                 elif hasattr(product, key):
                     setattr(product, key, value)
 
             product.updated_at = datetime.now()
             session.commit()
+            _notify_write("products", product_id)
             return product.to_dict()
         finally:
             session.close()
@@ -321,6 +426,61 @@ class LedgerManager:
         finally:
             session.close()
 
+    @handle_errors(stage="Product Management")
+    def rebuild_promotion_masks(self, only_missing: bool = False) -> int:
+        """metadata_json 에서 promo_mask 를 다시 계산합니다. 바뀐 제품 수를 반환.
+
+        only_missing=True 면 마스크가 비어 있는(NULL) 행만 봅니다 (원장 밖에서 SQL 로 넣은 행).
+        metadata_json 을 SQL 로 직접 고친 경우는 전체 재계산이 필요합니다.
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Product.id, Product.metadata_json, Product.promo_mask)
+            if only_missing:
+                query = query.filter(Product.promo_mask.is_(None))
+            changes = []
+            for pid, meta_json, old in query.yield_per(500):
+                try:
+                    meta = json.loads(meta_json) if meta_json else {}
+                except (TypeError, ValueError):
+                    meta = {}
+                mask = promotion_mask(meta if isinstance(meta, dict) else {})
+                if mask != old:
+                    changes.append({"id": pid, "promo_mask": mask})
+            if changes:
+                session.bulk_update_mappings(Product, changes)
+                session.commit()
+            return len(changes)
+        finally:
+            session.close()
+
+    @handle_errors(stage="Product Management")
+    def get_promotion_gaps(self, channels=None, limit: int = 100, after_id: str = None):
+        """아직 홍보되지 않은 채널이 있는 제품을 id 순으로 한 페이지 반환합니다.
+
+        한 번의 SQL 로 promo_mask 만 비교하므로 metadata JSON 을 제품마다 다시 읽지 않습니다.
+        반환: [{"id", "topic", "status", "missing": [채널, ...]}]. 다음 페이지는 after_id=마지막 id.
+        """
+        wanted = channels_mask(channels)
+        if not after_id:
+            self.rebuild_promotion_masks(only_missing=True)
+        session = self.get_session()
+        try:
+            # 마스크는 ALL_PROMOTION_MASK 이하이므로 "< 전체" 범위 조건으로 완료된 제품을 인덱스에서 거른다
+            query = session.query(Product.id, Product.topic, Product.status, Product.promo_mask).filter(
+                Product.promo_mask < ALL_PROMOTION_MASK,
+                Product.promo_mask.op("&")(wanted) != wanted,
+            )
+            if after_id:
+                query = query.filter(Product.id > after_id)
+            rows = query.order_by(Product.id).limit(limit).all()
+            return [
+                {"id": pid, "topic": topic, "status": status, "missing": missing_channels(mask, channels)}
+                for pid, topic, status, mask in rows
+            ]
+        finally:
+            session.close()
+
     @handle_errors(stage="Order Management")
     def create_order(
         self,
@@ -346,6 +506,7 @@ class LedgerManager:
             )
             session.add(order)
             session.commit()
+            _notify_write("orders", order_id)
             logger.info(
                 f"주문 생성 - ID: {order_id}, 제품 ID: {product_id}, 이메일: {customer_email}"
             )
@@ -388,6 +549,7 @@ class LedgerManager:
 
             session.commit()
             logger.info(f"주문 상태 업데이트 - ID: {order_id}, 새 상태: {status}")
+            _notify_write("orders", order_id)
             return order.to_dict()
         except Exception as e:
             session.rollback()
@@ -522,6 +684,7 @@ class LedgerManager:
             if product:
                 session.delete(product)
                 session.commit()
+                _notify_write("products", product_id)
                 logger.info(f"제품 레코드 및 관련 데이터 삭제 완료 - ID: {product_id}")
                 return {
                     "ok": True,
@@ -0,0 +1,247 @@
+"""
+이미지/링크 접근성 검사 서비스 (동시 프로빙 + 영속 TTL 캐시).
+
+홍보글 생성 재시도와 감사(audit) 과정에서 같은 CDN 이미지 URL 을 반복해서 HEAD 하던 것을
+한 번의 병렬 검사 + 결과 캐시로 바꿉니다.
+
+- 원격 URL: 고유 URL 만 ThreadPoolExecutor(LINK_CHECK_WORKERS, 기본 8)로 동시에 HEAD(실패 시 GET stream) 합니다.
+- 결과 캐시: data/link_check_cache.db (SQLite). 성공/실패 모두 저장하며 TTL 이 다릅니다.
+  - 성공(2xx/3xx)          LINK_CHECK_OK_TTL   (기본 7일)
+  - HTTP 오류(4xx/5xx)     LINK_CHECK_FAIL_TTL (기본 1시간)
+  - 네트워크 예외(타임아웃 등) LINK_CHECK_ERROR_TTL (기본 5분, 일시 장애를 오래 기억하지 않음)
+- 로컬 경로: 네트워크를 타지 않고 os.stat 만 하며, 결과를 프로세스 메모리에 짧게(LOCAL_STAT_TTL 30초) 캐시합니다.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "link_check_cache.db"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+LOCAL_STAT_TTL = 30.0
+
+_MD_IMAGE_RE = re.compile(r"!\[.*?\]\((.*?)\)")
+_HTML_IMAGE_RE = re.compile(r'<img[^>]+src="([^">]+)"')
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def extract_image_urls(content: str) -> List[str]:
+    """마크다운 ![alt](url "title") 과 HTML <img src="..."> 의 이미지 URL (등장 순서, 중복 제거)."""
+    urls: List[str] = []
+    for m in _MD_IMAGE_RE.findall(content or ""):
+        # url 뒤에 title 이 올 수 있으므로 첫 토큰만 사용
+        parts = m.split(maxsplit=1)
+        if parts:
+            urls.append(parts[0])
+    urls.extend(_HTML_IMAGE_RE.findall(content or ""))
+    seen = set()
+    out = []
+    for u in urls:
+        u = u.strip()
+        if u and not u.startswith("data:") and u not in seen:
+            seen.add(u)
+            out.append(u)
+    return out
+
+
+@dataclass
+class LinkCheckResult:
+    url: str
+    ok: bool
+    status: int = 0  # HTTP 상태 (로컬/예외는 0)
+    error: str = ""
+    checked_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def is_local(self) -> bool:
+        return not self.url.startswith("http")
+
+    def message(self) -> str:
+        """PromotionValidator.verify_image_links 의 기존 오류 문구."""
+        if self.ok:
+            return ""
+        if self.is_local:
+            return f"Missing local image file: {self.url}"
+        if self.status:
+            return f"Broken image link: {self.url} (Status: {self.status})"
+        return f"Error checking image {self.url}: {self.error}"
+
+
+class LinkChecker:
+    """URL 접근성 검사 (SQLite 결과 캐시 + 제한된 동시 프로빙)."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        timeout: float = 5.0,
+        ok_ttl: Optional[float] = None,
+        fail_ttl: Optional[float] = None,
+        error_ttl: Optional[float] = None,
+    ):
+        self.db_path = str(db_path or os.getenv("LINK_CHECK_DB") or DEFAULT_DB_PATH)
+        self.max_workers = max(1, int(max_workers or _env_float("LINK_CHECK_WORKERS", 8)))
+        self.timeout = timeout
+        self.ok_ttl = ok_ttl if ok_ttl is not None else _env_float("LINK_CHECK_OK_TTL", 7 * 86400.0)
+        self.fail_ttl = fail_ttl if fail_ttl is not None else _env_float("LINK_CHECK_FAIL_TTL", 3600.0)
+        self.error_ttl = error_ttl if error_ttl is not None else _env_float("LINK_CHECK_ERROR_TTL", 300.0)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stat_cache: Dict[str, Tuple[float, bool]] = {}
+        self.probes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS link_checks (
+                url TEXT PRIMARY KEY,
+                ok INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                error TEXT,
+                checked_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ---- 로컬 경로 ----
+
+    def _check_local(self, path: str) -> LinkCheckResult:
+        now = time.monotonic()
+        hit = self._stat_cache.get(path)
+        if hit and now - hit[0] < LOCAL_STAT_TTL:
+            return LinkCheckResult(path, hit[1], cached=True)
+        try:
+            os.stat(path)
+            exists = True
+        except OSError:
+            exists = False
+        self._stat_cache[path] = (now, exists)
+        return LinkCheckResult(path, exists, checked_at=time.time())
+
+    # ---- 원격 URL ----
+
+    def _session(self):
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.headers["User-Agent"] = USER_AGENT
+            self._local.session = s
+        return s
+
+    def _probe(self, url: str) -> LinkCheckResult:
+        now = time.time()
+        try:
+            s = self._session()
+            r = s.head(url, timeout=self.timeout, allow_redirects=True)
+            if r.status_code >= 400:
+                # 일부 서버는 HEAD 를 막으므로 GET(stream)으로 재확인
+                r = s.get(url, stream=True, timeout=self.timeout)
+                r.close()
+            return LinkCheckResult(url, r.status_code < 400, status=r.status_code, checked_at=now)
+        except Exception as e:
+            return LinkCheckResult(url, False, error=str(e), checked_at=now)
+
+    def _ttl_for(self, res: LinkCheckResult) -> float:
+        if res.ok:
+            return self.ok_ttl
+        return self.fail_ttl if res.status else self.error_ttl
+
+    def _load_cached(self, urls: List[str], now: float) -> Dict[str, LinkCheckResult]:
+        out: Dict[str, LinkCheckResult] = {}
+        with self._lock:
+            for i in range(0, len(urls), 500):
+                chunk = urls[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT url, ok, status, error, checked_at FROM link_checks "
+                    f"WHERE expires_at > ? AND url IN ({','.join('?' * len(chunk))})",
+                    [now, *chunk],
+                ).fetchall()
+                for url, ok, status, error, checked_at in rows:
+                    out[url] = LinkCheckResult(url, bool(ok), int(status), error or "", checked_at, cached=True)
+        return out
+
+    def _store(self, results: Iterable[LinkCheckResult]) -> None:
+        rows = [
+            (r.url, int(r.ok), int(r.status), r.error, r.checked_at, r.checked_at + self._ttl_for(r))
+            for r in results
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO link_checks (url, ok, status, error, checked_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def check_many(self, urls: Iterable[str], use_cache: bool = True) -> Dict[str, LinkCheckResult]:
+        """고유 URL 별 결과. 캐시 미스인 원격 URL 만 한 번의 병렬 라운드로 검사합니다."""
+        unique = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+        results: Dict[str, LinkCheckResult] = {}
+        remote = []
+        for u in unique:
+            if u.startswith("http"):
+                remote.append(u)
+            else:
+                results[u] = self._check_local(u)
+
+        cached = self._load_cached(remote, time.time()) if (remote and use_cache) else {}
+        results.update(cached)
+        misses = [u for u in remote if u not in cached]
+        if misses:
+            workers = min(self.max_workers, len(misses))
+            if workers == 1:
+                probed = [self._probe(misses[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="linkcheck") as ex:
+                    probed = list(ex.map(self._probe, misses))
+            self.probes += len(probed)
+            self._store(probed)
+            for r in probed:
+                results[r.url] = r
+            logger.debug("링크 검사: %d개 (캐시 %d, 프로빙 %d)", len(unique), len(cached), len(misses))
+        return results
+
+    def check(self, url: str, use_cache: bool = True) -> LinkCheckResult:
+        return self.check_many([url], use_cache=use_cache)[url.strip()]
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM link_checks WHERE url = ?", (url,))
+            self._conn.commit()
+        self._stat_cache.pop(url, None)
+
+
+_CHECKERS: Dict[str, LinkChecker] = {}
+_CHECKERS_LOCK = threading.Lock()
+
+
+def get_link_checker(db_path: Optional[str] = None) -> LinkChecker:
+    path = str(db_path or os.getenv("LINK_CHECK_DB") or DEFAULT_DB_PATH)
+    with _CHECKERS_LOCK:
+        if path not in _CHECKERS:
+            _CHECKERS[path] = LinkChecker(path)
+        return _CHECKERS[path]
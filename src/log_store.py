@@ -0,0 +1,357 @@
+"""
+로그 서브시스템: 크기 기반 로테이션, 역방향 tail, 구조화 JSONL 사이드카 + 오프셋 인덱스.
+
+- RotatingLogHandler: LOG_MAX_BYTES(기본 10MB) 초과 시 <log>.1 ... <log>.N 으로 로테이션.
+  여러 프로세스가 같은 파일에 쓰는 경우, 다른 프로세스가 로테이션한 것을 감지하면 새 파일을 다시 엽니다.
+- tail_lines: 파일 끝에서 블록 단위로 거꾸로 읽어 마지막 N줄만 반환 (파일 크기와 무관한 비용).
+- JsonlSidecarHandler: LOG_JSONL=1 이면 <log>.jsonl 에 레코드를 JSON 한 줄로 기록하고,
+  <log>.jsonl.idx 에 (바이트 오프셋, 시각, 레벨, product_id) 인덱스를 함께 남깁니다.
+- query_log: 인덱스만 읽어 product_id/레벨/시간 조건으로 거른 뒤 해당 오프셋만 seek 하여 읽습니다.
+- stage_breakdown: 제품 하나의 span 이벤트(src.utils.span)를 모아 단계별 소요 시간/재시도/결과를 반환합니다.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl  # 프로세스 간 잠금 (Windows 에는 없음: 프로세스 내 잠금 + O_APPEND 만 사용)
+except ImportError:
+    fcntl = None
+
+DEFAULT_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+DEFAULT_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+JSONL_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+_TAIL_BLOCK_SIZE = 8192
+
+# 메시지 본문에서 제품 ID 추출 (예: 20260214-105333-global-merchant-crypto-checkou)
+_PRODUCT_ID_RE = re.compile(r"\b(\d{8}-\d{6}-[A-Za-z0-9][A-Za-z0-9-]*)")
+
+
+def jsonl_enabled() -> bool:
+    return os.getenv("LOG_JSONL", "0").lower() in ("1", "true", "yes")
+
+
+# -----------------------------
+# Tail
+# -----------------------------
+
+
+def tail_lines(path, n: int = 50, encoding: str = "utf-8") -> List[str]:
+    """파일 끝에서 거꾸로 seek 하여 마지막 n줄을 반환합니다 (전체 파일을 읽지 않음)."""
+    n = max(1, int(n))
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        chunks: List[bytes] = []
+        newlines = 0
+        # 마지막 줄 끝의 개행은 세지 않도록 n+1 개를 찾을 때까지 읽음
+        while pos > 0 and newlines <= n:
+            step = min(_TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    data = b"".join(reversed(chunks))
+    return data.decode(encoding, errors="ignore").splitlines()[-n:]
+
+
+# -----------------------------
+# Handlers
+# -----------------------------
+
+
+class RotatingLogHandler(RotatingFileHandler):
+    """크기 기반 로테이션 핸들러 (다른 프로세스의 로테이션을 감지하여 새 파일로 전환)."""
+
+    def __init__(self, filename, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT, encoding: str = "utf-8", delay: bool = False):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=delay)
+
+    def _reopen_if_rotated(self) -> None:
+        if self.stream is None:
+            return
+        try:
+            disk = os.stat(self.baseFilename)
+            mine = os.fstat(self.stream.fileno())
+            if (disk.st_ino, disk.st_dev) == (mine.st_ino, mine.st_dev):
+                return
+        except OSError:
+            pass
+        self.stream.close()
+        self.stream = self._open()
+
+    def shouldRollover(self, record) -> bool:
+        self._reopen_if_rotated()
+        return super().shouldRollover(record)
+
+
+def extract_product_id(record: logging.LogRecord) -> str:
+    pid = getattr(record, "product_id", None)
+    if pid:
+        return str(pid)
+    m = _PRODUCT_ID_RE.search(record.getMessage())
+    return m.group(1) if m else ""
+
+
+def _rotate_pair(base: str, backup_count: int) -> None:
+    """<base>.jsonl(+.idx) 를 <base>.jsonl.1(+.idx) ... 로 밀어냅니다."""
+    for i in range(backup_count - 1, 0, -1):
+        for suffix in ("", INDEX_SUFFIX):
+            src, dst = f"{base}.{i}{suffix}", f"{base}.{i + 1}{suffix}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+    for suffix in ("", INDEX_SUFFIX):
+        if os.path.exists(base + suffix):
+            os.replace(base + suffix, f"{base}.1{suffix}")
+
+
+def _unlock_close(fd: int) -> None:
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except OSError:
+            pass
+    os.close(fd)
+
+
+class JsonlSidecarHandler(logging.Handler):
+    """레코드를 <log>.jsonl 에 기록하고 <log>.jsonl.idx 에 바이트 오프셋 인덱스를 남깁니다."""
+
+    def __init__(self, log_path, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT):
+        super().__init__()
+        self.path = str(log_path) + JSONL_SUFFIX
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+    def _open_locked(self) -> int:
+        """<log>.jsonl 을 O_APPEND 로 열고 프로세스 간 잠금을 잡습니다.
+
+        잠금을 기다리는 동안 다른 프로세스가 로테이션했으면(경로의 inode 가 바뀜) 새 파일로 다시 엽니다.
+        """
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                disk = os.stat(self.path)
+                mine = os.fstat(fd)
+                if (disk.st_ino, disk.st_dev) == (mine.st_ino, mine.st_dev):
+                    return fd
+            except OSError:
+                pass
+            _unlock_close(fd)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = {
+                "ts": round(record.created, 3),
+                "level": record.levelname,
+                "logger": record.name,
+                "product_id": extract_product_id(record),
+                "msg": record.getMessage(),
+            }
+            if record.exc_info:
+                entry["exc"] = logging.Formatter().formatException(record.exc_info)
+            elif record.exc_text:
+                # 큐 핸들러를 거친 레코드는 예외가 문자열로 확정되어 있음
+                entry["exc"] = record.exc_text
+            event = getattr(record, "event", None)
+            if isinstance(event, dict):
+                entry["event"] = event
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            with self.lock:
+                fd = self._open_locked()
+                try:
+                    if self.max_bytes and os.fstat(fd).st_size + len(line) > self.max_bytes:
+                        _rotate_pair(self.path, self.backup_count)
+                        _unlock_close(fd)
+                        fd = self._open_locked()
+                    # O_APPEND 쓰기 후의 fd 위치에서 오프셋을 계산: 다른 프로세스가 같은 파일에 덧붙여도 정확함
+                    os.write(fd, line)
+                    offset = os.lseek(fd, 0, os.SEEK_CUR) - len(line)
+                    idx = json.dumps([offset, entry["ts"], entry["level"], entry["product_id"]], ensure_ascii=False)
+                    with open(self.path + INDEX_SUFFIX, "a", encoding="utf-8") as f:
+                        f.write(idx + "\n")
+                finally:
+                    _unlock_close(fd)
+        except Exception:
+            self.handleError(record)
+
+
+def build_file_handlers(log_path, max_bytes: int = DEFAULT_MAX_BYTES, backup_count: int = DEFAULT_BACKUP_COUNT) -> List[logging.Handler]:
+    """로테이션 파일 핸들러 (+ LOG_JSONL=1 이면 JSONL 사이드카) 목록을 반환합니다."""
+    handlers: List[logging.Handler] = [RotatingLogHandler(log_path, max_bytes=max_bytes, backup_count=backup_count)]
+    if jsonl_enabled():
+        handlers.append(JsonlSidecarHandler(log_path, max_bytes=max_bytes, backup_count=backup_count))
+    return handlers
+
+
+# -----------------------------
+# Index query
+# -----------------------------
+
+
+class _SegmentIndex:
+    """JSONL 세그먼트 하나의 인덱스 (파일에 추가된 부분만 이어서 읽음)."""
+
+    def __init__(self, jsonl_path: str):
+        self.jsonl_path = jsonl_path
+        self.idx_path = jsonl_path + INDEX_SUFFIX
+        self.identity = None
+        self.read_pos = 0
+        self.entries: List[list] = []  # [offset, ts, level, product_id]
+        self.by_product: Dict[str, List[int]] = {}
+
+    def refresh(self) -> None:
+        try:
+            st = os.stat(self.idx_path)
+        except OSError:
+            self.identity, self.read_pos, self.entries, self.by_product = None, 0, [], {}
+            return
+        identity = (st.st_ino, st.st_dev)
+        if identity != self.identity or st.st_size < self.read_pos:
+            self.identity, self.read_pos, self.entries, self.by_product = identity, 0, [], {}
+        if st.st_size == self.read_pos:
+            return
+        with open(self.idx_path, "rb") as f:
+            f.seek(self.read_pos)
+            data = f.read()
+        # 마지막 줄이 아직 다 써지지 않았으면 다음에 다시 읽음
+        complete = data.rfind(b"\n") + 1
+        for raw in data[:complete].splitlines():
+            try:
+                item = json.loads(raw)
+            except ValueError:
+                continue
+            pos = len(self.entries)
+            self.entries.append(item)
+            if item[3]:
+                self.by_product.setdefault(item[3], []).append(pos)
+        self.read_pos += complete
+
+    def read_records(self, positions: List[int]) -> List[Dict[str, Any]]:
+        records = []
+        with open(self.jsonl_path, "rb") as f:
+            for pos in positions:
+                f.seek(self.entries[pos][0])
+                try:
+                    records.append(json.loads(f.readline()))
+                except ValueError:
+                    continue
+        return records
+
+
+_INDEX_CACHE: Dict[str, _SegmentIndex] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def _segment(jsonl_path: str) -> _SegmentIndex:
+    with _INDEX_LOCK:
+        seg = _INDEX_CACHE.get(jsonl_path)
+        if seg is None:
+            seg = _INDEX_CACHE[jsonl_path] = _SegmentIndex(jsonl_path)
+        seg.refresh()
+        return seg
+
+
+def query_log(
+    log_path,
+    product_id: Optional[str] = None,
+    level: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+) -> Dict[str, Any]:
+    """JSONL 사이드카를 최신순으로 페이지 조회합니다.
+
+    cursor 는 이전 응답의 next_cursor ("<세그먼트번호>:<위치>") 이며, 그보다 오래된 레코드를 반환합니다.
+    """
+    base = str(log_path) + JSONL_SUFFIX
+    limit = max(1, min(1000, int(limit)))
+    level = level.upper() if level else None
+    seg_no, start = 0, None
+    if cursor:
+        try:
+            seg_part, pos_part = cursor.split(":", 1)
+            seg_no, start = int(seg_part), int(pos_part)
+        except ValueError:
+            seg_no, start = 0, None
+
+    records: List[Dict[str, Any]] = []
+    next_cursor = None
+    while seg_no <= backup_count and len(records) < limit:
+        path = base if seg_no == 0 else f"{base}.{seg_no}"
+        if not os.path.exists(path + INDEX_SUFFIX):
+            break
+        seg = _segment(path)
+        candidates = seg.by_product.get(product_id, []) if product_id else range(len(seg.entries))
+        hi = len(seg.entries) if start is None else start
+        picked: List[int] = []
+        for pos in reversed(candidates):
+            if pos >= hi:
+                continue
+            _, ts, lvl, _ = seg.entries[pos]
+            if until is not None and ts > until:
+                continue
+            if since is not None and ts < since:
+                # 여러 프로세스/큐를 거친 레코드는 인덱스 순서와 시각 순서가 다를 수 있으므로 멈추지 않고 거름
+                continue
+            if level and lvl != level:
+                continue
+            picked.append(pos)
+            if len(records) + len(picked) >= limit:
+                next_cursor = f"{seg_no}:{pos}"
+                break
+        records.extend(seg.read_records(picked))
+        if next_cursor:
+            break
+        seg_no, start = seg_no + 1, None
+
+    return {"records": records, "next_cursor": next_cursor}
+
+
+def stage_breakdown(log_path, product_id: str, limit: int = 1000) -> Dict[str, Any]:
+    """제품의 span 이벤트를 시간순으로 모으고 단계(span 경로)별 합계를 계산합니다 (LOG_JSONL=1 필요)."""
+    events: List[Dict[str, Any]] = []
+    cursor = None
+    scanned = 0
+    while scanned < limit:
+        page = query_log(log_path, product_id=product_id, limit=min(500, limit - scanned), cursor=cursor)
+        scanned += len(page["records"])
+        for rec in page["records"]:
+            event = rec.get("event")
+            if isinstance(event, dict) and event.get("type") == "span":
+                events.append(dict(event, ts=rec.get("ts")))
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    events.sort(key=lambda e: e.get("ts") or 0)
+    stages: Dict[str, Dict[str, Any]] = {}
+    for e in events:
+        agg = stages.setdefault(e["span"], {"span": e["span"], "count": 0, "total_ms": 0.0, "retries": 0, "errors": 0})
+        agg["count"] += 1
+        agg["total_ms"] = round(agg["total_ms"] + float(e.get("ms") or 0), 1)
+        agg["retries"] += int(e.get("retries") or 0)
+        agg["errors"] += 1 if e.get("outcome") == "error" else 0
+    return {"product_id": product_id, "events": events, "stages": list(stages.values())}
+
+
+def recent_lines(log_path, n: int = 50) -> List[str]:
+    """대시보드용 최근 로그 n줄 (파일이 없으면 안내 문구)."""
+    if not os.path.exists(log_path):
+        return ["Log file not found"]
+    try:
+        return [l.strip() for l in tail_lines(log_path, n)]
+    except Exception:
+        return ["Failed to read log file"]
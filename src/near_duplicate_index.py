@@ -0,0 +1,433 @@
+"""
+근사 중복(near-duplicate) 콘텐츠 인덱스 (SimHash + 밴드 LSH).
+
+정확 일치(SHA-256/MD5)만으로는 문장 몇 개만 바뀐 제품/홍보글을 잡지 못하므로,
+문서마다 64비트 SimHash 지문을 만들어 해밍 거리로 유사도를 판단합니다.
+
+- 지문: 소문자 단어 3-gram 셰이글을 64비트로 해시하여 빈도 가중 SimHash
+- 조회: 64비트를 16비트 밴드 4개로 나눠 밴드별 버킷에 저장합니다.
+  해밍 거리 3 이하인 두 지문은 비둘기집 원리로 최소 한 밴드가 완전히 같으므로,
+  버킷 후보만 비교해도 누락이 없습니다 (문서 수와 무관하게 조회 비용이 거의 일정).
+- 저장: data/near_dup_index.db (SQLite). 메모리 버킷은 rowid 이후 추가분만 읽어 갱신하므로
+  여러 프로세스(데몬/대시보드/도구)가 같은 인덱스를 공유해도 증분 반영됩니다.
+
+문서 종류(kind): product(제품 마크다운), landing(랜딩 카피), promotion(홍보글)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from html import unescape
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "near_dup_index.db"
+
+FINGERPRINT_BITS = 64
+BAND_BITS = 16
+BANDS = FINGERPRINT_BITS // BAND_BITS
+SHINGLE_SIZE = 3
+# 밴드 4개 기준 누락 없는 최대 거리는 BANDS-1 = 3
+DEFAULT_MAX_DISTANCE = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "3"))
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_MASK64 = (1 << 64) - 1
+
+
+# -----------------------------
+# Fingerprint
+# -----------------------------
+
+
+def html_to_text(html: str) -> str:
+    """태그/스크립트/스타일을 제거한 보이는 텍스트."""
+    return unescape(_TAG_RE.sub(" ", html or ""))
+
+
+def _features(text: str) -> Dict[int, int]:
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i : i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    feats: Dict[int, int] = {}
+    for g in grams:
+        h = int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        feats[h] = feats.get(h, 0) + 1
+    return feats
+
+
+def simhash(text: str) -> int:
+    """64비트 SimHash (부호 없는 정수)."""
+    feats = _features(text)
+    if not feats:
+        return 0
+    # 특징마다 64비트를 도는 대신 바이트 위치별 (값 -> 가중치 합) 히스토그램을 모은 뒤 비트로 펼침
+    hist = [[0] * 256 for _ in range(FINGERPRINT_BITS // 8)]
+    total = 0
+    for h, w in feats.items():
+        total += w
+        for i, byte in enumerate(h.to_bytes(8, "little")):
+            hist[i][byte] += w
+    out = 0
+    for i, counts in enumerate(hist):
+        for bit in range(8):
+            if _bit_weight(counts, bit) * 2 > total:
+                out |= 1 << (i * 8 + bit)
+    return out
+
+
+def _bit_weight(counts: List[int], bit: int) -> int:
+    """바이트 값 히스토그램에서 해당 비트가 1인 값들의 가중치 합 (슬라이스 합으로 계산)."""
+    run = 1 << bit
+    period = run * 2
+    if run <= 8:
+        # 비트가 1인 값은 period 간격의 run 개 계열
+        return sum(sum(counts[k::period]) for k in range(run, period))
+    # 비트가 1인 값은 길이 run 의 연속 구간 256/period 개
+    return sum(sum(counts[start : start + run]) for start in range(run, 256, period))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def _bands(fp: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(fp >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def _to_signed(fp: int) -> int:
+    # SQLite INTEGER 는 부호 있는 64비트
+    return fp - (1 << 64) if fp >= (1 << 63) else fp
+
+
+def _to_unsigned(v: int) -> int:
+    return v & _MASK64
+
+
+# -----------------------------
+# Index
+# -----------------------------
+
+
+@dataclass(frozen=True)
+class NearDuplicateMatch:
+    doc_id: str
+    kind: str
+    product_id: str
+    distance: int
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def similarity(self) -> float:
+        return round(1.0 - self.distance / FINGERPRINT_BITS, 4)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "doc_id": self.doc_id,
+            "kind": self.kind,
+            "product_id": self.product_id,
+            "distance": self.distance,
+            "similarity": self.similarity,
+            "meta": dict(self.meta),
+        }
+
+
+class NearDuplicateIndex:
+    """SQLite 에 영속화되는 SimHash 근사 중복 인덱스."""
+
+    def __init__(self, db_path: Optional[str] = None, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.db_path = str(db_path or os.getenv("NEAR_DUP_INDEX_DB") or DEFAULT_DB_PATH)
+        self.max_distance = max_distance
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Tuple[str, str, int, str, Dict[str, Any]]] = {}  # doc_id -> (kind, product_id, fp, source_sig, meta)
+        self._buckets: List[Dict[int, Set[str]]] = [dict() for _ in range(BANDS)]
+        self._last_rowid = 0
+        self._last_count = -1
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                doc_id TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                product_id TEXT,
+                fingerprint INTEGER NOT NULL,
+                source_sig TEXT,
+                meta_json TEXT,
+                updated_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_product ON docs(product_id)")
+        self._conn.commit()
+        self._refresh()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- in-memory buckets ---
+
+    def _bucket_add(self, doc_id: str, fp: int) -> None:
+        for i, b in enumerate(_bands(fp)):
+            self._buckets[i].setdefault(b, set()).add(doc_id)
+
+    def _bucket_remove(self, doc_id: str) -> None:
+        old = self._docs.pop(doc_id, None)
+        if old is None:
+            return
+        for i, b in enumerate(_bands(old[2])):
+            bucket = self._buckets[i].get(b)
+            if bucket:
+                bucket.discard(doc_id)
+
+    def _load_row(self, row) -> None:
+        doc_id, kind, product_id, fp, sig, meta_json = row
+        self._bucket_remove(doc_id)
+        try:
+            meta = json.loads(meta_json) if meta_json else {}
+        except ValueError:
+            meta = {}
+        fp = _to_unsigned(fp)
+        self._docs[doc_id] = (kind, product_id or "", fp, sig or "", meta)
+        self._bucket_add(doc_id, fp)
+
+    def _load_since(self, seq: int) -> None:
+        rows = self._conn.execute(
+            "SELECT seq, doc_id, kind, product_id, fingerprint, source_sig, meta_json FROM docs WHERE seq > ? ORDER BY seq",
+            (seq,),
+        ).fetchall()
+        for row in rows:
+            self._load_row(row[1:])
+            self._last_rowid = row[0]
+
+    def _refresh(self) -> None:
+        """다른 프로세스가 추가/갱신한 문서를 증분 반영 (삭제가 있었으면 전체 재적재)."""
+        with self._lock:
+            max_seq, count = self._conn.execute("SELECT COALESCE(MAX(seq), 0), COUNT(*) FROM docs").fetchone()
+            if max_seq == self._last_rowid and count == self._last_count:
+                return
+            if max_seq > self._last_rowid:
+                self._load_since(self._last_rowid)
+            if count != len(self._docs):
+                self._docs.clear()
+                self._buckets = [dict() for _ in range(BANDS)]
+                self._last_rowid = 0
+                self._load_since(0)
+            self._last_count = count
+
+    # --- write ---
+
+    def add(
+        self,
+        doc_id: str,
+        text: str,
+        kind: str = "product",
+        product_id: str = "",
+        meta: Optional[Dict[str, Any]] = None,
+        source_sig: str = "",
+    ) -> int:
+        """문서를 추가/갱신하고 지문을 반환합니다. source_sig 가 같으면 재계산하지 않습니다."""
+        with self._lock:
+            cur = self._docs.get(doc_id)
+            if cur is not None and source_sig and cur[3] == source_sig:
+                return cur[2]
+        fp = simhash(text)
+        self.add_fingerprint(doc_id, fp, kind=kind, product_id=product_id, meta=meta, source_sig=source_sig)
+        return fp
+
+    def add_fingerprint(
+        self,
+        doc_id: str,
+        fp: int,
+        kind: str = "product",
+        product_id: str = "",
+        meta: Optional[Dict[str, Any]] = None,
+        source_sig: str = "",
+    ) -> None:
+        meta_json = json.dumps(meta or {}, ensure_ascii=False)
+        with self._lock:
+            self._refresh()
+            conn = self._conn
+            # 갱신 시 seq 를 새로 부여해야 다른 프로세스의 증분 읽기에 잡힘
+            conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+            cur = conn.execute(
+                "INSERT INTO docs (doc_id, kind, product_id, fingerprint, source_sig, meta_json, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (doc_id, kind, product_id, _to_signed(fp), source_sig, meta_json, time.time()),
+            )
+            conn.commit()
+            self._load_row((doc_id, kind, product_id, _to_signed(fp), source_sig, meta_json))
+            self._last_rowid = max(self._last_rowid, cur.lastrowid)
+            self._last_count = len(self._docs)
+
+    def update_meta(self, doc_id: str, **meta: Any) -> None:
+        with self._lock:
+            cur = self._docs.get(doc_id)
+        if cur is None:
+            return
+        kind, product_id, fp, sig, old_meta = cur
+        self.add_fingerprint(doc_id, fp, kind=kind, product_id=product_id, meta={**old_meta, **meta}, source_sig=sig)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._refresh()
+            self._conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+            self._bucket_remove(doc_id)
+            self._last_count = len(self._docs)
+
+    def remove_product(self, product_id: str) -> None:
+        with self._lock:
+            doc_ids = [d for d, v in self._docs.items() if v[1] == product_id]
+        for doc_id in doc_ids:
+            self.remove(doc_id)
+
+    # --- read ---
+
+    def query_fingerprint(
+        self,
+        fp: int,
+        kind: Optional[str] = None,
+        max_distance: Optional[int] = None,
+        exclude_product: Optional[str] = None,
+        exclude_doc: Optional[str] = None,
+        refresh: bool = True,
+    ) -> List[NearDuplicateMatch]:
+        """지문과 해밍 거리 max_distance 이하인 문서를 가까운 순으로 반환합니다."""
+        if refresh:
+            self._refresh()
+        limit = self.max_distance if max_distance is None else max_distance
+        if fp == 0:
+            return []
+        matches: List[NearDuplicateMatch] = []
+        with self._lock:
+            candidates: Set[str] = set()
+            for i, b in enumerate(_bands(fp)):
+                candidates |= self._buckets[i].get(b, set())
+            for doc_id in candidates:
+                d_kind, d_pid, d_fp, _, d_meta = self._docs[doc_id]
+                if kind and d_kind != kind:
+                    continue
+                if doc_id == exclude_doc or (exclude_product and d_pid == exclude_product):
+                    continue
+                dist = hamming(fp, d_fp)
+                if dist <= limit:
+                    matches.append(NearDuplicateMatch(doc_id, d_kind, d_pid, dist, dict(d_meta)))
+        matches.sort(key=lambda m: (m.distance, m.doc_id))
+        return matches
+
+    def query(self, text: str, **kwargs: Any) -> List[NearDuplicateMatch]:
+        return self.query_fingerprint(simhash(text), **kwargs)
+
+    def find_near_duplicate(self, text: str, **kwargs: Any) -> Optional[NearDuplicateMatch]:
+        matches = self.query(text, **kwargs)
+        return matches[0] if matches else None
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        with self._lock:
+            cur = self._docs.get(doc_id)
+        if cur is None:
+            return None
+        kind, product_id, fp, sig, meta = cur
+        return {"doc_id": doc_id, "kind": kind, "product_id": product_id, "fingerprint": fp, "source_sig": sig, "meta": dict(meta)}
+
+    def doc_ids(self, kind: Optional[str] = None) -> List[str]:
+        self._refresh()
+        with self._lock:
+            return [d for d, v in self._docs.items() if not kind or v[0] == kind]
+
+    def clusters(self, kind: Optional[str] = None, max_distance: Optional[int] = None) -> List[List[NearDuplicateMatch]]:
+        """서로 근사 중복인 문서 묶음 (보고용, 각 묶음은 2개 이상)."""
+        self._refresh()
+        with self._lock:
+            items = [(d, v) for d, v in self._docs.items() if not kind or v[0] == kind]
+        seen: Set[str] = set()
+        groups: List[List[NearDuplicateMatch]] = []
+        for doc_id, (d_kind, d_pid, d_fp, _, d_meta) in sorted(items):
+            if doc_id in seen:
+                continue
+            near = self.query_fingerprint(d_fp, kind=kind, max_distance=max_distance, exclude_doc=doc_id, refresh=False)
+            near = [m for m in near if m.doc_id not in seen]
+            if not near:
+                continue
+            seen.add(doc_id)
+            seen.update(m.doc_id for m in near)
+            groups.append([NearDuplicateMatch(doc_id, d_kind, d_pid, 0, dict(d_meta))] + near)
+        return groups
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+# -----------------------------
+# Document helpers
+# -----------------------------
+
+
+def file_signature(path: Path) -> str:
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def doc_id_for(kind: str, product_id: str, name: str = "") -> str:
+    return f"{kind}:{product_id}" + (f":{name}" if name else "")
+
+
+def index_product_outputs(index: NearDuplicateIndex, product_dir: Path) -> int:
+    """outputs/<id> 의 제품 마크다운/랜딩/홍보글을 인덱스에 반영 (파일 크기+mtime 이 같으면 건너뜀).
+
+    반환: 새로 지문을 계산한 문서 수
+    """
+    product_dir = Path(product_dir)
+    product_id = product_dir.name
+    promos = product_dir / "promotions"
+    blog = next((p for p in (promos / "blog_longform.md", promos / "blog_post.md") if p.exists()), promos / "blog_post.md")
+    sources: Iterable[Tuple[str, str, Path]] = (
+        ("product", "", product_dir / "product_en.md"),
+        ("landing", "", product_dir / "index.html"),
+        ("promotion", "blog", blog),
+    )
+    updated = 0
+    for kind, name, path in sources:
+        if not path.exists():
+            continue
+        doc_id = doc_id_for(kind, product_id, name)
+        sig = file_signature(path)
+        cur = index.get(doc_id)
+        if cur and cur["source_sig"] == sig:
+            continue
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        if path.suffix == ".html":
+            text = html_to_text(text)
+        index.add(doc_id, text, kind=kind, product_id=product_id, meta=(cur or {}).get("meta"), source_sig=sig)
+        updated += 1
+    return updated
+
+
+_INDEX: Optional[NearDuplicateIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """프로세스 전역 인덱스 싱글톤."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = NearDuplicateIndex()
+        return _INDEX
@@ -1,12 +1,14 @@
+import hashlib
+import json
 import os
 import shutil
+import zipfile
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from .config import Config
 from .utils import (
     ProductionError,
-    calculate_file_checksum,
     get_logger,
     handle_errors,
     retry_on_failure,
@@ -14,13 +16,155 @@ from .utils import (
 
 logger = get_logger(__name__)
 
+# 이미 압축된 포맷은 deflate 해도 크기가 줄지 않으므로 그대로 저장
+STORED_EXTENSIONS = {
+    ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz",
+    ".mp3", ".mp4", ".woff", ".woff2",
+}
+# 결정적(deterministic) ZIP 출력을 위한 고정 타임스탬프 (ZIP 포맷 최소값)
+ZIP_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# 이전 패키징 결과물은 다시 패키지에 포함하지 않음
+_PACKAGE_ARTIFACT_PREFIX = "package"
+# 증분 빌드 메타데이터(렌더 키/빌드 키/빌드 매니페스트/QA 캐시)는 배포물이 아님
+BUILD_METADATA_NAMES = {
+    ".render_key", ".build_manifest.json", ".build_manifest.tmp",
+    ".qa_cache.json", ".qa_cache.json.tmp",
+}
+BUILD_METADATA_SUFFIXES = (".buildkey",)
+
+
+class _HashingWriter:
+    """ZIP 바이트를 파일에 쓰면서 동시에 SHA256을 계산하는 래퍼.
+
+    seek/tell을 제공하지 않으므로 zipfile은 스트리밍 모드(data descriptor)로
+    기록하며, 이미 쓴 바이트를 되돌아가 수정하지 않습니다.
+    """
+
+    def __init__(self, fp):
+        self._fp = fp
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self.size += len(data)
+        return self._fp.write(data)
+
+    def flush(self) -> None:
+        self._fp.flush()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _zip_info(arcname: str) -> zipfile.ZipInfo:
+    zinfo = zipfile.ZipInfo(arcname, date_time=ZIP_FIXED_DATE_TIME)
+    zinfo.external_attr = 0o644 << 16
+    if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def iter_tree_entries(
+    source_dir: str, prefix: str = "", exclude_prefix: Optional[str] = None
+) -> Iterable[Tuple[str, str]]:
+    """source_dir 아래 파일을 (arcname, 절대경로) 형태로 정렬된 순서로 반환합니다."""
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        rel_root = os.path.relpath(root, source_dir)
+        for name in sorted(files):
+            if (
+                exclude_prefix
+                and rel_root == "."
+                and name.startswith(exclude_prefix)
+                and name.endswith(".zip")
+            ):
+                continue
+            if name in BUILD_METADATA_NAMES or name.endswith(BUILD_METADATA_SUFFIXES):
+                continue
+            rel = name if rel_root == "." else os.path.join(rel_root, name)
+            arcname = rel.replace(os.sep, "/")
+            if prefix:
+                arcname = f"{prefix}/{arcname}"
+            yield arcname, os.path.join(root, name)
+
+
+def write_deterministic_zip(
+    dest_path: str,
+    file_entries: Iterable[Tuple[str, str]],
+    generated: Optional[Dict[str, str]] = None,
+) -> Tuple[str, int]:
+    """파일 트리와 메모리상 생성 파일을 한 번에 ZIP으로 스트리밍 기록합니다.
+
+    - 임시 복사본 없이 원본 파일에서 바로 읽어 씁니다.
+    - 엔트리 순서/타임스탬프/권한을 고정하여 동일 입력이면 동일 바이트가 나옵니다.
+    - 쓰는 동안 SHA256을 계산하므로 결과 파일을 다시 읽지 않습니다.
+    - 임시 파일에 쓴 뒤 os.replace로 원자적으로 배치합니다.
+
+    Returns:
+        (sha256 체크섬, 바이트 크기)
+    """
+    entries = {arcname: path for arcname, path in file_entries}
+    generated = generated or {}
+    tmp_path = f"{dest_path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as raw:
+            writer = _HashingWriter(raw)
+            with zipfile.ZipFile(writer, "w") as zf:
+                for arcname in sorted(set(entries) | set(generated)):
+                    zinfo = _zip_info(arcname)
+                    with zf.open(zinfo, "w") as dst:
+                        if arcname in generated:
+                            dst.write(generated[arcname].encode("utf-8"))
+                        else:
+                            with open(entries[arcname], "rb") as src:
+                                shutil.copyfileobj(src, dst, 1024 * 1024)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return writer.hexdigest(), writer.size
+
+
+def place_artifact(src_path: str, dest_path: str) -> str:
+    """src_path를 dest_path에 하드링크로 원자적 배치합니다 (불가 시 복사).
+
+    Returns:
+        "exists" | "linked" | "copied"
+    """
+    if os.path.exists(dest_path):
+        try:
+            if os.path.samefile(src_path, dest_path):
+                return "exists"
+        except OSError:
+            pass
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = f"{dest_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src_path, tmp_path)
+        method = "linked"
+    except OSError:
+        shutil.copy2(src_path, tmp_path)
+        method = "copied"
+    os.replace(tmp_path, dest_path)
+    return method
+
 
 class PackageManager:
     """제품 자산을 판매 가능한 형태로 패키징하는 클래스"""
 
     def __init__(self, download_root_dir: str = Config.DOWNLOAD_DIR):
         self.download_root_dir = download_root_dir
-        os.makedirs(self.download_root_dir, exist_ok=True)
+        # 내용 주소 기반 저장소: 동일한 결정적 ZIP은 <sha256>.zip 하나만 유지
+        self.cas_dir = os.path.join(self.download_root_dir, ".cas")
+        os.makedirs(self.cas_dir, exist_ok=True)
         logger.info(
             f"PackageManager 초기화 완료. 다운로드 루트 디렉토리: {self.download_root_dir}"
         )
@@ -30,18 +174,39 @@ class PackageManager:
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         return f"{product_id}-{timestamp}"
 
-    def _create_dummy_file(self, target_dir: str, filename: str, content: str):
-        """더미 파일을 생성합니다."""
-        filepath = os.path.join(target_dir, filename)
-        try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(content)
-            logger.debug(f"더미 파일 생성: {filepath}")
-            return filepath
-        except Exception as e:
-            raise ProductionError(
-                f"더미 파일 생성 실패: {filepath}, 오류: {e}", stage="Package Manager"
-            )
+    def _generated_files(self, product_id: str) -> Dict[str, str]:
+        """패키지에 메모리상에서 주입되는 파일 (README, LICENSE 등 - 현재는 더미)"""
+        readme_content = f"# {product_id} - 디지털 제품\n\n이것은 {product_id} 주제로 생성된 디지털 제품입니다.\n\n## 포함된 파일\n- `index.html`: 메인 랜딩 페이지\n- `generation_report.json`: 제품 생성 보고서\n\n## 사용 방법\n`index.html` 파일을 웹 브라우저에서 직접 열어보세요.\n\n## 지원\n문의 사항은 `support@example.com`으로 연락주세요.\n"
+        license_content = "MIT License\n\nCopyright (c) 2026 {product_id}\n\nPermission is hereby granted...\n"  # 실제 라이선스 텍스트로 대체
+        return {
+            f"{product_id}/README.md": readme_content,
+            f"{product_id}/LICENSE.md": license_content,
+        }
+
+    def _build_cas_zip(
+        self, product_id: str, product_output_dir: str
+    ) -> Tuple[str, str, int, bool]:
+        """제품 디렉토리를 한 번의 패스로 ZIP으로 만들어 CAS에 저장합니다.
+
+        Returns:
+            (CAS 경로, 체크섬, 크기, 기존 CAS 재사용 여부)
+        """
+        staging_path = os.path.join(self.cas_dir, f"staging-{product_id}-{os.getpid()}.zip")
+        checksum, size = write_deterministic_zip(
+            staging_path,
+            iter_tree_entries(
+                product_output_dir,
+                prefix=product_id,
+                exclude_prefix=_PACKAGE_ARTIFACT_PREFIX,
+            ),
+            generated=self._generated_files(product_id),
+        )
+        cas_path = os.path.join(self.cas_dir, f"{checksum}.zip")
+        if os.path.exists(cas_path):
+            os.remove(staging_path)
+            return cas_path, checksum, size, True
+        os.replace(staging_path, cas_path)
+        return cas_path, checksum, size, False
 
     @handle_errors(stage="Package")
     @retry_on_failure(max_retries=2)
@@ -60,98 +225,48 @@ class PackageManager:
                 product_id=product_id,
             )
 
-        # 패키징을 위한 임시 디렉토리 생성
-        temp_package_dir = os.path.join(
-            self.download_root_dir, f"temp_{product_id}_package"
-        )
-        os.makedirs(temp_package_dir, exist_ok=True)
-
-        # 원본 제품 자산 복사
-        try:
-            # product_output_dir의 내용을 temp_package_dir/product_id_content로 복사
-            # 이렇게 하면 ZIP 파일 내부에 불필요한 상위 디렉토리 없이 실제 콘텐츠가 바로 들어감
-            final_content_dir = os.path.join(
-                temp_package_dir, product_id
-            )  # ZIP 내부의 최상위 폴더명
-            shutil.copytree(product_output_dir, final_content_dir, dirs_exist_ok=True)
-            logger.info(
-                f"제품 자산 복사 완료: {product_output_dir} -> {final_content_dir}"
-            )
-        except Exception as e:
-            shutil.rmtree(temp_package_dir, ignore_errors=True)
-            raise ProductionError(
-                f"제품 자산 복사 실패: {e}", stage="Package", product_id=product_id
-            )
-
-        # 필수 추가 파일 생성 (README, LICENSE 등 - 현재는 더미)
-        readme_content = f"# {product_id} - 디지털 제품\n\n이것은 {product_id} 주제로 생성된 디지털 제품입니다.\n\n## 포함된 파일\n- `index.html`: 메인 랜딩 페이지\n- `generation_report.json`: 제품 생성 보고서\n\n## 사용 방법\n`index.html` 파일을 웹 브라우저에서 직접 열어보세요.\n\n## 지원\n문의 사항은 `support@example.com`으로 연락주세요.\n"
-        license_content = "MIT License\n\nCopyright (c) 2026 {product_id}\n\nPermission is hereby granted...\n"  # 실제 라이선스 텍스트로 대체
-
-        _ = self._create_dummy_file(final_content_dir, "README.md", readme_content)
-        _ = self._create_dummy_file(final_content_dir, "LICENSE.md", license_content)
-
         # ZIP 파일 생성 경로 및 이름
         version = self._generate_version(product_id)
-        zip_filename = f"{version}.zip"
-        zip_filepath_base = os.path.join(self.download_root_dir, version)  # 확장자 제외
+        package_path = os.path.join(self.download_root_dir, f"{version}.zip")
 
         try:
-            # shutil.make_archive는 지정된 소스 디렉토리의 내용을 .zip으로 압축
-            # base_dir이 temp_package_dir이면, ZIP 파일 안에 temp_product_package가 통째로 들어감
-            # base_dir이 final_content_dir이면, ZIP 파일 안에 product_id가 통째로 들어감
-            # root_dir을 download_root_dir로 하고 base_dir을 product_id로 하면,
-            # download_root_dir/temp_product_package/product_id/ -> product_id/ 내의 파일들이 압축됨
-            package_path = shutil.make_archive(
-                zip_filepath_base, "zip", root_dir=temp_package_dir, base_dir=product_id
+            # 원본 트리에서 바로 스트리밍 압축 (임시 복사본 없음, 체크섬 동시 계산)
+            # ZIP 내부 최상위 폴더명은 product_id
+            cas_path, package_checksum, package_size, reused = self._build_cas_zip(
+                product_id, product_output_dir
             )
-            logger.info(f"제품 ZIP 파일 생성 완료: {package_path}")
-
-            # 대시보드 연동을 위해 product_output_dir에 package.zip으로 복사
-            dashboard_package_path = os.path.join(product_output_dir, "package.zip")
-            shutil.copy2(package_path, dashboard_package_path)
-            logger.info(f"대시보드용 package.zip 복사 완료: {dashboard_package_path}")
-
+            if reused:
+                logger.info(f"동일 내용의 패키지 재사용 (CAS): {cas_path}")
+            place_artifact(cas_path, package_path)
+            logger.info(f"제품 ZIP 파일 생성 완료: {package_path} ({package_size} bytes)")
         except Exception as e:
             raise ProductionError(
                 f"제품 ZIP 파일 생성 실패: {e}", stage="Package", product_id=product_id
             )
-        finally:
-            # 임시 디렉토리 정리
-            shutil.rmtree(temp_package_dir, ignore_errors=True)
-            logger.debug(f"임시 패키지 디렉토리 정리 완료: {temp_package_dir}")
-
-        # ZIP 파일 체크섬 계산
-        package_checksum = calculate_file_checksum(package_path)
 
-        # dashboard_server.py 호환을 위해 product_output_dir에 package.zip으로 복사
+        # dashboard_server.py 호환을 위해 동일 아티팩트를 하드링크(불가 시 복사)로 배치
         try:
             target_package_path = os.path.join(product_output_dir, "package.zip")
-            shutil.copy2(package_path, target_package_path)
-            logger.info(f"대시보드 호환용 package.zip 복사 완료: {target_package_path}")
-            
-            # 상위 디렉토리(outputs/<product_id>)에도 복사하여 확실히 접근 가능하게 함
+            method = place_artifact(cas_path, target_package_path)
+            logger.info(f"대시보드 호환용 package.zip 배치 완료 ({method}): {target_package_path}")
+
+            # 상위 디렉토리(outputs/<product_id>)에도 배치하여 확실히 접근 가능하게 함
             # product_output_dir이 이미 outputs/<product_id>인 경우도 있으므로 체크
             parent_dir = os.path.dirname(product_output_dir)
-            if os.path.basename(parent_dir) == "outputs":
-                 # 이미 올바른 위치
-                 pass
-            else:
-                 # outputs/<product_id> 위치를 찾아서 복사
-                 # Config.OUTPUT_DIR/product_id
-                 target_root_package = os.path.join(Config.OUTPUT_DIR, product_id, "package.zip")
-                 if target_root_package != target_package_path:
-                     os.makedirs(os.path.dirname(target_root_package), exist_ok=True)
-                     shutil.copy2(package_path, target_root_package)
-                     logger.info(f"outputs 루트에 package.zip 복사 완료: {target_root_package}")
-
-            # 3. downloads/product_id.zip으로 복사 (Vercel 정적 호스팅용)
+            if os.path.basename(parent_dir) != "outputs":
+                target_root_package = os.path.join(Config.OUTPUT_DIR, product_id, "package.zip")
+                if target_root_package != target_package_path:
+                    method = place_artifact(cas_path, target_root_package)
+                    logger.info(f"outputs 루트에 package.zip 배치 완료 ({method}): {target_root_package}")
+
+            # downloads/product_id.zip (Vercel 정적 호스팅용)
             static_download_path = os.path.join(self.download_root_dir, f"{product_id}.zip")
-            shutil.copy2(package_path, static_download_path)
-            logger.info(f"Vercel 정적 호스팅용 zip 복사 완료: {static_download_path}")
+            method = place_artifact(cas_path, static_download_path)
+            logger.info(f"Vercel 정적 호스팅용 zip 배치 완료 ({method}): {static_download_path}")
 
         except Exception as e:
-            logger.error(f"package.zip 복사 실패: {e}")
-            # 이 복사는 부가적인 작업이므로 실패해도 전체 프로세스를 중단하지는 않음
+            logger.error(f"package.zip 배치 실패: {e}")
+            # 이 배치는 부가적인 작업이므로 실패해도 전체 프로세스를 중단하지는 않음
 
         logger.info(
             f"제품 패키징 완료 - 제품 ID: {product_id}, 패키지 경로: {package_path}, 체크섬: {package_checksum}"
@@ -162,6 +277,8 @@ class PackageManager:
             "version": version,
             "package_path": package_path,
             "checksum": package_checksum,
+            "size_bytes": package_size,
+            "reused": reused,
             "packaged_at": datetime.now().isoformat(),
         }
 
@@ -0,0 +1,307 @@
+"""
+파이프라인 프로파일링 모드 (auto_pilot --profile 또는 PIPELINE_PROFILE=1).
+
+span(handle_errors / mark_stage) 의 시작/종료를 리스너로 받아 한 번의 실행(run)을 기록합니다.
+- timing: 제품별 단계 wall time / 재시도 / 결과 (단계별 p50/p90/p99) (span 이벤트와 같은 경로 이름, 예: Full Pipeline/pdf)
+- cprofile: 단계마다 cProfile (같은 단계는 배치의 여러 제품에 걸쳐 누적) -> <stage>.pstats + 상위 함수
+- sample: 샘플링 스레드가 단계 실행 중인 스레드의 스택을 주기적으로 수집 -> stacks.collapsed
+  (flamegraph.pl / speedscope / inferno 에 그대로 입력 가능한 "stage;frame;frame count" 형식)
+
+모드(PIPELINE_PROFILE 또는 --profile 값): 1/all(cprofile+sample), cprofile, sample, timing.
+결과는 data/perf/<run_id>/ (PIPELINE_PROFILE_DIR 로 변경) 에 report.json 과 함께 저장됩니다.
+제품 출력 폴더(outputs/<product_id>)는 그대로 배포/패키징되고 제품 목록으로도 스캔되므로 쓰지 않습니다.
+두 실행의 비교는 tools/perf_diff.py 를 사용합니다.
+"""
+
+import cProfile
+import json
+import math
+import os
+import platform
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import Span, add_span_listener, get_logger, remove_span_listener
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+MODES = ("all", "cprofile", "sample", "timing")
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+TOP_FUNCTIONS = 25
+
+
+def perf_dir() -> Path:
+    return Path(os.getenv("PIPELINE_PROFILE_DIR") or PROJECT_ROOT / "data" / "perf")
+
+
+def resolve_mode(value: Optional[str]) -> str:
+    """CLI/환경 변수 값을 모드 이름으로 바꿉니다. 비활성이면 ""."""
+    v = (value or "").strip().lower()
+    if v in ("", "0", "false", "no", "off"):
+        return ""
+    if v in ("1", "true", "yes", "on"):
+        return "all"
+    if v not in MODES:
+        raise ValueError(f"Unknown profile mode: {value} (choose from {', '.join(MODES)})")
+    return v
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """정렬된 값의 q 백분위 (nearest-rank). 빈 목록이면 0."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _safe_name(path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", path).strip("_") or "stage"
+
+
+def _frame_label(code) -> str:
+    module = Path(code.co_filename).stem
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class PipelineProfiler:
+    """한 번의 auto_pilot 실행을 프로파일링합니다 (start() ~ stop())."""
+
+    def __init__(self, mode: str = "all", run_id: str = "", out_root: Optional[Path] = None, label: str = ""):
+        self.mode = resolve_mode(mode) or "timing"
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        self.label = label
+        self.out_dir = Path(out_root or perf_dir()) / self.run_id
+        self.interval = float(os.getenv("PIPELINE_PROFILE_INTERVAL_MS", DEFAULT_SAMPLE_INTERVAL_MS)) / 1000.0
+        self.use_cprofile = self.mode in ("all", "cprofile")
+        self.use_sampling = self.mode in ("all", "sample")
+
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+        # 스레드별 진행 중인 단계 스택 (cProfile 은 스레드당 가장 바깥 단계만)
+        self._active: Dict[int, List[Span]] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._profiling: Dict[int, cProfile.Profile] = {}
+        self._stacks: Counter = Counter()
+        self._samples_by_stage: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._t0 = 0.0
+        self._started_at = ""
+
+    # ---- lifecycle ----
+
+    def start(self) -> "PipelineProfiler":
+        self._t0 = time.perf_counter()
+        self._started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        add_span_listener(self._on_span)
+        if self.use_sampling:
+            self._sampler = threading.Thread(target=self._sample_loop, name="pipeline-profiler", daemon=True)
+            self._sampler.start()
+        logger.info(f"[profile] run {self.run_id} 시작 (mode={self.mode})")
+        return self
+
+    def stop(self) -> Path:
+        """리스너/샘플러를 멈추고 보고서를 기록한 뒤 report.json 경로를 반환합니다."""
+        remove_span_listener(self._on_span)
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=2.0)
+        with self._lock:
+            for prof in self._profiling.values():
+                prof.disable()
+            self._profiling.clear()
+        path = self.write_report()
+        logger.info(f"[profile] run {self.run_id} 보고서: {path}")
+        return path
+
+    def __enter__(self) -> "PipelineProfiler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
+
+    # ---- span hooks ----
+
+    def _on_span(self, event: str, sp: Span) -> None:
+        tid = threading.get_ident()
+        if event == "start":
+            if not sp.is_stage:
+                return
+            with self._lock:
+                stack = self._active.setdefault(tid, [])
+                stack.append(sp)
+                if self.use_cprofile and tid not in self._profiling:
+                    prof = self._profiles.setdefault(sp.path, cProfile.Profile())
+                    try:
+                        prof.enable()
+                        self._profiling[tid] = prof
+                    except ValueError:
+                        # 다른 프로파일러(python -m cProfile 등)가 이미 활성
+                        pass
+            return
+
+        if sp.verbose:
+            with self._lock:
+                self._spans.append(
+                    {
+                        "span": sp.path,
+                        "product_id": sp.product_id,
+                        "ms": round(sp.ms, 2),
+                        "retries": sp.retries,
+                        "outcome": sp.outcome,
+                        "stage": sp.is_stage,
+                    }
+                )
+        if not sp.is_stage:
+            return
+        with self._lock:
+            stack = self._active.get(tid, [])
+            if sp in stack:
+                stack.remove(sp)
+            if not stack:
+                self._active.pop(tid, None)
+                prof = self._profiling.pop(tid, None)
+                if prof is not None:
+                    prof.disable()
+
+    # ---- sampling ----
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                active = {tid: stack[-1].path for tid, stack in self._active.items() if stack and tid != own}
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for tid, stage in active.items():
+                frame = frames.get(tid)
+                parts: List[str] = []
+                while frame is not None:
+                    parts.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if not parts:
+                    continue
+                key = ";".join([stage.replace(";", ":"), *reversed(parts)])
+                self._stacks[key] += 1
+                self._samples_by_stage[stage] += 1
+            del frames
+
+    # ---- report ----
+
+    def _stage_summary(self) -> Dict[str, Dict[str, Any]]:
+        by_path: Dict[str, List[float]] = {}
+        meta: Dict[str, Dict[str, int]] = {}
+        for s in self._spans:
+            by_path.setdefault(s["span"], []).append(s["ms"])
+            m = meta.setdefault(s["span"], {"retries": 0, "errors": 0})
+            m["retries"] += s["retries"]
+            m["errors"] += 1 if s["outcome"] == "error" else 0
+        summary = {}
+        for path, values in by_path.items():
+            values = sorted(values)
+            summary[path] = {
+                "count": len(values),
+                "total_ms": round(sum(values), 1),
+                "mean_ms": round(sum(values) / len(values), 1),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p90_ms": round(percentile(values, 90), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "max_ms": round(values[-1], 1),
+                **meta[path],
+            }
+        return summary
+
+    def _top_functions(self, prof: cProfile.Profile) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(prof)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+            rows.append(
+                {
+                    "func": f"{Path(filename).name}:{line}({func})" if line else func,
+                    "ncalls": nc,
+                    "tottime_ms": round(tt * 1000, 2),
+                    "cumtime_ms": round(ct * 1000, 2),
+                }
+            )
+        rows.sort(key=lambda r: -r["cumtime_ms"])
+        return rows[:TOP_FUNCTIONS]
+
+    def write_report(self) -> Path:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        products: Dict[str, Dict[str, Any]] = {}
+        for s in self._spans:
+            pid = s["product_id"] or "-"
+            entry = products.setdefault(pid, {"spans": [], "total_ms": 0.0})
+            entry["spans"].append({k: s[k] for k in ("span", "ms", "retries", "outcome")})
+            if "/" not in s["span"]:
+                entry["total_ms"] = round(entry["total_ms"] + s["ms"], 1)
+
+        files: Dict[str, Any] = {}
+        cprofile_top: Dict[str, List[Dict[str, Any]]] = {}
+        for path, prof in self._profiles.items():
+            try:
+                name = f"{_safe_name(path)}.pstats"
+                prof.dump_stats(str(self.out_dir / name))
+                files.setdefault("pstats", {})[path] = name
+                cprofile_top[path] = self._top_functions(prof)
+            except Exception as e:
+                logger.warning(f"[profile] {path} pstats 저장 실패: {e}")
+        if self._stacks:
+            collapsed = "".join(f"{k} {v}\n" for k, v in sorted(self._stacks.items()))
+            _atomic_write(self.out_dir / "stacks.collapsed", collapsed)
+            files["collapsed"] = "stacks.collapsed"
+
+        report = {
+            "run_id": self.run_id,
+            "label": self.label,
+            "mode": self.mode,
+            "started_at": self._started_at,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_ms": round((time.perf_counter() - self._t0) * 1000.0, 1),
+            "python": platform.python_version(),
+            "argv": sys.argv,
+            "products": products,
+            "stages": self._stage_summary(),
+            "cprofile": cprofile_top,
+            "samples": {
+                "interval_ms": self.interval * 1000.0,
+                "total": sum(self._samples_by_stage.values()),
+                "by_stage": dict(self._samples_by_stage),
+            },
+            "files": files,
+        }
+        path = self.out_dir / "report.json"
+        _atomic_write(path, json.dumps(report, ensure_ascii=False, indent=2))
+        return path
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def start_profiling(mode: Optional[str] = None, run_id: str = "", label: str = "") -> Optional[PipelineProfiler]:
+    """mode(없으면 PIPELINE_PROFILE) 가 켜져 있으면 프로파일러를 시작해 반환하고, 아니면 None."""
+    resolved = resolve_mode(mode if mode is not None else os.getenv("PIPELINE_PROFILE", ""))
+    if not resolved:
+        return None
+    return PipelineProfiler(resolved, run_id=run_id, label=label).start()
+
+
+def list_runs(root: Optional[Path] = None) -> List[Path]:
+    """report.json 이 있는 실행 폴더를 오래된 순으로 반환합니다."""
+    base = Path(root or perf_dir())
+    if not base.exists():
+        return []
+    runs = [p for p in base.iterdir() if (p / "report.json").exists()]
+    return sorted(runs, key=lambda p: (p / "report.json").stat().st_mtime)
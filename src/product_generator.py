@@ -6,12 +6,14 @@ import re
 import time
 import hashlib
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict
 
 from .config import Config
 from .progress_tracker import update_progress
 from .schema_generator import generate_product_schema
 from .schema_validator import run_rule_based_validation
+from .template_engine import RenderCache, compute_render_key, render_fragment, render_template
 from .topic_selector import select_topic
 from .utils import (
     ProductionError,
@@ -143,6 +145,7 @@ def _build_faq_html_from_schema(schema: Dict[str, Any]) -> str:
     return "\n        ".join(parts) if parts else ""
 
 
+@lru_cache(maxsize=1024)
 def _pick_theme_class(title: str) -> str:
     t = (title or "").lower()
     if any(k in t for k in ("course", "cohort", "bootcamp", "academy", "curriculum", "guide", "playbook", "workshop", "masterclass")):
@@ -164,7 +167,8 @@ def _pick_theme_class(title: str) -> str:
     return "theme-default"
 
 
-def _render_landing_html_from_schema(schema: Dict[str, Any], brand: str = "MetaPassiveIncome") -> str:
+def _landing_context_from_schema(schema: Dict[str, Any], brand: str = "MetaPassiveIncome") -> Dict[str, Dict[str, Any]]:
+    """스키마에서 랜딩/체크아웃 렌더링 입력값을 추출합니다 (렌더 키 계산에도 사용)."""
     pid = (schema.get("product_id") or "product").strip()
     sections = schema.get("sections") or {}
     hero = sections.get("hero") or {}
@@ -197,35 +201,85 @@ def _render_landing_html_from_schema(schema: Dict[str, Any], brand: str = "MetaP
         product_price = "$49"
         
     package_filename = schema.get("package_file", "package.zip")
-    
-    # checkout.html 생성
-    checkout_html = _render_checkout_html(
-        product_id=pid,
-        product_price=product_price,
-        product_title=headline,
-        brand=brand
-    )
 
     return {
-        "landing_html": _render_landing_html(
-            product_id=pid,
-            brand=brand,
-            headline=headline,
-            subheadline=subheadline,
-            primary_cta=primary_cta,
-            secondary_cta="Sign In",
-            features_html=features_html or None,
-            pricing_html=pricing_html or None,
-            faq_html=faq_html or None,
-            theme_class=theme_class,
-            design_meta=design,
-            product_price=product_price,
-            package_filename=package_filename
-        ),
-        "checkout_html": checkout_html
+        "landing": {
+            "product_id": pid,
+            "brand": brand,
+            "headline": headline,
+            "subheadline": subheadline,
+            "primary_cta": primary_cta,
+            "secondary_cta": "Sign In",
+            "features_html": features_html or None,
+            "pricing_html": pricing_html or None,
+            "faq_html": faq_html or None,
+            "theme_class": theme_class,
+            "design_meta": design,
+            "product_price": product_price,
+            "package_filename": package_filename,
+        },
+        "checkout": {
+            "product_id": pid,
+            "product_price": product_price,
+            "product_title": headline,
+            "brand": brand,
+        },
     }
 
 
+# 렌더 키(스키마 입력 + 템플릿 버전) -> 렌더 결과
+_RENDER_CACHE = RenderCache()
+# 제품 폴더에 마지막 렌더 키를 기록하는 파일
+RENDER_KEY_FILENAME = ".render_key"
+
+
+def landing_render_key(schema: Dict[str, Any], brand: str = "MetaPassiveIncome") -> str:
+    """스키마의 렌더 키. 값이 같으면 렌더링 결과도 같습니다."""
+    return compute_render_key(_landing_context_from_schema(schema, brand))
+
+
+def _render_landing_html_from_schema(schema: Dict[str, Any], brand: str = "MetaPassiveIncome") -> Dict[str, str]:
+    context = _landing_context_from_schema(schema, brand)
+    render_key = compute_render_key(context)
+    cached = _RENDER_CACHE.get(render_key)
+    if cached is None:
+        cached = {
+            "landing_html": _render_landing_html(**context["landing"]),
+            "checkout_html": _render_checkout_html(**context["checkout"]),
+        }
+        _RENDER_CACHE.put(render_key, cached)
+    return dict(cached)
+
+
+def render_product_pages(
+    schema: Dict[str, Any],
+    product_output_dir: str,
+    brand: str = "MetaPassiveIncome",
+    force: bool = False,
+) -> Dict[str, Any]:
+    """스키마로 index.html/checkout.html을 렌더링하여 저장합니다.
+
+    제품 폴더의 렌더 키가 현재 스키마/템플릿과 같고 index.html이 있으면
+    렌더링과 쓰기를 모두 건너뜁니다 (재배포 시 변경 없는 제품은 그대로 유지).
+    """
+    render_key = landing_render_key(schema, brand)
+    key_path = os.path.join(product_output_dir, RENDER_KEY_FILENAME)
+    index_html_path = os.path.join(product_output_dir, "index.html")
+    if not force and os.path.exists(index_html_path) and os.path.exists(key_path):
+        with open(key_path, "r", encoding="utf-8") as f:
+            if f.read().strip() == render_key:
+                return {"rendered": False, "render_key": render_key, "index_html_path": index_html_path}
+
+    render_result = _render_landing_html_from_schema(schema, brand=brand)
+    landing_html = _sanitize_html(render_result["landing_html"], schema)
+    _validate_html(landing_html)
+    write_text(index_html_path, landing_html)
+    if render_result["checkout_html"]:
+        write_text(os.path.join(product_output_dir, "checkout.html"), render_result["checkout_html"])
+    write_text(key_path, render_key)
+    return {"rendered": True, "render_key": render_key, "index_html_path": index_html_path}
+
+
 def _render_main_content_markdown(schema: Dict[str, Any]) -> str:
     """스키마에서 메인 콘텐츠 파일(product.md)용 마크다운 생성."""
     title = (schema.get("title") or "").strip() or "Product"
@@ -481,1015 +535,40 @@ def _render_landing_html(
     hero_image_url = pool[seed % len(pool)]
 
 
-    # HTML 템플릿 (기존 generator_module.py의 내용을 그대로 사용)
-    html = f"""<!doctype html>
-<html lang=\"en\">
-<head>
-  <meta charset=\"utf-8\" />
-  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-  <meta name=\"description\" content=\"{subheadline}\" />
-  <meta name=\"keywords\" content=\"{headline.replace(' ', ', ')}, digital product, passive income, {brand}\" />
-  <meta property=\"og:title\" content=\"{brand} | {headline}\" />
-  <meta property=\"og:description\" content=\"{subheadline}\" />
-  <meta property=\"og:image\" content=\"{hero_image_url}\" />
-  <meta property=\"og:type\" content=\"website\" />
-  <meta property=\"og:site_name\" content=\"{brand}\" />
-  <meta name=\"twitter:card\" content=\"summary_large_image\" />
-  <meta name=\"twitter:title\" content=\"{brand} | {headline}\" />
-  <meta name=\"twitter:description\" content=\"{subheadline}\" />
-  <meta name=\"twitter:image\" content=\"{hero_image_url}\" />
-  <meta name=\"robots\" content=\"index, follow\" />
-  <link rel=\"canonical\" href=\"https://meta-passive-income-{product_id}.vercel.app\" />
-  
-  <script type=\"application/ld+json\">
-  {{
-    \"@context\": \"https://schema.org/\",
-    \"@type\": \"Product\",
-    \"name\": \"{headline}\",
-    \"description\": \"{subheadline}\",
-    \"brand\": {{
-      \"@type\": \"Brand\",
-      \"name\": \"{brand}\"
-    }},
-    \"offers\": {{
-      \"@type\": \"Offer\",
-      \"priceCurrency\": \"USD\",
-      \"price\": \"{price_numeric}\",
-      \"availability\": \"https://schema.org/InStock\"
-    }}
-  }}
-  </script>
-  <link rel=\"icon\" href=\"data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><rect width=%22100%22 height=%22100%22 fill=%22%2300b4ff%22></rect></svg>\">
-  <title>{brand} | {headline}</title>
-
-  <style>
-    :root {{
-      --bg: #070b12;
-      --panel: rgba(255,255,255,0.06);
-      --panel2: rgba(255,255,255,0.08);
-      --text: rgba(255,255,255,0.92);
-      --muted: rgba(255,255,255,0.68);
-      --line: rgba(255,255,255,0.12);
-      --glow: {primary_color}55;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --danger: #ff4d6d;
-      --ok: #2ee59d;
-      --radius: 16px;
-      --font-main: {font_family};
-    }}
-
-    /* Urgency & Social Proof Styles */
-    .urgency-bar {{
-      background: var(--danger);
-      color: white;
-      text-align: center;
-      padding: 8px;
-      font-size: 13px;
-      font-weight: 700;
-      position: sticky;
-      top: 0;
-      z-index: 100;
-    }}
-
-    .notification-popup {{
-      position: fixed;
-      bottom: 20px;
-      left: 20px;
-      background: var(--panel);
-      border: 1px solid var(--line);
-      padding: 12px 18px;
-      border-radius: 12px;
-      display: flex;
-      align-items: center;
-      gap: 12px;
-      box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-      z-index: 1000;
-      transform: translateY(150%);
-      transition: transform 0.5s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-    }}
-
-    .notification-popup.show {{
-      transform: translateY(0);
-    }}
-
-    body.theme-course {{
-      --bg: #0b0814;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}33;
-    }}
-
-    body.theme-elegant {{
-      --bg: #0f172a;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}25;
-      --radius: 4px;
-    }}
-
-    body.theme-minimal {{
-      --bg: #ffffff;
-      --text: #1e293b;
-      --muted: #64748b;
-      --line: #e2e8f0;
-      --panel: #f8fafc;
-      --panel2: #f1f5f9;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}1a;
-    }}
-
-    body.theme-playful {{
-      --bg: #fdf2f8;
-      --text: #831843;
-      --muted: #be185d;
-      --line: #fbcfe8;
-      --panel: #ffffff;
-      --panel2: #fce7f3;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}20;
-      --radius: 24px;
-    }}
-
-    body.theme-dashboard {{
-      --bg: #020617;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}32;
-    }}
-
-    body.theme-landing {{
-      --bg: #020617;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}32;
-    }}
-
-    body.theme-saas {{
-      --bg: #020617;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}32;
-    }}
-
-    body.theme-tool {{
-      --bg: #020617;
-      --accent: {primary_color};
-      --accent2: {secondary_color};
-      --glow: {primary_color}34;
-    }}
-
-    * {{
-      box-sizing: border-box;
-    }}
-
-    html, body {{
-      margin: 0;
-      padding: 0;
-      background: radial-gradient(1200px 800px at 70% 20%, {primary_color}1a, transparent 55%),
-                  radial-gradient(900px 600px at 25% 30%, {secondary_color}14, transparent 55%),
-                  var(--bg);
-      color: var(--text);
-      font-family: var(--font-main);
-      line-height: 1.5;
-      scroll-behavior: smooth;
-    }}
-
-    a {{
-      color: inherit;
-      text-decoration: none;
-    }}
-
-    .container {{
-      max-width: 1100px;
-      margin: 0 auto;
-      padding: 24px;
-    }}
-
-    /* Layout Styles */
-    .layout-grid .grid {{
-      display: grid;
-      grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-      gap: 24px;
-    }}
-
-    .layout-creative .hero {{
-      text-align: left;
-      display: flex;
-      align-items: center;
-      gap: 40px;
-    }}
-
-    .layout-creative .hero-content {{
-      flex: 1;
-    }}
-
-    .layout-corporate .container {{
-      max-width: 900px;
-    }}
-
-    .layout-minimalist .hero {{
-      padding: 120px 24px;
-    }}
-
-    .nav {{
-      position: sticky;
-      top: 0;
-      z-index: 50;
-      backdrop-filter: blur(10px);
-      background: linear-gradient(to bottom, rgba(7,11,18,0.88), rgba(7,11,18,0.55));
-      border-bottom: 1px solid var(--line);
-    }}
-
-    .nav-inner {{
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-      gap: 16px;
-      padding: 14px 24px;
-      max-width: 1100px;
-      margin: 0 auto;
-    }}
-
-    .brand {{
-      display: flex;
-      align-items: center;
-      gap: 10px;
-      font-weight: 800;
-      letter-spacing: 0.2px;
-    }}
-
-    .logo {{
-      width: 34px;
-      height: 34px;
-      border-radius: 12px;
-      background: radial-gradient(circle at 30% 30%, rgba(34,211,238,0.9), rgba(0,180,255,0.3)),
-                  rgba(255,255,255,0.06);
-      box-shadow: 0 0 30px var(--glow);
-      border: 1px solid rgba(255,255,255,0.16);
-    }}
-
-    .nav-links {{
-      display: flex;
-      align-items: center;
-      gap: 16px;
-      font-size: 14px;
-      color: var(--muted);
-    }}
-
-    .nav-links a {{
-      padding: 8px 10px;
-      border-radius: 10px;
-    }}
-
-    .nav-links a:hover {{
-      background: rgba(255,255,255,0.06);
-      color: var(--text);
-    }}
-
-    .nav-actions {{
-      display: flex;
-      align-items: center;
-      gap: 10px;
-    }}
-
-    .btn {{
-      border: 1px solid rgba(255,255,255,0.18);
-      background: rgba(255,255,255,0.06);
-      color: var(--text);
-      padding: 10px 14px;
-      border-radius: 12px;
-      cursor: pointer;
-      font-weight: 700;
-      font-size: 14px;
-      transition: transform 0.05s ease, background 0.2s ease, border 0.2s ease;
-      user-select: none;
-    }}
-
-    .btn:hover {{
-      background: rgba(255,255,255,0.10);
-      border-color: rgba(255,255,255,0.26);
-    }}
-
-    .btn:active {{
-      transform: translateY(1px);
-    }}
-
-    .btn-primary {{
-      background: linear-gradient(135deg, rgba(0,180,255,0.95), rgba(34,211,238,0.85));
-      border: 0;
-      color: #001018;
-      box-shadow: 0 12px 30px rgba(0,180,255,0.22);
-    }}
-
-    .hero {{
-      padding: 64px 0 10px 0;
-    }}
-
-    .hero-grid {{
-      display: grid;
-      grid-template-columns: 1.2fr 0.8fr;
-      gap: 28px;
-      align-items: center;
-    }}
-
-    @media (max-width: 920px) {{
-      .hero-grid {{
-        grid-template-columns: 1fr;
-      }}
-    }}
-
-    .hero-preview {{
-      position: relative;
-    }}
-
-    .hero-image {{
-      width: 100%;
-      border-radius: 18px;
-      border: 1px solid var(--line);
-      box-shadow: 0 32px 64px rgba(0,0,0,0.4);
-      background: rgba(255,255,255,0.02);
-      aspect-ratio: 16 / 10;
-      object-fit: cover;
-    }}
-
-    .kicker {{
-      display: inline-flex;
-      align-items: center;
-      gap: 10px;
-      padding: 8px 12px;
-      border: 1px solid var(--line);
-      border-radius: 999px;
-      color: var(--muted);
-      background: rgba(255,255,255,0.04);
-      font-size: 13px;
-    }}
-
-    .kicker-dot {{
-      width: 8px;
-      height: 8px;
-      border-radius: 99px;
-      background: var(--accent2);
-      box-shadow: 0 0 16px rgba(34,211,238,0.45);
-    }}
-
-    h1 {{
-      margin: 16px 0 10px 0;
-      font-size: 46px;
-      line-height: 1.08;
-      letter-spacing: -0.6px;
-    }}
-
-    @media (max-width: 520px) {{
-      h1 {{
-        font-size: 36px;
-      }}
-    }}
-
-    .sub {{
-      margin: 0;
-      color: var(--muted);
-      font-size: 16px;
-      max-width: 60ch;
-    }}
-
-    .hero-actions {{
-      margin-top: 22px;
-      display: flex;
-      gap: 12px;
-      flex-wrap: wrap;
-    }}
-
-    .panel {{
-      background: linear-gradient(180deg, rgba(255,255,255,0.06), rgba(255,255,255,0.03));
-      border: 1px solid var(--line);
-      border-radius: var(--radius);
-      padding: 18px;
-      box-shadow: 0 24px 60px rgba(0,0,0,0.35);
-    }}
-
-    .panel h3 {{
-      margin: 0 0 10px 0;
-      font-size: 16px;
-    }}
-
-    .panel p {{
-      margin: 0;
-      color: var(--muted);
-      font-size: 14px;
-    }}
-
-    .stats {{
-      display: grid;
-      grid-template-columns: repeat(3, 1fr);
-      gap: 10px;
-      margin-top: 14px;
-    }}
-
-    .stat {{
-      padding: 12px;
-      border-radius: 14px;
-      background: rgba(255,255,255,0.05);
-      border: 1px solid rgba(255,255,255,0.10);
-    }}
-
-    .stat strong {{
-      display: block;
-      font-size: 15px;
-    }}
-
-    .stat span {{
-      display: block;
-      font-size: 12px;
-      color: var(--muted);
-      margin-top: 4px;
-    }}
-
-    section {{
-      padding: 36px 0;
-    }}
-
-    .section-title {{
-      font-size: 22px;
-      margin: 0 0 12px 0;
-      letter-spacing: -0.2px;
-    }}
-
-    .grid3 {{
-      display: grid;
-      grid-template-columns: repeat(3, 1fr);
-      gap: 14px;
-    }}
-
-    @media (max-width: 920px) {{
-      .grid3 {{
-        grid-template-columns: 1fr;
-      }}
-    }}
-
-    .card {{
-      padding: 16px;
-      border-radius: var(--radius);
-      border: 1px solid var(--line);
-      background: rgba(255,255,255,0.05);
-    }}
-
-    .card h4 {{
-      margin: 0 0 8px 0;
-      font-size: 15px;
-    }}
-
-    .card p {{
-      margin: 0;
-      color: var(--muted);
-      font-size: 13px;
-    }}
-
-    .pricing {{
-      display: grid;
-      grid-template-columns: repeat(3, 1fr);
-      gap: 14px;
-    }}
-
-    .pricing-card {{
-      background: rgba(255,255,255,0.03);
-      border: 1px solid rgba(255,255,255,0.08);
-      border-radius: 16px;
-      padding: 24px;
-      display: flex;
-      flex-direction: column;
-      transition: transform 0.2s ease, border-color 0.2s ease;
-    }}
-
-    .pricing-card:hover {{
-      transform: translateY(-4px);
-      border-color: var(--accent);
-      background: rgba(255,255,255,0.05);
-    }}
-
-    .pricing-card h3 {{
-      margin: 0;
-      font-size: 18px;
-    }}
-
-    .pricing-card .price {{
-      font-size: 36px;
-      font-weight: 800;
-      margin: 16px 0;
-      color: var(--text);
-    }}
-
-    .pricing-card .price span {{
-      font-size: 14px;
-      color: var(--muted);
-      font-weight: 400;
-    }}
-
-    .pricing-card .features {{
-      list-style: none;
-      padding: 0;
-      margin: 0 0 24px 0;
-      flex-grow: 1;
-    }}
-
-    .pricing-card .features li {{
-      padding: 8px 0;
-      color: var(--muted);
-      font-size: 14px;
-      display: flex;
-      align-items: center;
-      gap: 8px;
-    }}
-
-    .pricing-card .features li::before {{
-      content: "✓";
-      color: var(--accent);
-      font-weight: bold;
-    }}
-
-    @media (max-width: 920px) {{
-      .pricing {{
-        grid-template-columns: 1fr;
-      }}
-    }}
-
-    .price {{
-      font-size: 28px;
-      margin: 10px 0 8px 0;
-      letter-spacing: -0.4px;
-    }}
-
-    .badge {{
-      display: inline-flex;
-      align-items: center;
-      gap: 8px;
-      font-size: 12px;
-      color: rgba(255,255,255,0.75);
-      padding: 6px 10px;
-      border-radius: 999px;
-      border: 1px solid rgba(255,255,255,0.14);
-      background: rgba(255,255,255,0.04);
-    }}
-
-    .badge .pill {{
-      width: 8px;
-      height: 8px;
-      border-radius: 99px;
-      background: var(--ok);
-      box-shadow: 0 0 18px rgba(46,229,157,0.35);
-    }}
-
-    .list {{
-      margin: 10px 0 0 0;
-      padding: 0;
-      list-style: none;
-      color: var(--muted);
-      font-size: 13px;
-    }}
-
-    .list li {{
-      padding: 6px 0;
-      border-top: 1px dashed rgba(255,255,255,0.12);
-    }}
-
-    .faq {{
-      display: grid;
-      grid-template-columns: 1fr 1fr;
-      gap: 14px;
-    }}
-
-    @media (max-width: 920px) {{
-      .faq {{
-        grid-template-columns: 1fr;
-      }}
-    }}
-
-    footer {{
-      padding: 28px 0 46px 0;
-      color: var(--muted);
-      border-top: 1px solid var(--line);
-      margin-top: 26px;
-      font-size: 13px;
-    }}
-
-    .toast {{
-      position: fixed;
-      right: 14px;
-      bottom: 14px;
-      background: rgba(10,14,22,0.92);
-      border: 1px solid rgba(255,255,255,0.14);
-      padding: 10px 12px;
-      border-radius: 14px;
-      color: var(--text);
-      display: none;
-      z-index: 999;
-      max-width: 360px;
-      box-shadow: 0 24px 80px rgba(0,0,0,0.5);
-      font-size: 13px;
-    }}
-  </style>
-</head>
-
-<body data-product-id=\"{product_id}\" class=\"{theme_class} layout-{layout_style}\">
-  <div class=\"urgency-bar\">
-    LIMITED TIME OFFER: Save 50% for the next <span id=\"countdown\">15:00</span>
-  </div>
-  <div class=\"nav\">
-    <div class=\"nav-inner\">
-      <div class=\"brand\">
-        <div class=\"logo\" aria-hidden=\"true\"></div>
-        <div>{brand}</div>
-      </div>
-
-      <div class=\"nav-links\" aria-label=\"Primary\">
-        <a href=\"#features\" data-action=\"nav\" data-target=\"#features\">{nav_features_label}</a>
-        <a href=\"#pricing\" data-action=\"nav\" data-target=\"#pricing\">{nav_pricing_label}</a>
-        <a href=\"#faq\" data-action=\"nav\" data-target=\"#faq\">{nav_faq_label}</a>
-      </div>
-
-      <div class=\"nav-actions\">
-        <button class=\"btn\" data-action=\"open-login\">{secondary_cta}</button>
-        <button class=\"btn btn-primary\" data-action=\"open-plans\">{primary_cta}</button>
-      </div>
-    </div>
-  </div>
-
-  <main class=\"container\">
-    <div class=\"hero\">
-      <div class=\"hero-grid\">
-        <div>
-          <div class=\"kicker\">
-            <span class=\"kicker-dot\"></span>
-            <span>{kicker_text}</span>
-          </div>
-          <h1>{headline}</h1>
-          <p class=\"sub\">{subheadline}</p>
-
-          <div class=\"hero-actions\">
-            <button class=\"btn btn-primary\" data-action=\"open-plans\" style=\"padding: 14px 24px; font-size: 16px;\">{primary_cta}</button>
-            <button class=\"btn\" data-action=\"scroll\" data-target=\"#features\" style=\"padding: 14px 24px; font-size: 16px;\">Learn More</button>
-          </div>
-        </div>
-        <div class=\"hero-preview\">
-          <img src=\"{hero_image_url}\" alt=\"Product Preview\" class=\"hero-image\" loading=\"lazy\" />
-        </div>
-      </div>
-    </div>
-
-    <section id=\"features\">
-      <h2 class=\"section-title\">{features_title}</h2>
-      <div class=\"grid3\">
-        {features_html}
-      </div>
-    </section>
-
-    <section id=\"pricing\">
-      <h2 class=\"section-title\">{pricing_title}</h2>
-      <div class=\"pricing\">
-        {pricing_html}
-      </div>
-    </section>
-
-    <section id=\"faq\">
-      <h2 class=\"section-title\">{faq_title}</h2>
-      <div class=\"faq\">
-        {faq_html}
-      </div>
-    </section>
-
-    <footer>
-      <div style=\"margin-top:6px;\">© {brand}. All rights reserved.</div>
-    </footer>
-  </main>
-
-  <div class=\"notification-popup\" id=\"purchase-notification\">
-    <div style=\"font-size: 20px;\">🔥</div>
-    <div>
-      <div style=\"font-weight: 700; font-size: 14px;\" id=\"notif-name\">Someone from USA</div>
-      <div style=\"font-size: 12px; color: var(--muted);\">just purchased this product</div>
-    </div>
-  </div>
-
-
-
-
-
-  <!-- Toast -->
-  <div class=\"toast\" id=\"toast\"></div>
-
-  <script>
-    (function() {{
-      "use strict";
-
-      // 404 Error Suppressor for Vite/Client, Favicon, and Source Maps in previews
-      (function() {{
-        var originalError = console.error;
-        var originalWarn = console.warn;
-        
-        console.error = function() {{
-          var msg = arguments[0];
-          if (msg && typeof msg === 'string') {{
-            if (msg.indexOf('/@vite/client') !== -1 || 
-                msg.indexOf('Failed to load resource') !== -1 ||
-                msg.indexOf('favicon.ico') !== -1 ||
-                msg.indexOf('.map') !== -1) {{
-              return;
-            }}
-          }}
-          originalError.apply(console, arguments);
-        }};
-
-        console.warn = function() {{
-          var msg = arguments[0];
-          if (msg && typeof msg === 'string') {{
-            if (msg.indexOf('SourceMap') !== -1 || msg.indexOf('.map') !== -1) {{
-              return;
-            }}
-          }}
-          originalWarn.apply(console, arguments);
-        }};
-      }})();
-
-      // ----- 작은 유틸 -----
-      function qs(sel) {{ return document.querySelector(sel); }}
-      function qsa(sel) {{ return Array.from(document.querySelectorAll(sel)); }}
-
-      function isLocalPreview() {{
-        try {{
-          var h = window.location.hostname || "";
-          var p = String(window.location.port || "");
-          var prot = window.location.protocol || "";
-          // 8090/8088(preview), 8099(dashboard) 모두 로컬로 간주
-          if (p === "8099" || p === "8090" || p === "8088" || h === "127.0.0.1" || h === "localhost" || prot === "file:") {{
-              return true;
-          }}
-          return false;
-        }} catch (e) {{
-          return false;
-        }}
-      }}
-
-      // 프리뷰(8090 등)에서는 로컬 payment_server(5000) 사용
-      var API_BASE = "http://127.0.0.1:5000";
-      try {{
-        var h = window.location.hostname;
-        // 로컬 환경이 아닌 경우(배포 환경)에는 상대 경로 사용
-        if (h !== "127.0.0.1" && h !== "localhost" && window.location.protocol !== "file:") {{
-           API_BASE = ""; 
-        }}
-      }} catch (e) {{}}
-
-      // 가격 동적 생성 (하드코딩 제거)
-      try {{
-        var planBtns = document.getElementById("plan-buttons");
-        if (planBtns) {{
-            // 스키마에서 주입된 가격 정보 사용 (localStorage 무시)
-            planBtns.innerHTML = `
-                <button class="btn btn-primary" data-action="choose-plan" data-plan="Standard" data-price="{product_price}">
-                    Standard License ({product_price})
-                </button>
-            `;
-        }}
-      }} catch(e) {{}}
-
-      function showToast(msg) {{
-        var t = qs(\"#toast\");
-        if (!t) return;
-        t.textContent = msg;
-        t.style.display = \"block\";
-        clearTimeout(window.__toastTimer);
-        window.__toastTimer = setTimeout(function() {{
-          t.style.display = \"none\";
-        }}, 2200);
-      }}
-
-
-
-      function scrollToTarget(hash) {{
-        try {{
-          var el = qs(hash);
-          if (el) {{
-            el.scrollIntoView({{ behavior: \"smooth\", block: \"start\" }});
-          }}
-        }} catch (e) {{}}
-      }}
-
-      // ----- Marketing Urgency & Social Proof -----
-      function startCountdown(durationSec) {{
-        var timer = durationSec, minutes, seconds;
-        var el = qs(\"#countdown\");
-        if (!el) return;
-        setInterval(function () {{
-          minutes = parseInt(timer / 60, 10);
-          seconds = parseInt(timer % 60, 10);
-          minutes = minutes < 10 ? \"0\" + minutes : minutes;
-          seconds = seconds < 10 ? \"0\" + seconds : seconds;
-          el.textContent = minutes + \":\" + seconds;
-          if (--timer < 0) timer = durationSec;
-        }}, 1000);
-      }}
-
-      function startSocialProof() {{
-        var names = [\"Alex\", \"Sarah\", \"Michael\", \"Elena\", \"Ji-hoon\", \"Chloe\", \"David\", \"Yuki\"];
-        var locations = [\"USA\", \"UK\", \"Germany\", \"South Korea\", \"Japan\", \"Canada\", \"Singapore\"];
-        var notif = qs(\"#purchase-notification\");
-        var nameEl = qs(\"#notif-name\");
-        if (!notif || !nameEl) return;
-
-        function showNotif() {{
-          var name = names[Math.floor(Math.random() * names.length)];
-          var loc = locations[Math.floor(Math.random() * locations.length)];
-          nameEl.textContent = name + \" from \" + loc;
-          notif.classList.add(\"show\");
-          setTimeout(function() {{
-            notif.classList.remove(\"show\");
-          }}, 5000);
-        }}
-
-        setInterval(showNotif, 20000 + Math.random() * 20000);
-        setTimeout(showNotif, 3000);
-      }}
-
-      // Init Marketing
-      startCountdown(15 * 60);
-      startSocialProof();
-
-      // ----- 로컬 저장 (데모) -----
-      var productId = document.body.getAttribute(\"data-product-id\") || \"product\";
-      var KEY_LEADS = productId + \":leads\";
-      var KEY_PLAN  = productId + \":plan\";
-      var KEY_PRICE = productId + \":price\";
-      var KEY_ORDER = productId + \":order\";
-      var KEY_AUTH  = productId + \":auth\";
-
-      function readJson(key, fallback) {{
-        try {{
-          var v = localStorage.getItem(key);
-          if (!v) return fallback;
-          return JSON.parse(v);
-        }} catch (e) {{
-          return fallback;
-        }}
-      }}
-
-      function writeJson(key, obj) {{
-        localStorage.setItem(key, JSON.stringify(obj));
-      }}
-
-      // ----- 로직 유틸 -----
-      async function startPay(plan) {{
-        var rawPrice = "{product_price}";
-        var stored = localStorage.getItem(KEY_PRICE);
-        if (stored) rawPrice = stored;
-
-        showToast("Redirecting to secure checkout...");
-        setTimeout(function() {{
-            var url = "checkout.html?price=" + encodeURIComponent(rawPrice);
-            window.location.href = url;
-        }}, 500);
-      }}
-
-      async function checkPay() {{
-        var orderId = localStorage.getItem(KEY_ORDER) || "";
-        if (!orderId) {{
-          showToast("No recent payment to check. Start checkout first.");
-          return;
-        }}
-        showToast("Checking payment status...");
-        try {{
-          var url = API_BASE + "/api/pay/check?order_id=" + encodeURIComponent(orderId) + "&product_id=" + encodeURIComponent(productId);
-          var res = await fetch(url, {{ method: "GET" }});
-          var data = await res.json().catch(function() {{ return {{}}; }});
-          if (!res.ok) {{
-            showToast("Check failed: " + (data.error || res.status));
-            return;
-          }}
-          if (data.status === "paid" && data.download_url) {{
-            showToast("Payment confirmed. Redirecting to download...");
-            setTimeout(function() {{
-              var url = data.download_url;
-              if (API_BASE && url && url.indexOf("http") !== 0 && url[0] === "/") {{
-                url = API_BASE + url;
-              }}
-              // 로컬 미리보기(8090/8099) 환경이고 URL이 /api/pay/download로 시작하면 dashboard의 프록시를 통하도록 유도
-              if (isLocalPreview() && url && url.indexOf("/api/pay/download") !== -1) {{
-                // dashboard_server.py(8099)가 프록시 라우트를 가지고 있으므로 호스트를 변경
-                var currentPort = window.location.port;
-                if (currentPort === "8099") {{
-                  url = (url || "").replace("127.0.0.1:5000", window.location.host);
-                }}
-              }}
-              window.location.href = url;
-            }}, 800);
-          }} else {{
-            showToast("Payment not confirmed yet. Status: " + (data.status || "pending"));
-          }}
-        }} catch (e) {{
-          showToast("Error: " + (e.message || String(e)));
-        }}
-      }}
-
-      // ----- 액션 라우터 -----
-      var actions = {{
-        \"nav\": function(el) {{
-          var target = el.getAttribute(\"data-target\") || el.getAttribute(\"href\") || \"#features\";
-          if (target.startsWith(\"#\")) {{
-            scrollToTarget(target);
-          }}
-        }},
-
-        \"scroll\": function(el) {{
-          var target = el.getAttribute(\"data-target\") || \"#features\";
-          if (target.startsWith(\"#\")) {{
-            scrollToTarget(target);
-          }}
-        }},
-
-        \"open-login\": function() {{
-          startPay("SignIn");
-        }},
-
-        \"open-plans\": function() {{
-          var plan = localStorage.getItem(KEY_PLAN) || \"Premium\";
-          startPay(plan);
-        }},
-
-
-        \"choose-plan\": function(el) {{
-          var plan = el.getAttribute(\"data-plan\") || \"Starter\";
-          var price = el.getAttribute(\"data-price\") || \"$19\";
-          localStorage.setItem(KEY_PLAN, plan);
-          localStorage.setItem(KEY_PRICE, price);
-
-          showToast(\"Plan selected: \" + plan + \" (\" + price + \")\");
-          startPay(plan);
-        }},
-
-
-        \"check-payment\": function() {{
-          checkPay();
-        }},
-
-
-        \"reset-demo\": function() {{
-          localStorage.removeItem(KEY_LEADS);
-          localStorage.removeItem(KEY_PLAN);
-          localStorage.removeItem(KEY_AUTH);
-          var leadPlan = qs(\"#lead-plan\");
-          var leadEmail = qs(\"#lead-email\");
-          if (leadPlan) leadPlan.value = \"\";
-          if (leadEmail) leadEmail.value = \"\";
-          showToast(\"Reset.\");
-        }}
-      }};
-
-      function handleClick(e) {{
-        var el = e.target;
-        // 버튼 안쪽 span 클릭 등 대비: data-action 가진 조상까지 탐색
-        while (el && el !== document.body) {{
-          var act = el.getAttribute && el.getAttribute(\"data-action\");
-          if (act) {{
-            e.preventDefault();
-            var fn = actions[act];
-            if (fn) {{
-              fn(el);
-            }} else {{
-              showToast(\"Unknown action: \" + act);
-            }}
-            return;
-          }}
-          el = el.parentNode;
-        }}
-      }}
-
-      // ----- 해시 라우팅(단순) -----
-      function onHashChange() {{
-        var h = location.hash || \"\";
-        if (h && h.startsWith(\"#\")) {{
-          // 모달 해시 같은 건 쓰지 않고 섹션만 처리
-          if (qs(h)) {{
-            scrollToTarget(h);
-          }}
-        }}
-      }}
-
-      // ----- 초기 바인딩 -----
-      document.addEventListener(\"click\", handleClick);
-      window.addEventListener(\"hashchange\", onHashChange);
-
-
-
-      // 초기 해시 처리
-      onHashChange();
-
-      // showToast(\"JS loaded.\");
-    }})();
-  </script>
-</body>
-</html>
-"""
+    # HTML 템플릿 (templates/landing/*.j2, 프로세스당 1회 컴파일)
+    # 스타일/스크립트 블록은 디자인 색상·가격 조합별로 캐시된 조각을 재사용
+    styles_css = render_fragment(
+        "_styles.css.j2",
+        primary_color=primary_color,
+        secondary_color=secondary_color,
+        font_family=font_family,
+    )
+    scripts_js = render_fragment("_scripts.js.j2", product_price=product_price)
+    html = render_template(
+        "landing.html.j2",
+        styles_css=styles_css,
+        scripts_js=scripts_js,
+        product_id=product_id,
+        brand=brand,
+        headline=headline,
+        subheadline=subheadline,
+        primary_cta=primary_cta,
+        secondary_cta=secondary_cta,
+        features_html=features_html,
+        pricing_html=pricing_html,
+        faq_html=faq_html,
+        theme_class=theme_class,
+        layout_style=layout_style,
+        hero_image_url=hero_image_url,
+        price_numeric=price_numeric,
+        nav_features_label=nav_features_label,
+        nav_pricing_label=nav_pricing_label,
+        nav_faq_label=nav_faq_label,
+        features_title=features_title,
+        pricing_title=pricing_title,
+        faq_title=faq_title,
+        kicker_text=kicker_text,
+    )
     return html
 
 
@@ -1500,145 +579,13 @@ def _render_checkout_html(
     brand: str
 ) -> str:
     """정적 결제 페이지(checkout.html) 생성. Payment Server와 통신."""
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Checkout - {brand}</title>
-    <style>
-        body {{
-            font-family: 'Inter', system-ui, sans-serif;
-            background: #0f172a;
-            color: #e2e8f0;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            min-height: 100vh;
-            margin: 0;
-        }}
-        .checkout-container {{
-            background: #1e293b;
-            padding: 2rem;
-            border-radius: 1rem;
-            box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
-            width: 100%;
-            max-width: 400px;
-            text-align: center;
-            border: 1px solid rgba(255,255,255,0.1);
-        }}
-        h1 {{ margin-bottom: 0.5rem; font-size: 1.5rem; color: #fff; }}
-        .price {{ font-size: 2.5rem; font-weight: 700; color: #38bdf8; margin: 1rem 0; }}
-        .product-name {{ color: #94a3b8; margin-bottom: 2rem; }}
-        .btn {{
-            background: #38bdf8;
-            color: #0f172a;
-            border: none;
-            padding: 1rem 2rem;
-            border-radius: 0.5rem;
-            font-weight: 600;
-            font-size: 1.1rem;
-            cursor: pointer;
-            width: 100%;
-            transition: opacity 0.2s;
-        }}
-        .btn:hover {{ opacity: 0.9; }}
-        .btn:disabled {{ opacity: 0.5; cursor: not-allowed; }}
-        .error {{ color: #ef4444; margin-top: 1rem; font-size: 0.9rem; display: none; }}
-        .back-link {{ display: block; margin-top: 1.5rem; color: #94a3b8; text-decoration: none; font-size: 0.9rem; }}
-        .back-link:hover {{ color: #fff; }}
-    </style>
-</head>
-<body data-product-id="{product_id}" data-price="{product_price}">
-    <div class="checkout-container">
-        <h1>Secure Checkout</h1>
-        <div class="product-name">{product_title}</div>
-        <div class="price" id="display-price">{product_price}</div>
-        
-        <button id="payBtn" class="btn" onclick="startPayment()">Pay Now</button>
-        <div id="errorMsg" class="error"></div>
-        
-        <a href="index.html" class="back-link">← Back to Product</a>
-    </div>
-
-    <script>
-        // Payment Server Configuration
-        // 프리뷰(8090 등)에서는 로컬 payment_server(5000) 사용
-        var API_BASE = "http://127.0.0.1:5000";
-        try {{
-            var h = window.location.hostname;
-            // 로컬 환경이 아닌 경우(배포 환경)에는 상대 경로(API Routes) 사용
-            if (h !== "127.0.0.1" && h !== "localhost" && window.location.protocol !== "file:") {{
-                API_BASE = ""; 
-            }}
-        }} catch (e) {{}}
-        
-        var PRODUCT_ID = document.body.getAttribute('data-product-id');
-        var PRICE_STR = document.body.getAttribute('data-price');
-        var PRICE = parseFloat(PRICE_STR.replace(/[^0-9.]/g, '')) || 49;
-
-        // URL 파라미터 오버라이드
-        try {{
-            var params = new URLSearchParams(window.location.search);
-            if(params.has('price')) {{
-                var p = params.get('price');
-                document.getElementById('display-price').textContent = p;
-                PRICE = parseFloat(p.replace(/[^0-9.]/g, '')) || PRICE;
-            }}
-        }} catch(e) {{}}
-
-        async function startPayment() {{
-            const btn = document.getElementById('payBtn');
-            const err = document.getElementById('errorMsg');
-            
-            btn.disabled = true;
-            btn.textContent = "Processing...";
-            err.style.display = "none";
-
-            try {{
-                // Payment Server API 호출
-                // API_BASE가 비어있으면(배포환경) /api/pay/start 로 호출됨 (Vercel API Route)
-                var url = API_BASE + "/api/pay/start";
-                // 로컬 5000번 포트일 경우 명시적 URL 사용
-                if (API_BASE.includes("127.0.0.1")) {{
-                     url = "http://127.0.0.1:5000/api/pay/start";
-                }}
-
-                const res = await fetch(`${{url}}?product_id=${{PRODUCT_ID}}&price_amount=${{PRICE}}&price_currency=usd`);
-                const data = await res.json();
-                
-                if (!res.ok) {{
-                    throw new Error(data.error || "Payment initialization failed");
-                }}
-
-                if (data.nowpayments && data.nowpayments.invoice_url) {{
-                    window.location.href = data.nowpayments.invoice_url;
-                }} else if (data.status === "paid") {{
-                    btn.textContent = "Success! Redirecting...";
-                    
-                    // 다운로드 URL 처리
-                    let downloadUrl = data.download_url;
-                    if (downloadUrl && downloadUrl.startsWith("/") && API_BASE) {{
-                        downloadUrl = API_BASE + downloadUrl;
-                    }}
-                    
-                    setTimeout(() => {{
-                        window.location.href = downloadUrl;
-                    }}, 1000);
-                }} else {{
-                    throw new Error("Unexpected payment status: " + data.status);
-                }}
-            }} catch (e) {{
-                console.error(e);
-                err.textContent = e.message;
-                err.style.display = "block";
-                btn.disabled = false;
-                btn.textContent = "Pay Now";
-            }}
-        }}
-    </script>
-</body>
-</html>"""
+    return render_template(
+        "checkout.html.j2",
+        product_id=product_id,
+        product_price=product_price,
+        product_title=product_title,
+        brand=brand,
+    )
 
 
 # -----------------------------
@@ -1749,23 +696,8 @@ class ProductGenerator:
         update_progress("Product Creation", "Rendering HTML", 45, "Generating landing page...", safe_pid)
         schema["_injected_price"] = final_price_str
         
-        render_result = _render_landing_html_from_schema(schema, brand=config.brand)
-        if isinstance(render_result, dict):
-            landing_html = render_result["landing_html"]
-            checkout_html = render_result["checkout_html"]
-        else:
-            landing_html = render_result
-            checkout_html = ""
-        
-        landing_html = _sanitize_html(landing_html, schema)
-        _validate_html(landing_html)
-
-        index_html_path = os.path.join(product_output_dir, "index.html")
-        write_text(index_html_path, landing_html)
-
-        if checkout_html:
-            checkout_html_path = os.path.join(product_output_dir, "checkout.html")
-            write_text(checkout_html_path, checkout_html)
+        render_result = render_product_pages(schema, product_output_dir, brand=config.brand, force=True)
+        index_html_path = render_result["index_html_path"]
 
         main_content_file = (schema.get("assets") or {}).get("main_content_file") or "product.md"
         main_content_path = os.path.join(product_output_dir, main_content_file)
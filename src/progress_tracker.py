@@ -1,11 +1,13 @@
 import json
+import os
 import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
-PROGRESS_FILE = DATA_DIR / "progress.json"
+# PROGRESS_FILE 환경 변수로 위치 변경 (오프라인 벤치마크가 실제 진행 상태 파일을 덮어쓰지 않도록)
+PROGRESS_FILE = Path(os.getenv("PROGRESS_FILE") or DATA_DIR / "progress.json")
 
 def update_progress(
     task: str,
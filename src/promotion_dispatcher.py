@@ -1,13 +1,15 @@
+import copy
 import json
 import os
 import random
-import requests
-import base64
 import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from src.config import Config
+from src.config_store import channel_config_file, derived, get_secrets, secrets_file
+from src.utils import get_logger, span
 from src.seo_tools import SEOManager
 from src.blog_manager import BlogManager
 from src.social_manager import SocialManager
@@ -22,6 +24,13 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 CONFIG_PATH = DATA_DIR / "promo_channels.json"
 
+logger = get_logger(__name__)
+
+
+def _product_dir(product_id: str) -> Path:
+    """제품 출력 폴더 (파이프라인과 같은 OUTPUT_DIR 기준)."""
+    return Path(Config.OUTPUT_DIR) / product_id
+
 def _utc_iso():
     return datetime.utcnow().isoformat() + "Z"
 
@@ -231,7 +240,7 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
     # Try to load from product_schema.json first for consistency
     if product_id:
         try:
-            schema_path = PROJECT_ROOT / "outputs" / product_id / "product_schema.json"
+            schema_path = _product_dir(product_id) / "product_schema.json"
             if schema_path.exists():
                 with open(schema_path, 'r', encoding='utf-8') as f:
                     schema = json.load(f)
@@ -267,7 +276,7 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
                             except:
                                 pass
         except Exception as e:
-            print(f"Failed to load schema for market analysis: {e}")
+            logger.warning(f"Failed to load schema for market analysis: {e}")
 
     if not market_data:
         try:
@@ -308,7 +317,7 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
                 'category': cat_display
             }
         except Exception as e:
-            print(f"Market analysis fallback failed: {e}")
+            logger.warning(f"Market analysis fallback failed: {e}")
             market_data = {'average_price': max(97.00, current_price * 1.5), 'high_price': max(299.00, current_price * 3), 'category': "Premium Market Assets"}
     
     avg = market_data.get('average_price', 97.00)
@@ -355,7 +364,7 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
         </div>
         """)
     except Exception as e:
-        print(f"Comparison generation failed: {e}")
+        logger.warning(f"Comparison generation failed: {e}")
 
     # Related Products Section (Cross-Selling)
     try:
@@ -397,7 +406,7 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
             </div>
             """)
     except Exception as e:
-        print(f"Related products generation failed: {e}")
+        logger.warning(f"Related products generation failed: {e}")
 
     # FAQ Section
     out.append(f"""
@@ -460,70 +469,67 @@ def _simple_markdown_to_html(md: str, title: str = "", target_url: str = "", pri
     out.append("</div>") # Close container
     return "\n".join(out)
 
-def load_channel_config() -> Dict[str, Any]:
-    config = {}
-    if CONFIG_PATH.exists():
-        try:
-            config = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-        except Exception as e:
-            print(f"Error parsing promo_channels.json: {e}")
-    
-    # Fallback/Merge with secrets.json
+def _merge_channel_config(raw_config: Any, s: Any) -> Dict[str, Any]:
+    """promo_channels.json 에 secrets.json 의 자격 증명을 채워 넣은 채널 설정 (config_store 가 버전별로 캐시)."""
+    config = copy.deepcopy(raw_config) if isinstance(raw_config, dict) else {}
+    if not isinstance(s, dict) or not s:
+        return config
     try:
-        secrets_path = DATA_DIR / "secrets.json"
-        if secrets_path.exists():
-            with open(secrets_path, "r", encoding="utf-8") as f:
-                s = json.load(f)
-            
-            # WordPress
-            if "blog" not in config: config["blog"] = {"type": "wordpress"}
-            # Support both legacy flat keys and new nested structure
-            if not config["blog"].get("wp_api_url"): 
-                config["blog"]["wp_api_url"] = s.get("WP_API_URL") or s.get("wordpress", {}).get("api_url", "")
-            if not config["blog"].get("wp_token"): 
-                config["blog"]["wp_token"] = s.get("WP_TOKEN") or s.get("wordpress", {}).get("token", "")
-
-            # Medium
-            if "medium" not in config: config["medium"] = {}
-            if not config["medium"].get("token"): 
-                config["medium"]["token"] = s.get("MEDIUM_TOKEN") or s.get("medium", {}).get("token", "")
-            if not config["medium"].get("user_id"): 
-                config["medium"]["user_id"] = s.get("MEDIUM_USER_ID") or s.get("medium", {}).get("user_id", "")
-
-            # Tumblr
-            if "tumblr" not in config: config["tumblr"] = {}
-            tumblr_s = s.get("tumblr", {})
-            if not config["tumblr"].get("consumer_key"): config["tumblr"]["consumer_key"] = s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key", "")
-            if not config["tumblr"].get("consumer_secret"): config["tumblr"]["consumer_secret"] = s.get("TUMBLR_CONSUMER_SECRET") or tumblr_s.get("consumer_secret", "")
-            if not config["tumblr"].get("oauth_token"): config["tumblr"]["oauth_token"] = s.get("TUMBLR_OAUTH_TOKEN") or tumblr_s.get("oauth_token", "")
-            if not config["tumblr"].get("oauth_token_secret"): config["tumblr"]["oauth_token_secret"] = s.get("TUMBLR_OAUTH_TOKEN_SECRET") or tumblr_s.get("oauth_token_secret", "")
-            if not config["tumblr"].get("blog_identifier"): config["tumblr"]["blog_identifier"] = s.get("TUMBLR_BLOG_IDENTIFIER") or tumblr_s.get("blog_identifier", "")
-
-            # GitHub Pages
-            if "github_pages" not in config: config["github_pages"] = {}
-            gh_s = s.get("github_pages", {})
-            if not config["github_pages"].get("username"): config["github_pages"]["username"] = s.get("GITHUB_USERNAME") or gh_s.get("username", "")
-            if not config["github_pages"].get("token"): config["github_pages"]["token"] = s.get("GITHUB_TOKEN") or gh_s.get("token", "")
-            if not config["github_pages"].get("repo_url"): config["github_pages"]["repo_url"] = s.get("GITHUB_REPO_URL") or gh_s.get("repo_url", "")
-
-            # Blogger
-            if "blogger" not in config: config["blogger"] = {}
-            blogger_s = s.get("blogger", {})
-            if not config["blogger"].get("client_id"): config["blogger"]["client_id"] = s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id", "")
-            if not config["blogger"].get("client_secret"): config["blogger"]["client_secret"] = s.get("BLOGGER_CLIENT_SECRET") or blogger_s.get("client_secret", "")
-            if not config["blogger"].get("refresh_token"): config["blogger"]["refresh_token"] = s.get("BLOGGER_REFRESH_TOKEN") or blogger_s.get("refresh_token", "")
-            if not config["blogger"].get("blog_id"): config["blogger"]["blog_id"] = s.get("BLOGGER_BLOG_ID") or blogger_s.get("blog_id", "")
-
-
+        # WordPress
+        if "blog" not in config: config["blog"] = {"type": "wordpress"}
+        # Support both legacy flat keys and new nested structure
+        if not config["blog"].get("wp_api_url"): 
+            config["blog"]["wp_api_url"] = s.get("WP_API_URL") or s.get("wordpress", {}).get("api_url", "")
+        if not config["blog"].get("wp_token"): 
+            config["blog"]["wp_token"] = s.get("WP_TOKEN") or s.get("wordpress", {}).get("token", "")
+
+        # Medium
+        if "medium" not in config: config["medium"] = {}
+        if not config["medium"].get("token"): 
+            config["medium"]["token"] = s.get("MEDIUM_TOKEN") or s.get("medium", {}).get("token", "")
+        if not config["medium"].get("user_id"): 
+            config["medium"]["user_id"] = s.get("MEDIUM_USER_ID") or s.get("medium", {}).get("user_id", "")
+
+        # Tumblr
+        if "tumblr" not in config: config["tumblr"] = {}
+        tumblr_s = s.get("tumblr", {})
+        if not config["tumblr"].get("consumer_key"): config["tumblr"]["consumer_key"] = s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key", "")
+        if not config["tumblr"].get("consumer_secret"): config["tumblr"]["consumer_secret"] = s.get("TUMBLR_CONSUMER_SECRET") or tumblr_s.get("consumer_secret", "")
+        if not config["tumblr"].get("oauth_token"): config["tumblr"]["oauth_token"] = s.get("TUMBLR_OAUTH_TOKEN") or tumblr_s.get("oauth_token", "")
+        if not config["tumblr"].get("oauth_token_secret"): config["tumblr"]["oauth_token_secret"] = s.get("TUMBLR_OAUTH_TOKEN_SECRET") or tumblr_s.get("oauth_token_secret", "")
+        if not config["tumblr"].get("blog_identifier"): config["tumblr"]["blog_identifier"] = s.get("TUMBLR_BLOG_IDENTIFIER") or tumblr_s.get("blog_identifier", "")
+
+        # GitHub Pages
+        if "github_pages" not in config: config["github_pages"] = {}
+        gh_s = s.get("github_pages", {})
+        if not config["github_pages"].get("username"): config["github_pages"]["username"] = s.get("GITHUB_USERNAME") or gh_s.get("username", "")
+        if not config["github_pages"].get("token"): config["github_pages"]["token"] = s.get("GITHUB_TOKEN") or gh_s.get("token", "")
+        if not config["github_pages"].get("repo_url"): config["github_pages"]["repo_url"] = s.get("GITHUB_REPO_URL") or gh_s.get("repo_url", "")
+
+        # Blogger
+        if "blogger" not in config: config["blogger"] = {}
+        blogger_s = s.get("blogger", {})
+        if not config["blogger"].get("client_id"): config["blogger"]["client_id"] = s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id", "")
+        if not config["blogger"].get("client_secret"): config["blogger"]["client_secret"] = s.get("BLOGGER_CLIENT_SECRET") or blogger_s.get("client_secret", "")
+        if not config["blogger"].get("refresh_token"): config["blogger"]["refresh_token"] = s.get("BLOGGER_REFRESH_TOKEN") or blogger_s.get("refresh_token", "")
+        if not config["blogger"].get("blog_id"): config["blogger"]["blog_id"] = s.get("BLOGGER_BLOG_ID") or blogger_s.get("blog_id", "")
     except Exception as e:
-        print(f"Error loading secrets.json for fallback: {e}")
-    
+        logger.warning(f"Error loading secrets.json for fallback: {e}")
     return config
 
+
+def load_channel_config() -> Dict[str, Any]:
+    """채널 설정 (호출자가 수정해도 되는 복사본). 파일이 바뀌지 않았으면 디스크를 다시 읽지 않습니다."""
+    merged = derived(
+        "promotion_dispatcher.channel_config",
+        (channel_config_file(PROJECT_ROOT), secrets_file(PROJECT_ROOT)),
+        _merge_channel_config,
+    )
+    return copy.deepcopy(merged)
+
 def save_channel_config(config: Dict[str, Any]) -> bool:
     try:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        CONFIG_PATH.write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding="utf-8")
+        channel_config_file(PROJECT_ROOT).write(config)
         return True
     except Exception:
         return False
@@ -532,7 +538,7 @@ def build_channel_payloads(product_id: str) -> Dict[str, Any]:
     """
     outputs/<product_id>/promotions/ 에서 채널별 발행 payload를 생성.
     """
-    product_dir = PROJECT_ROOT / "outputs" / product_id
+    product_dir = _product_dir(product_id)
     promotions_dir = product_dir / "promotions"
     promotions_dir.mkdir(parents=True, exist_ok=True)
 
@@ -560,7 +566,7 @@ def build_channel_payloads(product_id: str) -> Dict[str, Any]:
             if not title:
                 title = s.get("title", "")
         except Exception as e:
-            print(f"Error reading schema in build_channel_payloads: {e}")
+            logger.warning(f"Error reading schema in build_channel_payloads: {e}")
 
     manifest = product_dir / "manifest.json"
     if manifest.exists():
@@ -753,61 +759,77 @@ def build_channel_payloads(product_id: str) -> Dict[str, Any]:
 
     return payloads
 
-def _check_duplicate_post(api_url: str, token: str, title: str) -> Dict[str, Any]:
+def _find_indexed_wp_post(title: str, content: str, product_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    근사 중복 인덱스(SimHash)에서 이미 WordPress 에 발행된 같은/유사 글을 찾습니다 (네트워크 호출 없음).
+    product_id 가 주어지면 그 제품 자신의 글은 비교 대상에서 제외합니다.
+    Returns {"exists": bool, "id": int, "link": str}
+    """
+    try:
+        from src.near_duplicate_index import get_near_duplicate_index
+
+        for m in get_near_duplicate_index().query(f"{title}\n{content}", kind="promotion", exclude_product=product_id):
+            if m.meta.get("wp_id"):
+                return {"exists": True, "id": m.meta["wp_id"], "link": m.meta.get("link", ""), "source": "index", "distance": m.distance}
+    except Exception as e:
+        logger.warning(f"Near-duplicate index lookup failed: {e}")
+    return {"exists": False}
+
+
+def _record_wp_post(product_id: str, title: str, content: str, wp_id: Any, link: str) -> None:
+    """발행(또는 원격에서 확인)된 WordPress 글을 근사 중복 인덱스에 기록합니다."""
+    try:
+        from src.near_duplicate_index import doc_id_for, get_near_duplicate_index
+
+        get_near_duplicate_index().add(
+            doc_id_for("promotion", product_id, "wordpress"),
+            f"{title}\n{content}",
+            kind="promotion",
+            product_id=product_id,
+            meta={"wp_id": wp_id, "link": link or "", "title": title},
+        )
+    except Exception as e:
+        logger.warning(f"Near-duplicate index update failed: {e}")
+
+
+def _check_duplicate_post(api_url: str, token: str, title: str, content: str = "", product_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Check if a post with the same title already exists in WordPress.
+    content 가 주어지면 먼저 로컬 근사 중복 인덱스에서 다른 제품(product_id 제외)의 글을 조회하고, 찾으면 원격 검색을 생략합니다.
+    NEAR_DUP_TRUST_INDEX=1 이면 인덱스에 없을 때도 원격 검색을 하지 않습니다.
     Returns {"exists": bool, "id": int, "link": str}
     """
+    if content:
+        indexed = _find_indexed_wp_post(title, content, product_id=product_id)
+        if indexed.get("exists") or os.getenv("NEAR_DUP_TRUST_INDEX", "0").lower() in ("1", "true", "yes"):
+            return indexed
     try:
-        import html
-        
-        if ":" in token:
-            encoded_auth = base64.b64encode(token.encode("utf-8")).decode("utf-8")
-            headers = {
-                "Authorization": f"Basic {encoded_auth}",
-                "Content-Type": "application/json",
-            }
-        else:
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json",
-            }
-        
+        from src.wp_client import get_wp_client
+
         # Search for posts with the title
         # search query looks for posts containing the terms, so we need to filter results
-        search_url = f"{api_url}?search={requests.utils.quote(title)}&per_page=10"
-        r = requests.get(search_url, headers=headers, timeout=10)
+        posts = get_wp_client(api_url, token).search_posts(title, per_page=10)
+        normalized_target = _normalize_title(title)
         
-        if r.status_code == 200:
-            posts = r.json()
-            normalized_target = _normalize_title(title)
+        for p in posts:
+            # Compare titles (WP returns rendered title)
+            rendered_title = p.get("title", {}).get("rendered", "")
+            normalized_found = _normalize_title(rendered_title)
             
-            for p in posts:
-                # Compare titles (WP returns rendered title)
-                rendered_title = p.get("title", {}).get("rendered", "")
-                normalized_found = _normalize_title(rendered_title)
-                
-                # Check for exact match or very close match
-                if normalized_found == normalized_target:
-                    return {"exists": True, "id": p["id"], "link": p["link"]}
-                
-                # Check if one contains the other if they are long enough (to catch slight variations)
-                if len(normalized_target) > 20 and (normalized_target in normalized_found or normalized_found in normalized_target):
-                     # Double check with a higher threshold or manual verification if needed
-                     # For now, treat as duplicate to be safe
-                     return {"exists": True, "id": p["id"], "link": p["link"]}
-                     
-        elif r.status_code in [401, 403]:
-            print(f"WP Auth Error during duplicate check: {r.status_code}")
-            # If auth fails, we can't check. To be safe, we might assume it doesn't exist 
-            # OR assume it DOES to prevent spamming. 
-            # Given the user complaint, let's log and proceed but maybe with caution.
-            # actually, if auth fails, publish will likely fail too.
-            pass
+            # Check for exact match or very close match
+            if normalized_found == normalized_target:
+                return {"exists": True, "id": p["id"], "link": p["link"]}
             
+            # Check if one contains the other if they are long enough (to catch slight variations)
+            if len(normalized_target) > 20 and (normalized_target in normalized_found or normalized_found in normalized_target):
+                 # Double check with a higher threshold or manual verification if needed
+                 # For now, treat as duplicate to be safe
+                 return {"exists": True, "id": p["id"], "link": p["link"]}
+        
+        # 인증 실패(401/403)는 search_posts 가 경고를 남기고 빈 목록을 돌려줌 -> 발행도 실패할 것이므로 그대로 진행
         return {"exists": False}
     except Exception as e:
-        print(f"WP Duplicate Check Error: {e}")
+        logger.warning(f"WP Duplicate Check Error: {e}")
         return {"exists": False}
 
 def _normalize_title(t: str) -> str:
@@ -824,18 +846,8 @@ def publish_post(api_url: str, token: str, title: str, content: str, status: str
     """
     WordPress REST API를 사용하여 포스트를 발행합니다.
     """
-    if ":" in token:
-        encoded_auth = base64.b64encode(token.encode("utf-8")).decode("utf-8")
-        headers = {
-            "Authorization": f"Basic {encoded_auth}",
-            "Content-Type": "application/json",
-        }
-    else:
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
-    
+    from src.wp_client import get_wp_client
+
     payload = {
         "title": title,
         "content": content,
@@ -846,16 +858,7 @@ def publish_post(api_url: str, token: str, title: str, content: str, status: str
     if tags:
         payload["tags"] = tags
     
-    try:
-        r = requests.post(api_url, headers=headers, json=payload, timeout=20)
-        if 200 <= r.status_code < 300:
-            return r.json()
-        else:
-            print(f"WP Publish Error: {r.status_code} - {r.text[:500]}")
-            return {}
-    except Exception as e:
-        print(f"WP Publish Exception: {e}")
-        return {}
+    return get_wp_client(api_url, token).create_post(payload)
 
 def _get_category_for_niche(niche: str) -> List[int]:
     # 임시 매핑 (실제 운영 환경에서 ID를 확인하여 업데이트 필요)
@@ -874,68 +877,32 @@ def _process_content_images(content: str, api_url: str, token: str, product_id:
     """
     Scans content for local image paths (assets/...), uploads them to WordPress,
     and replaces paths with the uploaded Media URL.
+    같은 내용의 이미지는 사이트의 미디어 인덱스(src/wp_client)로 한 번만 업로드하고, 나머지는 동시에 올립니다.
     """
     import re
+    from src.wp_client import get_wp_client
     
-    # WP Media Endpoint: assume api_url ends with /posts
-    if "/posts" in api_url:
-        media_url = api_url.replace("/posts", "/media")
-    else:
-        media_url = api_url.rstrip("/") + "/media"
-    
-    def upload_image(file_path: Path) -> str:
-        if not file_path.exists():
-            return ""
-        
-        try:
-            headers = {}
-            if ":" in token:
-                encoded_auth = base64.b64encode(token.encode("utf-8")).decode("utf-8")
-                headers["Authorization"] = f"Basic {encoded_auth}"
-            else:
-                headers["Authorization"] = f"Bearer {token}"
-            
-            # MIME type detection
-            ext = file_path.suffix.lower()
-            mime_type = "image/jpeg"
-            if ext == ".png": mime_type = "image/png"
-            elif ext == ".gif": mime_type = "image/gif"
-            elif ext == ".webp": mime_type = "image/webp"
-
-            headers["Content-Disposition"] = f'attachment; filename="{file_path.name}"'
-            headers["Content-Type"] = mime_type
-            
-            with open(file_path, "rb") as img_file:
-                r = requests.post(media_url, headers=headers, data=img_file, timeout=60)
-                
-            if 200 <= r.status_code < 300:
-                data = r.json()
-                return data.get("source_url", "")
-            else:
-                print(f"Image upload failed: {r.status_code} - {r.text[:200]}")
-                return ""
-        except Exception as e:
-            print(f"Image upload exception: {e}")
-            return ""
-
     # Pattern: src=["'](assets/[^"']+)["']
     pattern = re.compile(r'src=["\'](assets/[^"\']+)["\']')
-    matches = set(pattern.findall(content))
-    
-    for relative_path in matches:
+    local_files = {}
+    for relative_path in sorted(set(pattern.findall(content))):
         # Resolve file path
-        full_path = PROJECT_ROOT / "outputs" / product_id / relative_path
-        
+        full_path = _product_dir(product_id) / relative_path
         if full_path.exists():
-            print(f"Uploading local image: {relative_path}")
-            uploaded_url = upload_image(full_path)
-            if uploaded_url:
-                content = content.replace(relative_path, uploaded_url)
-                print(f"Replaced {relative_path} -> {uploaded_url}")
-            else:
-                print(f"Failed to upload {relative_path}, keeping local path")
+            local_files[relative_path] = full_path
         else:
-             print(f"Local image not found: {full_path}")
+            logger.warning(f"Local image not found: {full_path}")
+    if not local_files:
+        return content
+    
+    uploaded = get_wp_client(api_url, token).upload_many(local_files.values())
+    for relative_path, full_path in local_files.items():
+        uploaded_url = uploaded.get(str(full_path), "")
+        if uploaded_url:
+            content = content.replace(relative_path, uploaded_url)
+            logger.debug(f"Replaced {relative_path} -> {uploaded_url}")
+        else:
+            logger.warning(f"Failed to upload {relative_path}, keeping local path")
              
     return content
 
@@ -967,41 +934,39 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
     # Fallback to secrets.json if any credential is missing
     if not (medium_token and tumblr_creds and github_creds and blogger_creds):
         try:
-            with open(PROJECT_ROOT / "data" / "secrets.json", "r", encoding="utf-8") as f:
-                s = json.load(f)
-                
-                if not medium_token:
-                    medium_token = s.get("MEDIUM_TOKEN") or s.get("medium", {}).get("token")
-                
-                if not tumblr_creds:
-                    tumblr_s = s.get("tumblr", {})
-                    if s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key"):
-                        tumblr_creds = {
-                            "consumer_key": s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key"),
-                            "consumer_secret": s.get("TUMBLR_CONSUMER_SECRET") or tumblr_s.get("consumer_secret"),
-                            "oauth_token": s.get("TUMBLR_OAUTH_TOKEN") or tumblr_s.get("oauth_token"),
-                            "oauth_token_secret": s.get("TUMBLR_OAUTH_TOKEN_SECRET") or tumblr_s.get("oauth_token_secret"),
-                            "blog_identifier": s.get("TUMBLR_BLOG_IDENTIFIER") or tumblr_s.get("blog_identifier")
-                        }
-                
-                if not github_creds:
-                    gh_s = s.get("github_pages", {})
-                    if s.get("GITHUB_TOKEN") or gh_s.get("token"):
-                        github_creds = {
-                            "username": s.get("GITHUB_USERNAME") or gh_s.get("username"),
-                            "token": s.get("GITHUB_TOKEN") or gh_s.get("token"),
-                            "repo_url": s.get("GITHUB_REPO_URL") or gh_s.get("repo_url")
-                        }
+            s = get_secrets(PROJECT_ROOT)
+            if not medium_token:
+                medium_token = s.get("MEDIUM_TOKEN") or s.get("medium", {}).get("token")
+            
+            if not tumblr_creds:
+                tumblr_s = s.get("tumblr", {})
+                if s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key"):
+                    tumblr_creds = {
+                        "consumer_key": s.get("TUMBLR_CONSUMER_KEY") or tumblr_s.get("consumer_key"),
+                        "consumer_secret": s.get("TUMBLR_CONSUMER_SECRET") or tumblr_s.get("consumer_secret"),
+                        "oauth_token": s.get("TUMBLR_OAUTH_TOKEN") or tumblr_s.get("oauth_token"),
+                        "oauth_token_secret": s.get("TUMBLR_OAUTH_TOKEN_SECRET") or tumblr_s.get("oauth_token_secret"),
+                        "blog_identifier": s.get("TUMBLR_BLOG_IDENTIFIER") or tumblr_s.get("blog_identifier")
+                    }
+            
+            if not github_creds:
+                gh_s = s.get("github_pages", {})
+                if s.get("GITHUB_TOKEN") or gh_s.get("token"):
+                    github_creds = {
+                        "username": s.get("GITHUB_USERNAME") or gh_s.get("username"),
+                        "token": s.get("GITHUB_TOKEN") or gh_s.get("token"),
+                        "repo_url": s.get("GITHUB_REPO_URL") or gh_s.get("repo_url")
+                    }
 
-                if not blogger_creds:
-                    blogger_s = s.get("blogger", {})
-                    if s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id"):
-                        blogger_creds = {
-                            "client_id": s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id"),
-                            "client_secret": s.get("BLOGGER_CLIENT_SECRET") or blogger_s.get("client_secret"),
-                            "refresh_token": s.get("BLOGGER_REFRESH_TOKEN") or blogger_s.get("refresh_token"),
-                            "blog_id": s.get("BLOGGER_BLOG_ID") or blogger_s.get("blog_id")
-                        }
+            if not blogger_creds:
+                blogger_s = s.get("blogger", {})
+                if s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id"):
+                    blogger_creds = {
+                        "client_id": s.get("BLOGGER_CLIENT_ID") or blogger_s.get("client_id"),
+                        "client_secret": s.get("BLOGGER_CLIENT_SECRET") or blogger_s.get("client_secret"),
+                        "refresh_token": s.get("BLOGGER_REFRESH_TOKEN") or blogger_s.get("refresh_token"),
+                        "blog_id": s.get("BLOGGER_BLOG_ID") or blogger_s.get("blog_id")
+                    }
         except: pass
     
     blog_manager = BlogManager(
@@ -1016,7 +981,7 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
 
     # Inject Ad Code if available
     if ad_code:
-        print(f"💰 [Monetization] Injecting ad code into content...")
+        logger.info(f"💰 [Monetization] Injecting ad code into content...")
         
         # 1. For GitHub Pages / WordPress (Full HTML Support)
         if "blog" in payloads and "markdown" in payloads["blog"]:
@@ -1061,23 +1026,24 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
 
     # SEO Tags Generation
     seo_tags = SEOManager.generate_tags(payloads.get("title", ""), payloads.get("source", {}).get("primary_post", ""))
-    print(f"🏷️ [SEO] Generated tags: {seo_tags}")
+    logger.info(f"🏷️ [SEO] Generated tags: {seo_tags}")
 
     # Initialize SocialManager
-    social_manager = SocialManager(config_path=CONFIG_PATH, secrets_path=DATA_DIR / "secrets.json")
+    social_manager = SocialManager(config_path=CONFIG_PATH, secrets_path=secrets_file(PROJECT_ROOT).path)
+    # 레이트 리밋으로 예약된 게시는 백그라운드 워커가 허용 시각에 전송 (이전 실행의 예약 포함)
+    social_manager.start_scheduler()
 
+    # 모든 채널이 공유하는 secrets (config_store 캐시, 읽기 전용)
+    secrets = get_secrets(PROJECT_ROOT)
+
+    # 채널별 소요 시간을 span 이벤트로 기록 (Promotion Dispatch/<channel>)
+    dispatch_span = span("Promotion Dispatch", product_id=product_id, channels=len(channels))
     for channel in channels:
-        # Read secrets common for all channels
-        secrets = {}
-        try:
-            with open(PROJECT_ROOT / "data" / "secrets.json", "r", encoding="utf-8") as f:
-                secrets = json.load(f)
-        except Exception:
-            pass
+        dispatch_span.stage(channel)
 
         if channel == "medium":
             # Medium Publisher via BlogManager
-            print(f"🚀 [Medium] Publishing '{payloads['title']}'...")
+            logger.info(f"🚀 [Medium] Publishing '{payloads['title']}'...")
             
             # Canonical URL from WP if available
             canonical_url = None
@@ -1113,15 +1079,15 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
 
         elif channel == "tumblr":
             # Tumblr Publisher
-            print(f"🚀 [Tumblr] Publishing '{payloads['title']}'...")
+            logger.info(f"🚀 [Tumblr] Publishing '{payloads['title']}'...")
             if not tumblr_creds:
-                print("⚠️ [Tumblr] No credentials found in config.")
+                logger.warning("⚠️ [Tumblr] No credentials found in config.")
                 results["dispatch_results"]["tumblr"] = {"ok": False, "error": "No credentials"}
                 continue
                 
             blog_identifier = tumblr_creds.get("blog_identifier")
             if not blog_identifier:
-                print("⚠️ [Tumblr] Blog identifier missing.")
+                logger.warning("⚠️ [Tumblr] Blog identifier missing.")
                 results["dispatch_results"]["tumblr"] = {"ok": False, "error": "No blog_identifier"}
                 continue
             
@@ -1153,15 +1119,15 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
 
         elif channel == "github_pages":
             # GitHub Pages Publisher
-            print(f"🚀 [GitHub Pages] Publishing '{payloads['title']}'...")
+            logger.info(f"🚀 [GitHub Pages] Publishing '{payloads['title']}'...")
             if not github_creds:
-                 print("⚠️ [GitHub Pages] No credentials found.")
+                 logger.warning("⚠️ [GitHub Pages] No credentials found.")
                  results["dispatch_results"]["github_pages"] = {"ok": False, "error": "No credentials"}
                  continue
             
             repo_url = github_creds.get("repo_url")
             if not repo_url:
-                print("⚠️ [GitHub Pages] Repo URL missing.")
+                logger.warning("⚠️ [GitHub Pages] Repo URL missing.")
                 results["dispatch_results"]["github_pages"] = {"ok": False, "error": "No repo_url"}
                 continue
                 
@@ -1194,15 +1160,15 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
 
         elif channel == "blogger":
             # Blogger Publisher
-            print(f"🚀 [Blogger] Publishing '{payloads['title']}'...")
+            logger.info(f"🚀 [Blogger] Publishing '{payloads['title']}'...")
             if not blogger_creds:
-                 print("⚠️ [Blogger] No credentials found.")
+                 logger.warning("⚠️ [Blogger] No credentials found.")
                  results["dispatch_results"]["blogger"] = {"ok": False, "error": "No credentials"}
                  continue
             
             blog_id = blogger_creds.get("blog_id")
             if not blog_id:
-                print("⚠️ [Blogger] Blog ID missing.")
+                logger.warning("⚠️ [Blogger] Blog ID missing.")
                 results["dispatch_results"]["blogger"] = {"ok": False, "error": "No blog_id"}
                 continue
             
@@ -1245,11 +1211,13 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
                 # 카테고리 결정
                 cats = _get_category_for_niche(niche)
 
-                # 중복 포스트 검사
-                dup_res = _check_duplicate_post(wp_url, wp_token, payloads["title"])
+                # 중복 포스트 검사 (로컬 근사 중복 인덱스 → 원격 검색)
+                dup_res = _check_duplicate_post(wp_url, wp_token, payloads["title"], content=payloads["blog"]["markdown"], product_id=product_id)
                 if dup_res.get("exists"):
-                    print(f"Skipping WP Publish: Duplicate post found (ID: {dup_res['id']})")
+                    logger.info(f"Skipping WP Publish: Duplicate post found (ID: {dup_res['id']}, via {dup_res.get('source', 'search')})")
                     wp_res = {"id": dup_res["id"], "link": dup_res["link"]}
+                    if dup_res.get("source") != "index":
+                        _record_wp_post(product_id, payloads["title"], payloads["blog"]["markdown"], dup_res["id"], dup_res["link"])
                 else:
                     # 이미지 업로드 및 URL 교체 (Content Pre-processing)
                     # Use markdown to regenerate HTML with relative paths for local image resolution
@@ -1264,19 +1232,19 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
                     
                     final_content = html_for_wp
                     try:
-                        print("Processing images for WordPress upload...")
+                        logger.info("Processing images for WordPress upload...")
                         final_content = _process_content_images(final_content, wp_url, wp_token, product_id)
                     except Exception as e:
-                        print(f"Image processing failed: {e}")
+                        logger.warning(f"Image processing failed: {e}")
                     
                     # Pre-publish Validation
                     try:
                         from src.promotion_validator import PromotionValidator
                         img_errors = PromotionValidator.verify_image_links(final_content)
                         if img_errors:
-                            print(f"⚠️ [Pre-Publish Validation] Image issues found:")
+                            logger.warning(f"⚠️ [Pre-Publish Validation] Image issues found:")
                             for err in img_errors:
-                                print(f"  - {err}")
+                                logger.warning(f"  - {err}")
                     except ImportError:
                         pass
 
@@ -1291,22 +1259,24 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
                 
                 if wp_res and wp_res.get("id"):
                     results["dispatch_results"]["wordpress"] = {"ok": True, "id": wp_res["id"], "link": wp_res.get("link")}
+                    if not dup_res.get("exists"):
+                        _record_wp_post(product_id, payloads["title"], payloads["blog"]["markdown"], wp_res["id"], wp_res.get("link"))
                     
                     # Post-publish Validation
                     try:
-                        print(f"🔎 [Post-Publish Validation] Checking published post: {wp_res.get('link')}")
+                        logger.info(f"🔎 [Post-Publish Validation] Checking published post: {wp_res.get('link')}")
                         published_content = wp_res.get("content", {}).get("rendered", "")
                         if published_content:
                             from src.promotion_validator import PromotionValidator
                             post_errors = PromotionValidator.verify_image_links(published_content)
                             if post_errors:
-                                print(f"❌ [Post-Publish Validation] Found broken images in published post!")
+                                logger.warning(f"❌ [Post-Publish Validation] Found broken images in published post!")
                                 for err in post_errors:
-                                    print(f"  - {err}")
+                                    logger.warning(f"  - {err}")
                             else:
-                                print(f"✅ [Post-Publish Validation] All images look good.")
+                                logger.info(f"✅ [Post-Publish Validation] All images look good.")
                     except Exception as e:
-                        print(f"Post-publish validation error: {e}")
+                        logger.warning(f"Post-publish validation error: {e}")
 
                     # 레저에 발행 정보 기록
                     try:
@@ -1320,9 +1290,9 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
                         meta["wp_post_id"] = wp_res["id"]
                         meta["wp_link"] = wp_res.get("link")
                         lm.create_product(product_id, prod["topic"], metadata=meta)
-                        print(f"DEBUG: Saved wp_post_id={wp_res['id']} to ledger for {product_id}")
+                        logger.debug(f"Saved wp_post_id={wp_res['id']} to ledger for {product_id}")
                     except Exception as e:
-                        print(f"DEBUG: Failed to update ledger with WP info: {e}")
+                        logger.warning(f"Failed to update ledger with WP info: {e}")
                 else:
                     results["dispatch_results"]["wordpress"] = {"ok": False, "error": "Publish failed"}
             except Exception as e:
@@ -1337,11 +1307,11 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             hashtags = " ".join([f"#{tag.replace(' ', '')}" for tag in seo_tags[:3]])
             tweet_text = f"{tweet_text}\n\n{hashtags}"
             
-            res = social_manager.post_to_twitter(tweet_text)
+            res = social_manager.post_or_schedule("twitter", "post_to_twitter", product_id=product_id, ledger_meta={"key": "x_post_id", "field": "id"}, text=tweet_text)
             results["dispatch_results"]["x"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1359,11 +1329,11 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             description = payloads.get("source", {}).get("primary_post") or f"Check out {payloads.get('title', 'New Product')}"
             msg = f"{payloads.get('title', 'New Product')}\n\n{description}\n\n{link}"
             
-            res = social_manager.post_to_telegram(msg)
+            res = social_manager.post_or_schedule("telegram", "post_to_telegram", product_id=product_id, ledger_meta={"key": "telegram_posted", "value": "true"}, text=msg)
             results["dispatch_results"]["telegram"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1380,11 +1350,11 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             link = payloads.get('blog', {}).get('html', '').split('href="')[1].split('"')[0] if 'href="' in payloads.get('blog', {}).get('html', '') else payloads.get("url", "#")
             dc_text = f"**New Product Alert!** 🚀\n\n**{payloads['title']}**\n{payloads['source']['primary_post']}\n\n[Check it out here]({link})"
             
-            res = social_manager.post_to_discord(dc_text)
+            res = social_manager.post_or_schedule("discord", "post_to_discord", product_id=product_id, ledger_meta={"key": "discord_posted", "value": "true"}, text=dc_text)
             results["dispatch_results"]["discord"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1398,11 +1368,11 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             
         elif channel == "reddit":
             # Reddit via SocialManager
-            res = social_manager.post_to_reddit(title=payloads["title"], url=payloads.get("url", ""))
+            res = social_manager.post_or_schedule("reddit", "post_to_reddit", product_id=product_id, ledger_meta={"key": "reddit_url", "field": "url"}, title=payloads["title"], url=payloads.get("url", ""))
             results["dispatch_results"]["reddit"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1436,7 +1406,11 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
                  search_query = (payloads.get("title", "")).replace(" ", "+")
                  img_url = f"https://images.unsplash.com/featured/?{search_query},technology"
 
-            res = social_manager.post_to_pinterest(
+            res = social_manager.post_or_schedule(
+                "pinterest",
+                "post_to_pinterest",
+                product_id=product_id,
+                ledger_meta={"key": "pinterest_id", "field": "id"},
                 title=payloads["title"],
                 description=payloads.get("source", {}).get("primary_post", "")[:500],
                 link=payloads.get("url", ""),
@@ -1445,7 +1419,7 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             results["dispatch_results"]["pinterest"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1459,14 +1433,18 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
             
         elif channel == "linkedin":
             # LinkedIn via SocialManager
-            res = social_manager.post_to_linkedin(
+            res = social_manager.post_or_schedule(
+                "linkedin",
+                "post_to_linkedin",
+                product_id=product_id,
+                ledger_meta={"key": "linkedin_id", "field": "id"},
                 text=f"{payloads['title']}\n\n{payloads.get('source', {}).get('primary_post', '')}",
                 url=payloads.get("url", "")
             )
             results["dispatch_results"]["linkedin"] = res
             
             # Update Ledger
-            if res.get("ok"):
+            if res.get("ok") and not res.get("queued"):
                 try:
                     from src.ledger_manager import LedgerManager
                     from src.config import Config
@@ -1482,10 +1460,13 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
         elif channel == "youtube_shorts":
             # YouTube Shorts via SocialManager
             # Check if video file exists
-            video_path = PROJECT_ROOT / "outputs" / product_id / "promotions" / "shorts.mp4"
+            video_path = _product_dir(product_id) / "promotions" / "shorts.mp4"
             if video_path.exists():
-                print(f"🚀 [YouTube] Uploading Shorts for '{payloads['title']}'...")
-                res = social_manager.post_to_youtube(
+                logger.info(f"🚀 [YouTube] Uploading Shorts for '{payloads['title']}'...")
+                res = social_manager.post_or_schedule(
+                    "youtube",
+                    "post_to_youtube",
+                    product_id=product_id,
                     title=f"{payloads['title']} #Shorts",
                     description=f"{payloads.get('source', {}).get('primary_post', '')}\n\nGet it here: {payloads.get('url', '')}",
                     video_path=str(video_path),
@@ -1498,20 +1479,23 @@ def dispatch_publish(product_id: str, channels: List[str] = None) -> Dict[str, A
         elif channel == "instagram":
             # Instagram (Simulation / Future Implementation)
             # Requires Graph API with Business Account
-            print(f"📸 [Instagram] Simulation: Posting '{payloads['title']}' to Instagram...")
+            logger.info(f"📸 [Instagram] Simulation: Posting '{payloads['title']}' to Instagram...")
             results["dispatch_results"]["instagram"] = {"ok": True, "info": "Simulation success (API requires approval)"}
 
 
         elif channel == "tiktok":
             # TikTok (Simulation / Future Implementation)
             # Requires TikTok for Developers API approval
-            print(f"🎵 [TikTok] Simulation: Posting '{payloads['title']}' to TikTok...")
+            logger.info(f"🎵 [TikTok] Simulation: Posting '{payloads['title']}' to TikTok...")
             results["dispatch_results"]["tiktok"] = {"ok": True, "info": "Simulation success (API requires approval)"}
         
         else:
             # Other channels
             results["dispatch_results"][channel] = {"ok": True, "info": "Simulation success"}
-            
+
+    failed = [ch for ch, r in results["dispatch_results"].items() if not (isinstance(r, dict) and r.get("ok"))]
+    dispatch_span.set(failed=failed).finish()
+    logger.info(f"[{product_id}] 홍보 채널 발행 결과: {len(channels) - len(failed)}/{len(channels)} 성공" + (f" (실패: {', '.join(failed)})" if failed else ""))
     return results
 
 def repromote_best_sellers():
@@ -1531,7 +1515,7 @@ def repromote_best_sellers():
             return
             
         target = random.choice(promoted)
-        print(f"🔄 [Auto-Repromote] Selected {target['topic']} for re-promotion boost.")
+        logger.info(f"🔄 [Auto-Repromote] Selected {target['topic']} for re-promotion boost.")
         
         # Dispatch to social channels only (skip WP to avoid duplicates, or update WP)
         # For this "sophisticated" version, let's try to post to Telegram/Discord again with a "Trending" tag
@@ -1539,7 +1523,7 @@ def repromote_best_sellers():
         dispatch_publish(target['id'], channels=["x", "telegram", "discord"])
         
     except Exception as e:
-        print(f"Repromotion failed: {e}")
+        logger.warning(f"Repromotion failed: {e}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import re
-from typing import Dict, List, Any
+from typing import Any, Dict, List, Sequence
 
 class PromotionValidationResult:
     def __init__(self, passed: bool, score: float, feedback: List[str], schema_errors: List[str]):
@@ -47,54 +47,19 @@ class PromotionValidator:
         Verifies that all images in the content are accessible.
         Returns a list of error messages for broken images.
         """
-        import requests
-        import os
-        from pathlib import Path
-        
-        errors = []
-        # Markdown images: ![alt](url "title") or ![alt](url)
-        # Extract URL part, handling optional title
-        md_matches = re.findall(r"!\[.*?\]\((.*?)\)", content)
-        md_urls = []
-        for m in md_matches:
-            # url is the first part before space (if title exists)
-            # e.g. "http://... "title""
-            parts = m.split(maxsplit=1)
-            if parts:
-                md_urls.append(parts[0])
+        return PromotionValidator.verify_image_links_batch([content])[0]
 
-        # HTML images
-        html_urls = re.findall(r'<img[^>]+src="([^">]+)"', content)
-        
-        all_images = set(md_urls + html_urls)
-        
-        for url in all_images:
-            url = url.strip()
-            if not url or url.startswith("data:"): 
-                continue
-            
-            if url.startswith("http"):
-                try:
-                    # Fake user agent to avoid blocking
-                    headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-                    r = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
-                    if r.status_code >= 400:
-                        # Some servers block HEAD, try GET with stream
-                        r = requests.get(url, headers=headers, stream=True, timeout=5)
-                        r.close()
-                        if r.status_code >= 400:
-                            errors.append(f"Broken image link: {url} (Status: {r.status_code})")
-                except Exception as e:
-                    errors.append(f"Error checking image {url}: {e}")
-            else:
-                # Local path
-                # Handle absolute and relative paths
-                if not os.path.exists(url):
-                    # Check if it's relative to PROJECT_ROOT?
-                    # We assume absolute paths or CWD relative
-                    errors.append(f"Missing local image file: {url}")
-                    
-        return errors
+    @staticmethod
+    def verify_image_links_batch(contents: Sequence[str]) -> List[List[str]]:
+        """
+        여러 글의 이미지를 한 번에 검증합니다.
+        고유 URL 만 모아 한 번의 병렬 라운드로 검사하고(링크 검사 캐시 사용), 글별 오류 목록을 반환합니다.
+        """
+        from .link_checker import extract_image_urls, get_link_checker
+
+        per_post = [extract_image_urls(c) for c in contents]
+        results = get_link_checker().check_many(u for urls in per_post for u in urls)
+        return [[results[u].message() for u in urls if not results[u].ok] for urls in per_post]
 
     @staticmethod
     def validate_blog_post(content: str, title: str) -> PromotionValidationResult:
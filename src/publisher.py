@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import base64
 import time
@@ -11,13 +12,14 @@ from typing import Any, Dict, List, Tuple
 import requests
 
 from .config import Config
+from .config_store import secrets_file
 from .ledger_manager import LedgerManager
 # Import product generator for HTML regeneration
 try:
-    from .product_generator import _render_landing_html_from_schema
+    from .product_generator import render_product_pages
 except ImportError:
     # Fallback if circular import or missing
-    _render_landing_html_from_schema = None
+    render_product_pages = None
 from .utils import ProductionError, get_logger, handle_errors, retry_on_failure
 
 logger = get_logger(__name__)
@@ -33,6 +35,12 @@ class Publisher:
         self.vercel_api_token = Config.VERCEL_API_TOKEN
         self.github_token = Config.GITHUB_TOKEN
         self.vercel_team_id = os.getenv("VERCEL_TEAM_ID") or os.getenv("VERCEL_ORG_ID")
+        # 로컬 fake(tools/bench_pipeline.py)로 돌릴 때 API 주소/대기 시간/배포 방식을 환경 변수로 바꿈
+        self.vercel_api_url = (os.getenv("VERCEL_API_URL") or "https://api.vercel.com").rstrip("/")
+        self.deployment_gap = float(os.getenv("VERCEL_DEPLOY_GAP", self.MIN_DEPLOYMENT_GAP))
+        self.verify_interval = float(os.getenv("VERCEL_VERIFY_INTERVAL", "10"))
+        # git: 통합 사이트로 git push (기본), api: 제품별 Vercel 프로젝트로 API 배포
+        self.deploy_method = os.getenv("PUBLISH_DEPLOY_METHOD", "git").strip().lower()
 
         if not self.vercel_api_token:
             raise ProductionError("Vercel API 토큰이 없습니다.", stage="Publisher Init")
@@ -97,7 +105,7 @@ class Publisher:
                     files.append((rel, data))
         
         # data/secrets.json 추가 (Vercel에서 API 동작을 위해 필요)
-        secrets_json = project_root / "data" / "secrets.json"
+        secrets_json = secrets_file(project_root).path
         if secrets_json.exists():
             files.append(("data/secrets.json", secrets_json.read_bytes()))
 
@@ -105,13 +113,13 @@ class Publisher:
         vercel_json = project_root / "vercel.json"
         if vercel_json.exists():
             files.append(("vercel.json", vercel_json.read_bytes()))
-            logger.info("  - vercel.json 포함됨")
 
         # 필수 로컬 Python 모듈 추가 (api/ 내에서 import 하는 파일들)
         required_modules = [
             "payment_api.py",
             "nowpayments_client.py",
             "order_store.py",
+            "payment_status.py",
             "evm_verifier.py",
         ]
         for mod in set(required_modules):
@@ -158,16 +166,19 @@ class Publisher:
                 logger.warning(f"requirements.txt 필터링 중 오류: {e}")
                 files.append(("requirements.txt", req_txt.read_bytes()))
             
-        for f_path, f_content in files:
-            logger.info(f"  - 배포 파일: {f_path} ({len(f_content)} bytes)")
-            
         # 중복 파일 제거 (마지막 항목 유지)
         unique_files = {}
         for path, content in files:
             unique_files[path] = content
         
         final_files = [(p, c) for p, c in unique_files.items()]
-        logger.info(f"  - 최종 배포 파일 개수: {len(final_files)}")
+        # 파일별 목록은 DEBUG 에서만 (배포마다 수백 줄이 동기 로그로 나가지 않도록 요약 1줄만 INFO)
+        if logger.isEnabledFor(logging.DEBUG):
+            for f_path, f_content in final_files:
+                logger.debug(f"  - 배포 파일: {f_path} ({len(f_content)} bytes)")
+        logger.info(
+            f"  - 최종 배포 파일 개수: {len(final_files)} ({sum(len(c) for _, c in final_files)} bytes)"
+        )
         return final_files
 
     def _get_all_projects(self) -> List[Dict[str, Any]]:
@@ -177,7 +188,7 @@ class Publisher:
         qs_base = self._vercel_team_qs()
         
         while True:
-            url = f"https://api.vercel.com/v9/projects{qs_base}"
+            url = f"{self.vercel_api_url}/v9/projects{qs_base}"
             if qs_base:
                 url += f"&limit=100"
             else:
@@ -229,7 +240,7 @@ class Publisher:
         for p in target_projects[:to_delete_count]:
             p_id = p['id']
             p_name = p['name']
-            del_url = f"https://api.vercel.com/v9/projects/{p_id}{qs}"
+            del_url = f"{self.vercel_api_url}/v9/projects/{p_id}{qs}"
             dr = requests.delete(del_url, headers=self._vercel_headers())
             if dr.status_code in [200, 204]:
                 logger.info(f"프로젝트 삭제 성공: {p_name}")
@@ -250,8 +261,8 @@ class Publisher:
         # 1. 배포 간격 조절 (스로틀링 - 최소 10초로 약간 완화)
         now = time.time()
         time_since_last = now - Publisher._last_deployment_time
-        if time_since_last < 10:
-            wait_time = 10 - time_since_last
+        if time_since_last < self.deployment_gap:
+            wait_time = self.deployment_gap - time_since_last
             logger.info(f"Vercel 배포 스로틀링: {wait_time:.1f}초 대기 중...")
             time.sleep(wait_time)
 
@@ -268,8 +279,6 @@ class Publisher:
             )
 
         logger.info(f"Vercel 배포 파일 수집 완료: {len(files)}개 파일")
-        for f_path, _ in files[:10]: # 상위 10개만 로그 출력
-            logger.info(f"  - 배포 파일: {f_path}")
 
         vercel_files = []
         for path, content in files:
@@ -307,7 +316,7 @@ class Publisher:
         }
 
         qs = self._vercel_team_qs()
-        url = f"https://api.vercel.com/v13/deployments{qs}"
+        url = f"{self.vercel_api_url}/v13/deployments{qs}"
         
         # 2. 429 에러 대응을 위한 내부 재시도 로직 (지수 백오프 강화)
         max_internal_retries = 3
@@ -390,7 +399,7 @@ class Publisher:
         for i in range(max_retries):
             try:
                 # 10초 간격으로 시도
-                time.sleep(10)
+                time.sleep(self.verify_interval)
                 
                 # 1. 메인 페이지 검사
                 r = requests.get(url, timeout=15)
@@ -433,7 +442,7 @@ class Publisher:
         """Vercel 프로젝트 설정을 업데이트하여 Framework 오탐지를 방지합니다."""
         logger.info(f"Vercel 프로젝트 설정 업데이트 시도: {project_name}")
         qs = self._vercel_team_qs()
-        url = f"https://api.vercel.com/v9/projects/{project_name}{qs}"
+        url = f"{self.vercel_api_url}/v9/projects/{project_name}{qs}"
         
         # framework를 null로 설정하면 'Other' (정적 파일)로 취급됩니다.
         payload = {
@@ -456,7 +465,7 @@ class Publisher:
         """Vercel 프로젝트의 각종 보호 기능(SSO, Vercel Authentication 등)을 비활성화합니다."""
         logger.info(f"Vercel 프로젝트 보호 기능 비활성화 시도 - 프로젝트: {project_name}")
         qs = self._vercel_team_qs()
-        url = f"https://api.vercel.com/v9/projects/{project_name}{qs}"
+        url = f"{self.vercel_api_url}/v9/projects/{project_name}{qs}"
         
         # 'protection' 필드는 Vercel API v9에서 지원되지 않거나 형식이 다를 수 있음
         # 'ssoProtection'만 먼저 시도하고, 'deploymentProtection'은 별도로 시도하거나 제외
@@ -496,7 +505,7 @@ class Publisher:
         }
 
         qs = self._vercel_team_qs()
-        url = f"https://api.vercel.com/v9/projects/{project_name}/env{qs}"
+        url = f"{self.vercel_api_url}/v9/projects/{project_name}/env{qs}"
         
         # 기존 환경 변수 확인
         r = requests.get(url, headers=self._vercel_headers())
@@ -519,7 +528,7 @@ class Publisher:
                 # 실제 운영에서는 PATCH를 쓰는 것이 좋음.
                 logger.info(f"Vercel: {project_name}에 {key}가 이미 존재합니다. 업데이트를 시도합니다.")
                 env_id = existing_envs[key]['id']
-                patch_url = f"https://api.vercel.com/v9/projects/{project_name}/env/{env_id}{qs}"
+                patch_url = f"{self.vercel_api_url}/v9/projects/{project_name}/env/{env_id}{qs}"
                 payload = {
                     "value": value,
                     "target": ["production", "preview", "development"]
@@ -656,9 +665,11 @@ class Publisher:
                         schema["package_file"] = "package.zip"
                     # 없으면 pass (render 함수가 알아서 처리하거나 default 사용)
                 
-                html = _render_landing_html_from_schema(schema, brand="MetaPassiveIncome")
-                (Path(product_output_dir) / "index.html").write_text(html, encoding="utf-8")
-                logger.info(f"HTML 재생성 완료: {product_id}")
+                render_result = render_product_pages(schema, product_output_dir, brand="MetaPassiveIncome")
+                if render_result["rendered"]:
+                    logger.info(f"HTML 재생성 완료: {product_id}")
+                else:
+                    logger.info(f"스키마/템플릿 변경 없음, HTML 재생성 건너뜀: {product_id}")
             else:
                 logger.warning(f"스키마 파일 없음, HTML 재생성 건너뜀: {product_id}")
         except Exception as e:
@@ -670,7 +681,13 @@ class Publisher:
         # [NEW] Git Push 배포 방식 우선 사용 (Vercel API 한도 우회)
         # 모든 제품을 하나의 통합 사이트에서 서빙
         try:
-            deployment_url = self._deploy_via_git(product_id)
+            if self.deploy_method == "api":
+                project_name = self._sanitize_project_name(f"meta-passive-income-{product_id}")
+                deployment_url = self._deploy_to_vercel(product_id, project_name, product_output_dir)
+                deploy_method = "vercel_api"
+            else:
+                deployment_url = self._deploy_via_git(product_id)
+                deploy_method = "git_push"
             
             updated_product = self.ledger_manager.update_product_status(
                 product_id=product_id,
@@ -679,12 +696,12 @@ class Publisher:
                     "published_at": datetime.now().isoformat(),
                     "deployment_url": deployment_url,
                     "version": product.get("version"),
-                    "deploy_method": "git_push"
+                    "deploy_method": deploy_method
                 },
             )
             
             logger.info(
-                f"제품 발행 완료 (Git Push) - 제품 ID: {product_id}, 배포 URL: {deployment_url}"
+                f"제품 발행 완료 ({deploy_method}) - 제품 ID: {product_id}, 배포 URL: {deployment_url}"
             )
             return {"status": "PUBLISHED", "url": deployment_url}
             
@@ -727,9 +744,8 @@ class Publisher:
                         if "package_file" not in schema and (Path(output_dir) / "package.zip").exists():
                             schema["package_file"] = "package.zip"
                         
-                        if _render_landing_html_from_schema:
-                            html = _render_landing_html_from_schema(schema, brand="MetaPassiveIncome")
-                            (Path(output_dir) / "index.html").write_text(html, encoding="utf-8")
+                        if render_product_pages:
+                            render_product_pages(schema, output_dir, brand="MetaPassiveIncome")
                         else:
                             logger.warning("HTML generator not imported, skipping regeneration")
                 except Exception as e:
@@ -2,13 +2,15 @@ import json
 import os
 import re
 import zipfile  # ZIP 파일 처리를 위해 추가
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 import requests  # 다운로드 엔드포인트 유효성 검사를 위해 추가
 
 from .ai_quality import run_quality_inspection
 from .config import Config
 from .ledger_manager import LedgerManager  # LedgerManager 임포트
+from .qa_rules import Rule, RuleSet, content_digest
 from .schema_validator import run_rule_based_validation
 from .utils import (
     ProductionError,
@@ -21,6 +23,93 @@ from .utils import (
 
 logger = get_logger(__name__)
 
+# QA Stage 1 결과 캐시 (제품 폴더 내, 패키지에는 포함되지 않음)
+QA_CACHE_FILENAME = ".qa_cache.json"
+QA_CACHE_VERSION = 1
+# Stage 1 결과를 결정하는 입력 산출물 (내용 해시가 같으면 QA 를 건너뜀)
+QA_STAGE1_INPUTS = ("index.html", "product_schema.json", "premium_content_report.json")
+# 판정 로직이 들어 있는 모듈: 소스가 바뀌면(임계값/규칙 수정) 저장된 결과를 쓰지 않음
+QA_STAGE1_LOGIC_MODULES = ("qa_manager.py", "schema_validator.py", "product_schema.py", "ai_quality.py")
+MIN_HTML_LENGTH = 1500  # 최소 길이를 1200 -> 1500으로 상향
+_STAGE1_LOGIC_DIGEST: Optional[str] = None
+
+REQUIRED_HTML_ELEMENTS = ["<html", "<head", "<body", "</html>"]
+REQUIRED_SECTIONS = {
+    "hero": [r"<section[^>]*id=\"hero\"", r"<div[^>]*class=\".*hero\""],
+    "features": [r"<section[^>]*id=\"features\"", r"<h2[^>]*>Features</h2>"],
+    "pricing": [r"<section[^>]*id=\"pricing\"", r"<h2[^>]*>Pricing</h2>"],
+    "faq": [r"<section[^>]*id=\"faq\"", r"<h2[^>]*>FAQ</h2>"],
+    "cta": [
+        r"<button[^>]*data-action=\"open-plans\"",
+        r"<button[^>]*class=\".*btn-primary\"",
+    ],  # primary_cta 버튼
+}
+
+# index.html 검사 규칙 (산출물당 한 번에 평가)
+LANDING_RULES = RuleSet(
+    [Rule(f"element:{el}", el, ignore_case=True) for el in REQUIRED_HTML_ELEMENTS]
+    + [
+        Rule("local_preview", "function isLocalPreview()"),
+        Rule("port_8090", "8090"),
+        Rule("start_pay", "async function startPay(", count=True),
+        Rule("fetch_pay_start", "fetch(`${API_BASE}/api/pay/start`"),
+        Rule("fetch_pay_check", "fetch(`${API_BASE}/api/pay/check`"),
+        Rule("method_post", "method: 'POST'"),
+        Rule("method_get", "method: 'GET'"),
+        Rule("method", "method"),
+        Rule("fetch", "fetch"),
+        Rule("title", r"<title>(.*?)</title>", regex=True, ignore_case=True),
+        Rule("broken_link", r'<(?:img[^>]*src|a[^>]*href)=""[^>]*>', regex=True, ignore_case=True, count=True),
+    ]
+    + [
+        Rule(f"section:{section}:{i}", pattern, regex=True, ignore_case=True)
+        for section, patterns in REQUIRED_SECTIONS.items()
+        for i, pattern in enumerate(patterns)
+    ]
+)
+
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _load_qa_cache(output_dir: str) -> Dict:
+    try:
+        with open(os.path.join(output_dir, QA_CACHE_FILENAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == QA_CACHE_VERSION:
+            return data
+    except Exception:
+        pass
+    return {"version": QA_CACHE_VERSION}
+
+
+def _save_qa_cache(output_dir: str, data: Dict) -> None:
+    path = os.path.join(output_dir, QA_CACHE_FILENAME)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"QA 캐시 저장 실패 ({output_dir}): {e}")
+
+
+def _stage1_config_digest() -> str:
+    """Stage 1 판정 설정의 버전: 검사 모듈 소스 + 최소 길이 + AI 품질 모델/임계값."""
+    global _STAGE1_LOGIC_DIGEST
+    if _STAGE1_LOGIC_DIGEST is None:
+        here = os.path.dirname(os.path.abspath(__file__))
+        _STAGE1_LOGIC_DIGEST = content_digest(_read_bytes(os.path.join(here, name)) for name in QA_STAGE1_LOGIC_MODULES)
+    from .ai_quality import QUALITY_SCORE_THRESHOLD
+
+    ai_config = f"{os.getenv('AI_QUALITY_MODEL', 'deepseek-chat')}:{QUALITY_SCORE_THRESHOLD}"
+    return f"{_STAGE1_LOGIC_DIGEST}:{MIN_HTML_LENGTH}:{ai_config}"
+
 
 class QAResult:
     """QA 검사 결과를 담는 데이터 클래스"""
@@ -50,13 +139,66 @@ class QAManager:
         logger.info("QAManager 초기화 완료")
 
     @handle_errors(stage="QA Stage 1")
-    def run_qa_stage_1(self, product_id: str, output_dir: str) -> QAResult:
-        """1단계 QA (생성 품질 게이트)를 실행합니다."""
+    def run_qa_stage_1(
+        self, product_id: str, output_dir: str, use_cache: bool = True
+    ) -> QAResult:
+        """1단계 QA (생성 품질 게이트)를 실행합니다.
+
+        입력 산출물(QA_STAGE1_INPUTS)과 규칙/판정 설정이 이전 실행과 같으면 저장된 결과를 그대로 반환합니다.
+        """
+        cache_key = content_digest(
+            [
+                f"{QA_CACHE_VERSION}:{LANDING_RULES.fingerprint()}:{_stage1_config_digest()}:{product_id}".encode("utf-8"),
+                *(_read_bytes(os.path.join(output_dir, name)) for name in QA_STAGE1_INPUTS),
+            ]
+        )
+        cache = _load_qa_cache(output_dir) if use_cache else {"version": QA_CACHE_VERSION}
+        entry = cache.get("stage1") or {}
+        if use_cache and entry.get("key") == cache_key:
+            result = entry.get("result") or {}
+            logger.info(f"QA Stage 1 캐시 적중 (산출물 변경 없음) - 제품 ID: {product_id}")
+            return QAResult(
+                bool(result.get("passed")), "QA Stage 1", product_id, list(result.get("messages") or [])
+            )
+
+        result, cacheable = self._evaluate_stage_1(product_id, output_dir)
+        # AI 검사 오류나 AI 점수 미달처럼 결정적이지 않은 실패는 다음 실행에서 다시 검사하도록 저장하지 않음
+        if cacheable and os.path.isdir(output_dir):
+            cache["stage1"] = {"key": cache_key, "result": result.to_dict()}
+            _save_qa_cache(output_dir, cache)
+        return result
+
+    def run_qa_batch(
+        self,
+        product_ids: Optional[List[str]] = None,
+        workers: int = 4,
+        use_cache: bool = True,
+    ) -> Dict[str, QAResult]:
+        """카탈로그 전체(또는 지정 제품)의 QA Stage 1 을 병렬로 실행합니다."""
+        outputs_dir = Config.OUTPUT_DIR
+        if product_ids is None:
+            product_ids = sorted(
+                name for name in os.listdir(outputs_dir)
+                if os.path.isdir(os.path.join(outputs_dir, name))
+            ) if os.path.isdir(outputs_dir) else []
+
+        def _one(pid: str) -> QAResult:
+            try:
+                return self.run_qa_stage_1(pid, os.path.join(outputs_dir, pid), use_cache=use_cache)
+            except ProductionError as e:
+                return QAResult(False, "QA Stage 1", pid, [f"CRITICAL: {e.message}"])
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return dict(zip(product_ids, pool.map(_one, product_ids)))
+
+    def _evaluate_stage_1(self, product_id: str, output_dir: str) -> Tuple[QAResult, bool]:
+        """Stage 1 검사 본체. (결과, 캐시 가능 여부)를 반환합니다."""
         logger.info(
             f"QA Stage 1 시작 - 제품 ID: {product_id}, 출력 디렉토리: {output_dir}"
         )
         qa_messages = []
         passed = True
+        cacheable = True
 
         # 1. 주요 출력 파일 존재 및 읽기 가능 여부 확인
         index_html_path = os.path.join(output_dir, "index.html")
@@ -86,12 +228,13 @@ class QAManager:
             logger.warning(
                 f"QA Stage 1 실패 (파일 없음/읽기 불가) - 제품 ID: {product_id}"
             )
-            return QAResult(False, "QA Stage 1", product_id, qa_messages)
+            return QAResult(False, "QA Stage 1", product_id, qa_messages), True
+
+        scan = LANDING_RULES.scan(html_content)
 
         # 2. 필수 HTML 구조 요소 검사
-        required_html_elements = ["<html", "<head", "<body", "</html>"]
-        for element in required_html_elements:
-            if element.lower() not in html_content.lower():
+        for element in REQUIRED_HTML_ELEMENTS:
+            if not scan.has(f"element:{element}"):
                 qa_messages.append(
                     f"ERROR: 필수 HTML 요소 '{element}'가 누락되었습니다."
                 )
@@ -100,15 +243,15 @@ class QAManager:
                 qa_messages.append(f"SUCCESS: 필수 HTML 요소 '{element}'가 존재합니다.")
 
         # [NEW] 로컬 프리뷰 리다이렉트 방지 로직 검증 (8090 포트 예외 처리 확인)
-        if 'function isLocalPreview()' in html_content:
-            if '8090' in html_content:
+        if scan.has("local_preview"):
+            if scan.has("port_8090"):
                 qa_messages.append("SUCCESS: isLocalPreview()에 8090 포트 예외 처리가 포함되어 있습니다.")
             else:
                 qa_messages.append("ERROR: isLocalPreview()에 8090 포트 예외 처리가 누락되었습니다. (프리뷰 리다이렉트 위험)")
                 passed = False
         
         # [NEW] 결제 로직 중복 삽입 검증 (startPay 함수가 하나만 존재하는지 확인)
-        start_pay_count = html_content.count('async function startPay(')
+        start_pay_count = scan.count("start_pay")
         if start_pay_count > 1:
             qa_messages.append(f"ERROR: startPay() 함수가 {start_pay_count}개 발견되었습니다. (중복 삽입 의심)")
             passed = False
@@ -116,16 +259,16 @@ class QAManager:
             qa_messages.append("SUCCESS: startPay() 함수가 정상적으로 하나만 존재합니다.")
             
             # startPay 내부의 fetch 메서드 및 URL 검증
-            if "fetch(`${API_BASE}/api/pay/start`" in html_content or "fetch(`${API_BASE}/api/pay/check`" in html_content:
+            if scan.has("fetch_pay_start") or scan.has("fetch_pay_check"):
                 qa_messages.append("SUCCESS: startPay()가 올바른 API 엔드포인트를 호출합니다.")
             else:
                  # 하드코딩된 URL이나 다른 형태일 수 있으니 경고만
                 qa_messages.append("WARNING: startPay()에서 표준 API 엔드포인트 호출 패턴을 찾을 수 없습니다.")
 
             # 405 에러 방지를 위한 method 체크 (GET 권장)
-            if "method: 'POST'" in html_content and "fetch(`${API_BASE}/api/pay/start`" in html_content:
+            if scan.has("method_post") and scan.has("fetch_pay_start"):
                  qa_messages.append("WARNING: 결제 시작 요청에 POST가 사용됨. (GET 권장)")
-            elif "method: 'GET'" in html_content or ('method' not in html_content and "fetch" in html_content):
+            elif scan.has("method_get") or (not scan.has("method") and scan.has("fetch")):
                  # fetch default is GET
                  qa_messages.append("SUCCESS: 결제 시작 요청에 GET 메서드가 사용됩니다 (405 회피).")
         else:
@@ -175,23 +318,8 @@ class QAManager:
                 qa_messages.append(f"WARNING: 프리미엄 엔진-스키마 가격 검증 중 오류: {e}")
 
         # 3. 필수 구조 섹션 존재 여부 확인 (헤딩 태그나 ID/클래스 기반으로 검색)
-        required_sections = {
-            "hero": [r"<section[^>]*id=\"hero\"", r"<div[^>]*class=\".*hero\""],
-            "features": [r"<section[^>]*id=\"features\"", r"<h2[^>]*>Features</h2>"],
-            "pricing": [r"<section[^>]*id=\"pricing\"", r"<h2[^>]*>Pricing</h2>"],
-            "faq": [r"<section[^>]*id=\"faq\"", r"<h2[^>]*>FAQ</h2>"],
-            "cta": [
-                r"<button[^>]*data-action=\"open-plans\"",
-                r"<button[^>]*class=\".*btn-primary\"",
-            ],  # primary_cta 버튼
-        }
-
-        for section, patterns in required_sections.items():
-            found = False
-            for pattern in patterns:
-                if re.search(pattern, html_content, re.IGNORECASE):
-                    found = True
-                    break
+        for section, patterns in REQUIRED_SECTIONS.items():
+            found = any(scan.has(f"section:{section}:{i}") for i in range(len(patterns)))
             if not found:
                 qa_messages.append(
                     f"ERROR: 필수 섹션 '{section}'이 HTML에 존재하지 않습니다."
@@ -201,7 +329,7 @@ class QAManager:
                 qa_messages.append(f"SUCCESS: 필수 섹션 '{section}'이 존재합니다.")
 
         # 3.1. HTML 최소 길이 검사(콘텐츠 밀도 확인)
-        min_len = 1500  # 최소 길이를 1200 -> 1500으로 상향
+        min_len = MIN_HTML_LENGTH
         if len(html_content) < min_len:
             qa_messages.append(
                 f"ERROR: HTML 콘텐츠가 너무 짧습니다({len(html_content)}자). 최소 {min_len}자 필요."
@@ -213,7 +341,7 @@ class QAManager:
             )
 
         # [NEW] 타이틀 태그 검사 (Generic Title 방지)
-        title_match = re.search(r"<title>(.*?)</title>", html_content, re.IGNORECASE)
+        title_match = scan.match("title")
         if title_match:
             title_text = title_match.group(1).strip().lower()
             generic_titles = ["document", "untitled", "loading", "page", "home"]
@@ -229,12 +357,10 @@ class QAManager:
 
         # 4. 깨진 링크 또는 누락된 이미지 자산 검사 (간단한 정규식 기반)
         # <img src="" ...>, <a href="" ...> 와 같이 비어있는 src/href를 찾음
-        broken_links_imgs = re.findall(
-            r'<(?:img[^>]*src|a[^>]*href)=""[^>]*>', html_content, re.IGNORECASE
-        )
+        broken_links_imgs = scan.count("broken_link")
         if broken_links_imgs:
             qa_messages.append(
-                f"ERROR: {len(broken_links_imgs)}개의 깨진 링크 또는 누락된 이미지 src가 발견되었습니다."
+                f"ERROR: {broken_links_imgs}개의 깨진 링크 또는 누락된 이미지 src가 발견되었습니다."
             )
             passed = False
         else:
@@ -278,12 +404,15 @@ class QAManager:
                         f"ERROR: AI 품질 점수 미달. 결함: {quality_result.defects}"
                     )
                     passed = False
+                    # AI 판정은 실행마다 달라질 수 있으므로 불합격을 고정하지 않음
+                    cacheable = False
                 else:
                     qa_messages.append("SUCCESS: AI 품질 검사 통과.")
             except Exception as e:
                 logger.error(f"AI 품질 검사 필수 정책 위반/오류: {e}")
                 qa_messages.append(f"CRITICAL: AI 품질 검사 실패. AI 참여 필수 정책에 따라 QA 불합격 처리합니다. 오류: {e}")
                 passed = False
+                cacheable = False
 
 
         if passed:
@@ -293,7 +422,7 @@ class QAManager:
                 f"QA Stage 1 실패 - 제품 ID: {product_id}, 사유: {qa_messages}"
             )
 
-        return QAResult(passed, "QA Stage 1", product_id, qa_messages)
+        return QAResult(passed, "QA Stage 1", product_id, qa_messages), cacheable
 
     @handle_errors(stage="QA Stage 2")
     def run_qa_stage_2(
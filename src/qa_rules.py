@@ -0,0 +1,169 @@
+"""
+QA 규칙 엔진 (미리 컴파일한 부분 문자열/정규식 규칙을 산출물 단위로 한 번에 평가).
+
+QA 단계마다 규칙 수만큼 `html.lower()` 를 다시 만들고 정규식을 매번 전체 스캔하던 것을
+규칙 집합(RuleSet)으로 묶어 한 번에 평가합니다.
+
+- 대소문자 무시 규칙은 산출물당 한 번 만든 소문자 사본을 공유합니다.
+- 리터럴 규칙은 C 수준 검색(`in` / `str.count`)으로, 정규식 규칙은 미리 컴파일한 패턴으로 평가합니다.
+- 정규식 규칙은 모든 매치가 시작해야 하는 선행 리터럴(anchor)을 먼저 찾고, 없으면 정규식을 건너뛰며
+  있으면 첫 anchor 위치부터만 스캔합니다.
+- count=False(기본) 규칙은 첫 매치에서 멈춥니다. 개수가 필요한 규칙만 count=True 로 끝까지 셉니다.
+- 규칙별 결과는 단독 실행한 `in`/`str.count`/`re.search`/`re.findall` 과 같습니다.
+
+참고: CPython 의 re 에는 다중 패턴 오토마톤이 없어서, 규칙 전체를 하나의 alternation 으로 합친
+단일 스캔은 실제 카탈로그(index.html 평균 40KB)에서 규칙별 C 검색보다 수십 배 느렸습니다.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+@dataclass(frozen=True)
+class Rule:
+    """이름 있는 검사 규칙. regex=False 면 pattern 을 리터럴 부분 문자열로 취급합니다."""
+
+    name: str
+    pattern: str
+    regex: bool = False
+    ignore_case: bool = False
+    multiline: bool = False
+    count: bool = False  # True 면 매치 수를 끝까지 셈 (기본은 존재 여부만)
+
+    @property
+    def flags(self) -> int:
+        return (re.IGNORECASE if self.ignore_case else 0) | (re.MULTILINE if self.multiline else 0)
+
+    def anchor(self) -> str:
+        """정규식의 모든 매치가 시작해야 하는 선행 리터럴 (없으면 빈 문자열)."""
+        if not self.regex:
+            return self.pattern
+        p = self.pattern
+        if _has_top_level_alternation(p):
+            return ""
+        while p.startswith("\\b"):
+            p = p[2:]
+        out = []
+        for i, ch in enumerate(p):
+            if ch in _REGEX_META:
+                break
+            # 수량자가 붙은 문자는 선택적이므로 anchor 에서 제외
+            if i + 1 < len(p) and p[i + 1] in "*?{":
+                break
+            out.append(ch)
+        return "".join(out)
+
+
+@dataclass
+class ScanResult:
+    """규칙별 매치 수(존재 여부 규칙은 0/1)와 정규식 규칙의 첫 매치."""
+
+    counts: Dict[str, int]
+    matches: Dict[str, re.Match]
+
+    def has(self, name: str) -> bool:
+        return self.counts.get(name, 0) > 0
+
+    def count(self, name: str) -> int:
+        return self.counts.get(name, 0)
+
+    def match(self, name: str) -> Optional[re.Match]:
+        return self.matches.get(name)
+
+
+class RuleSet:
+    """컴파일된 규칙 집합. scan(text) 한 번으로 모든 규칙을 평가합니다."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        names = [r.name for r in rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"중복된 규칙 이름: {names}")
+        self.rules: List[Rule] = list(rules)
+        # (rule, 컴파일된 정규식 | None, 검색할 리터럴/anchor (대소문자 무시면 소문자))
+        self._plan: List[Tuple[Rule, Optional[re.Pattern], str]] = []
+        for r in self.rules:
+            if not r.pattern:
+                raise ValueError(f"빈 규칙은 지원하지 않습니다: {r.name}")
+            rx = re.compile(r.pattern, r.flags) if r.regex else None
+            anchor = r.anchor()
+            self._plan.append((r, rx, anchor.lower() if r.ignore_case else anchor))
+        self._needs_lower = any(r.ignore_case and a for r, _, a in self._plan)
+
+    def scan(self, text: str) -> ScanResult:
+        text = text or ""
+        lowered = text.lower() if self._needs_lower else text
+        # 특수 문자(İ 등)로 길이가 바뀌면 소문자 사본의 위치를 원문에 쓸 수 없음
+        same_positions = len(lowered) == len(text)
+        counts: Dict[str, int] = {}
+        matches: Dict[str, re.Match] = {}
+        for rule, rx, anchor in self._plan:
+            haystack = lowered if rule.ignore_case else text
+            if rx is None:
+                counts[rule.name] = haystack.count(anchor) if rule.count else int(anchor in haystack)
+                continue
+            start = 0
+            if anchor:
+                start = haystack.find(anchor)
+                if start < 0:
+                    counts[rule.name] = 0
+                    continue
+                if rule.ignore_case and not same_positions:
+                    start = 0
+            if rule.count:
+                found = list(rx.finditer(text, start))
+                counts[rule.name] = len(found)
+                if found:
+                    matches[rule.name] = found[0]
+            else:
+                m = rx.search(text, start)
+                counts[rule.name] = int(m is not None)
+                if m is not None:
+                    matches[rule.name] = m
+        return ScanResult(counts=counts, matches=matches)
+
+    def fingerprint(self) -> str:
+        """규칙 정의 해시 (규칙이 바뀌면 결과 캐시를 무효화하는 용도)."""
+        h = hashlib.sha256()
+        for r in self.rules:
+            h.update(
+                f"{r.name}\0{r.pattern}\0{int(r.regex)}{int(r.ignore_case)}{int(r.multiline)}{int(r.count)}\n".encode("utf-8")
+            )
+        return h.hexdigest()[:16]
+
+
+def content_digest(parts: Iterable[Optional[bytes]]) -> str:
+    """여러 산출물 바이트의 결합 해시 (없는 파일은 None)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            h.update(b"\xffmissing")
+        else:
+            h.update(len(part).to_bytes(8, "big"))
+            h.update(part)
+    return h.hexdigest()
@@ -0,0 +1,154 @@
+"""
+SQLite 에 영속화되는 토큰 버킷 레이트 리미터.
+
+키(예: "twitter:<계정>") 마다 정책의 두 버킷을 함께 적용합니다.
+- interval 버킷: 용량 1, min_interval_sec 마다 1개 충전  → 최소 게시 간격
+- daily 버킷   : 용량 max_daily, 24시간에 걸쳐 max_daily 개 충전 → 하루 최대 게시 수(이동 24시간)
+
+상태(토큰 수, 마지막 갱신 시각)는 data/social_scheduler.db 의 rate_buckets 테이블에 저장되므로
+데몬 재시작/SocialManager 인스턴스 재생성 후에도 제한이 유지되고, 여러 프로세스가 같은 한도를 공유합니다.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "social_scheduler.db"
+DAY_SECONDS = 86400.0
+
+
+def _buckets(policy: Dict[str, float]) -> List[Tuple[str, float, float]]:
+    """정책 -> [(버킷 이름, 용량, 초당 충전량)]"""
+    out = []
+    interval = float(policy.get("min_interval_sec") or 0)
+    if interval > 0:
+        out.append(("interval", 1.0, 1.0 / interval))
+    daily = float(policy.get("max_daily") or 0)
+    if daily > 0:
+        out.append(("daily", daily, daily / DAY_SECONDS))
+    return out
+
+
+class TokenBucketLimiter:
+    """키별 토큰 버킷 (SQLite 영속)."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or os.getenv("SOCIAL_SCHEDULER_DB") or DEFAULT_DB_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                key TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (key, bucket)
+            )
+            """
+        )
+
+    def _load(self, key: str) -> Dict[str, Tuple[float, float]]:
+        rows = self._conn.execute("SELECT bucket, tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchall()
+        return {b: (t, u) for b, t, u in rows}
+
+    @staticmethod
+    def _level(state: Dict[str, Tuple[float, float]], name: str, capacity: float, rate: float, now: float) -> float:
+        if name not in state:
+            return capacity
+        tokens, updated = state[name]
+        return min(capacity, tokens + max(0.0, now - updated) * rate)
+
+    def wait_time(self, key: str, policy: Dict[str, float], now: Optional[float] = None) -> float:
+        """지금 1회 게시하려면 기다려야 하는 초 (0 이면 즉시 가능). 토큰을 소비하지 않습니다."""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._load(key)
+        wait = 0.0
+        for name, capacity, rate in _buckets(policy):
+            level = self._level(state, name, capacity, rate, now)
+            if level < 1.0:
+                wait = max(wait, (1.0 - level) / rate)
+        return wait
+
+    def consume(self, key: str, policy: Dict[str, float], now: Optional[float] = None) -> None:
+        """게시 1회를 기록합니다 (각 버킷에서 토큰 1개 차감)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._load(key)
+                for name, capacity, rate in _buckets(policy):
+                    level = self._level(state, name, capacity, rate, now)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO rate_buckets (key, bucket, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                        (key, name, level - 1.0, now),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def try_acquire(self, key: str, policy: Dict[str, float], now: Optional[float] = None) -> Tuple[bool, float]:
+        """가능하면 토큰을 소비하고 (True, 0), 아니면 (False, 대기 초)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._load(key)
+                levels = [(name, self._level(state, name, cap, rate, now), rate) for name, cap, rate in _buckets(policy)]
+                wait = max([(1.0 - lvl) / rate for _, lvl, rate in levels if lvl < 1.0], default=0.0)
+                if wait <= 0:
+                    for name, lvl, _ in levels:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO rate_buckets (key, bucket, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                            (key, name, lvl - 1.0, now),
+                        )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait <= 0, wait
+
+    def refund(self, key: str, policy: Dict[str, float], now: Optional[float] = None) -> None:
+        """try_acquire 로 확보했지만 게시하지 못한 토큰 1개를 각 버킷에 돌려줍니다 (용량 초과 없음)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = self._load(key)
+                for name, capacity, rate in _buckets(policy):
+                    level = self._level(state, name, capacity, rate, now)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO rate_buckets (key, bucket, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                        (key, name, min(capacity, level + 1.0), now),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def status(self, key: str, policy: Dict[str, float], now: Optional[float] = None) -> Dict[str, float]:
+        """버킷별 현재 토큰 수 (대시보드/디버그용)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._load(key)
+        return {name: round(self._level(state, name, cap, rate, now), 3) for name, cap, rate in _buckets(policy)}
+
+
+_LIMITERS: Dict[str, TokenBucketLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(db_path: Optional[str] = None) -> TokenBucketLimiter:
+    path = str(db_path or os.getenv("SOCIAL_SCHEDULER_DB") or DEFAULT_DB_PATH)
+    with _LIMITERS_LOCK:
+        if path not in _LIMITERS:
+            _LIMITERS[path] = TokenBucketLimiter(path)
+        return _LIMITERS[path]
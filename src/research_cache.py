@@ -0,0 +1,250 @@
+"""
+웹 리서치 캐시 (검색 결과 / 페이지 본문, SQLite 영속).
+
+AIWebResearcher 가 제품 생성마다 같은(또는 거의 같은) 토픽으로 DuckDuckGo 검색과
+페이지 수집을 반복하던 것을 캐시합니다. 저장 위치: data/research_cache.db (RESEARCH_CACHE_DB)
+
+- 검색: 정규화한 쿼리 키 → 결과 목록. TTL RESEARCH_SEARCH_TTL (기본 1일).
+  토큰 집합(소문자, 단순 복수형 제거)이 같으면 같은 키입니다. related_topic 을 주고 조회하면
+  토픽 토큰(불용어 제외)의 Jaccard 유사도가 RESEARCH_RELATED_THRESHOLD(기본 0.8) 이상인 최근 토픽의 결과도 재사용합니다.
+  쿼리에 붙는 고정 문구(" trends 2025 market analysis" 등)는 유사도에 넣지 않습니다.
+- 페이지: URL → 추출된 본문 + ETag/Last-Modified. TTL RESEARCH_PAGE_TTL (기본 7일).
+  만료 후에는 조건부 GET(If-None-Match / If-Modified-Since)으로 재검증하고, 304 면 본문을 그대로 씁니다.
+- 실패(HTTP 오류/빈 결과)는 RESEARCH_FAIL_TTL (기본 10분) 동안만 기억합니다.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "research_cache.db"
+# 관련 쿼리 탐색 시 비교할 최근 검색 수
+RELATED_SCAN_LIMIT = 500
+
+_TOKEN_RE = re.compile(r"\w+")
+# 토픽 유사도에서 빼는 불용어 (서로 다른 토픽이 공유해도 의미가 없는 단어)
+TOPIC_STOPWORDS = frozenset(
+    "a an and the for of to in on with by from at or your you how best guide top".split()
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def query_tokens(query: str) -> FrozenSet[str]:
+    """쿼리 정규화 토큰 (소문자, 단순 복수형 's' 제거)."""
+    tokens = set()
+    for tok in _TOKEN_RE.findall((query or "").lower()):
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.add(tok)
+    return frozenset(tokens)
+
+
+def query_key(query: str) -> str:
+    return " ".join(sorted(query_tokens(query)))
+
+
+def topic_key(topic: str) -> str:
+    """관련 검색 비교용 토픽 키 (쿼리 토큰에서 불용어 제외)."""
+    return " ".join(sorted(query_tokens(topic) - TOPIC_STOPWORDS))
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    status: int
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0
+    expires_at: float = 0.0
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.status == 200 and bool(self.etag or self.last_modified)
+
+
+class ResearchCache:
+    """검색 결과/페이지 본문 캐시."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        search_ttl: Optional[float] = None,
+        page_ttl: Optional[float] = None,
+        fail_ttl: Optional[float] = None,
+        related_threshold: Optional[float] = None,
+    ):
+        self.db_path = str(db_path or os.getenv("RESEARCH_CACHE_DB") or DEFAULT_DB_PATH)
+        self.search_ttl = search_ttl if search_ttl is not None else _env_float("RESEARCH_SEARCH_TTL", 86400.0)
+        self.page_ttl = page_ttl if page_ttl is not None else _env_float("RESEARCH_PAGE_TTL", 7 * 86400.0)
+        self.fail_ttl = fail_ttl if fail_ttl is not None else _env_float("RESEARCH_FAIL_TTL", 600.0)
+        self.related_threshold = (
+            related_threshold if related_threshold is not None else _env_float("RESEARCH_RELATED_THRESHOLD", 0.8)
+        )
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                query_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                requested INTEGER NOT NULL,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_search_cache_fetched ON search_cache(fetched_at);
+            CREATE TABLE IF NOT EXISTS page_cache (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(search_cache)")}
+        if "topic_key" not in columns:
+            # 이전 스키마: 토픽 키가 없는 행은 관련 검색 대상에서 빠짐 (정확히 같은 쿼리로만 재사용)
+            self._conn.execute("ALTER TABLE search_cache ADD COLUMN topic_key TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+
+    # ---- 검색 ----
+
+    def get_search(self, query: str, max_results: int, related_topic: str = "") -> Optional[List[Dict[str, Any]]]:
+        """만료되지 않은 검색 결과 (max_results 이상 요청했던 결과만 재사용).
+
+        related_topic 을 주면 같은 쿼리가 없을 때 토픽이 거의 같은 최근 검색 결과를 씁니다.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT requested, results FROM search_cache WHERE query_key = ? AND expires_at > ?",
+                (query_key(query), now),
+            ).fetchone()
+            if row is None and related_topic:
+                row = self._find_related(frozenset(topic_key(related_topic).split()), max_results, now)
+        if row is None or row[0] < max_results:
+            return None
+        return json.loads(row[1])[:max_results]
+
+    def _find_related(self, tokens: FrozenSet[str], max_results: int, now: float):
+        best, best_score = None, 0.0
+        rows = self._conn.execute(
+            "SELECT topic_key, requested, results FROM search_cache "
+            "WHERE expires_at > ? AND requested >= ? AND results != '[]' AND topic_key != '' "
+            "ORDER BY fetched_at DESC LIMIT ?",
+            (now, max_results, RELATED_SCAN_LIMIT),
+        ).fetchall()
+        for key, requested, results in rows:
+            score = _jaccard(tokens, frozenset(key.split()))
+            if score >= self.related_threshold and score > best_score:
+                best, best_score = (requested, results), score
+        if best is not None:
+            logger.info(f"관련 토픽 검색 결과 재사용 (유사도 {best_score:.2f})")
+        return best
+
+    def put_search(self, query: str, max_results: int, results: List[Dict[str, Any]], related_topic: str = "") -> None:
+        now = time.time()
+        ttl = self.search_ttl if results else self.fail_ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (query_key, query, requested, results, fetched_at, expires_at, topic_key) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    query_key(query),
+                    query,
+                    int(max_results),
+                    json.dumps(results, ensure_ascii=False),
+                    now,
+                    now + ttl,
+                    topic_key(related_topic) if related_topic else "",
+                ),
+            )
+            self._conn.commit()
+
+    # ---- 페이지 ----
+
+    def get_page(self, url: str) -> Optional[CachedPage]:
+        """만료 여부와 무관하게 저장된 항목 (재검증용)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, text, status, etag, last_modified, fetched_at, expires_at FROM page_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(row[0], row[1], int(row[2]), row[3] or "", row[4] or "", row[5], row[6])
+
+    def put_page(self, url: str, text: str, status: int, etag: str = "", last_modified: str = "") -> None:
+        now = time.time()
+        ttl = self.page_ttl if (status == 200 and text) else self.fail_ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache (url, text, status, etag, last_modified, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, text, int(status), etag, last_modified, now, now + ttl),
+            )
+            self._conn.commit()
+
+    def touch_page(self, url: str) -> None:
+        """304 Not Modified: 본문은 그대로 두고 유효 기간만 연장합니다."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE page_cache SET fetched_at = ?, expires_at = ? WHERE url = ?",
+                (now, now + self.page_ttl, url),
+            )
+            self._conn.commit()
+
+    def purge_expired(self, grace: float = 30 * 86400.0) -> int:
+        """만료 후 grace 초가 지난 항목 삭제 (재검증 여지를 남기기 위해 바로 지우지 않음)."""
+        cutoff = time.time() - grace
+        with self._lock:
+            n = self._conn.execute("DELETE FROM search_cache WHERE expires_at < ?", (cutoff,)).rowcount
+            n += self._conn.execute("DELETE FROM page_cache WHERE expires_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return n
+
+
+_CACHES: Dict[str, ResearchCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_research_cache(db_path: Optional[str] = None) -> ResearchCache:
+    path = str(db_path or os.getenv("RESEARCH_CACHE_DB") or DEFAULT_DB_PATH)
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            _CACHES[path] = ResearchCache(path)
+        return _CACHES[path]
@@ -18,6 +18,7 @@ from .product_schema import (
     get_product_schema_definition,
     parse_product_schema_json,
 )
+from .lazy_import import lazy_module
 from .schema_validator import run_rule_based_validation
 from .utils import get_logger, ProductionError
 from .niche_data import NICHE_CONTENT_MAP, get_niche_for_topic
@@ -27,27 +28,27 @@ logger = get_logger(__name__)
 # 재시도 횟수 (invalid JSON / schema mismatch 시)
 MAX_SCHEMA_RETRIES = 3
 
-AI_API_KEY = os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
-AI_API_BASE = os.getenv("AI_API_BASE", "https://api.deepseek.com/v1")
-AI_MODEL = os.getenv("AI_QUALITY_MODEL", "deepseek-chat")
+genai = lazy_module("google.genai")
+HAS_GEMINI = genai is not None
 
-# Gemini API Key
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
 
-try:
-    import google.genai as genai
-    HAS_GEMINI = True
-except ImportError:
-    HAS_GEMINI = False
+# API 키는 호출 시점에 읽음 (init_config() 로 .env/secrets.json 이 나중에 적용되어도 반영)
+def _ai_api_key() -> str | None:
+    return os.getenv("DEEPSEEK_API_KEY") or os.getenv("OPENAI_API_KEY")
+
+
+def _gemini_api_key() -> str | None:
+    return os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
 
 
 def _call_gemini(system: str, user: str, max_tokens: int = 4000) -> str | None:
     """Google Gemini API 호출 (New SDK)."""
-    if not GEMINI_API_KEY or not HAS_GEMINI:
+    api_key = _gemini_api_key()
+    if not api_key or not HAS_GEMINI:
         return None
     
     try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
+        client = genai.Client(api_key=api_key)
         response = client.models.generate_content(
             model="gemini-2.0-flash",
             contents=f"{system}\n\nUser Request:\n{user}",
@@ -66,11 +67,13 @@ def _call_llm(system: str, user: str, max_tokens: int = 4000) -> str | None:
     """OpenAI 호환 Chat Completions 호출, 실패 시 Gemini 시도."""
     
     # 1. Try DeepSeek/OpenAI if configured
-    if AI_API_KEY:
-        url = f"{AI_API_BASE.rstrip('/')}/chat/completions"
-        headers = {"Authorization": f"Bearer {AI_API_KEY}", "Content-Type": "application/json"}
+    api_key = _ai_api_key()
+    if api_key:
+        api_base = os.getenv("AI_API_BASE", "https://api.deepseek.com/v1")
+        url = f"{api_base.rstrip('/')}/chat/completions"
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
         payload = {
-            "model": AI_MODEL,
+            "model": os.getenv("AI_QUALITY_MODEL", "deepseek-chat"),
             "messages": [
                 {"role": "system", "content": system},
                 {"role": "user", "content": user},
@@ -88,7 +91,7 @@ def _call_llm(system: str, user: str, max_tokens: int = 4000) -> str | None:
             logger.warning(f"DeepSeek/OpenAI API 호출 실패 ({e}). Gemini로 전환 시도.")
 
     # 2. Try Gemini fallback
-    if GEMINI_API_KEY and HAS_GEMINI:
+    if _gemini_api_key() and HAS_GEMINI:
         logger.info("DeepSeek/OpenAI 실패 또는 미설정. Gemini API를 사용합니다.")
         return _call_gemini(system, user, max_tokens)
         
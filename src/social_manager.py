@@ -1,22 +1,46 @@
 import os
-import json
 import logging
 import requests
 import time
-import random
+import hashlib
 from datetime import datetime, timedelta
+from functools import wraps
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-try:
-    import tweepy
-except ImportError:
-    tweepy = None
+from .config_store import get_config_file
+from .lazy_import import lazy_module
+from .rate_limiter import get_rate_limiter
+from .social_scheduler import get_post_scheduler, jitter
+
+# 미설치면 None, 설치되어 있으면 실제 게시 시점에 import
+tweepy = lazy_module("tweepy")
+praw = lazy_module("praw")
+
+def _rate_guarded(channel: str):
+    """게시 메서드 래퍼: 게시 전에 토큰을 원자적으로 확보하고(try_acquire), 게시하지 못하면(ok 아님/예외) 돌려줍니다.
+
+    확인(wait_time)과 차감(consume)을 따로 하면 두 프로세스가 같은 토큰으로 둘 다 게시할 수 있습니다.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            if not self._check_safety(channel):
+                return self._rate_limited(channel)
+            posted = False
+            try:
+                result = fn(self, *args, **kwargs)
+                posted = bool(isinstance(result, dict) and result.get("ok"))
+                return result
+            finally:
+                if not posted:
+                    self._refund(channel)
+
+        return wrapper
+
+    return decorator
 
-try:
-    import praw
-except ImportError:
-    praw = None
 
 class SocialManager:
     def __init__(self, config_path: Path = None, secrets_path: Path = None):
@@ -24,6 +48,9 @@ class SocialManager:
         self.config = {}
         self.secrets = {}
         self.last_post_times = {}
+        # 채널/계정별 토큰 버킷 (data/social_scheduler.db 에 영속, 재시작 후에도 유지)
+        self.limiter = get_rate_limiter()
+        self._last_wait: Dict[str, float] = {}
         
         # Safety / Policy Configuration
         self.safety_policy = {
@@ -38,17 +65,14 @@ class SocialManager:
             "tiktok": {"min_interval_sec": 3600, "max_daily": 5}
         }
         
-        if config_path and config_path.exists():
-            try:
-                self.config = json.loads(config_path.read_text(encoding='utf-8'))
-            except Exception as e:
-                self.logger.error(f"Failed to load config: {e}")
+        # 설정/시크릿은 config_store 캐시에서 가져옴 (파일이 바뀌었을 때만 다시 파싱)
+        if config_path:
+            cfg = get_config_file(config_path).copy()
+            self.config = cfg if isinstance(cfg, dict) else {}
 
-        if secrets_path and secrets_path.exists():
-            try:
-                self.secrets = json.loads(secrets_path.read_text(encoding='utf-8'))
-            except Exception as e:
-                self.logger.error(f"Failed to load secrets: {e}")
+        if secrets_path:
+            sec = get_config_file(secrets_path).get()
+            self.secrets = sec if isinstance(sec, dict) else {}
 
         # Merge secrets into config for easier access
         self._merge_secrets()
@@ -105,29 +129,97 @@ class SocialManager:
         self.config["tiktok"]["username"] = self.secrets.get("TIKTOK_USERNAME", "")
         self.config["tiktok"]["password"] = self.secrets.get("TIKTOK_PASSWORD", "")
 
+    def _account_id(self, channel: str) -> str:
+        """레이트 리밋을 계정 단위로 적용하기 위한 계정 식별자 (비밀값은 해시로만 사용)."""
+        cfg = self.config.get(channel, {})
+        ident = {
+            "twitter": (cfg.get("access_token") or "").split("-")[0] or cfg.get("api_key", ""),
+            "reddit": cfg.get("username", ""),
+            "pinterest": cfg.get("board_id", ""),
+            "telegram": cfg.get("chat_id", ""),
+            "discord": cfg.get("webhook_url", ""),
+            "linkedin": cfg.get("urn", ""),
+            "youtube": cfg.get("client_id", ""),
+            "instagram": cfg.get("username", ""),
+            "tiktok": cfg.get("username", ""),
+        }.get(channel, "")
+        if not ident:
+            return "default"
+        return hashlib.sha1(str(ident).encode("utf-8")).hexdigest()[:12]
+
+    def _rate_key(self, channel: str) -> str:
+        return f"{channel}:{self._account_id(channel)}"
+
     def _check_safety(self, channel: str) -> bool:
-        """Enforces account protection policy (rate limits)."""
+        """Enforces account protection policy (rate limits: min interval + max daily, persisted)."""
         policy = self.safety_policy.get(channel)
         if not policy:
             return True
-            
-        last_time = self.last_post_times.get(channel)
-        if last_time:
-            elapsed = (datetime.now() - last_time).total_seconds()
-            if elapsed < policy["min_interval_sec"]:
-                self.logger.warning(f"Safety Policy: Skipping {channel} (Rate limit: {elapsed:.0f}/{policy['min_interval_sec']}s)")
-                return False
-        
-        # Human-like random delay before action
-        time.sleep(random.uniform(1.0, 3.0))
+
+        # 확인과 차감을 한 트랜잭션(BEGIN IMMEDIATE)으로: 통과하면 토큰이 이미 이 게시에 할당됨
+        ok, wait = self.limiter.try_acquire(self._rate_key(channel), policy)
+        self._last_wait[channel] = wait
+        if not ok:
+            self.logger.warning(f"Safety Policy: Skipping {channel} (Rate limit: retry in {wait:.0f}s)")
+            return False
         return True
 
+    def _rate_limited(self, channel: str) -> Dict[str, Any]:
+        return {"ok": False, "msg": "Rate limited", "rate_limited": True, "retry_after": round(self._last_wait.get(channel, 0.0), 1)}
+
+    def _refund(self, channel: str):
+        policy = self.safety_policy.get(channel)
+        if policy:
+            try:
+                self.limiter.refund(self._rate_key(channel), policy)
+            except Exception as e:
+                self.logger.warning(f"Safety Policy: {channel} token refund failed: {e}")
+
     def _mark_posted(self, channel: str):
+        # 토큰은 _check_safety 에서 이미 차감됨
         self.last_post_times[channel] = datetime.now()
 
+    def post_or_schedule(self, channel: str, method: str, product_id: str = "", ledger_meta: Optional[Dict[str, str]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        지금 보낼 수 있으면 바로 게시하고, 레이트 리밋에 걸리면 허용 시각으로 예약한 뒤 즉시 반환합니다.
+        예약된 경우 {"ok": True, "queued": True, "job_id", "scheduled_at"} 를 반환하며,
+        게시 결과는 백그라운드 워커가 ledger_meta({"key", "field"|"value"}) 에 따라 원장에 기록합니다.
+        """
+        policy = self.safety_policy.get(channel, {})
+        rate_key = self._rate_key(channel)
+        wait = self.limiter.wait_time(rate_key, policy) if policy else 0.0
+        if wait <= 0:
+            result = getattr(self, method)(**kwargs)
+            if not result.get("rate_limited"):
+                return result
+            # 확인 직후 다른 프로세스가 토큰을 가져감: 예약으로 전환
+            wait = float(result.get("retry_after") or 0.0)
+
+        scheduler = self.start_scheduler()
+        not_before = time.time() + wait + jitter()
+        dedupe_key = f"{rate_key}:{product_id}:{method}" if product_id else None
+        job = scheduler.enqueue(
+            channel,
+            rate_key,
+            method,
+            kwargs,
+            not_before,
+            product_id=product_id,
+            ledger_meta=ledger_meta,
+            dedupe_key=dedupe_key,
+        )
+        scheduled_at = datetime.fromtimestamp(job["not_before"]).isoformat(timespec="seconds")
+        self.logger.info(f"Safety Policy: {channel} post scheduled at {scheduled_at} (job {job['job_id']})")
+        return {"ok": True, "queued": True, "job_id": job["job_id"], "scheduled_at": scheduled_at, "msg": f"Scheduled at {scheduled_at}"}
+
+    def start_scheduler(self):
+        """예약 게시 워커를 시작합니다 (프로세스당 1개, 이전 실행에서 남은 예약도 이어서 처리)."""
+        scheduler = get_post_scheduler(self)
+        scheduler.start()
+        return scheduler
+
+    @_rate_guarded("twitter")
     def post_to_twitter(self, text: str) -> Dict[str, Any]:
-        if not self._check_safety("twitter"): return {"ok": False, "msg": "Rate limited"}
-        
         cfg = self.config.get("twitter", {})
         if not (cfg.get("api_key") and cfg.get("api_secret")):
             return {"ok": False, "msg": "Skipped: Missing Twitter API Key/Secret"}
@@ -148,9 +240,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("reddit")
     def post_to_reddit(self, title: str, url: str, subreddit_name: str = "u_MetaPassiveIncome") -> Dict[str, Any]:
-        if not self._check_safety("reddit"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("reddit", {})
         if not (cfg.get("client_id") and cfg.get("client_secret")):
              return {"ok": False, "msg": "Skipped: Missing Reddit Client ID/Secret"}
@@ -177,9 +268,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("pinterest")
     def post_to_pinterest(self, title: str, description: str, link: str, image_url: str) -> Dict[str, Any]:
-        if not self._check_safety("pinterest"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("pinterest", {})
         token = cfg.get("access_token")
         board_id = cfg.get("board_id")
@@ -213,9 +303,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("telegram")
     def post_to_telegram(self, text: str) -> Dict[str, Any]:
-        if not self._check_safety("telegram"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("telegram", {})
         token = cfg.get("bot_token")
         chat_id = cfg.get("chat_id")
@@ -236,9 +325,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("discord")
     def post_to_discord(self, text: str) -> Dict[str, Any]:
-        if not self._check_safety("discord"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("discord", {})
         webhook_url = cfg.get("webhook_url")
         
@@ -257,9 +345,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("linkedin")
     def post_to_linkedin(self, text: str, url: str) -> Dict[str, Any]:
-        if not self._check_safety("linkedin"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("linkedin", {})
         token = cfg.get("access_token")
         urn = cfg.get("urn")
@@ -312,9 +399,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("youtube")
     def post_to_youtube(self, title: str, description: str, video_path: str, tags: list = None) -> Dict[str, Any]:
-        if not self._check_safety("youtube"): return {"ok": False, "msg": "Rate limited"}
-
         cfg = self.config.get("youtube", {})
         if not (cfg.get("client_id") and cfg.get("client_secret")):
              self.logger.info(f"YouTube OAuth missing. Simulating upload for {video_path}")
@@ -372,9 +458,8 @@ class SocialManager:
         except Exception as e:
             return {"ok": False, "msg": str(e)}
 
+    @_rate_guarded("instagram")
     def post_to_instagram(self, image_url: str, caption: str) -> Dict[str, Any]:
-        if not self._check_safety("instagram"): return {"ok": False, "msg": "Rate limited"}
-        
         cfg = self.config.get("instagram", {})
         username = cfg.get("username")
         
@@ -385,9 +470,8 @@ class SocialManager:
         self._mark_posted("instagram")
         return {"ok": True, "msg": "Content prepared for Instagram (Manual/Mobile upload required due to API limits)"}
 
+    @_rate_guarded("tiktok")
     def post_to_tiktok(self, video_path: str, caption: str) -> Dict[str, Any]:
-        if not self._check_safety("tiktok"): return {"ok": False, "msg": "Rate limited"}
-        
         cfg = self.config.get("tiktok", {})
         username = cfg.get("username")
         
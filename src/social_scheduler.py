@@ -0,0 +1,304 @@
+"""
+소셜 게시 스케줄러: 레이트 리밋에 걸린 게시를 SQLite 큐에 넣고 백그라운드 워커가 허용 시각에 보냅니다.
+
+- 작업(job)은 data/social_scheduler.db 의 scheduled_posts 테이블에 저장되어 재시작 후에도 이어서 처리
+- 각 작업은 가장 이른 전송 가능 시각(not_before)을 가지며, 워커는 그 시각이 된 작업만 꺼내
+  토큰 버킷(src.rate_limiter)을 다시 확인한 뒤 SocialManager.<method>(**kwargs) 를 호출
+- 같은 dedupe_key 의 대기 작업이 있으면 새로 넣지 않음 (재시도 루프가 같은 글을 여러 번 예약하지 않도록)
+- 성공 시 ledger_meta 가 있으면 원장 제품 메타데이터에 게시 결과를 기록 (디스패처가 즉시 게시할 때와 동일)
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .rate_limiter import DEFAULT_DB_PATH
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF_SEC = 300.0
+STALE_RUNNING_SEC = 3600.0
+# 사람처럼 보이도록 전송 시각에 더하는 지연 (호출 스레드에서 sleep 하지 않음)
+JITTER_RANGE = (1.0, 3.0)
+
+
+def jitter() -> float:
+    return random.uniform(*JITTER_RANGE)
+
+
+class PostScheduler:
+    """예약 게시 큐 + 백그라운드 워커."""
+
+    def __init__(self, executor=None, db_path: Optional[str] = None, poll_interval: float = 30.0):
+        self.db_path = str(db_path or os.getenv("SOCIAL_SCHEDULER_DB") or DEFAULT_DB_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.executor = executor  # SocialManager
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scheduled_posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL,
+                rate_key TEXT NOT NULL,
+                method TEXT NOT NULL,
+                kwargs_json TEXT NOT NULL,
+                not_before REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                product_id TEXT,
+                ledger_meta_json TEXT,
+                dedupe_key TEXT,
+                result_json TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sched_due ON scheduled_posts(status, not_before)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sched_dedupe ON scheduled_posts(dedupe_key, status)")
+        self._conn.commit()
+
+    # -----------------------------
+    # Queue
+    # -----------------------------
+
+    def enqueue(
+        self,
+        channel: str,
+        rate_key: str,
+        method: str,
+        kwargs: Dict[str, Any],
+        not_before: float,
+        product_id: str = "",
+        ledger_meta: Optional[Dict[str, str]] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """작업을 예약하고 {"job_id", "not_before", "deduped"} 를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            if dedupe_key:
+                row = self._conn.execute(
+                    "SELECT id, not_before FROM scheduled_posts WHERE dedupe_key = ? AND status IN ('pending', 'running')",
+                    (dedupe_key,),
+                ).fetchone()
+                if row:
+                    return {"job_id": row[0], "not_before": row[1], "deduped": True}
+            cur = self._conn.execute(
+                """
+                INSERT INTO scheduled_posts
+                    (channel, rate_key, method, kwargs_json, not_before, product_id, ledger_meta_json, dedupe_key, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    channel,
+                    rate_key,
+                    method,
+                    json.dumps(kwargs, ensure_ascii=False),
+                    not_before,
+                    product_id,
+                    json.dumps(ledger_meta or {}),
+                    dedupe_key,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            job_id = cur.lastrowid
+        self._wakeup.set()
+        return {"job_id": job_id, "not_before": not_before, "deduped": False}
+
+    def _reschedule(self, job_id: int, not_before: float, attempts: Optional[int] = None, result: Any = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE scheduled_posts SET status = 'pending', not_before = ?, attempts = COALESCE(?, attempts), result_json = COALESCE(?, result_json), updated_at = ? WHERE id = ?",
+                (not_before, attempts, json.dumps(result, ensure_ascii=False, default=str) if result is not None else None, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def _finish(self, job_id: int, status: str, result: Any, attempts: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE scheduled_posts SET status = ?, attempts = ?, result_json = ?, updated_at = ? WHERE id = ?",
+                (status, attempts, json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def _claim_due(self, limit: int = 20) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            # 비정상 종료로 running 에 남은 작업은 다시 대기 상태로
+            self._conn.execute(
+                "UPDATE scheduled_posts SET status = 'pending' WHERE status = 'running' AND updated_at < ?",
+                (now - STALE_RUNNING_SEC,),
+            )
+            rows = self._conn.execute(
+                "SELECT id, channel, rate_key, method, kwargs_json, attempts, product_id, ledger_meta_json FROM scheduled_posts "
+                "WHERE status = 'pending' AND not_before <= ? ORDER BY not_before LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            claimed = []
+            for row in rows:
+                cur = self._conn.execute(
+                    "UPDATE scheduled_posts SET status = 'running', updated_at = ? WHERE id = ? AND status = 'pending'",
+                    (now, row[0]),
+                )
+                if cur.rowcount:
+                    claimed.append(
+                        {
+                            "id": row[0],
+                            "channel": row[1],
+                            "rate_key": row[2],
+                            "method": row[3],
+                            "kwargs": json.loads(row[4]),
+                            "attempts": row[5],
+                            "product_id": row[6] or "",
+                            "ledger_meta": json.loads(row[7] or "{}"),
+                        }
+                    )
+            self._conn.commit()
+        return claimed
+
+    def next_due_in(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(not_before) FROM scheduled_posts WHERE status = 'pending'").fetchone()
+        if not row or row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, channel, method, not_before, attempts, product_id, status FROM scheduled_posts "
+                "WHERE status IN ('pending', 'running') ORDER BY not_before"
+            ).fetchall()
+        return [
+            {
+                "job_id": r[0],
+                "channel": r[1],
+                "method": r[2],
+                "scheduled_at": datetime.fromtimestamp(r[3]).isoformat(timespec="seconds"),
+                "attempts": r[4],
+                "product_id": r[5],
+                "status": r[6],
+            }
+            for r in rows
+        ]
+
+    def job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, attempts, result_json, not_before FROM scheduled_posts WHERE id = ?", (job_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"job_id": job_id, "status": row[0], "attempts": row[1], "result": json.loads(row[2]) if row[2] else None, "not_before": row[3]}
+
+    # -----------------------------
+    # Worker
+    # -----------------------------
+
+    def _record_ledger(self, product_id: str, ledger_meta: Dict[str, str], result: Dict[str, Any]) -> None:
+        if not product_id or not ledger_meta.get("key"):
+            return
+        try:
+            from .config import Config
+            from .ledger_manager import LedgerManager
+
+            lm = LedgerManager(Config.DATABASE_URL)
+            prod = lm.get_product(product_id)
+            if prod:
+                meta = prod.get("metadata") or {}
+                field = ledger_meta.get("field")
+                meta[ledger_meta["key"]] = str(result.get(field, "posted")) if field else ledger_meta.get("value", "true")
+                lm.create_product(product_id, prod["topic"], metadata=meta)
+        except Exception as e:
+            logger.warning(f"[{product_id}] 예약 게시 결과 원장 기록 실패: {e}")
+
+    def run_due(self) -> int:
+        """전송 시각이 된 작업을 처리합니다. 처리(전송 시도)한 작업 수를 반환합니다."""
+        if self.executor is None:
+            return 0
+        done = 0
+        for job in self._claim_due():
+            policy = self.executor.safety_policy.get(job["channel"], {})
+            wait = self.executor.limiter.wait_time(job["rate_key"], policy)
+            if wait > 0:
+                self._reschedule(job["id"], time.time() + wait + jitter())
+                continue
+            attempts = job["attempts"] + 1
+            try:
+                result = getattr(self.executor, job["method"])(**job["kwargs"])
+            except Exception as e:
+                result = {"ok": False, "msg": f"{type(e).__name__}: {e}"}
+            done += 1
+            if result.get("ok"):
+                self._finish(job["id"], "done", result, attempts)
+                self._record_ledger(job["product_id"], job["ledger_meta"], result)
+                logger.info(f"예약 게시 완료: {job['channel']} (job {job['id']})")
+            elif result.get("rate_limited"):
+                # 다른 프로세스가 먼저 토큰을 사용함: 시도 횟수는 늘리지 않고 다시 예약
+                self._reschedule(job["id"], time.time() + float(result.get("retry_after", 60)) + jitter())
+            elif attempts >= MAX_ATTEMPTS:
+                self._finish(job["id"], "failed", result, attempts)
+                logger.warning(f"예약 게시 실패 (포기): {job['channel']} (job {job['id']}): {result.get('msg')}")
+            else:
+                self._reschedule(job["id"], time.time() + RETRY_BACKOFF_SEC * attempts, attempts=attempts, result=result)
+        return done
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.warning(f"예약 게시 워커 오류: {e}")
+            due_in = self.next_due_in()
+            timeout = self.poll_interval if due_in is None else min(self.poll_interval, due_in)
+            self._wakeup.wait(timeout=max(0.05, timeout))
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="social-post-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+_SCHEDULERS: Dict[str, PostScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_post_scheduler(executor=None, db_path: Optional[str] = None) -> PostScheduler:
+    """DB 경로별 스케줄러 싱글톤. executor 를 주면 이후 작업은 그 SocialManager 로 실행합니다."""
+    path = str(db_path or os.getenv("SOCIAL_SCHEDULER_DB") or DEFAULT_DB_PATH)
+    with _SCHEDULERS_LOCK:
+        sched = _SCHEDULERS.get(path)
+        if sched is None:
+            sched = _SCHEDULERS[path] = PostScheduler(executor, path)
+        elif executor is not None:
+            sched.executor = executor
+        return sched
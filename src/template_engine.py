@@ -0,0 +1,90 @@
+import hashlib
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from .utils import PROJECT_ROOT, get_logger
+
+logger = get_logger(__name__)
+
+# 랜딩/체크아웃 페이지 템플릿 위치
+LANDING_TEMPLATE_DIR = Path(PROJECT_ROOT) / "templates" / "landing"
+
+
+@lru_cache(maxsize=1)
+def _environment():
+    """Jinja2 환경 (프로세스당 1회 생성, 템플릿은 최초 사용 시 1회 컴파일 후 재사용)."""
+    from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+    return Environment(
+        loader=FileSystemLoader(str(LANDING_TEMPLATE_DIR)),
+        autoescape=False,  # 기존 f-string 렌더링과 동일하게 호출 측에서 이스케이프
+        keep_trailing_newline=True,
+        auto_reload=False,
+        cache_size=-1,
+        undefined=StrictUndefined,
+    )
+
+
+def render_template(name: str, **context: Any) -> str:
+    """컴파일된 템플릿으로 페이지를 렌더링합니다."""
+    return _environment().get_template(name).render(**context)
+
+
+@lru_cache(maxsize=256)
+def _render_fragment_cached(name: str, items: tuple) -> str:
+    return render_template(name, **dict(items))
+
+
+def render_fragment(name: str, **context: Any) -> str:
+    """정적 CSS/JS 블록처럼 입력 조합이 적은 조각을 입력값 기준으로 캐시하여 렌더링합니다."""
+    return _render_fragment_cached(name, tuple(sorted(context.items())))
+
+
+@lru_cache(maxsize=1)
+def template_version() -> str:
+    """템플릿 파일 내용의 해시. 템플릿이 바뀌면 모든 렌더 키가 무효화됩니다."""
+    h = hashlib.sha256()
+    for path in sorted(LANDING_TEMPLATE_DIR.glob("*.j2")):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def compute_render_key(context: Dict[str, Any]) -> str:
+    """렌더링 입력(context) + 템플릿 버전으로 렌더 키를 계산합니다."""
+    payload = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str)
+    h = hashlib.sha256()
+    h.update(template_version().encode("utf-8"))
+    h.update(payload.encode("utf-8"))
+    return h.hexdigest()
+
+
+class RenderCache:
+    """렌더 키 -> 렌더 결과 LRU 캐시 (프로세스 내 재배포/대량 재생성용)."""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
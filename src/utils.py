@@ -1,9 +1,14 @@
+import contextvars
+import copy
 import hashlib
 import json
 import logging
 import os
+import threading
+import time
+import weakref
 from functools import wraps
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional
 
 # 프로젝트 루트 경로 계산
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,16 +17,158 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 LOG_FILE = os.getenv(
     "LOG_FILE", os.path.join(PROJECT_ROOT, "logs", "product_factory.log")
 )
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-# 로그 디렉토리 생성 (존재하지 않을 경우)
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+_EXC_FORMATTER = logging.Formatter()
+
+
+_ROOT_HANDLERS: "weakref.WeakSet[_LazyRootHandler]" = weakref.WeakSet()
+
+
+def _queue_enabled() -> bool:
+    return os.getenv("LOG_QUEUE", "1").lower() not in ("0", "false", "no")
+
+
+class _LazyRootHandler(logging.Handler):
+    """
+    루트 로거용 지연 + 비동기 핸들러.
+
+    import 시에는 이 핸들러만 등록하고(파일/디렉토리 생성 없음), 첫 레코드가 들어오거나
+    configure_logging() 이 호출될 때 로그 디렉토리와 로테이션 파일 + 콘솔 핸들러를 만듭니다.
+    기본(LOG_QUEUE=1)은 QueueListener 백그라운드 스레드가 파일/콘솔에 쓰고, 호출 스레드는
+    메시지를 포맷해 큐에 넣기만 합니다. LOG_QUEUE=0 이면 호출 스레드에서 바로 씁니다.
+    fork 된 자식 프로세스(ProcessPoolExecutor 등)에는 리스너 스레드가 없으므로 자식에서는 동기 쓰기로 전환합니다.
+    """
+
+    def __init__(self, log_file: str, stream=None):
+        super().__init__()
+        self.log_file = log_file
+        self.stream = stream
+        self.targets: Optional[List[logging.Handler]] = None
+        self.listener = None
+        self._queue = None
+        self._build_lock = threading.Lock()
+        _ROOT_HANDLERS.add(self)
+
+    def _after_fork_in_child(self) -> None:
+        # 큐는 복제되지만 그 큐를 비우는 리스너 스레드는 부모에만 있으므로 버리고 직접 씀
+        self._build_lock = threading.Lock()
+        self.listener = None
+        self._queue = None
+
+    def materialize(self) -> List[logging.Handler]:
+        if self.targets is None:
+            with self._build_lock:
+                if self.targets is None:
+                    # 크기 기반 로테이션, LOG_JSONL=1 이면 JSONL 사이드카
+                    from .log_store import build_file_handlers
+
+                    os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+                    handlers = [*build_file_handlers(self.log_file), logging.StreamHandler(self.stream)]
+                    formatter = logging.Formatter(LOG_FORMAT)
+                    for h in handlers:
+                        h.setFormatter(formatter)
+                    if _queue_enabled():
+                        import queue
+                        from logging.handlers import QueueListener
+
+                        self._queue = queue.SimpleQueue()
+                        self.listener = QueueListener(self._queue, *handlers, respect_handler_level=True)
+                        self.listener.start()
+                    self.targets = handlers
+        return self.targets
+
+    def _prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """큐에 넣기 전 메시지/예외를 문자열로 확정합니다 (args 나 traceback 객체를 다른 스레드로 넘기지 않음)."""
+        msg = record.getMessage()
+        record = copy.copy(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        targets = self.materialize()
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(self._prepare(record))
+            except Exception:
+                self.handleError(record)
+            return
+        for h in targets:
+            if record.levelno >= h.level:
+                h.handle(record)
+
+    def flush(self) -> None:
+        for h in self.targets or []:
+            h.flush()
+
+    def close(self) -> None:
+        # 리스너를 먼저 멈춰 큐에 남은 레코드를 모두 쓴 뒤 파일을 닫음 (logging.shutdown 에서도 호출됨)
+        if self.listener is not None:
+            try:
+                self.listener.stop()
+            except Exception:
+                pass
+            self.listener = None
+            self._queue = None
+        for h in self.targets or []:
+            h.close()
+        super().close()
 
-# 로거 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(LOG_FILE, encoding="utf-8"), logging.StreamHandler()],
-)
+
+def _reset_root_handlers_after_fork() -> None:
+    for h in list(_ROOT_HANDLERS):
+        h._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_root_handlers_after_fork)
+
+
+_LOGGING_LOCK = threading.Lock()
+
+
+def _install_root_handler(log_file: str, level: int, stream=None, force: bool = False) -> Optional[_LazyRootHandler]:
+    """루트 로거에 핸들러가 없을 때만 지연 핸들러를 등록합니다 (logging.basicConfig 와 같은 규칙)."""
+    root = logging.getLogger()
+    with _LOGGING_LOCK:
+        if force:
+            for h in root.handlers[:]:
+                root.removeHandler(h)
+                h.close()
+        for h in root.handlers:
+            if isinstance(h, _LazyRootHandler):
+                return h
+        if root.handlers:
+            return None
+        handler = _LazyRootHandler(log_file, stream=stream)
+        root.addHandler(handler)
+        root.setLevel(level)
+        return handler
+
+
+def configure_logging(
+    log_file: Optional[str] = None, level: int = logging.INFO, stream=None, force: bool = False
+) -> bool:
+    """
+    파일(로테이션) + 콘솔 로깅을 즉시 준비합니다 (멱등).
+    이미 다른 방식으로 루트 로거가 설정되어 있으면 아무것도 하지 않고 False 를 반환합니다.
+    force=True 면 기존 루트 핸들러를 닫고 교체합니다 (logging.basicConfig(force=True) 와 동일).
+    """
+    handler = _install_root_handler(str(log_file or LOG_FILE), level, stream=stream, force=force)
+    if handler is None:
+        return False
+    handler.materialize()
+    return True
+
+
+# 로거 설정: 핸들러 등록만 하고 로그 파일은 첫 기록 시 생성 (LOG_AUTOCONFIG=0 이면 등록하지 않음)
+if os.getenv("LOG_AUTOCONFIG", "1") != "0":
+    _install_root_handler(LOG_FILE, logging.INFO)
 
 
 def get_logger(name):
@@ -44,37 +191,212 @@ class ProductionError(Exception):
         self.stage = stage
         self.product_id = product_id
         self.original_exception = original_exception
-        logger.error(
-            f"[ProductionError] Stage: {self.stage}, Product ID: {self.product_id}, Message: {self.message}, Original: {self.original_exception}"
-        )
+        # 생성 시에는 로깅하지 않음: 예외가 span(handle_errors) 을 빠져나갈 때 한 번만 기록됩니다.
+
+
+# -----------------------------
+# Span: 단계별 소요 시간 / 재시도 / 결과를 구조화 이벤트로 기록
+# -----------------------------
+
+span_logger = get_logger("spans")
+_CURRENT_SPAN: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+# span 시작/종료 리스너 (pipeline_profiler 등). 비어 있으면 호출 비용 없음
+_SPAN_LISTENERS: List[Callable[[str, "Span"], None]] = []
+
+
+def add_span_listener(listener: Callable[[str, "Span"], None]) -> None:
+    """listener(event, span) 를 등록합니다. event 는 "start" 또는 "finish" 입니다."""
+    if listener not in _SPAN_LISTENERS:
+        _SPAN_LISTENERS.append(listener)
+
+
+def remove_span_listener(listener: Callable[[str, "Span"], None]) -> None:
+    if listener in _SPAN_LISTENERS:
+        _SPAN_LISTENERS.remove(listener)
+
+
+def _notify_span(event: str, sp: "Span") -> None:
+    for listener in list(_SPAN_LISTENERS):
+        try:
+            listener(event, sp)
+        except Exception:
+            span_logger.debug("span listener failed", exc_info=True)
+
+
+class Span:
+    """
+    하나의 단계 실행 구간.
+
+    종료 시 "spans" 로거로 이벤트 1건을 남깁니다. 레코드의 `event` 속성(JSONL 사이드카의 "event" 필드)에
+    {"type": "span", "span", "parent", "product_id", "ms", "retries", "outcome", "error", ...} 가 들어갑니다.
+    - 제품 ID 가 있는 span 과 stage() 로 만든 하위 단계는 INFO, 나머지(원장 조회 등 내부 호출)는 DEBUG 로 기록
+    - 실패는 예외당 한 번만 ERROR 로 기록 (바깥 span 들은 같은 예외를 outcome=error 로 INFO 기록)
+    - retry_on_failure 가 재시도하면 진행 중이던 하위 단계는 outcome=retry 로 닫힘
+    """
+
+    def __init__(self, name: str, product_id: Optional[str] = None, parent: Optional["Span"] = None, stage: bool = False, **fields):
+        self.name = name
+        self.parent = parent
+        self.product_id = product_id or (parent.product_id if parent else None)
+        self.verbose = bool(product_id) or stage
+        self.is_stage = stage
+        self.fields: Dict[str, Any] = fields
+        self.retries = 0
+        self.outcome: Optional[str] = None
+        self.ms = 0.0
+        self._t0 = time.perf_counter()
+        self._stage: Optional[Span] = None
+        self._token = None
+        if _SPAN_LISTENERS:
+            _notify_span("start", self)
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    def set(self, **fields) -> "Span":
+        """이벤트에 필드를 추가합니다. product_id 는 span 자체의 제품 ID 를 갱신합니다."""
+        pid = fields.pop("product_id", None)
+        if pid:
+            self.product_id = pid
+            self.verbose = True
+        self.fields.update(fields)
+        return self
+
+    def stage(self, name: str, **fields) -> "Span":
+        """순차 하위 단계를 시작합니다. 진행 중인 이전 하위 단계는 성공으로 닫습니다."""
+        if self._stage is not None:
+            self._stage.finish()
+        self._stage = Span(name, parent=self, stage=True, **fields)
+        return self._stage
+
+    def record_retry(self, error: Optional[BaseException] = None) -> None:
+        """재시도 1회를 기록합니다. 진행 중이던 하위 단계는 outcome=retry 로 닫습니다."""
+        self.retries += 1
+        if self._stage is not None:
+            self._stage.finish("retry", error)
+            self._stage = None
+
+    def finish(self, outcome: str = "ok", error: Optional[BaseException] = None) -> "Span":
+        if self.outcome is not None:
+            return self
+        if self._stage is not None:
+            self._stage.finish(outcome, error)
+            self._stage = None
+        self.outcome = outcome
+        self.ms = (time.perf_counter() - self._t0) * 1000.0
+        _emit_span(self, error)
+        if _SPAN_LISTENERS:
+            _notify_span("finish", self)
+        return self
+
+    def __enter__(self) -> "Span":
+        self._token = _CURRENT_SPAN.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.finish("error" if exc is not None else "ok", exc)
+        if self._token is not None:
+            _CURRENT_SPAN.reset(self._token)
+            self._token = None
+        return False
+
+
+def _describe_error(error: BaseException) -> str:
+    if isinstance(error, ProductionError):
+        return f"{error.stage}: {error.message}"
+    return f"{type(error).__name__}: {error}"
+
+
+def _emit_span(sp: Span, error: Optional[BaseException]) -> None:
+    first_report = sp.outcome == "error" and error is not None and not getattr(error, "_span_logged", False)
+    if first_report:
+        level = logging.ERROR
+        try:
+            error._span_logged = True
+        except Exception:
+            pass
+    else:
+        level = logging.INFO if sp.verbose else logging.DEBUG
+    if not span_logger.isEnabledFor(level):
+        return
+    event: Dict[str, Any] = {
+        "type": "span",
+        "span": sp.path,
+        "stage": sp.name,
+        "parent": sp.parent.path if sp.parent else None,
+        "product_id": sp.product_id,
+        "ms": round(sp.ms, 1),
+        "retries": sp.retries,
+        "outcome": sp.outcome,
+    }
+    if error is not None:
+        event["error"] = _describe_error(error)
+    event.update(sp.fields)
+    msg = f"[span] {sp.product_id or '-'} {sp.path} {sp.outcome} {sp.ms:.0f}ms retries={sp.retries}"
+    if error is not None:
+        msg += f" error={event['error']}"
+    span_logger.log(level, msg, extra={"product_id": sp.product_id, "event": event})
+
+
+def span(name: str, product_id: Optional[str] = None, **fields) -> Span:
+    """현재 span 의 하위 span 을 만듭니다. `with span("Publish", product_id=pid) as sp:` 또는 finish() 로 닫습니다."""
+    return Span(name, product_id=product_id, parent=_CURRENT_SPAN.get(), **fields)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
+
+
+def mark_stage(name: str, **fields) -> Optional[Span]:
+    """현재 span 안에서 다음 순차 단계를 시작합니다 (span 밖이면 아무것도 하지 않음)."""
+    sp = _CURRENT_SPAN.get()
+    return sp.stage(name, **fields) if sp is not None else None
+
+
+def annotate_span(**fields) -> None:
+    """현재 span 이벤트에 필드(product_id, status 등)를 추가합니다."""
+    sp = _CURRENT_SPAN.get()
+    if sp is not None:
+        sp.set(**fields)
+
+
+def _product_id_from_call(args, kwargs) -> Optional[str]:
+    return kwargs.get("product_id") or (
+        getattr(args[0], "product_id", None) if args else None
+    )
 
 
 def handle_errors(stage):
     """
     함수 실행 중 발생하는 예외를 처리하고 로깅하는 데 사용되는 데코레이터.
     ProductionError로 캡슐화하여 일관된 오류 보고를 제공합니다.
+    호출 구간은 span(stage) 으로 기록되어 소요 시간 / 재시도 / 결과가 이벤트로 남습니다.
     """
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            product_id = kwargs.get("product_id") or (
-                args[0].product_id if hasattr(args[0], "product_id") else None
-            )
-            try:
-                return func(*args, **kwargs)
-            except ProductionError as e:
-                # 이미 ProductionError인 경우 다시 캡슐화하지 않음
-                raise e
-            except Exception as e:
-                # 다른 모든 예외를 ProductionError로 캡슐화
-                error_message = f"'{func.__name__}' 함수 실행 중 오류 발생: {e}"
-                raise ProductionError(
-                    error_message,
-                    stage=stage,
-                    product_id=product_id,
-                    original_exception=e,
-                )
+            product_id = _product_id_from_call(args, kwargs)
+            with span(stage, product_id=product_id, func=func.__name__) as sp:
+                try:
+                    result = func(*args, **kwargs)
+                except ProductionError as e:
+                    # 이미 ProductionError인 경우 다시 캡슐화하지 않음
+                    raise e
+                except Exception as e:
+                    # 다른 모든 예외를 ProductionError로 캡슐화
+                    error_message = f"'{func.__name__}' 함수 실행 중 오류 발생: {e}"
+                    raise ProductionError(
+                        error_message,
+                        stage=stage,
+                        product_id=sp.product_id,
+                        original_exception=e,
+                    )
+                status = getattr(result, "status", None)
+                if isinstance(status, str):
+                    sp.set(status=status)
+                return result
 
         return wrapper
 
@@ -84,16 +406,15 @@ def handle_errors(stage):
 def retry_on_failure(
     max_retries=3, delay_seconds=1, catch_exceptions=(ProductionError,)
 ):  # ProductionError 추가
-#     """
-#     실패 시 지정된 횟수만큼 재시도하는 데코레이터.
-#     """
+    """
+    실패 시 지정된 횟수만큼 재시도하는 데코레이터.
+    재시도 횟수는 현재 span(보통 바깥의 handle_errors) 이벤트의 retries 에 더해집니다.
+    """
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            product_id = kwargs.get("product_id") or (
-                args[0].product_id if hasattr(args[0], "product_id") else None
-            )
+            product_id = _product_id_from_call(args, kwargs)
             for attempt in range(1, max_retries + 1):
                 try:
                     return func(*args, **kwargs)
@@ -106,9 +427,10 @@ def retry_on_failure(
                             f"All {max_retries} attempts for {func.__name__} failed (Product ID: {product_id})."
                         )
                         raise  # 마지막 시도 실패 시 예외 다시 발생
+                    sp = _CURRENT_SPAN.get()
+                    if sp is not None:
+                        sp.record_retry(e)
                     # 간단한 지연 후 재시도
-                    import time
-
                     time.sleep(delay_seconds)
             return None  # 모든 재시도 실패 시 None 반환 (실제 사용 시 예외 발생 또는 기본값 처리 필요)
 
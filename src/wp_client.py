@@ -0,0 +1,399 @@
+"""
+WordPress REST 클라이언트 (연결 풀 세션 + 미디어 중복 업로드 방지 + 배치/조건부 요청).
+
+홍보 발행(promotion_dispatcher), 감사(audit_bot), 자동 복구(auto_heal_system), 댓글 봇(comment_bot)이
+각자 인증 헤더를 만들고 일회성 requests 호출을 하던 것을 한 곳으로 모읍니다.
+
+- 세션: 사이트+토큰별로 하나의 requests.Session (HTTPAdapter 풀 크기 = 업로드 동시성)을 재사용합니다.
+- 미디어 인덱스: data/wp_media_index.db (WP_MEDIA_INDEX_DB). 파일 SHA-256 -> 미디어 id/URL.
+  재사용 전 프로세스마다 한 번 원격 미디어를 확인하고, 사이트에서 지워졌으면(404) 다시 올립니다.
+  같은 이미지는 사이트마다 한 번만 업로드하고, 여러 파일은 WP_UPLOAD_WORKERS(기본 4)개까지 동시에 올립니다.
+- 배치: 글 수정/생성은 WP 5.6+ 의 POST /wp-json/batch/v1 로 묶어 보냅니다 (요청당 최대 25개).
+  배치 엔드포인트가 없으면(404) 그 사이트는 개별 요청으로 돌아갑니다.
+- 조건부 읽기: 글 조회 응답의 ETag / Last-Modified 와 본문을 같은 DB 에 저장하고,
+  다음 조회에 If-None-Match / If-Modified-Since 를 보내 304 면 저장된 본문을 씁니다.
+
+api_url 은 기존 설정(WP_URL / wp_api_url)과 같은 .../wp-json/wp/v2/posts 형태입니다.
+"""
+
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "wp_media_index.db"
+USER_AGENT = "template-factory-wp-client/1.0"
+# WP REST batch/v1 의 기본 최대 요청 수
+BATCH_LIMIT = 25
+
+
+def _db_path(db_path: Optional[str] = None) -> str:
+    return str(db_path or os.getenv("WP_MEDIA_INDEX_DB") or DEFAULT_DB_PATH)
+
+
+def auth_header(token: str, default_scheme: str = "Bearer") -> str:
+    """'user:app-password' 는 Basic(base64), 그 외 토큰은 default_scheme 그대로 붙입니다."""
+    if ":" in token:
+        return "Basic " + base64.b64encode(token.encode("utf-8")).decode("utf-8")
+    return f"{default_scheme} {token}"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class WordPressStore:
+    """업로드한 미디어(해시 -> id/URL)와 글 조회 검증자(ETag/Last-Modified + 본문)를 저장하는 SQLite."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = _db_path(db_path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS media (
+                site TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                media_id INTEGER,
+                source_url TEXT NOT NULL,
+                filename TEXT,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (site, sha256)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS post_cache (
+                site TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (site, post_id)
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ---- media ----
+
+    def find_media(self, site: str, sha256: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT media_id, source_url FROM media WHERE site = ? AND sha256 = ?", (site, sha256)
+            ).fetchone()
+        return {"id": row[0], "source_url": row[1]} if row else None
+
+    def record_media(self, site: str, sha256: str, media_id: Any, source_url: str, filename: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO media (site, sha256, media_id, source_url, filename, uploaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (site, sha256, media_id, source_url, filename, time.time()),
+            )
+            self._conn.commit()
+
+    def forget_media(self, site: str, sha256: str) -> None:
+        """원격에서 지운 미디어를 인덱스에서 뺍니다 (다음 업로드 때 다시 올림)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM media WHERE site = ? AND sha256 = ?", (site, sha256))
+            self._conn.commit()
+
+    # ---- posts ----
+
+    def cached_post(self, site: str, post_id: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM post_cache WHERE site = ? AND post_id = ?", (site, str(post_id))
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            return row[0] or "", row[1] or "", json.loads(row[2])
+        except ValueError:
+            return None
+
+    def store_post(self, site: str, post_id: str, etag: str, last_modified: str, body: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO post_cache (site, post_id, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (site, str(post_id), etag, last_modified, json.dumps(body, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def forget_post(self, site: str, post_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM post_cache WHERE site = ? AND post_id = ?", (site, str(post_id)))
+            self._conn.commit()
+
+
+class WordPressClient:
+    """한 WordPress 사이트(+인증 토큰)용 REST 클라이언트. get_wp_client() 로 공유해서 씁니다."""
+
+    def __init__(
+        self,
+        api_url: str,
+        token: str,
+        default_scheme: str = "Bearer",
+        timeout: float = 20.0,
+        max_workers: Optional[int] = None,
+        store: Optional[WordPressStore] = None,
+    ):
+        self.posts_url = api_url.rstrip("/")
+        # .../wp-json/wp/v2/posts -> .../wp-json/wp/v2 (사이트 키) 와 .../wp-json (배치 루트)
+        self.v2_url = self.posts_url[: -len("/posts")] if self.posts_url.endswith("/posts") else self.posts_url
+        self.rest_root = self.v2_url[: -len("/wp/v2")] if self.v2_url.endswith("/wp/v2") else ""
+        self.media_url = f"{self.v2_url}/media"
+        self.comments_url = f"{self.v2_url}/comments"
+        self.timeout = timeout
+        self.max_workers = max(1, int(max_workers or os.getenv("WP_UPLOAD_WORKERS") or 4))
+        self.store = store or get_wp_store()
+        self._batch_supported = bool(self.rest_root)
+        # 이번 프로세스에서 원격에 남아 있음을 확인한 미디어 해시 (재검증은 해시당 한 번)
+        self._media_verified: set = set()
+        self._media_verified_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+        if token:
+            self.session.headers["Authorization"] = auth_header(token, default_scheme)
+
+    # ---- posts ----
+
+    def search_posts(self, search: str, per_page: int = 10) -> List[Dict[str, Any]]:
+        """제목/본문 검색. 실패하면 경고를 남기고 빈 목록."""
+        r = self.session.get(self.posts_url, params={"search": search, "per_page": per_page}, timeout=self.timeout)
+        if r.status_code == 200:
+            return r.json()
+        if r.status_code in (401, 403):
+            logger.warning(f"WP Auth Error during search: {r.status_code}")
+        else:
+            logger.warning(f"WP search failed: {r.status_code} - {r.text[:200]}")
+        return []
+
+    def get_post(self, post_id: Any, use_cache: bool = True) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(HTTP 상태, 글). 저장된 검증자가 있으면 조건부 요청을 보내고, 304 면 (200, 저장된 글)."""
+        headers = {}
+        cached = self.store.cached_post(self.v2_url, post_id) if use_cache else None
+        if cached:
+            etag, last_modified, _body = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        r = self.session.get(f"{self.posts_url}/{post_id}", headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and cached:
+            return 200, cached[2]
+        if r.status_code != 200:
+            return r.status_code, None
+        post = r.json()
+        etag, last_modified = r.headers.get("ETag", ""), r.headers.get("Last-Modified", "")
+        if etag or last_modified:
+            self.store.store_post(self.v2_url, post_id, etag, last_modified, post)
+        return 200, post
+
+    def create_post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """글 생성. 실패하면 경고를 남기고 {}."""
+        try:
+            r = self.session.post(self.posts_url, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"WP Publish Exception: {e}")
+            return {}
+        if 200 <= r.status_code < 300:
+            try:
+                return r.json()
+            except ValueError:
+                # 플러그인/프록시가 JSON 이 아닌 2xx 본문을 돌려주는 경우
+                logger.warning(f"WP Publish returned non-JSON body: {r.status_code} - {r.text[:200]}")
+                return {}
+        logger.warning(f"WP Publish Error: {r.status_code} - {r.text[:500]}")
+        return {}
+
+    def update_post(self, post_id: Any, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.update_posts({post_id: payload}).get(post_id, {})
+
+    def update_posts(self, updates: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """여러 글 수정 (배치). post_id -> 수정된 글 (실패는 {})."""
+        ids = list(updates)
+        ops = [("POST", f"/wp/v2/posts/{pid}", updates[pid]) for pid in ids]
+        out: Dict[Any, Dict[str, Any]] = {}
+        for pid, (status, body) in zip(ids, self.batch(ops)):
+            # 수정된 글은 저장된 조회 본문이 낡았으므로 버림
+            self.store.forget_post(self.v2_url, pid)
+            if 200 <= status < 300 and isinstance(body, dict):
+                out[pid] = body
+            else:
+                logger.error(f"Failed to update post {pid}: {status} - {str(body)[:200]}")
+                out[pid] = {}
+        return out
+
+    # ---- batch ----
+
+    def batch(self, ops: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[int, Any]]:
+        """(method, REST 경로, body) 목록을 batch/v1 로 보내고 요청 순서대로 (상태, 본문)을 돌려줍니다.
+
+        경로는 /wp-json 아래 기준 (예: /wp/v2/posts/12). 배치를 못 쓰는 사이트는 개별 요청으로 보냅니다.
+        """
+        results: List[Tuple[int, Any]] = []
+        for i in range(0, len(ops), BATCH_LIMIT):
+            chunk = ops[i : i + BATCH_LIMIT]
+            results.extend(self._send_batch(chunk) if self._batch_supported and len(chunk) > 1 else self._send_each(chunk))
+        return results
+
+    def _send_batch(self, chunk: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[int, Any]]:
+        payload = {"requests": [{"method": m, "path": p, "body": b} for m, p, b in chunk]}
+        try:
+            r = self.session.post(f"{self.rest_root}/batch/v1", json=payload, timeout=self.timeout * 2)
+        except requests.RequestException as e:
+            return [(0, str(e))] * len(chunk)
+        if r.status_code == 404:
+            logger.info(f"WP batch/v1 미지원 ({self.rest_root}), 개별 요청으로 전환")
+            self._batch_supported = False
+            return self._send_each(chunk)
+        if r.status_code not in (200, 207):
+            return [(r.status_code, r.text[:200])] * len(chunk)
+        responses = (r.json() or {}).get("responses") or []
+        out = [(int(x.get("status", 0)), x.get("body")) for x in responses]
+        return out + [(0, "missing batch response")] * (len(chunk) - len(out))
+
+    def _send_each(self, chunk: List[Tuple[str, str, Dict[str, Any]]]) -> List[Tuple[int, Any]]:
+        out = []
+        for method, path, body in chunk:
+            url = f"{self.rest_root}{path}" if self.rest_root else self.v2_url + path.replace("/wp/v2", "", 1)
+            try:
+                r = self.session.request(method, url, json=body, timeout=self.timeout)
+                out.append((r.status_code, r.json() if r.content else None))
+            except (requests.RequestException, ValueError) as e:
+                out.append((0, str(e)))
+        return out
+
+    # ---- comments ----
+
+    def list_comments(self, **params) -> List[Dict[str, Any]]:
+        r = self.session.get(self.comments_url, params=params, timeout=self.timeout)
+        if r.status_code != 200:
+            raise requests.HTTPError(f"{r.status_code} {r.text[:200]}", response=r)
+        return r.json()
+
+    def create_comment(self, payload: Dict[str, Any]) -> Tuple[bool, Any]:
+        r = self.session.post(self.comments_url, json=payload, timeout=self.timeout)
+        return r.status_code in (200, 201), (r.json() if r.status_code in (200, 201) else r.text)
+
+    # ---- media ----
+
+    def _media_exists(self, known: Dict[str, Any]) -> bool:
+        """인덱스의 미디어가 원격에 아직 있는지 확인합니다. 404/410 일 때만 False (네트워크 오류 등은 있다고 봄)."""
+        try:
+            if known.get("id"):
+                r = self.session.get(f"{self.media_url}/{known['id']}", params={"_fields": "id"}, timeout=self.timeout)
+            else:
+                r = self.session.head(known["source_url"], allow_redirects=True, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"WP media revalidation failed: {e}")
+            return True
+        return r.status_code not in (404, 410)
+
+    def upload_media(self, path: Path, sha256: str = "") -> Dict[str, Any]:
+        """이미지 업로드. 같은 내용(SHA-256)을 이 사이트에 올린 적이 있으면 업로드 없이 기존 미디어를 돌려줍니다.
+
+        재사용하는 인덱스 항목은 프로세스마다 한 번 원격에 있는지 확인하고, 지워졌으면(404) 인덱스에서 빼고 다시 올립니다.
+        """
+        path = Path(path)
+        digest = sha256 or file_sha256(path)
+        known = self.store.find_media(self.v2_url, digest)
+        if known:
+            with self._media_verified_lock:
+                verified = digest in self._media_verified
+            if verified or self._media_exists(known):
+                with self._media_verified_lock:
+                    self._media_verified.add(digest)
+                return {**known, "reused": True}
+            logger.info(f"WP media {known.get('id')} is gone from the site; uploading {path.name} again")
+            self.store.forget_media(self.v2_url, digest)
+        mime_type = mimetypes.guess_type(path.name)[0] or "image/jpeg"
+        headers = {"Content-Disposition": f'attachment; filename="{path.name}"', "Content-Type": mime_type}
+        with open(path, "rb") as f:
+            r = self.session.post(self.media_url, headers=headers, data=f, timeout=max(self.timeout, 60))
+        if not 200 <= r.status_code < 300:
+            logger.warning(f"Image upload failed: {r.status_code} - {r.text[:200]}")
+            return {}
+        data = r.json()
+        if data.get("source_url"):
+            self.store.record_media(self.v2_url, digest, data.get("id"), data["source_url"], path.name)
+            with self._media_verified_lock:
+                self._media_verified.add(digest)
+        return {"id": data.get("id"), "source_url": data.get("source_url", ""), "reused": False}
+
+    def upload_many(self, paths: Iterable[Path]) -> Dict[str, str]:
+        """여러 이미지를 제한된 동시성으로 업로드합니다. str(path) -> source_url (실패는 "")."""
+        files = [Path(p) for p in dict.fromkeys(str(p) for p in paths)]
+        digests = {str(p): file_sha256(p) for p in files}
+        # 같은 내용의 파일은 한 번만 올림
+        first_by_digest: Dict[str, Path] = {}
+        for p in files:
+            first_by_digest.setdefault(digests[str(p)], p)
+
+        def _upload(item: Tuple[str, Path]) -> Tuple[str, str]:
+            digest, p = item
+            try:
+                return digest, self.upload_media(p, sha256=digest).get("source_url", "")
+            except Exception as e:
+                logger.warning(f"Image upload exception: {e}")
+                return digest, ""
+
+        items = list(first_by_digest.items())
+        workers = min(self.max_workers, len(items)) or 1
+        if workers == 1:
+            uploaded = dict(map(_upload, items))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wp-upload") as ex:
+                uploaded = dict(ex.map(_upload, items))
+        return {str(p): uploaded.get(digests[str(p)], "") for p in files}
+
+
+_STORES: Dict[str, WordPressStore] = {}
+_CLIENTS: Dict[Tuple[str, str, str], WordPressClient] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_wp_store(db_path: Optional[str] = None) -> WordPressStore:
+    path = _db_path(db_path)
+    with _REGISTRY_LOCK:
+        if path not in _STORES:
+            _STORES[path] = WordPressStore(path)
+        return _STORES[path]
+
+
+def get_wp_client(api_url: str, token: str, default_scheme: str = "Bearer") -> WordPressClient:
+    """사이트+토큰별 공유 클라이언트 (세션 연결 풀 재사용)."""
+    key = (api_url.rstrip("/"), token, default_scheme)
+    store = get_wp_store()
+    with _REGISTRY_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or client.store is not store:
+            client = _CLIENTS[key] = WordPressClient(api_url, token, default_scheme=default_scheme, store=store)
+        return client
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+tools/bench_landing_render.py
+
+목적:
+- regenerate_landing_pages.py 와 같은 대량 재생성 상황에서 랜딩/체크아웃 렌더링 처리량(pages/second)을 측정합니다.
+- 비교 대상:
+  [cold]     스키마마다 렌더 캐시를 비우고 템플릿 렌더링 (항상 재렌더)
+  [memo]     프로세스 내 렌더 키 캐시 히트 (동일 스키마 재배포)
+  [key-only] 렌더 키 계산만 수행 (디스크의 .render_key 비교로 건너뛰는 경로)
+
+사용:
+    python tools/bench_landing_render.py --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import product_generator as pg  # noqa: E402
+
+
+def _load_schemas(roots: List[str]) -> List[Dict[str, Any]]:
+    schemas: List[Dict[str, Any]] = []
+    for root in roots:
+        base = PROJECT_ROOT / root
+        if not base.exists():
+            continue
+        for path in sorted(base.glob("*/product_schema.json")):
+            try:
+                schemas.append(json.loads(path.read_text(encoding="utf-8")))
+            except Exception:
+                continue
+    return schemas
+
+
+def _measure(label: str, schemas: List[Dict[str, Any]], rounds: int, fn) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for schema in schemas:
+            fn(schema)
+    dt = time.perf_counter() - t0
+    pages = len(schemas) * rounds
+    return {
+        "mode": label,
+        "pages": pages,
+        "seconds": round(dt, 4),
+        "pages_per_second": round(pages / dt, 1) if dt > 0 else 0.0,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Landing page render throughput benchmark")
+    ap.add_argument("--corpus", nargs="+", default=["outputs", "public/outputs"])
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    schemas = _load_schemas(args.corpus)
+    if not schemas:
+        print("product_schema.json 코퍼스를 찾지 못했습니다.")
+        return 1
+
+    def cold(schema):
+        pg._RENDER_CACHE.clear()
+        pg._render_landing_html_from_schema(schema)
+
+    def memo(schema):
+        pg._render_landing_html_from_schema(schema)
+
+    def key_only(schema):
+        pg.landing_render_key(schema)
+
+    # 템플릿 컴파일은 프로세스당 1회 (측정에서 제외)
+    pg._render_landing_html_from_schema(schemas[0])
+
+    results = [
+        _measure("cold", schemas, args.rounds, cold),
+        _measure("memo", schemas, args.rounds, memo),
+        _measure("key-only", schemas, args.rounds, key_only),
+    ]
+    if args.json:
+        print(json.dumps({"corpus_size": len(schemas), "results": results}, indent=2))
+    else:
+        print(f"corpus: {len(schemas)} schemas x {args.rounds} rounds")
+        for r in results:
+            print(f"[{r['mode']:<8}] {r['pages']:>6} pages  {r['seconds']:>8.4f}s  {r['pages_per_second']:>10.1f} pages/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+tools/bench_pdf_render.py
+
+목적:
+- 생성된 product_en.md 코퍼스로 PDF 빌드 처리량(PDFs/minute)을 측정합니다.
+- 비교 대상:
+  [serial]  pro_pdf_engine.build_pdf_from_markdown 을 순차 호출 (기존 파이프라인 방식)
+  [pool]    pdf_render_service.PDFRenderService 워밍 워커 풀
+  [cached]  동일 입력 재빌드 (빌드 키 캐시 히트)
+
+사용:
+    python tools/bench_pdf_render.py --corpus outputs public/outputs --limit 20 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from pdf_render_service import PDFRenderService  # noqa: E402
+from pro_pdf_engine import build_pdf_from_markdown  # noqa: E402
+
+
+def _collect_corpus(roots: List[str], limit: int) -> List[Path]:
+    found: List[Path] = []
+    for root in roots:
+        base = (PROJECT_ROOT / root).resolve()
+        if not base.exists():
+            continue
+        found.extend(sorted(base.glob("*/product_en.md")))
+    return found[:limit]
+
+
+def _cover_meta(md_path: Path) -> dict:
+    return {
+        "brand": "MetaPassiveIncome",
+        "title": md_path.parent.name,
+        "product_id": md_path.parent.name,
+        "language": "EN",
+        "generated_at": "2026-01-01",
+    }
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds * 60.0, 2) if seconds > 0 else 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="PDF build throughput benchmark")
+    ap.add_argument("--corpus", nargs="+", default=["outputs", "public/outputs"])
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    corpus = _collect_corpus(args.corpus, args.limit)
+    if not corpus:
+        print("product_en.md 코퍼스를 찾지 못했습니다.")
+        return 1
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_pdf_"))
+    report = {"corpus_size": len(corpus), "workers": args.workers}
+    try:
+        # [serial]
+        t0 = time.perf_counter()
+        ok = 0
+        for i, md in enumerate(corpus):
+            res = build_pdf_from_markdown(
+                md, work_dir / "serial" / f"{i}.pdf", md.parent.name, cover_meta=_cover_meta(md)
+            )
+            ok += int(res.ok)
+        dt = time.perf_counter() - t0
+        report["serial"] = {"ok": ok, "seconds": round(dt, 3), "pdfs_per_minute": _rate(ok, dt)}
+
+        jobs = [
+            (md, work_dir / "pool" / f"{i}.pdf", md.parent.name, _cover_meta(md))
+            for i, md in enumerate(corpus)
+        ]
+        with PDFRenderService(max_workers=args.workers) as svc:
+            # 워커 기동 비용은 측정에서 제외 (상시 구동 서비스 가정)
+            svc._get_pool()
+            if svc._pool is not None:
+                list(svc._pool.map(abs, range(args.workers)))
+
+            # [pool]
+            t0 = time.perf_counter()
+            results = svc.build_many(jobs, force=True)
+            dt = time.perf_counter() - t0
+            ok = sum(int(r.ok) for r in results)
+            report["pool"] = {"ok": ok, "seconds": round(dt, 3), "pdfs_per_minute": _rate(ok, dt)}
+
+            # [cached]
+            t0 = time.perf_counter()
+            results = svc.build_many(jobs)
+            dt = time.perf_counter() - t0
+            ok = sum(int(r.ok) for r in results)
+            report["cached"] = {
+                "ok": ok,
+                "seconds": round(dt, 3),
+                "pdfs_per_minute": _rate(ok, dt),
+                "cache_hits": svc.stats["cache_hits"],
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"corpus: {report['corpus_size']} files, workers: {report['workers']}")
+        for mode in ("serial", "pool", "cached"):
+            r = report[mode]
+            print(f"[{mode:<6}] {r['ok']:>4} ok  {r['seconds']:>8.3f}s  {r['pdfs_per_minute']:>10.2f} PDFs/min")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+"""
+tools/bench_pipeline.py
+
+목적:
+- 제품 파이프라인(ProductFactory.create_and_process_product / run_batch)을 네트워크 없이 끝까지 돌려
+  처리량과 단계별 지연을 측정하고, 기준선(baseline) JSON 과 비교해 단계 회귀를 보여준다.
+- 외부 서비스는 모두 로컬 fake 로 대체한다.
+  LLM(OpenAI 호환/Gemini), Vercel(API + 배포 사이트), WordPress, Upstash -> tools/fake_pipeline_services.py
+  NOWPayments -> tools/fake_nowpayments.py, DuckDuckGo -> tools/fake_research_server.py
+- 원장/출력/다운로드/캐시 DB/secrets/progress 파일은 임시 폴더로 돌려 실제 데이터를 건드리지 않는다.
+  loopback 이외의 접속은 audit hook 으로 차단하고 시도한 호스트를 결과에 남긴다 (--allow-network 로 허용).
+- 측정: 단계(span 경로)별 p50/p90/p99, 제품당 전체 시간, products/hour, 최대 RSS, 디스크 쓰기 바이트,
+  fake 별 호출 수. 단계 시간은 src/pipeline_profiler.py 의 span 리스너로 수집한다.
+
+사용:
+    python tools/bench_pipeline.py                          # single 3개 + batch 3개, 기준선과 비교
+    python tools/bench_pipeline.py --products 5 --mode batch --latency-ms 200
+    python tools/bench_pipeline.py --save-baseline          # 결과를 기준선으로 저장
+    python tools/bench_pipeline.py --fail-on-regression     # 회귀가 있으면 종료 코드 1
+    python tools/bench_pipeline.py --selftest               # 제품 1개로 전체 경로 점검
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_BASELINE = PROJECT_ROOT / "data" / "bench" / "pipeline_baseline.json"
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1", "", None}
+# fake 로 대체한 서비스의 실제 호스트. 여기로 나가는 시도가 있으면 env 재지정이 빠진 경로다.
+# (제품 페이지의 하드코딩 이미지 CDN 등 제3자 정적 자원은 차단만 하고 결과에 남긴다)
+FAKED_HOSTS = {
+    "api.deepseek.com",
+    "api.openai.com",
+    "generativelanguage.googleapis.com",
+    "html.duckduckgo.com",
+    "duckduckgo.com",
+    "api.vercel.com",
+    "api.nowpayments.io",
+    "api-sandbox.nowpayments.io",
+}
+# 처리량/메모리/디스크 지표의 비교 방향 (True: 클수록 좋음)
+METRICS = {
+    "products_per_hour": True,
+    "peak_rss_mb": False,
+    "disk_write_bytes": False,
+    "output_bytes": False,
+}
+
+
+# -----------------------------
+# 외부 네트워크 차단
+# -----------------------------
+
+_NET = {"block": False, "attempts": Counter()}
+
+
+def _network_guard(event: str, args) -> None:
+    if event == "socket.getaddrinfo":
+        host = args[0]
+    elif event == "socket.connect":
+        address = args[1]
+        host = address[0] if isinstance(address, tuple) else None
+    else:
+        return
+    if isinstance(host, bytes):
+        host = host.decode("ascii", "ignore")
+    if host in LOOPBACK_HOSTS or (isinstance(host, str) and host.startswith("127.")):
+        return
+    _NET["attempts"][str(host)] += 1
+    if _NET["block"]:
+        raise OSError(f"bench_pipeline: external network blocked ({host})")
+
+
+# -----------------------------
+# 측정 도우미
+# -----------------------------
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+
+            return round(psutil.Process().memory_info().peak_wset / 1e6, 1)
+        except Exception:
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 bytes
+    return round(peak / 1e6 if sys.platform == "darwin" else peak / 1e3, 1)
+
+
+def _write_bytes() -> Optional[int]:
+    """프로세스가 지금까지 디스크에 쓴 바이트 (/proc/self/io, 없으면 None)."""
+    try:
+        with open("/proc/self/io", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import psutil
+
+        return int(psutil.Process().io_counters().write_bytes)
+    except Exception:
+        return None
+
+
+def _tree_bytes(*roots: Path) -> int:
+    total = 0
+    for root in roots:
+        for dirpath, _dirs, files in os.walk(root):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+    return total
+
+
+def _pcts(values: List[float]) -> Dict[str, float]:
+    from src.pipeline_profiler import percentile
+
+    values = sorted(values)
+    return {f"p{q}_ms": round(percentile(values, q), 1) for q in (50, 90, 99)}
+
+
+# -----------------------------
+# 오프라인 환경
+# -----------------------------
+
+
+class OfflineEnvironment:
+    """fake 서버들과 임시 작업 폴더를 띄우고, 파이프라인이 그쪽을 보도록 환경 변수를 설정한다."""
+
+    def __init__(self, work_dir: Path, latency: float = 0.0):
+        from tools.fake_nowpayments import FakeNowPayments
+        from tools.fake_pipeline_services import FakeLLM, FakeUpstash, FakeVercel, FakeWordPress
+        from tools.fake_research_server import FakeResearchServer
+
+        self.work_dir = work_dir
+        self.llm = FakeLLM(latency=latency)
+        self.vercel = FakeVercel(latency=latency, pay_start=self._pay_start)
+        self.wordpress = FakeWordPress(latency=latency)
+        self.upstash = FakeUpstash(latency=latency)
+        self.nowpayments = FakeNowPayments(delay=latency)
+        self.research = FakeResearchServer(delay=latency)
+        self._saved_env: Dict[str, Optional[str]] = {}
+        self._saved_cwd = ""
+
+    @property
+    def fakes(self) -> Dict[str, Any]:
+        return {
+            "llm": self.llm,
+            "vercel": self.vercel,
+            "wordpress": self.wordpress,
+            "upstash": self.upstash,
+            "nowpayments": self.nowpayments,
+            "research": self.research,
+        }
+
+    def env(self) -> Dict[str, str]:
+        w = self.work_dir
+        return {
+            # 저장 위치
+            "DATABASE_URL": f"sqlite:///{w / 'ledger.db'}",
+            "OUTPUT_DIR": str(w / "outputs"),
+            "DOWNLOAD_DIR": str(w / "downloads"),
+            "SECRETS_PATH": str(w / "secrets.json"),
+            "PROGRESS_FILE": str(w / "progress.json"),
+            "NEAR_DUP_INDEX_DB": str(w / "near_dup_index.db"),
+            "RESEARCH_CACHE_DB": str(w / "research_cache.db"),
+            "SOCIAL_SCHEDULER_DB": str(w / "social_scheduler.db"),
+            "TRANSLATION_MEMORY_DB": str(w / "translation_memory.db"),
+            "LINK_CHECK_DB": str(w / "link_check.db"),
+            "WP_MEDIA_INDEX_DB": str(w / "wp_media_index.db"),
+            "ASSET_STORE_DIR": str(w / "asset_store"),
+            "GH_PAGES_MIRROR_DIR": str(w / "gh_pages"),
+            "LOG_JSONL": "0",
+            # LLM
+            "DEEPSEEK_API_KEY": "bench",
+            "AI_API_BASE": self.llm.base_url,
+            "GEMINI_API_KEY": "bench",
+            "GOOGLE_GEMINI_BASE_URL": self.llm.base_url,
+            # 검색
+            "DDG_HTML_URL": f"{self.research.base_url}/html/",
+            "RESEARCH_SEARCH_BACKEND": "html",
+            # Vercel
+            "VERCEL_API_TOKEN": "bench",
+            "VERCEL_API_URL": self.vercel.base_url,
+            "PUBLISH_DEPLOY_METHOD": "api",
+            "VERCEL_DEPLOY_GAP": "0",
+            "VERCEL_VERIFY_INTERVAL": "0",
+            # 결제 / 주문 저장소
+            "PAYMENT_MODE": "nowpayments",
+            "NOWPAYMENTS_API_KEY": "bench",
+            "NOWPAYMENTS_BASE_URL": self.nowpayments.base_url,
+            "UPSTASH_REDIS_REST_URL": self.upstash.base_url,
+            "UPSTASH_REDIS_REST_TOKEN": self.upstash.token,
+            "DOWNLOAD_TOKEN_SECRET": "bench-download-secret",
+            "JWT_SECRET_KEY": "bench-jwt-secret",
+        }
+
+    def _pay_start(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """배포 사이트의 /api/pay/start: 로컬 결제 서버와 같은 start_order (NOWPayments + Upstash 저장소)."""
+        from order_store import get_order_store
+        from payment_api import start_order
+
+        order = start_order(self.work_dir, req.get("product_id", ""), float(req.get("amount") or 1.0), req.get("currency", "usd"))
+        saved = get_order_store(self.work_dir).get(order["order_id"]) or {}
+        return {**order, "payment_id": saved.get("provider_payment_id") or order["order_id"]}
+
+    def start(self) -> "OfflineEnvironment":
+        for fake in self.fakes.values():
+            fake.start()
+        (self.work_dir / "secrets.json").write_text(
+            json.dumps({"WP_URL": self.wordpress.posts_url, "WP_TOKEN": "bench:bench-app-password"}),
+            encoding="utf-8",
+        )
+        # 실제 키가 섞이지 않도록 (genai 는 GOOGLE_API_KEY 를 GEMINI_API_KEY 보다 우선)
+        for key in ("GOOGLE_API_KEY", "OPENAI_API_KEY"):
+            self._saved_env[key] = os.environ.pop(key, None)
+        for key, value in self.env().items():
+            self._saved_env.setdefault(key, os.environ.get(key))
+            os.environ[key] = value
+        # 일부 홍보 채널(blog_manager 초안 등)은 현재 폴더에 파일을 쓴다
+        self._saved_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        return self
+
+    def stop(self) -> None:
+        if self._saved_cwd:
+            os.chdir(self._saved_cwd)
+        for fake in self.fakes.values():
+            try:
+                fake.stop()
+            except Exception:
+                pass
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def call_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for name, fake in self.fakes.items():
+            if hasattr(fake, "calls"):
+                counts.update({f"{name} {k}": v for k, v in fake.calls.items()})
+            elif hasattr(fake, "requests"):
+                counts.update({f"{name} GET {k}": v for k, v in fake.requests.items()})
+        if self.nowpayments.payments:
+            counts["nowpayments POST /v1/payment"] = len(self.nowpayments.payments)
+        return counts
+
+
+# -----------------------------
+# 실행
+# -----------------------------
+
+
+def run_phase(factory, name: str, products: int, work_dir: Path, env: OfflineEnvironment, profile: str, seed: int) -> Dict[str, Any]:
+    """한 단계(single/batch)를 실행하고 지표를 반환한다."""
+    from src.pipeline_profiler import PipelineProfiler
+    from tools.fake_pipeline_services import BENCH_TOPICS
+
+    calls_before = Counter(env.call_counts())
+    written_before = _write_bytes()
+    bytes_before = _tree_bytes(work_dir / "outputs", work_dir / "downloads")
+    profiler = PipelineProfiler(profile or "timing", run_id=f"bench-{name}", out_root=work_dir / "perf", label=name).start()
+    t0 = time.perf_counter()
+    try:
+        if name == "single":
+            # batch 가 고르는 주제(목록 앞쪽)와 겹치지 않도록 뒤쪽부터
+            results = [factory.create_and_process_product(t, ["en"]) for t in BENCH_TOPICS[::-1][:products]]
+        else:
+            results = factory.run_batch(batch_size=products, languages=["en"], seed=seed)
+    finally:
+        wall = time.perf_counter() - t0
+        report = json.loads(profiler.stop().read_text(encoding="utf-8"))
+
+    written_after = _write_bytes()
+    statuses = Counter(r.status for r in results)
+    published = statuses.get("PUBLISHED", 0)
+    per_product = [p["total_ms"] for pid, p in report["products"].items() if pid != "-"]
+    calls = Counter(env.call_counts())
+    calls.subtract(calls_before)
+    return {
+        "products": len(results),
+        "published": published,
+        "statuses": dict(statuses),
+        "wall_s": round(wall, 3),
+        "products_per_hour": round(published / wall * 3600.0, 1) if wall > 0 else 0.0,
+        "product_ms": _pcts(per_product),
+        "stages": report["stages"],
+        "peak_rss_mb": _peak_rss_mb(),
+        "disk_write_bytes": (written_after - written_before) if written_before is not None and written_after is not None else None,
+        "output_bytes": _tree_bytes(work_dir / "outputs", work_dir / "downloads") - bytes_before,
+        "fake_calls": {k: v for k, v in sorted(calls.items()) if v},
+    }
+
+
+def run_bench(
+    products: int = 3,
+    modes: Optional[List[str]] = None,
+    latency_ms: float = 0.0,
+    warmup: int = 1,
+    profile: str = "timing",
+    seed: int = 42,
+    allow_network: bool = False,
+    keep: bool = False,
+) -> Dict[str, Any]:
+    modes = modes or ["single", "batch"]
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    _NET["block"] = not allow_network
+    _NET["attempts"].clear()
+    env = OfflineEnvironment(work_dir, latency=latency_ms / 1000.0).start()
+    console = open(os.devnull, "w", encoding="utf-8")
+    try:
+        from src.utils import configure_logging
+
+        # 파이프라인 로그는 작업 폴더의 pipeline.log 로만 (--keep 으로 확인)
+        configure_logging(str(work_dir / "pipeline.log"), stream=console, force=True)
+        from auto_pilot import ProductFactory
+
+        factory = ProductFactory(PROJECT_ROOT)
+        if warmup:
+            # 지연 import(reportlab 등)와 캐시 준비 비용은 측정에서 제외
+            run_phase(factory, "single", warmup, work_dir, env, "timing", seed)
+        result: Dict[str, Any] = {
+            "kind": "pipeline_bench",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {"products": products, "modes": modes, "latency_ms": latency_ms, "warmup": warmup, "profile": profile},
+            "phases": {},
+        }
+        for i, mode in enumerate(modes):
+            result["phases"][mode] = run_phase(factory, mode, products, work_dir, env, profile, seed + i)
+        result["external_network_attempts"] = dict(_NET["attempts"])
+        if keep:
+            result["work_dir"] = str(work_dir)
+        return result
+    finally:
+        env.stop()
+        _NET["block"] = False
+        logging.shutdown()
+        console.close()
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# -----------------------------
+# 기준선 비교
+# -----------------------------
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float = 25.0) -> List[Dict[str, Any]]:
+    """단계 평균 시간(perf_diff 규칙)과 처리량/메모리/디스크 지표를 단계(phase)별로 비교한다."""
+    from tools.perf_diff import diff_stages
+
+    rows: List[Dict[str, Any]] = []
+    for phase in sorted(set(base.get("phases", {})) & set(new.get("phases", {}))):
+        a, b = base["phases"][phase], new["phases"][phase]
+        for r in diff_stages(a, b, threshold=threshold):
+            rows.append({"phase": phase, "metric": r["span"], "base": r["base_ms"], "new": r["new_ms"], "change_pct": r["change_pct"], "regression": r["regression"]})
+        for metric, higher_is_better in METRICS.items():
+            av, bv = a.get(metric), b.get(metric)
+            change = (bv - av) / av * 100.0 if av and bv is not None else None
+            worse = change is not None and (-change if higher_is_better else change) >= threshold
+            rows.append({"phase": phase, "metric": metric, "base": av, "new": bv, "change_pct": round(change, 1) if change is not None else None, "regression": bool(worse)})
+    return rows
+
+
+def _fmt(v) -> str:
+    if v is None:
+        return f"{'-':>12}"
+    return f"{v:>12.1f}" if isinstance(v, float) else f"{v:>12}"
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    cfg = result["config"]
+    print(f"products/phase: {cfg['products']}  fake latency: {cfg['latency_ms']} ms  warmup: {cfg['warmup']}")
+    for phase, r in result["phases"].items():
+        print(
+            f"\n[{phase}] {r['published']}/{r['products']} published in {r['wall_s']:.1f}s  "
+            f"-> {r['products_per_hour']:.1f} products/hour  statuses={r['statuses']}"
+        )
+        pm = r["product_ms"]
+        print(f"  product total ms  p50 {pm['p50_ms']:.0f}  p90 {pm['p90_ms']:.0f}  p99 {pm['p99_ms']:.0f}")
+        print(f"  peak RSS {r['peak_rss_mb']} MB  disk writes {r['disk_write_bytes']} B  outputs {r['output_bytes']} B")
+        print(f"  {'stage':<44} {'n':>4} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for path, s in sorted(r["stages"].items(), key=lambda kv: -kv[1]["total_ms"]):
+            print(f"  {path[:44]:<44} {s['count']:>4} {s['p50_ms']:>9.1f} {s['p90_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+    if result.get("external_network_attempts"):
+        print(f"\nexternal network attempts (blocked): {result['external_network_attempts']}")
+
+
+def print_compare(rows: List[Dict[str, Any]]) -> None:
+    print(f"\n{'phase':<7} {'metric':<44} {'base':>12} {'new':>12} {'change':>8}")
+    for r in rows:
+        change = f"{r['change_pct']:+.1f}%" if r["change_pct"] is not None else "-"
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['phase']:<7} {r['metric'][:44]:<44} {_fmt(r['base'])} {_fmt(r['new'])} {change:>8}{flag}")
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _selftest() -> int:
+    failures = []
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    result = run_bench(products=1, modes=["single", "batch"], warmup=0)
+    single, batch = result["phases"]["single"], result["phases"]["batch"]
+    print_result(result)
+    expect(single["published"] == 1, "single product published through fake Vercel")
+    expect(batch["published"] == 1, "run_batch picked a topic from fake Gemini and published")
+    expect(any(k.startswith("Full Pipeline/") for k in single["stages"]), "per-stage spans collected")
+    expect("p99_ms" in next(iter(single["stages"].values())), "stage percentiles reported")
+    expect(single["fake_calls"].get("llm POST /chat/completions", 0) >= 1, "schema generated by fake LLM")
+    expect(single["fake_calls"].get("upstash POST /set", 0) >= 1, "order stored in fake Upstash")
+    expect(single["fake_calls"].get("wordpress POST /wp-json/wp/v2/posts", 0) == 1, "promotion posted to fake WordPress")
+    expect(single["output_bytes"] > 0 and single["peak_rss_mb"], "disk and memory measured")
+    leaked = {h: n for h, n in result["external_network_attempts"].items() if h in FAKED_HOSTS or h.endswith(".upstash.io")}
+    expect(not leaked, f"faked services never reached over the network ({leaked})")
+
+    rows = compare(result, result)
+    expect(rows and not any(r["regression"] for r in rows), "identical results show no regression")
+    slower = json.loads(json.dumps(result))
+    for s in slower["phases"]["single"]["stages"].values():
+        s["mean_ms"] = s["mean_ms"] * 3 + 10
+    expect(any(r["regression"] for r in compare(result, slower)), "slower stage flagged against baseline")
+
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Offline end-to-end pipeline benchmark")
+    ap.add_argument("--products", type=int, default=3, help="단계(phase)당 제품 수")
+    ap.add_argument("--mode", choices=["single", "batch", "both"], default="both")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="fake 응답 지연 (실서비스 왕복 흉내)")
+    ap.add_argument("--warmup", type=int, default=1, help="측정 전 버리는 제품 수")
+    ap.add_argument("--profile", default="timing", help="timing / cprofile / sample / all (src/pipeline_profiler.py)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE))
+    ap.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    ap.add_argument("--out", type=str, default="", help="결과 JSON 저장 경로")
+    ap.add_argument("--threshold", type=float, default=25.0, help="회귀로 볼 변화율(%%)")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--allow-network", action="store_true", help="loopback 이외 접속을 막지 않음")
+    ap.add_argument("--keep", action="store_true", help="임시 작업 폴더 유지")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+
+    sys.addaudithook(_network_guard)
+    if args.selftest:
+        return _selftest()
+
+    modes = ["single", "batch"] if args.mode == "both" else [args.mode]
+    result = run_bench(
+        products=args.products,
+        modes=modes,
+        latency_ms=args.latency_ms,
+        warmup=args.warmup,
+        profile=args.profile,
+        seed=args.seed,
+        allow_network=args.allow_network,
+        keep=args.keep,
+    )
+    if args.out:
+        _write_json(Path(args.out), result)
+
+    baseline_path = Path(args.baseline)
+    rows: List[Dict[str, Any]] = []
+    if baseline_path.exists() and not args.save_baseline:
+        rows = compare(json.loads(baseline_path.read_text(encoding="utf-8")), result, threshold=args.threshold)
+        result["comparison"] = {"baseline": str(baseline_path), "threshold": args.threshold, "rows": rows}
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_result(result)
+        if rows:
+            print_compare(rows)
+    if args.save_baseline:
+        _write_json(baseline_path, result)
+        print(f"baseline saved: {baseline_path}")
+
+    regressions = [f"{r['phase']}:{r['metric']}" for r in rows if r["regression"]]
+    if regressions and not args.json:
+        print(f"REGRESSIONS (>= {args.threshold:.0f}%): {', '.join(regressions)}")
+    return 1 if (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,7 @@ def deploy_api():
         "order_store.py",
         "payment_api.py",
         "nowpayments_client.py",
+        "payment_status.py",
         "evm_verifier.py",
         "api/main.py",
         "api/health.py",
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+tools/fake_deepl.py
+
+목적:
+- 실제 DeepL 없이 translation_engine 의 세그먼트 분할 / 번역 메모리 / 배치 요청을 검증하는 로컬 fake 서버.
+- 제공 엔드포인트:
+  POST /v2/translate   form: auth_key, target_lang, text (여러 개)
+                       -> {"translations": [{"detected_source_language": "EN", "text": "<LANG> ..."}]}
+- 요청 수, 요청별 text 개수, 과금 문자 수, 동시 처리 최대치를 기록한다.
+- 요청당 text 가 50개를 넘으면 DeepL 과 같이 413 을 돌려준다.
+
+사용:
+    python tools/fake_deepl.py --selftest     # 임시 번역 메모리 DB 로 시나리오 검증
+    python tools/fake_deepl.py --port 8767    # 서버만 실행 (DEEPL_API_URL=http://127.0.0.1:8767/v2/translate)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+from urllib.parse import parse_qs
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+MAX_TEXTS_PER_REQUEST = 50
+
+
+class FakeDeepL:
+    """스레드에서 도는 DeepL fake. 번역 결과는 "<LANG> 원문" 형식이다."""
+
+    def __init__(self, port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.requests = 0
+        self.batch_sizes: List[int] = []
+        self.body_sizes: List[int] = []
+        self.billed_chars = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # noqa: D401 - 조용히
+                return
+
+            def _send(self, status: int, payload) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if not self.path.startswith("/v2/translate"):
+                    return self._send(404, {"message": "not found"})
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+                with fake._lock:
+                    fake.body_sizes.append(length)
+                texts = form.get("text", [])
+                lang = (form.get("target_lang") or [""])[0]
+                if not form.get("auth_key") or not lang:
+                    return self._send(403, {"message": "Wrong endpoint or auth"})
+                if len(texts) > MAX_TEXTS_PER_REQUEST:
+                    return self._send(413, {"message": "Too many texts"})
+                with fake._lock:
+                    fake.requests += 1
+                    fake.batch_sizes.append(len(texts))
+                    fake.billed_chars += sum(len(t) for t in texts)
+                    fake._in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake._in_flight)
+                try:
+                    if fake.delay:
+                        time.sleep(fake.delay)
+                    out = [{"detected_source_language": "EN", "text": f"<{lang}> {t}"} for t in texts]
+                    return self._send(200, {"translations": out})
+                finally:
+                    with fake._lock:
+                        fake._in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}/v2/translate"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeDeepL":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+SAMPLE_DOC = """# Passive Income Starter Kit
+
+Build your first digital product in a weekend.
+
+```python
+print("keep this code as is")
+```
+
+| Plan | Price |
+|------|------:|
+| Starter plan | $19 |
+
+- [ ] Pick a niche
+- [ ] Write the outline
+> Ship it before it feels ready.
+"""
+
+
+def _selftest() -> int:
+    tmp_dir = Path(tempfile.mkdtemp(prefix="fake_deepl_"))
+    fake = FakeDeepL(delay=0.2).start()
+    os.environ.update(
+        {
+            "DEEPL_API_KEY": "fake-key",
+            "DEEPL_API_URL": fake.url,
+            "TRANSLATION_MEMORY_DB": str(tmp_dir / "tm.db"),
+        }
+    )
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+    from translation_engine import split_segments, translate
+
+    failures = []
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    expect("".join(p for p, _ in split_segments(SAMPLE_DOC)) == SAMPLE_DOC, "segments reassemble losslessly")
+
+    # 1) 첫 번역: 코드 블록/표 구조 보존, 순서 유지
+    r = translate(SAMPLE_DOC, "de")
+    expect(r.ok and r.provider == "deepl", "translated via deepl")
+    expect('print("keep this code as is")' in r.text and "<DE> print" not in r.text, "code block kept verbatim")
+    expect("|------|------:|" in r.text and "| <DE> Starter plan | $19 |" in r.text, "table structure kept")
+    expect(r.text.startswith("# <DE> Passive Income Starter Kit\n"), "heading marker kept")
+    expect("- [ ] <DE> Pick a niche" in r.text and "> <DE> Ship it" in r.text, "list/quote markers kept")
+    expect(r.text.index("Pick a niche") < r.text.index("Write the outline"), "segment order kept")
+    expect(fake.requests == 1 and r.memory_hits == 0, "one batched request on cold memory")
+
+    # 2) 같은 문서 재번역: 요청 없음
+    before = fake.requests
+    r2 = translate(SAMPLE_DOC, "de")
+    expect(r2.text == r.text and fake.requests == before, "rerun served from translation memory")
+
+    # 3) 한 줄만 수정: 그 세그먼트만 과금
+    chars = fake.billed_chars
+    edited = SAMPLE_DOC.replace("Write the outline", "Write the detailed outline")
+    r3 = translate(edited, "de")
+    expect(
+        fake.requests == before + 1 and fake.billed_chars - chars == len("Write the detailed outline"),
+        "edited line is the only billed segment",
+    )
+    expect(r3.memory_hits == r3.segments - 1, "other segments hit memory")
+
+    # 4) 다른 언어는 별도로 한 번만 과금
+    translate(SAMPLE_DOC, "fr")
+    translate(SAMPLE_DOC, "fr")
+    expect(fake.requests == before + 2, "second language paid once")
+
+    # 5) 큰 문서: 50개 이하 배치 여러 개를 동시에 전송
+    big = "\n".join(f"Paragraph number {i} about pricing strategy." for i in range(230)) + "\n"
+    fake.batch_sizes.clear()
+    t0 = time.perf_counter()
+    r5 = translate(big, "es")
+    elapsed = time.perf_counter() - t0
+    expect(r5.ok and r5.text.count("<ES> Paragraph") == 230, "large doc fully translated")
+    expect(
+        len(fake.batch_sizes) == 5 and max(fake.batch_sizes) <= MAX_TEXTS_PER_REQUEST,
+        "large doc split into bounded batches",
+    )
+    expect(fake.max_in_flight >= 2, "batches sent concurrently")
+    lines = r5.text.splitlines()
+    expect(all(f"Paragraph number {i} " in lines[i] for i in range(230)), "large doc reassembled in order")
+
+    # 5-1) 한글 문서: 배치 크기는 URL 인코딩된 본문 기준 (글자당 9바이트)
+    os.environ["DEEPL_BATCH_BYTES"] = "4000"
+    fake.body_sizes.clear()
+    ko = "\n".join(f"가격 전략에 관한 {i}번째 문단입니다. 첫 디지털 상품을 주말에 만드는 방법을 설명합니다." for i in range(60)) + "\n"
+    r51 = translate(ko, "en")
+    os.environ.pop("DEEPL_BATCH_BYTES")
+    expect(r51.ok and r51.text.count("<EN> 가격 전략") == 60, "non-ascii doc fully translated")
+    expect(
+        len(fake.body_sizes) > 1 and max(fake.body_sizes) <= 4000 + 100,
+        "encoded request bodies stay within DEEPL_BATCH_BYTES",
+    )
+
+    # 6) 제공자 실패 시 mock 으로 대체 (메모리에 없는 세그먼트)
+    os.environ["DEEPL_API_URL"] = f"http://127.0.0.1:{fake.port}/missing"
+    r6 = translate("A brand new sentence.", "ja")
+    expect(r6.ok and r6.provider == "mock", "falls back to mock when provider fails")
+
+    fake.stop()
+    print(f"requests: {fake.requests}, billed chars: {fake.billed_chars}, large doc: {elapsed * 1000:.0f}ms")
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local fake DeepL server for translation_engine")
+    ap.add_argument("--port", type=int, default=8767)
+    ap.add_argument("--delay", type=float, default=0.0, help="응답 지연(초)")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+    if args.selftest:
+        return _selftest()
+    fake = FakeDeepL(port=args.port, delay=args.delay).start()
+    print(f"Fake DeepL on {fake.url} (DEEPL_API_URL={fake.url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
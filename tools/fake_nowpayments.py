@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+tools/fake_nowpayments.py
+
+목적:
+- 실제 키/네트워크 없이 NOWPayments 연동(IPN 수신, 상태 캐시, singleflight, pending 재확인)을 검증하는 로컬 fake 서버.
+- 제공 엔드포인트 (NOWPayments 와 동일한 경로):
+  POST /v1/payment            결제 생성 -> {payment_id, payment_status: waiting, ...}
+  GET  /v1/payment/<id>       상태 조회 (GET 호출 수를 집계, --delay 로 지연 주입)
+  GET  /invoice/<id>          결제 생성 응답의 invoice_url (결제 흐름 검수에서 접속 확인)
+- FakeNowPayments.set_status(..., ipn_url=...) 로 상태를 바꾸고 서명된 IPN 을 보낼 수 있다.
+
+사용:
+    python tools/fake_nowpayments.py --selftest     # 임시 프로젝트 루트에서 시나리오 검증
+    python tools/fake_nowpayments.py --port 8765    # 서버만 실행 (NOWPAYMENTS_BASE_URL=http://127.0.0.1:8765)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.request import Request, urlopen
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class FakeNowPayments:
+    """스레드에서 도는 NOWPayments fake. payments/get_calls 로 상태와 호출 수를 확인한다."""
+
+    def __init__(self, port: int = 0, delay: float = 0.0, ipn_secret: str = "fake-ipn-secret"):
+        self.delay = delay
+        self.ipn_secret = ipn_secret
+        self.payments: Dict[str, Dict[str, Any]] = {}
+        self.get_calls = 0
+        self._lock = threading.Lock()
+        self._seq = 0
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # noqa: D401 - 조용히
+                return
+
+            def _json(self, status: int, data: Dict[str, Any]) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith("/invoice/"):
+                    return self._json(200, {"invoice": self.path.rsplit("/", 1)[-1]})
+                if not self.path.startswith("/v1/payment/"):
+                    return self._json(404, {"message": "not found"})
+                pid = self.path.rsplit("/", 1)[-1]
+                with fake._lock:
+                    fake.get_calls += 1
+                if fake.delay:
+                    time.sleep(fake.delay)
+                p = fake.payments.get(pid)
+                if not p:
+                    return self._json(404, {"message": "payment not found"})
+                return self._json(200, p)
+
+            def do_POST(self):
+                if self.path != "/v1/payment":
+                    return self._json(404, {"message": "not found"})
+                length = int(self.headers.get("Content-Length", 0))
+                req = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake._seq += 1
+                    pid = str(5000000000 + fake._seq)
+                p = {
+                    "payment_id": pid,
+                    "payment_status": "waiting",
+                    "order_id": req.get("order_id"),
+                    "order_description": req.get("order_description"),
+                    "price_amount": req.get("price_amount"),
+                    "price_currency": req.get("price_currency"),
+                    "pay_address": "FAKE_ADDRESS",
+                    "invoice_url": f"{fake.base_url}/invoice/{pid}",
+                }
+                fake.payments[pid] = p
+                return self._json(201, p)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.port = self.server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeNowPayments":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def set_status(self, payment_id: str, status: str, ipn_url: Optional[str] = None, bad_signature: bool = False) -> int:
+        """상태 변경 + (ipn_url 이 있으면) 서명된 IPN 전송. IPN 응답 HTTP 코드를 반환."""
+        from payment_status import IPN_SIG_HEADER, sign_ipn
+
+        p = self.payments[payment_id]
+        p["payment_status"] = status
+        if not ipn_url:
+            return 0
+        body = json.dumps(p).encode("utf-8")
+        sig = sign_ipn(p, "wrong-secret" if bad_signature else self.ipn_secret)
+        req = Request(ipn_url, data=body, method="POST", headers={"Content-Type": "application/json", IPN_SIG_HEADER: sig})
+        try:
+            with urlopen(req, timeout=5) as r:
+                return r.status
+        except Exception as e:  # HTTPError 포함
+            return int(getattr(e, "code", 0) or 0)
+
+
+def _selftest() -> int:
+    tmp_root = Path(tempfile.mkdtemp(prefix="fake_np_"))
+    fake = FakeNowPayments(delay=0.3).start()
+    os.environ.update(
+        {
+            "NOWPAYMENTS_BASE_URL": fake.base_url,
+            "NOWPAYMENTS_API_KEY": "fake-api-key",
+            "NOWPAYMENTS_IPN_SECRET": fake.ipn_secret,
+            "NOWPAYMENTS_STATUS_TTL": "2",
+        }
+    )
+    os.environ.pop("UPSTASH_REDIS_REST_URL", None)
+
+    import payment_api
+    import payment_status
+    from order_store import get_order_store
+
+    failures = []
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    # 1) 동시 polling 은 upstream 1회로 합쳐진다 (singleflight) + TTL 동안 재사용
+    order = payment_api.start_order(tmp_root, "fake-product", 19.9, "usd")
+    oid = order["order_id"]
+    with ThreadPoolExecutor(max_workers=20) as ex:
+        results = list(ex.map(lambda _: payment_api.check_order(tmp_root, oid), range(20)))
+    expect(all(r["status"] == "pending" for r in results), "20 concurrent checks -> pending")
+    expect(fake.get_calls == 1, f"singleflight: upstream GET calls = {fake.get_calls} (expected 1)")
+    payment_api.check_order(tmp_root, oid)
+    expect(fake.get_calls == 1, "repeat check within TTL served from cache")
+
+    # 2) IPN 서버(backend 와 같은 처리)를 띄워 서명된 IPN 반영
+    class _IpnHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            return
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            res = payment_api.handle_ipn(tmp_root, raw, self.headers.get(payment_status.IPN_SIG_HEADER, ""))
+            body = json.dumps(res).encode("utf-8")
+            self.send_response(int(res.get("http_status", 200)))
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    ipn_server = ThreadingHTTPServer(("127.0.0.1", 0), _IpnHandler)
+    threading.Thread(target=ipn_server.serve_forever, daemon=True).start()
+    ipn_url = f"http://127.0.0.1:{ipn_server.server_address[1]}/api/pay/ipn"
+
+    store = get_order_store(tmp_root)
+    pid = store.get(oid)["provider_payment_id"]
+    expect(fake.set_status(pid, "finished", ipn_url, bad_signature=True) == 401, "bad signature rejected (401)")
+    expect(store.get(oid)["status"] == "pending", "order unchanged after bad signature")
+    expect(fake.set_status(pid, "finished", ipn_url) == 200, "signed IPN accepted")
+    expect(store.get(oid)["status"] == "paid", "IPN pushed status into order store")
+    calls = fake.get_calls
+    res = payment_api.check_order(tmp_root, oid)
+    expect(res["can_download"] and fake.get_calls == calls, "check after IPN needs no upstream call")
+    # 역순 도착한 오래된 IPN 은 paid 를 되돌리지 않는다
+    fake.set_status(pid, "confirming", ipn_url)
+    expect(store.get(oid)["status"] == "paid", "late 'confirming' IPN does not downgrade paid")
+
+    # JS(JSON.stringify) 표기로 서명된 본문: 작은/큰 실수, 정수형 실수 표기가 파이썬 repr 과 다름
+    import hashlib
+    import hmac
+
+    js_form = (
+        '{"actually_paid":0.00005,"fee":1.5e-7,"order_id":"o-1","outcome_amount":123456789012345680000,'
+        '"pay_amount":1e+21,"payment_id":5077125051,"payment_status":"finished","price_amount":39}'
+    )
+    js_sig = hmac.new(fake.ipn_secret.encode("utf-8"), js_form.encode("utf-8"), hashlib.sha512).hexdigest()
+    raw = (
+        '{"payment_id": 5077125051, "payment_status": "finished", "price_amount": 39.0, "actually_paid": 5e-05,'
+        ' "fee": 0.00000015, "pay_amount": 1e21, "outcome_amount": 1.2345678901234568e20, "order_id": "o-1"}'
+    )
+    verified = payment_status.verify_ipn_signature(raw.encode("utf-8"), js_sig, fake.ipn_secret)
+    expect(verified is not None and verified["actually_paid"] == 0.00005, "IPN signed over JSON.stringify form verified")
+
+    # 3) IPN 을 놓친 pending 주문은 reconciler 가 재확인
+    order2 = payment_api.start_order(tmp_root, "fake-product-2", 9.9, "usd")
+    pid2 = store.get(order2["order_id"])["provider_payment_id"]
+    fake.set_status(pid2, "finished")  # IPN 없음
+    rec = payment_status.PendingReconciler(tmp_root, min_age=0)
+    result = rec.run_once()
+    expect(result.updated == 1 and store.get(order2["order_id"])["status"] == "paid", f"reconciler recovered missed IPN ({result})")
+    expect(rec.run_once().checked == 0, "settled orders are not polled again")
+
+    ipn_server.shutdown()
+    fake.stop()
+    print(f"upstream GET calls total: {fake.get_calls}")
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local fake NOWPayments server")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=0.0, help="GET /v1/payment 응답 지연(초)")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+    if args.selftest:
+        return _selftest()
+    fake = FakeNowPayments(port=args.port, delay=args.delay).start()
+    print(f"Fake NOWPayments on {fake.base_url} (IPN secret: {fake.ipn_secret})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,696 @@
+# -*- coding: utf-8 -*-
+"""
+tools/fake_pipeline_services.py
+
+목적:
+- auto_pilot 파이프라인을 네트워크 없이 끝까지 돌리기 위한 결정론적 로컬 fake 서버 모음.
+  (NOWPayments / DuckDuckGo / DeepL 은 tools/fake_nowpayments.py, fake_research_server.py, fake_deepl.py)
+- FakeLLM        OpenAI 호환 POST /chat/completions (AI_API_BASE) +
+                 Gemini POST /v1beta/models/<model>:generateContent (GOOGLE_GEMINI_BASE_URL)
+                 스키마 요청에는 규칙 검증을 통과하는 제품 스키마, 품질 검사에는 통과 점수,
+                 주제 요청에는 고정 주제 후보 JSON 을 돌려준다.
+- FakeVercel     POST /v13/deployments, /v9/projects/... (VERCEL_API_URL) 와 배포된 사이트
+                 GET /d/<deployment>/<path>, GET /d/<deployment>/api/health, POST /d/<deployment>/api/pay/start
+- FakeUpstash    Upstash Redis REST: POST /set/<key>, GET /get/<key>
+- FakeWordPress  /wp-json/wp/v2/posts (search/생성), /posts/<id> (조회: ETag/304, 수정), /comments (목록/생성),
+                 /wp-json/wp/v2/media (업로드), POST /wp-json/batch/v1, GET /uploads/<file>
+- 모든 fake 는 calls(경로별 호출 수)와 latency(응답 전 지연, 초)를 가진다.
+
+사용:
+    python tools/fake_pipeline_services.py --selftest
+    python tools/fake_pipeline_services.py --serve      # 네 서버를 띄우고 주소 출력 (Ctrl+C 종료)
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# (HTTP 상태, Content-Type, 본문) 또는 끝에 추가 응답 헤더 dict
+Response = Tuple[Any, ...]
+
+# FakeLLM 이 주제 후보로 돌려주는 고정 목록 (서로 충분히 달라 run_batch 의 유사도 중복 제거에 걸리지 않음)
+BENCH_TOPICS = [
+    "Freelance invoice tracker for designers",
+    "Yoga studio class booking landing page",
+    "Crypto portfolio tax summary dashboard",
+    "Wedding planner client checklist kit",
+    "SaaS onboarding email sequence templates",
+    "Restaurant QR menu microsite",
+    "Podcast launch media kit",
+    "Real estate open house lead funnel",
+    "Personal trainer client progress portal",
+    "Etsy shop sales analytics sheet",
+    "Nonprofit year-end donation page",
+    "Indie game press kit website",
+    "Dental clinic appointment reminder flow",
+    "Online course sales page for language tutors",
+    "Coffee roaster subscription storefront",
+]
+
+
+def _json(status: int, data: Any) -> Response:
+    return status, "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class _FakeServer:
+    """스레드에서 도는 HTTP fake 의 공통 부분. 하위 클래스는 handle() 만 구현한다."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # noqa: D401 - 조용히
+                return
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                body = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                with fake._lock:
+                    fake.calls[f"{method} {fake.route_name(parsed.path)}"] += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+                try:
+                    result = fake.handle(method, parsed.path, parse_qs(parsed.query), self.headers, body)
+                except Exception as e:  # fake 자체 오류는 500 으로 (파이프라인 쪽 오류 처리 확인용)
+                    result = _json(500, {"error": str(e)})
+                status, ctype, out = result[:3]
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(out)))
+                for name, value in (result[3] if len(result) > 3 else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(out)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_HEAD(self):
+                self._dispatch("HEAD")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def route_name(self, path: str) -> str:
+        """호출 수 집계용 경로 이름 (ID 같은 가변 부분은 묶음)."""
+        return re.sub(r"/\d+(?=/|$)", "/<id>", path)
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers, body: bytes) -> Response:
+        raise NotImplementedError
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# -----------------------------
+# LLM (OpenAI 호환 + Gemini)
+# -----------------------------
+
+
+class FakeLLM(_FakeServer):
+    """제품 스키마/주제 후보를 결정론적으로 생성하는 LLM fake."""
+
+    def route_name(self, path: str) -> str:
+        return "/v1beta/models:generateContent" if ":generateContent" in path else path
+
+    def _schema_reply(self, system: str, user: str) -> Optional[str]:
+        pid = re.search(r"product_id: use exactly: (\S+)", system)
+        topic = re.search(r"Topic: (.+)", user)
+        if not pid or not topic:
+            return None
+        from src.schema_generator import _build_fallback_schema
+
+        price = re.search(r"set to exactly \$([\d.]+)", system)
+        schema = _build_fallback_schema(
+            product_id=pid.group(1),
+            topic=topic.group(1).strip(),
+            headline=f"{topic.group(1).strip()} Launch Kit",
+            subheadline="",
+            price_usd=float(price.group(1)) if price else 49.0,
+        )
+        return json.dumps(schema, ensure_ascii=False)
+
+    def _topics_reply(self, prompt: str) -> str:
+        excluded = prompt.split("EXCLUDE THESE TOPICS**:", 1)[1].split("(These", 1)[0] if "EXCLUDE THESE TOPICS" in prompt else ""
+        candidates = [
+            {
+                "topic": t,
+                "audience": "Small business owners",
+                "value_prop": f"Launch {t.lower()} in one afternoon",
+                "price_usd": str(29 + 10 * (i % 5)),
+                "price_comparison": "Similar templates sell for $29-$79 on Gumroad",
+                "score": 95 - i,
+                "reasons": ["clear buyer", "recurring need", "fast to build"],
+            }
+            for i, t in enumerate(BENCH_TOPICS)
+            if t not in excluded
+        ]
+        return json.dumps({"candidates": candidates}, ensure_ascii=False)
+
+    def handle(self, method, path, query, headers, body) -> Response:
+        req = json.loads(body or b"{}")
+        if path.endswith("/chat/completions"):
+            messages = req.get("messages") or []
+            system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+            user = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+            if "quality inspector" in system:
+                # src/ai_quality.py 품질 검사: 기본 임계값(AI_QUALITY_THRESHOLD=90) 이상으로 통과
+                text = json.dumps({"score": 94, "defects": []})
+            else:
+                text = self._schema_reply(system, user) or "OK"
+            return _json(
+                200,
+                {
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "model": req.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                },
+            )
+        if ":generateContent" in path:
+            prompt = " ".join(
+                part.get("text", "") for c in req.get("contents") or [] for part in c.get("parts") or []
+            )
+            text = self._topics_reply(prompt) if '"candidates"' in prompt else "OK"
+            return _json(
+                200,
+                {
+                    "candidates": [
+                        {"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}
+                    ],
+                    "usageMetadata": {"promptTokenCount": 0, "candidatesTokenCount": 0, "totalTokenCount": 0},
+                },
+            )
+        return _json(404, {"error": "not found"})
+
+
+# -----------------------------
+# Vercel API + 배포된 사이트
+# -----------------------------
+
+
+class FakeVercel(_FakeServer):
+    """배포 요청의 파일을 메모리에 두고 /d/<deployment>/ 아래에서 서빙한다.
+
+    pay_start(payload) 를 주면 배포된 사이트의 POST /api/pay/start 를 그 함수로 처리한다.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, pay_start: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        super().__init__(port, latency)
+        self.pay_start = pay_start
+        self.deployments: Dict[str, Dict[str, bytes]] = {}
+        self.projects: Dict[str, Dict[str, Any]] = {}
+        self.uploaded_bytes = 0
+
+    def route_name(self, path: str) -> str:
+        if path.startswith("/d/"):
+            rest = path.split("/", 3)[3] if path.count("/") >= 3 else ""
+            return "/d/<id>/" + (rest if rest.startswith("api/") else "<file>")
+        return re.sub(r"/v9/projects/[^/]+", "/v9/projects/<name>", path)
+
+    def _deploy(self, req: Dict[str, Any]) -> Response:
+        files: Dict[str, bytes] = {}
+        for f in req.get("files") or []:
+            data = f.get("data", "")
+            raw = base64.b64decode(data) if f.get("encoding") == "base64" else data.encode("utf-8")
+            files[f["file"]] = raw
+        with self._lock:
+            dep_id = f"dpl{len(self.deployments) + 1}"
+            self.deployments[dep_id] = files
+            self.uploaded_bytes += sum(len(v) for v in files.values())
+            self.projects.setdefault(req.get("name", ""), {"envs": []})
+        return _json(200, {"id": dep_id, "url": f"{self.base_url}/d/{dep_id}", "readyState": "READY", "name": req.get("name")})
+
+    def _site(self, method: str, path: str, body: bytes) -> Response:
+        parts = path.split("/", 3)
+        files = self.deployments.get(parts[2])
+        if files is None:
+            return 404, "text/plain", b"404: NOT_FOUND"
+        rel = unquote(parts[3]) if len(parts) > 3 else ""
+        if rel == "api/health":
+            return _json(200, {"status": "ok"})
+        if rel == "api/pay/start" and method == "POST":
+            if self.pay_start is None:
+                return _json(404, {"error": "not_found"})
+            return _json(200, self.pay_start(json.loads(body or b"{}")))
+        if not rel or rel.endswith("/"):
+            rel += "index.html"
+        data = files.get(rel)
+        if data is None:
+            return 404, "text/plain", b"404: NOT_FOUND"
+        ctype = "text/html; charset=utf-8" if rel.endswith(".html") else "application/octet-stream"
+        return 200, ctype, data
+
+    def handle(self, method, path, query, headers, body) -> Response:
+        if path.startswith("/d/"):
+            return self._site(method, path, body)
+        if path == "/v13/deployments" and method == "POST":
+            return self._deploy(json.loads(body or b"{}"))
+        m = re.match(r"^/v9/projects/([^/]+)(/env(?:/([^/]+))?)?$", path)
+        if path == "/v9/projects" and method == "GET":
+            return _json(200, {"projects": [{"id": n, "name": n} for n in self.projects], "pagination": {"next": None}})
+        if m:
+            project = self.projects.setdefault(m.group(1), {"envs": []})
+            if not m.group(2):
+                return _json(200, {"id": m.group(1), "name": m.group(1)})
+            if method == "GET":
+                return _json(200, {"envs": project["envs"]})
+            req = json.loads(body or b"{}")
+            if method == "POST":
+                project["envs"].append({"id": f"env{len(project['envs']) + 1}", "key": req.get("key"), "value": req.get("value")})
+            return _json(200, {"ok": True})
+        return _json(404, {"error": {"code": "not_found"}})
+
+
+# -----------------------------
+# Upstash Redis REST
+# -----------------------------
+
+
+class FakeUpstash(_FakeServer):
+    """Upstash Redis REST 의 get/set 만 구현 (order_store.UpstashOrderStore 용)."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, token: str = "fake-upstash-token"):
+        super().__init__(port, latency)
+        self.token = token
+        self.data: Dict[str, str] = {}
+
+    def route_name(self, path: str) -> str:
+        return "/" + path.strip("/").split("/", 1)[0]
+
+    def handle(self, method, path, query, headers, body) -> Response:
+        if headers.get("Authorization") != f"Bearer {self.token}":
+            return _json(401, {"error": "Unauthorized"})
+        cmd, _, key = path.strip("/").partition("/")
+        key = unquote(key)
+        if cmd == "set":
+            self.data[key] = body.decode("utf-8")
+            return _json(200, {"result": "OK"})
+        if cmd == "get":
+            return _json(200, {"result": self.data.get(key)})
+        return _json(400, {"error": f"unsupported command: {cmd}"})
+
+
+# -----------------------------
+# WordPress REST
+# -----------------------------
+
+
+class FakeWordPress(_FakeServer):
+    """WordPress REST 의 posts/comments/media/batch 일부. api_url 은 .../wp-json/wp/v2/posts 형태로 쓴다."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, batch: bool = True):
+        super().__init__(port, latency)
+        self.batch_enabled = batch
+        self.posts: List[Dict[str, Any]] = []
+        self.comments: List[Dict[str, Any]] = []
+        self.media: Dict[str, bytes] = {}
+        self.posts_url = f"{self.base_url}/wp-json/wp/v2/posts"
+
+    def route_name(self, path: str) -> str:
+        if path.startswith("/uploads/"):
+            return "/uploads/<file>"
+        return super().route_name(path)
+
+    @staticmethod
+    def _etag(post: Dict[str, Any]) -> str:
+        return f'"{post["id"]}-{post["modified"]}"'
+
+    def add_comment(self, post: int, content: str, author_name: str = "Visitor", parent: int = 0, status: str = "approve") -> Dict[str, Any]:
+        """테스트용 방문자 댓글 추가 (date/modified 는 추가 순서대로 증가)."""
+        with self._lock:
+            comment_id = len(self.comments) + 1
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(1767225600 + comment_id))
+            comment = {
+                "id": comment_id,
+                "post": post,
+                "parent": parent,
+                "author_name": author_name,
+                "status": status,
+                "date_gmt": stamp,
+                "modified_gmt": stamp,
+                "content": {"rendered": f"<p>{content}</p>"},
+            }
+            self.comments.append(comment)
+        return comment
+
+    def _list_comments(self, query) -> Response:
+        q = {k: v[0] for k, v in query.items()}
+        found = [c for c in self.comments if c["status"] == q.get("status", "approve")]
+        if q.get("post"):
+            found = [c for c in found if str(c["post"]) == q["post"]]
+        if q.get("after"):
+            found = [c for c in found if c["date_gmt"] > q["after"]]
+        if q.get("modified_after"):
+            found = [c for c in found if c["modified_gmt"] > q["modified_after"]]
+        field = "modified_gmt" if q.get("orderby") == "modified" else "date_gmt"
+        found.sort(key=lambda c: (c[field], c["id"]), reverse=q.get("order", "desc") == "desc")
+        per_page, page = int(q.get("per_page", 10)), int(q.get("page", 1))
+        start = int(q["offset"]) if q.get("offset") else (page - 1) * per_page
+        return _json(200, found[start : start + per_page])
+
+    def _batch(self, headers, body: bytes) -> Response:
+        if not self.batch_enabled:
+            return _json(404, {"code": "rest_no_route"})
+        responses = []
+        for req in (json.loads(body or b"{}").get("requests") or []):
+            parsed = urlparse(req.get("path", ""))
+            status, _ctype, out = self.handle(
+                req.get("method", "POST"),
+                "/wp-json" + parsed.path,
+                parse_qs(parsed.query),
+                headers,
+                json.dumps(req.get("body") or {}).encode("utf-8"),
+            )[:3]
+            responses.append({"status": status, "body": json.loads(out or b"null"), "headers": {}})
+        return _json(207, {"responses": responses})
+
+    def handle(self, method, path, query, headers, body) -> Response:
+        if path.startswith("/uploads/"):
+            data = self.media.get(path[len("/uploads/"):])
+            return (200, "application/octet-stream", data) if data is not None else _json(404, {"code": "rest_no_route"})
+        if not headers.get("Authorization"):
+            return _json(401, {"code": "rest_not_logged_in"})
+        if path == "/wp-json/batch/v1" and method == "POST":
+            return self._batch(headers, body)
+        if path == "/wp-json/wp/v2/posts" and method == "GET":
+            search = (query.get("search") or [""])[0].lower()
+            per_page = int((query.get("per_page") or ["10"])[0])
+            found = [p for p in reversed(self.posts) if search in p["title"]["rendered"].lower()]
+            return _json(200, found[:per_page])
+        if path == "/wp-json/wp/v2/posts" and method == "POST":
+            req = json.loads(body or b"{}")
+            with self._lock:
+                post_id = len(self.posts) + 1
+                post = {
+                    "id": post_id,
+                    "link": f"{self.base_url}/?p={post_id}",
+                    "status": req.get("status", "publish"),
+                    "modified": 1,
+                    "title": {"rendered": req.get("title", "")},
+                    "content": {"rendered": req.get("content", "")},
+                    "categories": req.get("categories") or [],
+                }
+                self.posts.append(post)
+            return _json(201, post)
+        m = re.fullmatch(r"/wp-json/wp/v2/posts/(\d+)", path)
+        if m:
+            idx = int(m.group(1)) - 1
+            if not 0 <= idx < len(self.posts):
+                return _json(404, {"code": "rest_post_invalid_id"})
+            post = self.posts[idx]
+            if method == "GET":
+                etag = self._etag(post)
+                if headers.get("If-None-Match") == etag:
+                    return 304, "application/json", b"", {"ETag": etag}
+                return _json(200, post) + ({"ETag": etag},)
+            if method in ("POST", "PUT", "PATCH"):
+                req = json.loads(body or b"{}")
+                with self._lock:
+                    for key in ("title", "content"):
+                        if key in req:
+                            post[key] = {"rendered": req[key]}
+                    if "status" in req:
+                        post["status"] = req["status"]
+                    post["modified"] += 1
+                return _json(200, post)
+        if path == "/wp-json/wp/v2/comments" and method == "GET":
+            return self._list_comments(query)
+        if path == "/wp-json/wp/v2/comments" and method == "POST":
+            req = json.loads(body or b"{}")
+            comment = self.add_comment(int(req.get("post") or 0), req.get("content", ""), author_name="bot", parent=int(req.get("parent") or 0))
+            return _json(201, comment)
+        if path == "/wp-json/wp/v2/media" and method == "POST":
+            disposition = headers.get("Content-Disposition", "")
+            name = re.search(r'filename="([^"]+)"', disposition)
+            with self._lock:
+                media_id = len(self.media) + 1
+                filename = f"{media_id}-{name.group(1) if name else 'upload.bin'}"
+                self.media[filename] = body
+            return _json(201, {"id": media_id, "source_url": f"{self.base_url}/uploads/{filename}"})
+        m = re.fullmatch(r"/wp-json/wp/v2/media/(\d+)", path)
+        if m:
+            filename = next((f for f, data in self.media.items() if f.startswith(m.group(1) + "-") and data is not None), None)
+            if filename is None:
+                return _json(404, {"code": "rest_post_invalid_id"})
+            if method == "DELETE":
+                self.media[filename] = None  # id 는 재사용하지 않음
+                return _json(200, {"deleted": True})
+            return _json(200, {"id": int(m.group(1)), "source_url": f"{self.base_url}/uploads/{filename}"})
+        return _json(404, {"code": "rest_no_route"})
+
+
+def _selftest() -> int:
+    import os
+    import tempfile
+
+    import requests
+
+    failures = []
+    tmp = Path(tempfile.mkdtemp(prefix="fake_services_"))
+    # WordPress 클라이언트의 미디어/조회 캐시를 저장소 밖으로
+    os.environ["WP_MEDIA_INDEX_DB"] = str(tmp / "wp_media_index.db")
+    os.environ["COMMENT_INGEST_DB"] = str(tmp / "comment_ingest.db")
+    os.environ["COMMENT_CURSOR_OVERLAP"] = "0"
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    llm = FakeLLM().start()
+    vercel = FakeVercel(pay_start=lambda req: {"payment_id": "1", "invoice_url": "", "product_id": req.get("product_id")}).start()
+    upstash = FakeUpstash().start()
+    wp = FakeWordPress().start()
+    try:
+        system = "Rules:\n- product_id: use exactly: 20260101-000000-demo\n- sections.pricing.price: set to exactly $39.00"
+        r = requests.post(
+            f"{llm.base_url}/chat/completions",
+            json={"messages": [{"role": "system", "content": system}, {"role": "user", "content": "Topic: Demo kit\n\nGenerate"}]},
+            timeout=5,
+        )
+        schema = json.loads(r.json()["choices"][0]["message"]["content"])
+        from src.schema_validator import run_rule_based_validation
+
+        expect(schema["product_id"] == "20260101-000000-demo", "LLM schema uses requested product_id")
+        expect(run_rule_based_validation(schema).passed, "LLM schema passes rule validation")
+        r = requests.post(
+            f"{llm.base_url}/v1beta/models/gemini-2.0-flash:generateContent",
+            json={"contents": [{"parts": [{"text": 'Output "candidates" JSON'}]}]},
+            timeout=5,
+        )
+        topics = json.loads(r.json()["candidates"][0]["content"]["parts"][0]["text"])["candidates"]
+        expect(len(topics) == len(BENCH_TOPICS), "Gemini topic candidates returned")
+
+        r = requests.post(
+            f"{vercel.base_url}/v13/deployments",
+            json={"name": "demo", "files": [{"file": "index.html", "data": "<h1>hi</h1>", "encoding": "utf-8"}]},
+            timeout=5,
+        )
+        url = r.json()["url"]
+        expect(requests.get(url, timeout=5).text == "<h1>hi</h1>", "deployment serves index.html")
+        expect(requests.get(f"{url}/api/health", timeout=5).status_code == 200, "deployment health endpoint")
+        expect(requests.post(f"{url}/api/pay/start", json={"product_id": "p1"}, timeout=5).json()["product_id"] == "p1", "pay/start delegated")
+
+        from order_store import Order, UpstashOrderStore
+
+        store = UpstashOrderStore(upstash.base_url, upstash.token)
+        store.upsert(Order(order_id="o1", product_id="p1", amount=1.0, currency="usd", status="pending", created_at="now", provider="simulated"))
+        expect((store.get("o1") or {}).get("product_id") == "p1", "Upstash set/get round trip")
+
+        from src.promotion_dispatcher import _check_duplicate_post, publish_post
+
+        post = publish_post(wp.posts_url, "user:pass", "Demo Post Title", "<p>x</p>")
+        expect(post.get("id") == 1, "WordPress post created")
+        dup = _check_duplicate_post(wp.posts_url, "user:pass", "Demo Post Title")
+        expect(dup.get("exists") and dup.get("id") == 1, "WordPress search finds duplicate")
+        r = requests.post(
+            wp.posts_url.replace("/posts", "/media"),
+            headers={"Authorization": "Bearer t", "Content-Disposition": 'attachment; filename="a.png"'},
+            data=b"PNG",
+            timeout=5,
+        )
+        expect(requests.get(r.json()["source_url"], timeout=5).content == b"PNG", "WordPress media served back")
+
+        from src.wp_client import WordPressClient, WordPressStore, get_wp_client
+
+        client = get_wp_client(wp.posts_url, "user:pass")
+        for name, data in (("a.png", b"A"), ("b.png", b"A"), ("c.png", b"C")):
+            (tmp / name).write_bytes(data)
+        before = wp.calls["POST /wp-json/wp/v2/media"]
+        urls = client.upload_many([tmp / "a.png", tmp / "b.png", tmp / "c.png"])
+        expect(wp.calls["POST /wp-json/wp/v2/media"] - before == 2 and urls[str(tmp / "a.png")] == urls[str(tmp / "b.png")], "identical images uploaded once")
+        client.upload_many([tmp / "c.png"])
+        expect(wp.calls["POST /wp-json/wp/v2/media"] - before == 2, "media index reused across calls")
+        fresh = WordPressClient(wp.posts_url, "user:pass")
+        fresh.upload_many([tmp / "c.png"])
+        expect(wp.calls["POST /wp-json/wp/v2/media"] - before == 2, "indexed media revalidated and reused")
+        c_url = urls[str(tmp / "c.png")]
+        requests.delete(f"{wp.posts_url.replace('/posts', '/media')}/{c_url.rsplit('/', 1)[1].split('-')[0]}", headers={"Authorization": "Bearer t"}, timeout=5)
+        c_new = WordPressClient(wp.posts_url, "user:pass").upload_many([tmp / "c.png"])[str(tmp / "c.png")]
+        expect(
+            wp.calls["POST /wp-json/wp/v2/media"] - before == 3 and c_new != c_url and requests.get(c_new, timeout=5).content == b"C",
+            "media deleted on the site is uploaded again",
+        )
+
+        status, first = client.get_post(1)
+        status2, second = client.get_post(1)
+        expect(status == status2 == 200 and first == second, "conditional post read served from cache on 304")
+        for i in range(2):
+            client.create_post({"title": f"Batch {i}", "content": "old"})
+        before = dict(wp.calls)
+        updated = client.update_posts({pid: {"content": f"new {pid}"} for pid in (1, 2, 3)})
+        expect(wp.calls["POST /wp-json/batch/v1"] - before.get("POST /wp-json/batch/v1", 0) == 1, "post updates sent in one batch request")
+        expect(all(updated[pid]["content"]["rendered"] == f"new {pid}" for pid in (1, 2, 3)), "batch updates applied")
+        expect(client.get_post(1)[1]["content"]["rendered"] == "new 1", "post cache invalidated after update")
+
+        wp_old = FakeWordPress(batch=False).start()
+        try:
+            legacy = WordPressClient(wp_old.posts_url, "user:pass", store=WordPressStore(str(tmp / "legacy.db")))
+            for i in range(2):
+                legacy.create_post({"title": f"Legacy {i}", "content": "old"})
+            res = legacy.update_posts({1: {"content": "x"}, 2: {"content": "y"}})
+            expect(res[2].get("content", {}).get("rendered") == "y" and wp_old.calls["POST /wp-json/wp/v2/posts/<id>"] == 2, "falls back to single requests without batch/v1")
+        finally:
+            wp_old.stop()
+
+        wp.add_comment(1, "Great product")
+        ok, _ = client.create_comment({"post": 1, "parent": 1, "content": "Thanks"})
+        expect(ok and len(client.list_comments(per_page=10)) == 2, "comments listed and created")
+
+        from src.comment_bot import CommentBot
+        from src.comment_ingest import INBOX_KEEP_DAYS, MAX_PAGES, PAGE_SIZE, get_comment_ingestor
+
+        ingestor = get_comment_ingestor(wp.posts_url, "user:pass")
+        expect(ingestor.refresh() == 2, "first comment poll bootstraps the inbox")
+        product_post = client.create_post({"title": "Demo", "content": '<div data-product-id="20260101-000000-demo"></div>'})
+        for text in ("I want to buy this", "please recreate", "purchase link?"):
+            wp.add_comment(product_post["id"], text)
+        before = dict(wp.calls)
+        expect(ingestor.refresh() == 3, "only comments after the cursor are fetched")
+        expect(wp.calls["GET /wp-json/wp/v2/comments"] - before["GET /wp-json/wp/v2/comments"] == 1, "one comment request per poll")
+        pending = ingestor.pending("recreate")
+        ids = {ingestor.product_for_post(c["post"]) for c in pending if c["post"] == product_post["id"]}
+        expect(ids == {"20260101-000000-demo"}, "product_id resolved from post")
+        expect(wp.calls["GET /wp-json/wp/v2/posts/<id>"] - before.get("GET /wp-json/wp/v2/posts/<id>", 0) == 1, "post->product lookup cached")
+        ingestor.mark_processed("recreate", [c["id"] for c in pending])
+        expect(ingestor.refresh() == 0 and not ingestor.pending("recreate"), "processed comments not returned again")
+        calls = wp.calls["GET /wp-json/wp/v2/comments"]
+        bot = CommentBot(wp.posts_url, "user:pass")
+        unreplied = bot.fetch_unreplied_comments()
+        expect(len(unreplied) == 5 and wp.calls["GET /wp-json/wp/v2/comments"] == calls, "reply bot shares the recent fetch")
+        bot.post_reply(unreplied[-1]["id"], "Thanks!", unreplied[-1]["post"])
+        ingestor.refresh()
+        left = {c["id"] for c in bot.fetch_unreplied_comments()}
+        expect(unreplied[-1]["id"] not in left and len(left) == 4, "replied comment and bot reply skipped")
+        # 처리 기록이 inbox 보다 조금 먼저 보존 기간을 넘겨도 봇의 답글이 다시 나오지 않아야 함
+        conn = ingestor.store._conn
+        conn.execute("UPDATE processed SET processed_at = ?", (time.time() - INBOX_KEEP_DAYS * 86400 - 60,))
+        conn.execute("UPDATE inbox SET fetched_at = ?", (time.time() - INBOX_KEEP_DAYS * 86400 + 60,))
+        conn.commit()
+        ingestor.refresh()
+        expect({c["id"] for c in bot.fetch_unreplied_comments()} == left, "processed rows outlive their inbox rows")
+        # 폴링 비용은 새 댓글 수에 비례: 새 댓글이 없으면 작은 첫 페이지 한 번
+        calls = wp.calls["GET /wp-json/wp/v2/comments"]
+        ingestor.refresh()
+        expect(wp.calls["GET /wp-json/wp/v2/comments"] - calls == 1, "idle poll is a single small page")
+        # 페이지 상한보다 많은 댓글이 한꺼번에 쌓여도 커서는 최신으로 옮겨짐 (다음 댓글을 놓치지 않음)
+        for i in range(MAX_PAGES * PAGE_SIZE + 50):
+            wp.add_comment(1, f"burst {i}")
+        ingestor.refresh()
+        after_burst = wp.add_comment(product_post["id"], "after the burst")
+        ingestor.refresh()
+        expect(after_burst["id"] in {c["id"] for c in ingestor.pending("reply")}, "cursor advances past a burst over the page cap")
+        # 늦게 승인된 댓글(작성 시각이 과거)은 정기 확인(COMMENT_SWEEP_INTERVAL)에서 수집
+        held = wp.add_comment(1, "held for moderation", status="hold")
+        for i in range(30):
+            wp.add_comment(1, f"newer {i}")
+        ingestor.refresh()
+        held["status"] = "approve"
+        ingestor.refresh()
+        expect(held["id"] not in {c["id"] for c in ingestor.pending("reply")}, "regular poll stops at the cursor")
+        conn.execute("UPDATE cursors SET swept_at = 0")
+        conn.commit()
+        ingestor.refresh()
+        expect(held["id"] in {c["id"] for c in ingestor.pending("reply")}, "late-approved comment picked up by the sweep")
+        print(f"calls: llm={dict(llm.calls)} vercel={dict(vercel.calls)} wp={dict(wp.calls)}")
+    finally:
+        for fake in (llm, vercel, upstash, wp):
+            fake.stop()
+
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local fakes for LLM / Vercel / Upstash / WordPress")
+    ap.add_argument("--selftest", action="store_true")
+    ap.add_argument("--serve", action="store_true", help="서버를 띄우고 주소를 출력")
+    ap.add_argument("--latency", type=float, default=0.0, help="응답 전 지연(초)")
+    args = ap.parse_args()
+
+    if args.selftest:
+        return _selftest()
+    if not args.serve:
+        ap.print_help()
+        return 0
+    fakes = {
+        "AI_API_BASE / GOOGLE_GEMINI_BASE_URL": FakeLLM(latency=args.latency).start(),
+        "VERCEL_API_URL": FakeVercel(latency=args.latency).start(),
+        "UPSTASH_REDIS_REST_URL": FakeUpstash(latency=args.latency).start(),
+        "WP_URL (…/wp-json/wp/v2/posts)": FakeWordPress(latency=args.latency).start(),
+    }
+    for name, fake in fakes.items():
+        print(f"{name:<40} {fake.base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    for fake in fakes.values():
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
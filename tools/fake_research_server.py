@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+tools/fake_research_server.py
+
+목적:
+- 실제 DuckDuckGo/외부 사이트 없이 AIWebResearcher(검색 캐시, 페이지 동시 수집, 도메인별 간격,
+  ETag 재검증)를 검증하는 로컬 fake 서버.
+- 제공 엔드포인트:
+  GET /html/?q=...     DuckDuckGo HTML 검색 결과 형식 (a.result__a) -> /page/<n> 링크 3개
+  GET /page/<n>        본문 페이지 (ETag 지원, If-None-Match 일치 시 304, --delay 로 지연 주입)
+- 같은 서버를 127.0.0.1 / localhost 두 호스트명으로 부르면 서로 다른 "도메인"으로 취급된다.
+
+사용:
+    python tools/fake_research_server.py --selftest     # 임시 캐시 DB 로 시나리오 검증
+    python tools/fake_research_server.py --port 8766    # 서버만 실행 (DDG_HTML_URL=http://127.0.0.1:8766/html/)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+class FakeResearchServer:
+    """스레드에서 도는 검색/페이지 fake. requests 로 경로별 호출 수를 확인한다."""
+
+    def __init__(self, port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self.page_version = 1
+        self.fetch_log: List[Tuple[str, float]] = []  # (host, 시작 시각)
+        self._lock = threading.Lock()
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):  # noqa: D401 - 조용히
+                return
+
+            def _send(self, status: int, body: bytes = b"", headers=None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                host = (self.headers.get("Host") or "").split(":")[0]
+                with fake._lock:
+                    fake.requests[parsed.path] += 1
+                if parsed.path.startswith("/html"):
+                    q = parse_qs(parsed.query).get("q", [""])[0]
+                    # 서로 다른 두 호스트명으로 링크를 섞어 도메인별 동시 수집을 확인
+                    links = "".join(
+                        f'<div class="result"><a class="result__a" href="http://{h}:{fake.port}/page/{i}">'
+                        f"{q} result {i}</a></div>"
+                        for i, h in enumerate(["127.0.0.1", "localhost", "127.0.0.1"])
+                    )
+                    return self._send(200, f"<html><body>{links}</body></html>".encode("utf-8"))
+                if parsed.path.startswith("/page/"):
+                    with fake._lock:
+                        fake.fetch_log.append((host, time.monotonic()))
+                    etag = f'"v{fake.page_version}-{parsed.path}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        with fake._lock:
+                            fake.not_modified += 1
+                        return self._send(304, headers={"ETag": etag})
+                    if fake.delay:
+                        time.sleep(fake.delay)
+                    body = (
+                        "<html><head><title>Page</title><script>var x = 1;</script></head><body>"
+                        "<nav>menu</nav><h1>Market trends</h1>"
+                        f"<p>Growth in {parsed.path} is 42% year over year (v{fake.page_version}).</p>"
+                        "<footer>footer</footer></body></html>"
+                    )
+                    return self._send(200, body.encode("utf-8"), {"ETag": etag})
+                return self._send(404, b"not found")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.port = self.server.server_address[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self) -> "FakeResearchServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _selftest() -> int:
+    tmp_dir = Path(tempfile.mkdtemp(prefix="fake_research_"))
+    fake = FakeResearchServer(delay=0.3).start()
+    os.environ.update(
+        {
+            "DDG_HTML_URL": f"{fake.base_url}/html/",
+            "RESEARCH_SEARCH_BACKEND": "html",
+            "RESEARCH_DOMAIN_INTERVAL": "0.5",
+        }
+    )
+    os.environ.pop("HTTP_PROXY", None)
+    os.environ.pop("http_proxy", None)
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
+
+    from src.ai_web_researcher import AIWebResearcher, extract_text
+    from src.research_cache import ResearchCache
+
+    failures = []
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    cache = ResearchCache(str(tmp_dir / "research.db"), page_ttl=60)
+    researcher = AIWebResearcher(cache=cache)
+
+    # 1) 첫 리서치: 검색 1회 + 페이지 3개 동시 수집 (같은 도메인 2개는 간격 유지)
+    t0 = time.perf_counter()
+    ctx = researcher.research_topic_trends("ai side hustles")
+    cold = time.perf_counter() - t0
+    expect("42% year over year" in ctx and ctx.count("Source:") == 3, "context built from 3 pages")
+    expect("var x" not in ctx and "menu" not in ctx and "footer" not in ctx, "script/nav/footer stripped")
+    expect(fake.requests["/html/"] == 1, "one search request")
+    starts = {}
+    for host, ts in fake.fetch_log:
+        starts.setdefault(host, []).append(ts)
+    same_host = sorted(starts.get("127.0.0.1", []))
+    expect(len(same_host) == 2 and same_host[1] - same_host[0] >= 0.45, "same-domain fetches spaced by interval")
+    other = starts.get("localhost", [None])[0]
+    # localhost 페이지는 127.0.0.1 의 간격 대기(검색 직후)에 막히지 않고 먼저 수집된다
+    expect(other is not None and other < same_host[0], "other domain not blocked by same-domain interval")
+
+    # 2) 같은 토픽 / 관련 토픽(복수형 차이)은 네트워크 없이 재사용
+    calls = sum(fake.requests.values())
+    t0 = time.perf_counter()
+    researcher.research_topic_trends("ai side hustles")
+    researcher.research_topic_trends("AI side hustle")
+    researcher.research_topic_trends("best ai side hustles for you")  # 불용어만 다름 -> 토픽 유사도 1.0
+    warm = time.perf_counter() - t0
+    expect(sum(fake.requests.values()) == calls, "repeated/related topic served from cache")
+
+    # 2-1) 고정 문구(trends 2025 market analysis)는 유사도에 넣지 않음: 대상만 다른 토픽은 새로 검색
+    researcher.research_topic_trends("Etsy digital planner for nurses")
+    searches = fake.requests["/html/"]
+    researcher.research_topic_trends("Etsy digital planner for teachers")
+    expect(fake.requests["/html/"] == searches + 1, "different topic with shared query suffix searched again")
+
+    # 3) 만료된 페이지는 ETag 로 재검증 (304) 후 본문 재사용
+    cache.page_ttl = 0
+    cache._conn.execute("UPDATE page_cache SET expires_at = 0")
+    cache._conn.commit()
+    text = researcher.fetch_page_content(f"{fake.base_url}/page/0")
+    expect(fake.not_modified == 1 and "42%" in text, "expired page revalidated with If-None-Match (304)")
+
+    # 4) 콘텐츠가 바뀌면 새 본문 수신
+    fake.page_version = 2
+    cache._conn.execute("UPDATE page_cache SET expires_at = 0")
+    cache._conn.commit()
+    text = researcher.fetch_page_content(f"{fake.base_url}/page/0")
+    expect("(v2)" in text, "changed page re-downloaded")
+
+    expect(extract_text("") == "", "empty html -> empty text")
+
+    fake.stop()
+    print(f"cold research: {cold:.2f}s, warm x3: {warm * 1000:.1f}ms, requests: {dict(fake.requests)}")
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local fake search/page server for AIWebResearcher")
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--delay", type=float, default=0.0, help="페이지 응답 지연(초)")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+    if args.selftest:
+        return _selftest()
+    fake = FakeResearchServer(port=args.port, delay=args.delay).start()
+    print(f"Fake research server on {fake.base_url} (DDG_HTML_URL={fake.base_url}/html/)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+tools/import_budget.py
+
+목적:
+- 서버/CLI 진입 모듈의 콜드 import 비용을 `python -X importtime` 으로 측정하고 예산(ms)과 비교한다.
+- 대상마다 새 인터프리터에서 --repeat 회 import 하여 중앙값을 쓴다 (첫 실행은 .pyc 워밍업으로 버림).
+- 예산 초과 외에도 다음을 실패로 본다.
+  * 대상별로 금지한 무거운 모듈(google.genai, reportlab.platypus, bs4, tweepy, sqlalchemy 등)이 import 트리에 있음
+  * import 만으로 data/secrets.json 이 바뀌거나 로그 파일이 생김 (import 부작용)
+
+사용:
+    python tools/import_budget.py                       # 전체 대상 측정, 초과 시 종료 코드 1
+    python tools/import_budget.py --target dashboard_server --repeat 5
+    python tools/import_budget.py --json data/import_budget.json   # 결과 저장 (추세 비교용)
+    python tools/import_budget.py --top 15              # 대상별 가장 비싼 하위 import 출력
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 대상 모듈 -> (예산 ms, import 되면 안 되는 모듈)
+# 예산은 측정값(개발 머신 기준)에 여유를 둔 값. 무거운 의존성이 다시 최상위 import 로 돌아오면 초과한다.
+_SERVER_FORBIDDEN = ("google.genai", "reportlab", "bs4", "tweepy", "praw", "sqlalchemy")
+_API_FORBIDDEN = ("requests", "flask", "sqlalchemy")
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "src.config": (40.0, ("dotenv", "requests") + _SERVER_FORBIDDEN),
+    "src.utils": (40.0, ("src.log_store",) + _SERVER_FORBIDDEN),
+    "dashboard_server": (450.0, _SERVER_FORBIDDEN),
+    "auto_pilot": (1000.0, ("google.genai", "reportlab.platypus", "tweepy", "praw")),
+    "api.index": (150.0, _API_FORBIDDEN),
+    "api.main": (150.0, _API_FORBIDDEN),
+    "api.download": (150.0, _API_FORBIDDEN),
+    "api.health": (80.0, _API_FORBIDDEN),
+    "api.nowpayments": (80.0, _API_FORBIDDEN),
+    "api.payment_handler": (120.0, _API_FORBIDDEN),
+}
+
+WATCHED_FILES = ("data/secrets.json", "logs/product_factory.log")
+
+
+@dataclass
+class ImportSample:
+    cumulative_ms: float  # 대상 모듈의 누적 import 시간 (-X importtime)
+    wall_ms: float  # 인터프리터 시작 포함 전체 프로세스 시간
+    modules: Dict[str, float]  # 모듈 -> 누적 ms
+    children: List[Tuple[str, float]]  # 대상 하위 트리의 (들여쓴 이름, 누적 ms)
+    error: str = ""
+
+
+@dataclass
+class TargetReport:
+    target: str
+    budget_ms: float
+    median_ms: float
+    wall_ms: float
+    modules_loaded: int
+    forbidden_loaded: List[str] = field(default_factory=list)
+    side_effects: List[str] = field(default_factory=list)
+    error: str = ""
+    top: List[Tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.error or self.forbidden_loaded or self.side_effects) and self.median_ms <= self.budget_ms
+
+
+def _parse_importtime(stderr: str) -> Tuple[Dict[str, float], List[Tuple[str, float]]]:
+    modules: Dict[str, float] = {}
+    tree: List[Tuple[str, float]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative = int(parts[1]) / 1000.0
+        name = parts[2].rstrip()
+        modules[name.strip()] = cumulative
+        tree.append((name, cumulative))
+    return modules, tree
+
+
+def _file_state() -> Dict[str, Optional[Tuple[int, int]]]:
+    state: Dict[str, Optional[Tuple[int, int]]] = {}
+    for rel in WATCHED_FILES:
+        try:
+            st = os.stat(PROJECT_ROOT / rel)
+            state[rel] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            state[rel] = None
+    return state
+
+
+def measure_once(target: str) -> ImportSample:
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(PROJECT_ROOT),
+        env=env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    wall = (time.perf_counter() - t0) * 1000.0
+    modules, tree = _parse_importtime(proc.stderr)
+    error = ""
+    if proc.returncode != 0:
+        tail = [ln for ln in proc.stderr.splitlines() if not ln.startswith("import time:")]
+        error = tail[-1] if tail else f"exit code {proc.returncode}"
+    # 대상 모듈의 하위 트리만 (site 등 인터프리터 시작 비용 제외).
+    # -X importtime 은 자식을 부모보다 먼저 출력하므로, 최상위 대상 줄 바로 앞의 들여쓴 줄들이 하위 트리다.
+    children: List[Tuple[str, float]] = []
+    for i, (name, _ms) in enumerate(tree):
+        if name == " " + target:
+            j = i - 1
+            while j >= 0 and tree[j][0].startswith("   "):
+                j -= 1
+            children = tree[j + 1 : i]
+            break
+    return ImportSample(
+        cumulative_ms=modules.get(target, 0.0),
+        wall_ms=wall,
+        modules=modules,
+        children=children,
+        error=error,
+    )
+
+
+def measure(target: str, budget_ms: float, forbidden: Tuple[str, ...], repeat: int = 3, top: int = 0) -> TargetReport:
+    before = _file_state()
+    measure_once(target)  # .pyc 워밍업
+    samples = [measure_once(target) for _ in range(max(1, repeat))]
+    after = _file_state()
+    last = samples[-1]
+    side_effects = [
+        f"{rel} {'created' if before[rel] is None else 'modified'} on import"
+        for rel in WATCHED_FILES
+        if before[rel] != after[rel] and after[rel] is not None
+    ]
+    loaded = [m for m in forbidden if any(name == m or name.startswith(m + ".") for name in last.modules)]
+    expensive = sorted(
+        ((name.strip(), ms) for name, ms in last.children),
+        key=lambda item: -item[1],
+    )
+    return TargetReport(
+        target=target,
+        budget_ms=budget_ms,
+        median_ms=round(statistics.median(s.cumulative_ms for s in samples), 1),
+        wall_ms=round(statistics.median(s.wall_ms for s in samples), 1),
+        modules_loaded=len(last.modules),
+        forbidden_loaded=loaded,
+        side_effects=side_effects,
+        error=last.error,
+        top=[(name, round(ms, 1)) for name, ms in expensive[:top]],
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cold import time budget check (python -X importtime)")
+    ap.add_argument("--target", action="append", help="측정할 모듈 (여러 번 지정 가능, 기본: 전체)")
+    ap.add_argument("--repeat", type=int, default=3, help="대상별 반복 횟수 (중앙값 사용)")
+    ap.add_argument("--top", type=int, default=0, help="대상별 비싼 하위 import N개 출력")
+    ap.add_argument("--budget", action="append", default=[], help="예산 덮어쓰기: 모듈=ms")
+    ap.add_argument("--json", type=str, default="", help="결과를 JSON 으로 저장할 경로")
+    args = ap.parse_args()
+
+    budgets = dict(BUDGETS)
+    for item in args.budget:
+        name, _, value = item.partition("=")
+        forbidden = budgets.get(name, (0.0, ()))[1]
+        budgets[name] = (float(value), forbidden)
+    targets = args.target or list(budgets)
+
+    reports: List[TargetReport] = []
+    print(f"{'target':<22} {'import ms':>10} {'budget':>8} {'wall ms':>9} {'mods':>6}  status")
+    for target in targets:
+        budget_ms, forbidden = budgets.get(target, (float("inf"), ()))
+        r = measure(target, budget_ms, forbidden, repeat=args.repeat, top=args.top)
+        reports.append(r)
+        status = "ok" if r.ok else "FAIL"
+        print(f"{target:<22} {r.median_ms:>10.1f} {budget_ms:>8.0f} {r.wall_ms:>9.1f} {r.modules_loaded:>6}  {status}")
+        if r.error:
+            print(f"    error: {r.error}")
+        for m in r.forbidden_loaded:
+            print(f"    heavy module imported eagerly: {m}")
+        for s in r.side_effects:
+            print(f"    side effect: {s}")
+        for name, ms in r.top:
+            print(f"    {ms:>9.1f} ms  {name}")
+
+    if args.json:
+        out = Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "python": sys.version.split()[0],
+            "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "reports": [dict(asdict(r), ok=r.ok) for r in reports],
+        }
+        tmp = out.with_suffix(out.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, out)
+    failed = [r.target for r in reports if not r.ok]
+    print("BUDGET " + (f"EXCEEDED: {', '.join(failed)}" if failed else "OK"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
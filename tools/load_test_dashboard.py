@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+tools/load_test_dashboard.py
+
+목적:
+- 대시보드를 여러 개 열어 둔 상황(각 탭이 5초마다 3개 API 폴링)을 흉내내어
+  1) 폴링 응답 지연/304 비율
+  2) 같은 원장(SQLite)에 쓰는 데몬 측 쓰기 지연이 폴링 부하로 늘어나는지
+  를 측정합니다.
+- 원장은 data/ledger.db 의 임시 복사본을 사용하므로 실제 데이터는 변경되지 않습니다.
+
+구성:
+  [server]  별도 프로세스에서 dashboard_server.app 실행
+  [pollers] 별도 프로세스에서 N 개 스레드가 ETag(If-None-Match)를 붙여 폴링
+  [daemon]  이 프로세스에서 원장 update_product 를 반복하며 지연 측정
+            (먼저 폴러 없이 기준값을 재고, 다음에 폴러를 켠 상태로 측정)
+
+사용:
+    python tools/load_test_dashboard.py --dashboards 50 --interval 5 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+ENDPOINTS = ["/api/system/progress", "/api/system/status", "/api/products?page=1&limit=10"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    values = sorted(values)
+
+    def pct(p: float) -> float:
+        return round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 3)
+
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.mean(values) * 1000, 3),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def _poller_process(base_url: str, dashboards: int, interval: float, duration: float, out_q) -> None:
+    import requests
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def dashboard(idx: int) -> None:
+        session = requests.Session()
+        etags: Dict[str, str] = {}
+        # 탭마다 폴링 시작 시점을 분산
+        time.sleep(interval * idx / max(1, dashboards))
+        while time.time() < deadline:
+            for ep in ENDPOINTS:
+                headers = {"If-None-Match": etags[ep]} if ep in etags else {}
+                t0 = time.perf_counter()
+                try:
+                    r = session.get(base_url + ep, headers=headers, timeout=30)
+                    code = r.status_code
+                    if r.headers.get("ETag"):
+                        etags[ep] = r.headers["ETag"]
+                except Exception:
+                    code = -1
+                dt = time.perf_counter() - t0
+                with lock:
+                    latencies.append(dt)
+                    statuses[code] = statuses.get(code, 0) + 1
+            time.sleep(interval)
+
+    threads = [threading.Thread(target=dashboard, args=(i,), daemon=True) for i in range(dashboards)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    out_q.put({"latencies": latencies, "statuses": statuses})
+
+
+def _daemon_writes(database_url: str, duration: float, pause: float) -> List[float]:
+    from src.ledger_manager import LedgerManager
+
+    lm = LedgerManager(database_url)
+    products = lm.list_products(limit=5) or []
+    if not products:
+        lm.create_product("load-test-product", "load test")
+        products = [{"id": "load-test-product"}]
+    pid = products[0]["id"]
+
+    latencies: List[float] = []
+    deadline = time.time() + duration
+    i = 0
+    while time.time() < deadline:
+        t0 = time.perf_counter()
+        lm.update_product(pid, metadata={"load_test_tick": str(i)})
+        latencies.append(time.perf_counter() - t0)
+        i += 1
+        time.sleep(pause)
+    return latencies
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Dashboard polling load test")
+    ap.add_argument("--dashboards", type=int, default=50, help="동시에 열린 대시보드 수")
+    ap.add_argument("--interval", type=float, default=5.0, help="대시보드 폴링 주기(초)")
+    ap.add_argument("--duration", type=float, default=20.0, help="각 단계 측정 시간(초)")
+    ap.add_argument("--write-pause", type=float, default=0.2, help="데몬 쓰기 간격(초)")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="dash_load_"))
+    db_path = work_dir / "ledger.db"
+    src_db = PROJECT_ROOT / "data" / "ledger.db"
+    if src_db.exists():
+        shutil.copy2(src_db, db_path)
+    database_url = f"sqlite:///{db_path}"
+    os.environ["DATABASE_URL"] = database_url
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import dashboard_server as d; "
+            f"d.app.run(host='127.0.0.1', port={port}, threaded=True, debug=False, use_reloader=False)",
+        ],
+        cwd=str(PROJECT_ROOT),
+        env=dict(os.environ, DATABASE_URL=database_url),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    report: Dict[str, object] = {"dashboards": args.dashboards, "interval_s": args.interval}
+    try:
+        import requests
+
+        for _ in range(120):
+            try:
+                if requests.get(base_url + "/health", timeout=1).ok:
+                    break
+            except Exception:
+                time.sleep(0.5)
+        else:
+            print("dashboard server failed to start")
+            return 1
+
+        # [baseline] 폴러 없이 데몬 쓰기 지연
+        report["daemon_write_idle"] = _percentiles(_daemon_writes(database_url, args.duration, args.write_pause))
+
+        # [loaded] 폴러를 켠 상태로 데몬 쓰기 지연
+        out_q = multiprocessing.Queue()
+        poller = multiprocessing.Process(
+            target=_poller_process,
+            args=(base_url, args.dashboards, args.interval, args.duration, out_q),
+        )
+        poller.start()
+        report["daemon_write_loaded"] = _percentiles(_daemon_writes(database_url, args.duration, args.write_pause))
+        polled = out_q.get(timeout=args.duration + 120)
+        poller.join()
+
+        statuses = polled["statuses"]
+        total = sum(statuses.values()) or 1
+        report["poll_latency"] = _percentiles(polled["latencies"])
+        report["poll_statuses"] = {str(k): v for k, v in sorted(statuses.items())}
+        report["poll_not_modified_ratio"] = round(statuses.get(304, 0) / total, 3)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"dashboards: {args.dashboards} (poll every {args.interval}s)")
+        for key in ("daemon_write_idle", "daemon_write_loaded", "poll_latency"):
+            r = report[key]
+            print(f"[{key:<20}] n={r.get('count', 0):>6}  p50={r.get('p50_ms', 0):>8}ms  p95={r.get('p95_ms', 0):>8}ms  p99={r.get('p99_ms', 0):>8}ms")
+        print(f"poll statuses: {report['poll_statuses']}  (304 ratio {report['poll_not_modified_ratio']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
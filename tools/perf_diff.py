@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+tools/perf_diff.py
+
+목적:
+- auto_pilot 프로파일링 모드(--profile / PIPELINE_PROFILE)가 남긴 두 실행의 단계별 시간을 비교한다.
+- 인자는 run_id, 실행 폴더(data/perf/<run_id>) 또는 report.json 경로. 생략하면 가장 최근 두 실행.
+  경로 구분자가 없고 .json 으로 끝나지 않는 인자는 run_id 로 보고 perf 폴더 아래에서만 찾는다.
+- 단계(span 경로)별 평균 ms 와 변화율을 출력하고, --threshold(%) 이상 느려진 단계를 회귀로 표시한다.
+- --functions 를 주면 단계별 cProfile 상위 함수의 누적 시간 변화도 출력한다.
+
+사용:
+    python tools/perf_diff.py                          # 최근 두 실행 비교
+    python tools/perf_diff.py 20261018-101500 20261018-113000 --threshold 15
+    python tools/perf_diff.py base/report.json new/report.json --fail-on-regression
+    python tools/perf_diff.py --list                   # 저장된 실행 목록
+    python tools/perf_diff.py --selftest
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 두 실행 모두 이보다 짧은 단계는 변화율이 커도 회귀로 보지 않음 (노이즈)
+MIN_STAGE_MS = 5.0
+
+
+def _is_path_ref(ref: str) -> bool:
+    """경로 구분자가 있거나 .json 으로 끝나면 파일시스템 경로, 아니면 run_id."""
+    seps = {"/", os.sep} | ({os.altsep} if os.altsep else set())
+    return any(sep in ref for sep in seps) or ref.endswith(".json")
+
+
+def load_report(ref: str, root: Optional[Path] = None) -> Dict[str, Any]:
+    from src.pipeline_profiler import perf_dir
+
+    # run_id 는 항상 perf_dir() 아래에서 찾음 (현재 폴더에 같은 이름의 폴더가 있어도 무시)
+    p = Path(ref) if _is_path_ref(ref) else Path(root or perf_dir()) / ref
+    if p.is_dir():
+        p = p / "report.json"
+    if not p.exists():
+        raise FileNotFoundError(f"report not found: {ref}")
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def diff_stages(
+    base: Dict[str, Any], new: Dict[str, Any], threshold: float = 10.0
+) -> List[Dict[str, Any]]:
+    rows = []
+    a_stages, b_stages = base.get("stages", {}), new.get("stages", {})
+    for path in sorted(set(a_stages) | set(b_stages)):
+        a, b = a_stages.get(path), b_stages.get(path)
+        a_ms = a["mean_ms"] if a else None
+        b_ms = b["mean_ms"] if b else None
+        change = None
+        if a_ms and b_ms is not None:
+            change = (b_ms - a_ms) / a_ms * 100.0
+        regression = bool(
+            change is not None and change >= threshold and max(a_ms or 0, b_ms or 0) >= MIN_STAGE_MS
+        )
+        rows.append(
+            {
+                "span": path,
+                "base_ms": a_ms,
+                "new_ms": b_ms,
+                "change_pct": round(change, 1) if change is not None else None,
+                "base_count": a["count"] if a else 0,
+                "new_count": b["count"] if b else 0,
+                "regression": regression,
+            }
+        )
+    return rows
+
+
+def diff_functions(base: Dict[str, Any], new: Dict[str, Any], top: int = 5) -> Dict[str, List[Tuple[str, float, float]]]:
+    """단계별로 누적 시간 변화가 가장 큰 함수 top 개 (함수, base ms, new ms)."""
+    out: Dict[str, List[Tuple[str, float, float]]] = {}
+    for path in sorted(set(base.get("cprofile", {})) & set(new.get("cprofile", {}))):
+        a = {r["func"]: r["cumtime_ms"] for r in base["cprofile"][path]}
+        b = {r["func"]: r["cumtime_ms"] for r in new["cprofile"][path]}
+        changes = [(f, a.get(f, 0.0), b.get(f, 0.0)) for f in set(a) | set(b)]
+        changes.sort(key=lambda t: -abs(t[2] - t[1]))
+        out[path] = changes[:top]
+    return out
+
+
+def _fmt(ms: Optional[float]) -> str:
+    return f"{ms:>10.1f}" if ms is not None else f"{'-':>10}"
+
+
+def print_diff(base: Dict[str, Any], new: Dict[str, Any], rows: List[Dict[str, Any]], functions: bool = False) -> None:
+    print(f"base: {base.get('run_id')} ({base.get('label', '')})  wall {base.get('wall_ms', 0):.0f} ms")
+    print(f"new : {new.get('run_id')} ({new.get('label', '')})  wall {new.get('wall_ms', 0):.0f} ms")
+    print(f"{'span':<48} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    for r in rows:
+        change = f"{r['change_pct']:+.1f}%" if r["change_pct"] is not None else ("new" if r["base_ms"] is None else "gone")
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['span'][:48]:<48} {_fmt(r['base_ms'])} {_fmt(r['new_ms'])} {change:>8}{flag}")
+    if functions:
+        for path, changes in diff_functions(base, new).items():
+            print(f"\n[{path}] cProfile cumtime 변화 상위")
+            for func, a_ms, b_ms in changes:
+                print(f"    {a_ms:>9.1f} -> {b_ms:>9.1f} ms  {func}")
+
+
+def _selftest() -> int:
+    import time
+
+    from src.pipeline_profiler import PipelineProfiler
+    from src.utils import handle_errors, mark_stage
+
+    failures = []
+
+    def expect(cond: bool, label: str) -> None:
+        print(("  ok   " if cond else "  FAIL ") + label)
+        if not cond:
+            failures.append(label)
+
+    class _Factory:
+        def __init__(self, slow: float):
+            self.slow = slow
+
+        @handle_errors(stage="Full Pipeline")
+        def run(self, product_id: str = ""):
+            mark_stage("content")
+            time.sleep(0.02)
+            mark_stage("pdf")
+            sum(i * i for i in range(20000))
+            time.sleep(self.slow)
+            mark_stage("package")
+            time.sleep(0.01)
+
+    root = Path(tempfile.mkdtemp(prefix="perf_diff_"))
+    reports = []
+    for run_id, slow in (("base", 0.02), ("new", 0.06)):
+        with PipelineProfiler("all", run_id=run_id, out_root=root) as prof:
+            for i in range(2):
+                _Factory(slow).run(product_id=f"20260101-00000{i}-selftest")
+        reports.append(load_report(run_id, root))
+        expect((prof.out_dir / "report.json").exists(), f"{run_id}: report.json written")
+
+    base, new = reports
+    # 현재 폴더에 run_id 와 같은 이름의 폴더가 있어도 run_id 는 perf_dir 아래에서 찾음
+    decoy = Path(tempfile.mkdtemp(prefix="perf_diff_cwd_"))
+    (decoy / "base").mkdir()
+    cwd = os.getcwd()
+    os.chdir(decoy)
+    try:
+        expect(load_report("base", root) == base, "run_id resolved under perf dir before cwd")
+    finally:
+        os.chdir(cwd)
+    expect(load_report(str(root / "new"), root) == new, "path with separator loaded as a path")
+    expect(set(base["products"]) == {"20260101-000000-selftest", "20260101-000001-selftest"}, "spans grouped per product")
+    expect(base["stages"]["Full Pipeline/pdf"]["count"] == 2, "stage timings aggregated across products")
+    expect("Full Pipeline/pdf" in base["cprofile"], "cProfile collected per stage")
+    expect((root / "base" / "Full_Pipeline_pdf.pstats").exists(), "pstats file per stage")
+    collapsed = (root / "base" / "stacks.collapsed").read_text(encoding="utf-8")
+    expect(collapsed.startswith("Full Pipeline/") and collapsed.strip().split("\n")[0].rsplit(" ", 1)[1].isdigit(), "collapsed stacks written")
+
+    rows = {r["span"]: r for r in diff_stages(base, new, threshold=50.0)}
+    expect(rows["Full Pipeline/pdf"]["regression"], "slower stage flagged as regression")
+    expect(not rows["Full Pipeline/package"]["regression"], "unchanged stage not flagged")
+    print_diff(base, new, list(rows.values()))
+
+    print("SELFTEST " + ("FAILED" if failures else "PASSED"))
+    return 1 if failures else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Compare stage timings of two profiled auto_pilot runs")
+    ap.add_argument("base", nargs="?", help="기준 실행 (run_id / 폴더 / report.json)")
+    ap.add_argument("new", nargs="?", help="비교 실행 (run_id / 폴더 / report.json)")
+    ap.add_argument("--threshold", type=float, default=10.0, help="회귀로 볼 평균 시간 증가율(%%)")
+    ap.add_argument("--functions", action="store_true", help="단계별 cProfile 함수 변화도 출력")
+    ap.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    ap.add_argument("--json", action="store_true", help="비교 결과를 JSON 으로 출력")
+    ap.add_argument("--list", action="store_true", help="저장된 실행 목록")
+    ap.add_argument("--selftest", action="store_true")
+    args = ap.parse_args()
+
+    if args.selftest:
+        return _selftest()
+
+    from src.pipeline_profiler import list_runs
+
+    if args.list:
+        for run in list_runs():
+            report = json.loads((run / "report.json").read_text(encoding="utf-8"))
+            print(f"{report['run_id']:<20} {report.get('mode', ''):<9} {report.get('wall_ms', 0):>10.0f} ms  {report.get('label', '')}")
+        return 0
+
+    if not args.base or not args.new:
+        runs = list_runs()
+        if len(runs) < 2:
+            print("비교할 실행이 2개 이상 필요합니다 (auto_pilot --profile 로 생성).")
+            return 2
+        args.base, args.new = str(runs[-2]), str(runs[-1])
+
+    base, new = load_report(args.base), load_report(args.new)
+    rows = diff_stages(base, new, threshold=args.threshold)
+    if args.json:
+        print(json.dumps({"base": base["run_id"], "new": new["run_id"], "stages": rows}, ensure_ascii=False, indent=2))
+    else:
+        print_diff(base, new, rows, functions=args.functions)
+    regressions = [r["span"] for r in rows if r["regression"]]
+    if regressions and not args.json:
+        print(f"REGRESSIONS (>= {args.threshold:.0f}%): {', '.join(regressions)}")
+    return 1 if (regressions and args.fail_on_regression) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
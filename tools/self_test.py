@@ -16,6 +16,8 @@ from __future__ import annotations
 
 import json  # JSON 파싱
 import os  # 환경변수
+import signal  # 백그라운드 서버 정리
+import socket  # 포트 사용 여부 확인
 import subprocess  # 서브프로세스 실행
 import sys  # 파이썬 경로
 import time  # 대기
@@ -59,18 +61,52 @@ def _wait_until(url: str, timeout_sec: int = 10) -> bool:
     return False
 
 
-def _run(cmd: list[str], cwd: Path) -> subprocess.CompletedProcess:
-    """명령 실행(실패 시 stdout/stderr 포함)"""
-    return subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True)
+def _port_in_use(port: int) -> bool:
+    """127.0.0.1:port 에 이미 누가 리슨 중인지 확인"""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1.0):
+            return True
+    except OSError:
+        return False
+
+
+def _stop_process_group(pgid: int, ports: list[int], timeout_sec: int = 10) -> None:
+    """pgid 그룹에 남은 프로세스(auto_pilot 이 띄운 백그라운드 서버)를 종료하고 포트가 닫힐 때까지 대기"""
+    if os.name != "posix":
+        return
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    end = time.time() + timeout_sec
+    while time.time() < end and any(_port_in_use(p) for p in ports):
+        time.sleep(0.3)
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
 
 
 def test_1_auto_pilot() -> str:
     """[TEST 1] auto_pilot 산출물 검증"""
     print("[TEST 1] auto_pilot --batch 1 --languages en,ko")
-    p = _run(
+    # auto_pilot 은 dashboard/payment/preview 서버를 백그라운드로 띄우므로
+    # 새 프로세스 그룹에서 실행하고, 끝나면 이번에 새로 뜬 서버만 그룹째 종료함 (TEST 2/3 포트 충돌 방지)
+    server_ports = [int(os.getenv("DASHBOARD_PORT", "8099") or "8099"), 5000, 8088]
+    spawned_ports = [port for port in server_ports if not _port_in_use(port)]
+    proc = subprocess.Popen(
         [sys.executable, "auto_pilot.py", "--batch", "1", "--languages", "en,ko"],
-        cwd=PROJECT_ROOT,
+        cwd=str(PROJECT_ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=(os.name == "posix"),
     )
+    try:
+        stdout, stderr = proc.communicate()
+    finally:
+        _stop_process_group(proc.pid, spawned_ports)
+    p = subprocess.CompletedProcess(proc.args, proc.returncode, stdout, stderr)
     if p.returncode != 0:
         raise RuntimeError("auto_pilot failed\n" + p.stdout + "\n" + p.stderr)
 
@@ -119,6 +155,10 @@ def test_2_dashboard() -> None:
 
     last_err = None
     for chosen_port in candidate_ports:
+        if _port_in_use(int(chosen_port)):
+            # 다른 서버(예: 이전 테스트가 남긴 preview 서버)가 응답하면 /health 검사가 엉뚱한 서버를 보게 됨
+            last_err = f"port {chosen_port}: already in use"
+            continue
         env["DASHBOARD_PORT"] = chosen_port
 
         proc = subprocess.Popen(
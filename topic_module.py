@@ -6,15 +6,14 @@ import os
 import random
 from typing import Dict, List
 
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-
+from src.config import load_environment
+from src.lazy_import import lazy_module
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
-load_dotenv()
+# google-genai 는 import 비용이 커서(~0.5s) Gemini 호출 시점에 로드
+genai = lazy_module("google.genai")
 
 
 def _pick_topics_from_web(count: int = 5, excluded_topics: List[str] = None) -> List[Dict]:
@@ -110,6 +109,7 @@ def pick_topics(
     Gemini를 이용해 주제 후보를 만들고, 시장성 점수로 상위 주제를 반환한다.
     Gemini 실패 시 Web Search를 통한 Fallback을 시도한다.
     """
+    load_environment()
     api_key = os.getenv("GEMINI_API_KEY", "").strip()
     
     # API 키가 없으면 바로 Web Fallback 시도
@@ -162,7 +162,7 @@ Output JSON ONLY. No code blocks.
         response = client.models.generate_content(
             model="gemini-2.0-flash",
             contents=prompt,
-            config=types.GenerateContentConfig(
+            config=genai.types.GenerateContentConfig(
                 temperature=0.7,
                 max_output_tokens=2048,
                 response_mime_type="application/json"
@@ -12,18 +12,49 @@ translation_engine.py
 현재 구현:
 - DeepL API (DEEPL_API_KEY가 있으면 실제 번역)
 - 그 외: Mock translate (언어 태그만 붙임)
+
+DeepL 번역 파이프라인:
+- 마크다운을 줄 단위 세그먼트로 나눕니다. 코드 블록(``` / ~~~), 표 구분선, HTML/이미지 줄은 원문 그대로 두고,
+  제목/목록/인용 기호와 표의 | 구조는 유지한 채 본문(셀)만 번역합니다.
+- 번역 메모리(data/translation_memory.db, TRANSLATION_MEMORY_DB): (세그먼트 해시, 대상 언어) -> 번역문.
+  제품을 다시 생성하거나 여러 언어로 실행해도 새로 생긴 문장만 DeepL 로 보냅니다.
+- 메모리에 없는 세그먼트만 요청당 최대 DEEPL_BATCH_SEGMENTS(기본 50)개 / DEEPL_BATCH_BYTES(기본 60KB, URL 인코딩된 요청 본문 기준)로 묶어
+  DEEPL_WORKERS(기본 3)개 요청을 동시에 보내고, 원래 순서대로 다시 조립합니다.
+- DEEPL_API_URL 로 엔드포인트를 바꿀 수 있습니다 (로컬 fake 서버: tools/fake_deepl.py).
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 SUPPORTED_LANGS = ["en", "ko", "es", "fr", "de", "ja", "zh"]
 
+PROJECT_ROOT = Path(__file__).resolve().parent
+DEFAULT_TM_PATH = PROJECT_ROOT / "data" / "translation_memory.db"
+DEFAULT_DEEPL_URL = "https://api-free.deepl.com/v2/translate"
+
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_LINE_RE = re.compile(
+    r"^(\s*(?:#{1,6}\s+|>\s*|[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)*)(.*?)(\s*)$"
+)
+_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+_VERBATIM_LINE_RE = re.compile(r"^\s*(<[^>]+>\s*)+$|^\s*!\[[^\]]*\]\([^)]*\)\s*$")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
 
 @dataclass
 class TranslationResult:
@@ -31,6 +62,206 @@ class TranslationResult:
     provider: str
     text: str
     error: Optional[str] = None
+    segments: int = 0  # 번역 대상 세그먼트 수
+    memory_hits: int = 0  # 번역 메모리에서 가져온 세그먼트 수
+    billed_chars: int = 0  # 이번에 DeepL 로 보낸 문자 수
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+# -----------------------------
+# 세그먼트 분할 / 조립
+# -----------------------------
+
+
+def _translatable(core: str) -> bool:
+    return bool(core) and bool(_LETTER_RE.search(core)) and not _VERBATIM_LINE_RE.match(core)
+
+
+def _split_line(line: str, pieces: List[Tuple[str, bool]]) -> None:
+    body = line.rstrip("\r\n")
+    newline = line[len(body):]
+    stripped = body.strip()
+    if not stripped or _VERBATIM_LINE_RE.match(body):
+        pieces.append((line, False))
+        return
+    if stripped.startswith("|"):
+        if _TABLE_SEP_RE.match(body):
+            pieces.append((line, False))
+            return
+        # 표: | 구조와 셀 앞뒤 공백은 유지하고 셀 내용만 번역
+        cells = _CELL_SPLIT_RE.split(body)
+        for i, cell in enumerate(cells):
+            if i:
+                pieces.append(("|", False))
+            core = cell.strip()
+            if _translatable(core):
+                lead = cell[: len(cell) - len(cell.lstrip())]
+                trail = cell[len(cell.rstrip()):]
+                pieces.extend([(lead, False), (core, True), (trail, False)])
+            else:
+                pieces.append((cell, False))
+        pieces.append((newline, False))
+        return
+    m = _LINE_RE.match(body)
+    prefix, core, suffix = m.group(1), m.group(2), m.group(3)
+    if _translatable(core):
+        pieces.extend([(prefix, False), (core, True), (suffix + newline, False)])
+    else:
+        pieces.append((line, False))
+
+
+def split_segments(markdown: str) -> List[Tuple[str, bool]]:
+    """마크다운 -> [(조각, 번역 여부)]. 조각을 그대로 이어 붙이면 원문과 같습니다."""
+    pieces: List[Tuple[str, bool]] = []
+    fence: Optional[str] = None
+    for line in (markdown or "").splitlines(keepends=True):
+        m = _FENCE_RE.match(line)
+        if fence is not None:
+            pieces.append((line, False))
+            if m and m.group(1) == fence:
+                fence = None
+            continue
+        if m:
+            fence = m.group(1)
+            pieces.append((line, False))
+            continue
+        _split_line(line, pieces)
+    return [(t, tr) for t, tr in pieces if t]
+
+
+def segment_hash(segment: str) -> str:
+    return hashlib.sha256(segment.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# 번역 메모리
+# -----------------------------
+
+
+class TranslationMemory:
+    """(세그먼트 해시, 대상 언어) -> 번역문 (SQLite 영속)."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or os.getenv("TRANSLATION_MEMORY_DB") or DEFAULT_TM_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                seg_hash TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (seg_hash, lang)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def lookup(self, segments: List[str], lang: str) -> Dict[str, str]:
+        """원문 -> 번역문 (메모리에 있는 것만)."""
+        by_hash = {segment_hash(s): s for s in segments}
+        hashes = list(by_hash)
+        out: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(hashes), 500):
+                chunk = hashes[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT seg_hash, target FROM translation_memory "
+                    f"WHERE lang = ? AND seg_hash IN ({','.join('?' * len(chunk))})",
+                    [lang, *chunk],
+                ).fetchall()
+                for h, target in rows:
+                    out[by_hash[h]] = target
+        return out
+
+    def store(self, pairs: Dict[str, str], lang: str, provider: str) -> None:
+        now = time.time()
+        rows = [(segment_hash(s), lang, s, t, provider, now) for s, t in pairs.items()]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (seg_hash, lang, source, target, provider, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+_TM: Dict[str, TranslationMemory] = {}
+_TM_LOCK = threading.Lock()
+
+
+def get_translation_memory(db_path: Optional[str] = None) -> TranslationMemory:
+    path = str(db_path or os.getenv("TRANSLATION_MEMORY_DB") or DEFAULT_TM_PATH)
+    with _TM_LOCK:
+        if path not in _TM:
+            _TM[path] = TranslationMemory(path)
+        return _TM[path]
+
+
+# -----------------------------
+# DeepL
+# -----------------------------
+
+
+def _encoded_size(seg: str) -> int:
+    """_deepl_request 가 보내는 form 본문에서 세그먼트 하나가 차지하는 바이트 수 (한글은 글자당 9바이트)."""
+    return len("&text=") + len(urllib.parse.quote_plus(seg))
+
+
+def _batches(segments: List[str], max_segments: int, max_bytes: int) -> List[List[str]]:
+    out: List[List[str]] = []
+    cur: List[str] = []
+    size = 0
+    for seg in segments:
+        n = _encoded_size(seg)
+        if cur and (len(cur) >= max_segments or size + n > max_bytes):
+            out.append(cur)
+            cur, size = [], 0
+        cur.append(seg)
+        size += n
+    if cur:
+        out.append(cur)
+    return out
+
+
+def _deepl_request(key: str, texts: List[str], target_lang: str, retries: int = 2) -> List[str]:
+    """DeepL 요청 1회 (text 파라미터 여러 개). 429/5xx 는 Retry-After 만큼 기다렸다 재시도합니다."""
+    data = urllib.parse.urlencode(
+        [("auth_key", key), ("target_lang", target_lang)] + [("text", t) for t in texts]
+    ).encode("utf-8")
+    url = os.getenv("DEEPL_API_URL", DEFAULT_DEEPL_URL)
+    for attempt in range(retries + 1):
+        req = urllib.request.Request(url, data=data, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                body = resp.read().decode("utf-8", errors="ignore")
+            translations = [t["text"] for t in json.loads(body)["translations"]]
+            if len(translations) != len(texts):
+                raise ValueError(f"translation count mismatch: {len(translations)} != {len(texts)}")
+            return translations
+        except urllib.error.HTTPError as e:
+            if attempt < retries and (e.code == 429 or e.code >= 500):
+                try:
+                    wait = float(e.headers.get("Retry-After") or 0)
+                except ValueError:
+                    wait = 0.0
+                time.sleep(min(30.0, wait or 2.0 * (attempt + 1)))
+                continue
+            raise
+    raise RuntimeError("unreachable")
 
 
 def _deepl_translate(text: str, target_lang: str) -> TranslationResult:
@@ -42,23 +273,55 @@ def _deepl_translate(text: str, target_lang: str) -> TranslationResult:
 
     # DeepL target codes: EN, KO, ES, FR, DE, JA, ZH
     tl = target_lang.upper()
-    if tl == "ZH":
-        tl = "ZH"
+    lang = target_lang.lower()
 
-    data = urllib.parse.urlencode(
-        {"auth_key": key, "text": text, "target_lang": tl}
-    ).encode("utf-8")
-    req = urllib.request.Request(
-        "https://api-free.deepl.com/v2/translate", data=data, method="POST"
-    )
+    pieces = split_segments(text)
+    segments = list(dict.fromkeys(p for p, tr in pieces if tr))
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            body = resp.read().decode("utf-8", errors="ignore")
-        js = json.loads(body)
-        out = js["translations"][0]["text"]
-        return TranslationResult(ok=True, provider="deepl", text=out)
-    except Exception as e:
-        return TranslationResult(ok=False, provider="deepl", text=text, error=str(e))
+        memory = get_translation_memory()
+        known = memory.lookup(segments, lang)
+    except Exception:
+        memory, known = None, {}
+    misses = [s for s in segments if s not in known]
+    translated: Dict[str, str] = dict(known)
+    errors: List[str] = []
+
+    def _run(batch: List[str]) -> None:
+        try:
+            out = dict(zip(batch, _deepl_request(key, batch, tl)))
+        except Exception as e:
+            errors.append(str(e))
+            return
+        translated.update(out)
+        if memory is not None:
+            try:
+                memory.store(out, lang, "deepl")
+            except Exception:
+                pass
+
+    batches = _batches(
+        misses,
+        max_segments=max(1, _env_int("DEEPL_BATCH_SEGMENTS", 50)),
+        max_bytes=max(1, _env_int("DEEPL_BATCH_BYTES", 60000)),
+    )
+    workers = min(max(1, _env_int("DEEPL_WORKERS", 3)), len(batches))
+    if workers == 1:
+        for batch in batches:
+            _run(batch)
+    elif workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_run, batches))
+
+    stats = dict(
+        segments=len(segments),
+        memory_hits=len(known),
+        billed_chars=sum(len(s) for s in misses),
+    )
+    if errors:
+        # 성공한 배치는 메모리에 남았으므로 다음 시도에서는 실패한 부분만 다시 보냄
+        return TranslationResult(ok=False, provider="deepl", text=text, error=errors[0], **stats)
+    out = "".join(translated[p] if tr else p for p, tr in pieces)
+    return TranslationResult(ok=True, provider="deepl", text=out, **stats)
 
 
 def mock_translate(text: str, target_lang: str) -> TranslationResult: